@@ -0,0 +1,37 @@
+"""
+Migration: Create rules_engine_training_checkpoints table
+
+Revision ID: 018_rules_training_checkpoints
+Revises: 017_telegram_exchange
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '018_rules_training_checkpoints'
+down_revision = '017_telegram_exchange'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create rules_engine_training_checkpoints table (one row per platform)."""
+    op.create_table(
+        'rules_engine_training_checkpoints',
+        sa.Column('platform', sa.Text(), nullable=False),
+        sa.Column('last_event_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('last_event_id', sa.String(36), nullable=True),
+        sa.Column('weights', JSONB, nullable=False),
+        sa.Column('examples_seen', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('NOW()'), nullable=False),
+        sa.PrimaryKeyConstraint('platform')
+    )
+
+
+def downgrade():
+    """Drop rules_engine_training_checkpoints table."""
+    op.drop_table('rules_engine_training_checkpoints')
@@ -13,7 +13,7 @@ from typing import Dict, Any
 from app.core.database import get_db
 from app.models.database import Job, JobStatus, Clip, ClipStatus, VideoAsset
 from app.core.logging import get_logger
-from app.ledger import get_recent_events, get_total_events
+from app.ledger import get_recent_events, get_total_events, get_ledger_writer
 from app.ledger.models import LedgerEvent
 from app.auth.permissions import require_role
 
@@ -266,3 +266,34 @@ async def get_ledger_recent(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=error_msg
         )
+
+
+@router.get("/ledger/writer")
+async def get_ledger_writer_stats(
+    _auth: dict = Depends(require_role("admin"))
+) -> Dict[str, Any]:
+    """
+    Get buffered ledger writer metrics.
+    
+    Returns:
+        {
+            "enabled": true,
+            "running": true,
+            "queue_depth": 12,
+            "max_queue_depth": 480,
+            "max_buffer": 10000,
+            "enqueued": 15230,
+            "written": 15218,
+            "dropped": 0,
+            "retried": 0,
+            "failed": 0,
+            "flushes": 96,
+            "last_flush_ms": 4.2
+        }
+        or {"enabled": false} when events go to the request's session
+    """
+    writer = get_ledger_writer()
+    if writer is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **writer.stats()}
@@ -3,6 +3,7 @@ Jobs endpoint handlers.
 POST /jobs - Create a job
 GET /jobs - List jobs
 GET /jobs/{id} - Get a job
+POST /jobs/{id}/cancel - Cancel a job
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
@@ -14,6 +15,7 @@ from app.models.schemas import Job as JobSchema, JobCreate
 from app.models.database import Job, JobStatus
 from app.core.database import get_db
 from app.services.job_worker import run_job
+from app.services.variant_renderer import request_render_cancel
 from app.worker import process_single_job
 from app.auth.permissions import require_role
 from app.ledger.logging import log_job_event
@@ -33,7 +35,7 @@ async def create_job(
     Args:
         job_data: Job creation data
         db: Database session
-        
+    
     Returns:
         Created Job object
     """
@@ -66,7 +68,8 @@ async def create_job(
         metadata={
             "job_type": job_data.job_type,
             "has_params": job_data.params is not None
-        }
+        },
+        durability="transactional"
     )
     
     await db.commit()
@@ -89,7 +92,7 @@ async def list_jobs(
         status: Filter by job status
         created_by: Filter by creator (not implemented yet)
         db: Database session
-        
+    
     Returns:
         List of Job objects
     """
@@ -116,7 +119,7 @@ async def get_job(
     Args:
         id: Job ID
         db: Database session
-        
+    
     Returns:
         Job object
     """
@@ -180,7 +183,7 @@ async def process_job_by_id(
     Args:
         id: Job ID
         db: Database session
-        
+    
     Returns:
         Processing summary with status, clips generated, and timing
     """
@@ -200,3 +203,65 @@ async def process_job_by_id(
     summary = await run_job(str(id), db)
     
     return summary
+
+
+@router.post("/jobs/{id}/cancel")
+async def cancel_job(
+    id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _auth: dict = Depends(require_role("admin", "manager", "operator"))
+):
+    """
+    Cancel a job.
+    
+    PENDING jobs are marked FAILED before they run. PROCESSING variant jobs
+    get a persisted cancel flag: ffmpeg is terminated at once if it runs in
+    this process, otherwise at the worker's next progress update; the job
+    then fails with a cancellation error.
+    
+    Args:
+        id: Job ID
+        db: Database session
+    
+    Returns:
+        {
+            "job_id": str,
+            "status": str,
+            "cancelled": bool
+        }
+    """
+    result = await db.execute(
+        select(Job).where(Job.id == id)
+    )
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="job not found"
+        )
+    
+    cancelled = False
+    if job.status == JobStatus.PENDING:
+        job.status = JobStatus.FAILED
+        job.error_message = "Cancelled"
+        cancelled = True
+    elif job.status == JobStatus.PROCESSING and job.job_type == "generate_variants":
+        request_render_cancel(job)
+        cancelled = True
+    
+    if cancelled:
+        await log_job_event(
+            db=db,
+            job_id=job.id,
+            event_type="job_cancelled",
+            metadata={"job_type": job.job_type},
+            durability="transactional"
+        )
+        await db.commit()
+    
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "cancelled": cancelled
+    }
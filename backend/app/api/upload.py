@@ -165,14 +165,16 @@ async def upload_video(
                 "size": file_size,
                 "content_type": file.content_type,
                 "title": title
-            }
+            },
+            durability="transactional"
         )
         
         await log_job_event(
             db=db,
             job_id=job.id,
             event_type="job_created",
-            metadata={"job_type": "cut_analysis", "reason": "initial_cut_from_upload"}
+            metadata={"job_type": "cut_analysis", "reason": "initial_cut_from_upload"},
+            durability="transactional"
         )
         
         # 11. Commit transaction
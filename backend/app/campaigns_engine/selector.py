@@ -7,6 +7,8 @@ from uuid import UUID
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.clip_dedup import find_recent_duplicates
 from app.models.database import Clip, ClipStatus, BestClipDecisionModel
 from app.rules_engine import RuleEngine
 from app.campaigns_engine.schemas import BestClipDecision, ClipScore
@@ -21,7 +23,11 @@ async def select_best_clip_for_platform(
     """
     Select the best clip for a video asset on a specific platform.
     
-    Uses Rule Engine to evaluate all READY clips and selects the one with highest score.
+    Uses Rule Engine to evaluate all READY clips in one batch (cached rules,
+    one ledger event) and selects the one with highest score.
+    Clips that near-duplicate a clip recently scheduled/published on the platform
+    are flagged in the ledger, or passed over if CLIP_DEDUP_ACTION is "skip"
+    (unless every candidate is a duplicate).
     Stores the decision in best_clip_decisions table and logs to ledger.
     
     Args:
@@ -46,20 +52,22 @@ async def select_best_clip_for_platform(
     if not clips:
         raise ValueError(f"No READY clips found for video_asset_id={video_asset_id}")
     
-    # Evaluate each clip with Rule Engine
+    # Evaluate all clips with Rule Engine in one batch
     engine = RuleEngine()
-    scores: list[ClipScore] = []
-    
-    for clip in clips:
-        score = await engine.evaluate_clip(db, clip.id, platform)
-        scores.append(ClipScore(
-            clip_id=clip.id,
-            platform=platform,
-            score=score
-        ))
+    clip_scores = await engine.evaluate_clips_batch(db, clips, platform)
+    scores: list[ClipScore] = [
+        ClipScore(clip_id=clip.id, platform=platform, score=score)
+        for clip, score in zip(clips, clip_scores)
+    ]
+    
+    # Check all candidates against recent posts on the platform at once
+    duplicates = await find_recent_duplicates(db, clips, platform)
+    eligible = scores
+    if duplicates and settings.CLIP_DEDUP_ACTION == "skip":
+        eligible = [s for s in scores if str(s.clip_id) not in duplicates] or scores
     
     # Select clip with highest score
-    best_score = max(scores, key=lambda s: s.score)
+    best_score = max(eligible, key=lambda s: s.score)
     best_clip = next(c for c in clips if c.id == best_score.clip_id)
     
     # Create decision object
@@ -84,7 +92,8 @@ async def select_best_clip_for_platform(
             "platform": platform,
             "clip_id": str(best_clip.id),
             "score": best_score.score,
-            "num_candidates": len(clips)
+            "num_candidates": len(clips),
+            "near_duplicates": duplicates or None
         }
     )
     
@@ -65,7 +65,8 @@ async def create_internal_campaigns_for_decisions(
                 "clip_id": str(decision.clip_id),
                 "video_asset_id": str(decision.video_asset_id),
                 "score": decision.score
-            }
+            },
+            durability="transactional"
         )
     
     await db.commit()
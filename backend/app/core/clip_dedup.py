@@ -0,0 +1,324 @@
+"""
+Core Clip Dedup Module
+Near-duplicate clip detection over clip-level CLIP embeddings
+(ClipMetadata.avg_embedding), used before a clip is scheduled or selected
+for a platform.
+
+- cut_analysis stores each clip's average embedding in Clip.params
+  ("avg_embedding", base64 float16)
+- ClipDedupIndex keeps normalized embeddings in memory: exact cosine over
+  small candidate sets, SimHash LSH buckets to prune large ones
+- find_recent_duplicates() compares clips against the clips scheduled or
+  published on the same platform within CLIP_DEDUP_WINDOW_DAYS; vectors are
+  served from the index and re-read from the database only for clips that
+  are new to the process or whose Clip.updated_at changed (e.g. re-analyzed)
+"""
+import base64
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_index = None
+_loaded: Dict[str, Any] = {}  # clip_id -> Clip.updated_at the index reflects (clips without an embedding too)
+
+
+def encode_embedding(vector: Iterable[float]) -> str:
+    """Embedding as base64 float16 (1 KB for 512-d instead of ~10 KB of JSON floats)."""
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def decode_embedding(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float16).astype(np.float32)
+
+
+class ClipDedupIndex:
+    """
+    In-memory index of clip embeddings for near-duplicate lookups.
+    
+    Vectors are L2-normalized, so similarity is the cosine. Queries restricted
+    to at most `brute_force_max` candidates are scored exactly with one matrix
+    product; larger ones are first pruned with `num_tables` random-hyperplane
+    (SimHash) tables of `num_bits` bits, where near-duplicates (cosine >= 0.9)
+    share a bucket in at least one table with high probability.
+    """
+    
+    def __init__(
+        self,
+        num_tables: int = 8,
+        num_bits: int = 12,
+        brute_force_max: int = 4096,
+        seed: int = 0
+    ):
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.brute_force_max = brute_force_max
+        self.seed = seed
+        
+        self.dimension: Optional[int] = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._count = 0
+        self._rows: Dict[str, int] = {}  # clip_id -> row
+        self._clip_ids: List[str] = []
+        self._planes: Optional[np.ndarray] = None  # (num_tables * num_bits, dimension)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(num_tables)]
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, clip_id: str) -> bool:
+        return clip_id in self._rows
+    
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, num_tables) bucket keys."""
+        bits = (vectors @ self._planes.T > 0).reshape(len(vectors), self.num_tables, self.num_bits)
+        return bits.astype(np.int64) @ self._bit_weights
+    
+    def add(self, clip_id: str, vector: Iterable[float]) -> None:
+        """Index (or replace) the embedding of a clip."""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        vector = vector / norm
+        
+        if self.dimension is None:
+            self.dimension = len(vector)
+            self._vectors = np.zeros((1024, self.dimension), dtype=np.float32)
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.num_tables * self.num_bits, self.dimension)).astype(np.float32)
+        elif len(vector) != self.dimension:
+            raise ValueError(f"Embedding dimension {len(vector)} != index dimension {self.dimension}")
+        
+        row = self._rows.get(clip_id)
+        if row is None:
+            row = self._count
+            if row == len(self._vectors):
+                self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+            self._rows[clip_id] = row
+            self._clip_ids.append(clip_id)
+            self._count += 1
+        else:
+            # Replaced embedding: drop the old bucket entries
+            for table, key in enumerate(self._hash(self._vectors[row:row + 1])[0].tolist()):
+                self._buckets[table][key].remove(row)
+        
+        self._vectors[row] = vector
+        for table, key in enumerate(self._hash(vector[None, :])[0].tolist()):
+            self._buckets[table].setdefault(key, []).append(row)
+    
+    def discard(self, clip_id: str) -> None:
+        """Remove a clip from the index (no-op if not indexed)."""
+        row = self._rows.pop(clip_id, None)
+        if row is None:
+            return
+        
+        for table, key in enumerate(self._hash(self._vectors[row:row + 1])[0].tolist()):
+            self._buckets[table][key].remove(row)
+        
+        # Move the last row into the freed one
+        last = self._count - 1
+        if row != last:
+            for table, key in enumerate(self._hash(self._vectors[last:last + 1])[0].tolist()):
+                bucket = self._buckets[table][key]
+                bucket[bucket.index(last)] = row
+            self._vectors[row] = self._vectors[last]
+            self._clip_ids[row] = self._clip_ids[last]
+            self._rows[self._clip_ids[row]] = row
+        
+        self._clip_ids.pop()
+        self._count -= 1
+    
+    def get(self, clip_id: str) -> Optional[np.ndarray]:
+        """Normalized embedding of a clip, if indexed."""
+        row = self._rows.get(clip_id)
+        return None if row is None else self._vectors[row]
+    
+    def query(
+        self,
+        vector: Iterable[float],
+        min_similarity: float,
+        candidates: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+        top_k: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Indexed clips whose cosine similarity to `vector` is >= min_similarity.
+        
+        Args:
+            vector: Query embedding (normalized here)
+            min_similarity: Cosine threshold
+            candidates: Only consider these clip IDs (unindexed ones are ignored)
+            exclude: Clip IDs never returned (e.g. the query clip itself)
+            top_k: Max matches
+        
+        Returns:
+            (clip_id, similarity) pairs, most similar first
+        """
+        if not self._count:
+            return []
+        
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm == 0 or len(vector) != self.dimension:
+            return []
+        vector = vector / norm
+        
+        if candidates is None:
+            rows = np.arange(self._count)
+        else:
+            rows = np.fromiter(
+                (self._rows[c] for c in set(candidates) if c in self._rows),
+                dtype=np.int64
+            )
+        
+        if len(rows) > self.brute_force_max:
+            bucketed = set()
+            for table, key in enumerate(self._hash(vector[None, :])[0].tolist()):
+                bucketed.update(self._buckets[table].get(key, ()))
+            rows = rows[np.isin(rows, np.fromiter(bucketed, dtype=np.int64, count=len(bucketed)))]
+        
+        excluded = {self._rows[c] for c in exclude if c in self._rows}
+        if excluded:
+            rows = rows[~np.isin(rows, list(excluded))]
+        if not len(rows):
+            return []
+        
+        similarities = self._vectors[rows] @ vector
+        matches = np.flatnonzero(similarities >= min_similarity)
+        matches = matches[np.argsort(-similarities[matches], kind="stable")][:top_k]
+        return [(self._clip_ids[rows[i]], round(float(similarities[i]), 4)) for i in matches]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "clips": self._count,
+            "dimension": self.dimension,
+            "num_tables": self.num_tables,
+            "num_bits": self.num_bits,
+        }
+
+
+def get_clip_dedup_index() -> ClipDedupIndex:
+    """Process-wide ClipDedupIndex (filled lazily from Clip.params)."""
+    global _index
+    
+    if _index is None:
+        _index = ClipDedupIndex()
+        _loaded.clear()
+    return _index
+
+
+async def _load_embeddings(db: AsyncSession, clip_ids: List[Any]) -> None:
+    """
+    Bring the index up to date with the stored embeddings of clips.
+    
+    One query reads the clips' updated_at; params are read only for clips
+    that are new to the process or were updated since they were loaded, so
+    re-analyzed clips are re-indexed and clips without an embedding are not
+    fetched again.
+    """
+    from app.models.database import Clip
+    
+    index = get_clip_dedup_index()
+    if not clip_ids:
+        return
+    
+    result = await db.execute(select(Clip.id, Clip.updated_at).where(Clip.id.in_(clip_ids)))
+    stale = [
+        clip_id for clip_id, updated_at in result.all()
+        if str(clip_id) not in _loaded or _loaded[str(clip_id)] != updated_at
+    ]
+    if not stale:
+        return
+    
+    result = await db.execute(select(Clip.id, Clip.updated_at, Clip.params).where(Clip.id.in_(stale)))
+    for clip_id, updated_at, params in result.all():
+        data = (params or {}).get("avg_embedding")
+        if data:
+            index.add(str(clip_id), decode_embedding(data))
+        else:
+            index.discard(str(clip_id))
+        _loaded[str(clip_id)] = updated_at
+
+
+async def find_recent_duplicates(
+    db: AsyncSession,
+    clips: List[Any],
+    platform: str,
+    around: Optional[datetime] = None,
+    window_days: Optional[int] = None,
+    min_similarity: Optional[float] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Near-duplicates of clips among the clips scheduled or published on a platform.
+    
+    Other clips with a non-failed publish log on `platform` whose scheduled
+    (or requested) time is within `window_days` of `around` are compared
+    with each clip by embedding cosine similarity.
+    
+    Args:
+        db: Database session
+        clips: Clip rows to check
+        platform: Platform name
+        around: Reference time (defaults to utcnow)
+        window_days: Days before/after `around` (defaults to CLIP_DEDUP_WINDOW_DAYS)
+        min_similarity: Cosine threshold (defaults to CLIP_DEDUP_MIN_SIMILARITY)
+    
+    Returns:
+        {clip_id: [{"clip_id", "similarity"}, ...]} for the clips that have
+        near-duplicates (empty if disabled or no clip has an embedding)
+    """
+    from app.models.database import PublishLogModel
+    
+    if not settings.CLIP_DEDUP_ENABLED or not clips:
+        return {}
+    
+    around = around or datetime.utcnow()
+    window = timedelta(days=window_days if window_days is not None else settings.CLIP_DEDUP_WINDOW_DAYS)
+    min_similarity = min_similarity if min_similarity is not None else settings.CLIP_DEDUP_MIN_SIMILARITY
+    
+    await _load_embeddings(db, [clip.id for clip in clips])
+    index = get_clip_dedup_index()
+    queried = [clip for clip in clips if str(clip.id) in index]
+    if not queried:
+        return {}
+    
+    lo, hi = around - window, around + window
+    result = await db.execute(
+        select(PublishLogModel.clip_id).where(
+            and_(
+                PublishLogModel.platform == platform,
+                PublishLogModel.status != "failed",
+                or_(
+                    PublishLogModel.scheduled_for.between(lo, hi),
+                    and_(PublishLogModel.scheduled_for.is_(None), PublishLogModel.requested_at.between(lo, hi))
+                )
+            )
+        ).distinct()
+    )
+    recent = result.scalars().all()
+    if not recent:
+        return {}
+    
+    await _load_embeddings(db, recent)
+    candidates = [str(clip_id) for clip_id in recent]
+    
+    duplicates = {}
+    for clip in queried:
+        clip_id = str(clip.id)
+        matches = index.query(index.get(clip_id), min_similarity, candidates=candidates, exclude=[clip_id])
+        if matches:
+            duplicates[clip_id] = [
+                {"clip_id": match_id, "similarity": similarity}
+                for match_id, similarity in matches
+            ]
+    
+    return duplicates
@@ -38,6 +38,29 @@ class Settings(BaseSettings):
     MAX_JOB_RETRIES: int = 3  # maximum retry attempts per job
     WORKER_ENABLED: bool = False  # enable background worker loop
     
+    # Vision Worker Pool Configuration
+    VISION_POOL_ENABLED: bool = False  # analyze clips with the multi-process vision pool (YOLO + CLIP)
+    VISION_POOL_WORKERS: int = 0  # worker processes (0 = CPU count)
+    VISION_POOL_MAX_IN_FLIGHT: int = 0  # max clips queued or running (0 = 2 x workers)
+    VISION_FRAME_CACHE_ENABLED: bool = False  # decode each video once into memory-mapped .npy frame stacks
+    VISION_FRAME_CACHE_DIR: str = "storage/frame_cache"
+    VISION_FRAME_CACHE_MAX_BYTES: int = 2 * 1024 ** 3  # LRU eviction above this size
+    VISION_RESULTS_STORE_ENABLED: bool = False  # reuse clip analyses keyed by (content hash, range, models)
+    VISION_RESULTS_STORE_DIR: str = "storage/vision_results"
+    VISION_CUT_DETECTION_ENABLED: bool = True  # shot-boundary cut analysis (OpenCV only, no models)
+    
+    # Variant Rendering (FFmpeg)
+    FFMPEG_BINARY: str = "ffmpeg"
+    VARIANT_STORAGE_DIR: str = "storage/variants"  # rendered platform variants, one folder per clip
+    RENDER_MAX_CONCURRENT: int = 0  # ffmpeg processes at once (0 = CPU count // RENDER_THREADS_PER_JOB)
+    RENDER_THREADS_PER_JOB: int = 2  # threads per ffmpeg process
+    
+    # Ledger Writer
+    LEDGER_WRITER_ENABLED: bool = False  # buffer ledger events and write them in batches (own session)
+    LEDGER_WRITER_BATCH_SIZE: int = 500  # rows per INSERT; a full batch is flushed at once
+    LEDGER_WRITER_FLUSH_INTERVAL_MS: int = 200  # longest time an event waits in the buffer
+    LEDGER_WRITER_MAX_BUFFER: int = 10000  # buffered events above this are dropped (and counted)
+    
     # Debug Configuration
     DEBUG_ENDPOINTS_ENABLED: bool = True  # enable /debug endpoints (disable in production)
     
@@ -53,6 +76,10 @@ class Settings(BaseSettings):
         "tiktok": 30,
         "youtube": 90
     }
+    CLIP_DEDUP_ENABLED: bool = True  # check clips against recent posts on the platform by CLIP embedding
+    CLIP_DEDUP_MIN_SIMILARITY: float = 0.95  # cosine similarity at or above which clips are near-duplicates
+    CLIP_DEDUP_WINDOW_DAYS: int = 30  # compare with clips scheduled/published this many days around
+    CLIP_DEDUP_ACTION: str = "flag"  # "flag" (record in metadata/ledger) or "skip" (reject / don't select)
     
     # Orchestrator Configuration
     ORCHESTRATOR_ENABLED: bool = False  # enable autonomous orchestrator loop
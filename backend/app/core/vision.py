@@ -0,0 +1,149 @@
+"""
+Core Vision Module
+Wires the Vision Engine (app.ml) into the API process from settings:
+shared VisionConfig, results store, multi-process worker pool and
+shot-boundary cut detection.
+
+app.ml is imported lazily: it pulls in PyTorch/YOLO, which API processes
+that never analyze video don't need.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_results_store = None
+
+
+def get_vision_config():
+    """VisionConfig shared by every engine (the results store key depends on it)."""
+    from app.ml.models import VisionConfig
+    
+    return VisionConfig(
+        pool_workers=settings.VISION_POOL_WORKERS,
+        pool_max_in_flight=settings.VISION_POOL_MAX_IN_FLIGHT,
+        frame_cache_enabled=settings.VISION_FRAME_CACHE_ENABLED,
+        frame_cache_dir=settings.VISION_FRAME_CACHE_DIR,
+        frame_cache_max_bytes=settings.VISION_FRAME_CACHE_MAX_BYTES,
+        results_store_enabled=settings.VISION_RESULTS_STORE_ENABLED,
+        results_store_dir=settings.VISION_RESULTS_STORE_DIR
+    )
+
+
+def get_vision_pool():
+    """Process-wide VisionWorkerPool (started on first use)."""
+    from app.ml.vision_pool import get_vision_pool as _get_vision_pool
+    
+    return _get_vision_pool(get_vision_config())
+
+
+def get_vision_results_store():
+    """Process-wide VisionResultsStore, or None if disabled."""
+    global _results_store
+    
+    if not settings.VISION_RESULTS_STORE_ENABLED:
+        return None
+    
+    if _results_store is None:
+        from app.ml.results_store import VisionResultsStore
+        _results_store = VisionResultsStore(settings.VISION_RESULTS_STORE_DIR)
+    return _results_store
+
+
+async def analyze_clips(
+    video_path: Optional[str],
+    clips: List[Dict[str, Any]],
+    video_id: str
+) -> Optional[List[Any]]:
+    """
+    Vision analysis (ClipMetadata) for clips of one video.
+    
+    Stored results are returned without loading any model; missing clips are
+    analyzed in the vision pool when it is enabled.
+    
+    Args:
+        video_path: Local path of the source video
+        clips: One dict per clip with clip_id and optional start_ms / end_ms
+        video_id: Source video UUID
+    
+    Returns:
+        ClipMetadata per clip (same order), or None if the video is not
+        available locally or some clip can't be analyzed here
+    """
+    if not video_path or not os.path.exists(video_path):
+        return None
+    
+    store = get_vision_results_store()
+    results: List[Any] = [None] * len(clips)
+    
+    if store is not None:
+        config = get_vision_config()
+        # Off the event loop: the first lookup hashes the video file
+        results = await asyncio.to_thread(lambda: [
+            store.get(
+                video_path,
+                config,
+                start_ms=clip.get("start_ms"),
+                end_ms=clip.get("end_ms"),
+                clip_id=clip["clip_id"],
+                video_id=video_id
+            )
+            for clip in clips
+        ])
+    
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+    
+    if not settings.VISION_POOL_ENABLED:
+        return None
+    
+    try:
+        computed = await get_vision_pool().process_clips([
+            {
+                "video_path": video_path,
+                "clip_id": clips[i]["clip_id"],
+                "video_id": video_id,
+                "start_ms": clips[i].get("start_ms"),
+                "end_ms": clips[i].get("end_ms"),
+            }
+            for i in missing
+        ])
+    except Exception as e:
+        logger.warning(f"Vision analysis failed for {video_path}: {e}")
+        return None
+    
+    for i, metadata in zip(missing, computed):
+        results[i] = metadata
+    return results
+
+
+async def detect_cuts(video_path: Optional[str]) -> Optional[Any]:
+    """
+    Shot-boundary cut analysis (CutAnalysis) of a whole video.
+    
+    Runs in a thread (OpenCV decoding releases the GIL), so the event loop
+    keeps serving while a long video is analyzed.
+    
+    Args:
+        video_path: Local path of the source video
+    
+    Returns:
+        CutAnalysis, or None if disabled, the video is not available locally
+        or it can't be decoded
+    """
+    if not settings.VISION_CUT_DETECTION_ENABLED or not video_path or not os.path.exists(video_path):
+        return None
+    
+    try:
+        from app.ml.cut_detector import CutDetector
+        
+        detector = CutDetector(get_vision_config())
+        return await asyncio.to_thread(detector.analyze, video_path)
+    except Exception as e:
+        logger.warning(f"Cut analysis failed for {video_path}: {e}")
+        return None
@@ -74,7 +74,8 @@ async def execute_action(
                 "action_type": action_type,
                 "payload": payload,
                 "result": result
-            }
+            },
+            durability="transactional"
         )
         
         return {
@@ -96,7 +97,8 @@ async def execute_action(
                 "payload": payload,
                 "error": str(e)
             },
-            is_error=True
+            is_error=True,
+            durability="transactional"
         )
         
         raise
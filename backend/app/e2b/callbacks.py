@@ -71,7 +71,8 @@ async def process_e2b_callback(
             "num_cuts": len(result.cuts) if result.status == "completed" else 0,
             "processing_time_ms": result.processing_time_ms,
             "has_error": result.error_message is not None
-        }
+        },
+        durability="transactional"
     )
     
     return job
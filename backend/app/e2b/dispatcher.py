@@ -43,7 +43,8 @@ async def dispatch_e2b_job(
             "job_type": job.job_type,
             "video_asset_id": str(job.video_asset_id),
             "dispatcher": "e2b"
-        }
+        },
+        durability="transactional"
     )
     
     try:
@@ -69,7 +70,8 @@ async def dispatch_e2b_job(
                 "status": result.status,
                 "num_cuts": len(result.cuts),
                 "processing_time_ms": result.processing_time_ms
-            }
+            },
+            durability="transactional"
         )
         
         return result
@@ -87,7 +89,8 @@ async def dispatch_e2b_job(
             metadata={
                 "error": str(e),
                 "error_type": type(e).__name__
-            }
+            },
+            durability="transactional"
         )
         
         raise
@@ -18,6 +18,7 @@ from app.e2b.models import (
     FakeCut,
 )
 from app.ledger import log_event
+from app.core.vision import detect_cuts
 
 
 async def run_e2b_simulation(
@@ -31,7 +32,7 @@ async def run_e2b_simulation(
     - YOLO detections (10-30 objects)
     - Embeddings (every 1000ms)
     - Trend features
-    - Video cuts (3-12 clips)
+    - Video cuts (3-12 clips; real shot-boundary cuts when the file is local)
     - Visual scores for each cut
     
     Formula: score = 0.6*visual + 0.2*motion + 0.2*trend
@@ -67,8 +68,13 @@ async def run_e2b_simulation(
     # Generate fake trend features
     trend_features = _generate_trend_features()
     
-    # Generate fake cuts (3-12 clips)
-    cuts = _generate_cuts(duration_ms, trend_features)
+    # Real shot-boundary cuts when the source file is available,
+    # else fake cuts (3-12 clips)
+    cut_analysis = await detect_cuts(video_asset.file_path)
+    if cut_analysis is not None and cut_analysis.candidates:
+        cuts = _cuts_from_analysis(cut_analysis, trend_features)
+    else:
+        cuts = _generate_cuts(duration_ms, trend_features)
     
     # Create clips in database
     await _create_clips_in_db(
@@ -92,7 +98,8 @@ async def run_e2b_simulation(
             "num_embeddings": len(embeddings),
             "num_cuts": len(cuts),
             "processing_time_ms": processing_time_ms
-        }
+        },
+        durability="transactional"
     )
     
     return E2BSandboxResult(
@@ -236,6 +243,27 @@ def _generate_cuts(duration_ms: int, trend_features: FakeTrendFeatures) -> List[
     return sorted(cuts, key=lambda c: c.start_ms)
 
 
+def _cuts_from_analysis(cut_analysis, trend_features: FakeTrendFeatures) -> List[FakeCut]:
+    """
+    Convert detected candidate windows (app.ml CutAnalysis) to cuts.
+    
+    Visual score and motion intensity come from the video; the trend score
+    is still simulated.
+    """
+    return [
+        FakeCut(
+            start_ms=candidate.start_ms,
+            end_ms=candidate.end_ms,
+            duration_ms=candidate.duration_ms,
+            visual_score=candidate.visual_score,
+            motion_intensity=candidate.motion_intensity,
+            trend_score=trend_features.overall_trend_score,
+            confidence=candidate.confidence
+        )
+        for candidate in cut_analysis.candidates
+    ]
+
+
 async def _create_clips_in_db(
     db: AsyncSession,
     video_asset_id,
@@ -36,10 +36,20 @@ Usage:
         event_type="clip_created",
         metadata={"visual_score": 0.85}
     )
+    
+    # Batch events off the caller's transaction (e.g. at startup)
+    await start_ledger_writer(AsyncSessionLocal)
 """
 
 from app.ledger.models import LedgerEvent, EventSeverity
 from app.ledger.service import log_event, log_job_event, log_clip_event
+from app.ledger.writer import (
+    Durability,
+    LedgerWriter,
+    get_ledger_writer,
+    start_ledger_writer,
+    stop_ledger_writer
+)
 from app.ledger.ledger import (
     get_recent_events,
     get_events_by_type,
@@ -59,6 +69,13 @@ __all__ = [
     "log_job_event",
     "log_clip_event",
     
+    # Buffered writer
+    "Durability",
+    "LedgerWriter",
+    "get_ledger_writer",
+    "start_ledger_writer",
+    "stop_ledger_writer",
+    
     # Query functions
     "get_recent_events",
     "get_events_by_type",
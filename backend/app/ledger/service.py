@@ -3,12 +3,16 @@ Ledger service layer for event logging.
 
 Provides fail-safe functions to log events without breaking application flow.
 All functions catch exceptions and only log errors, never raising them.
+
+Events go to the caller's session unless a LedgerWriter is running
+(app.ledger.writer), which buffers them and writes them in batches.
 """
 from typing import Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ledger.models import LedgerEvent, EventSeverity
+from app.ledger.writer import Durability, get_ledger_writer
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -23,7 +27,8 @@ async def log_event(
     severity: str = "INFO",
     worker_id: Optional[str] = None,
     job_id: Optional[UUID] = None,
-    clip_id: Optional[UUID] = None
+    clip_id: Optional[UUID] = None,
+    durability: Optional[str] = None
 ) -> Optional[LedgerEvent]:
     """
     Log a generic event to the ledger.
@@ -41,9 +46,12 @@ async def log_event(
         worker_id: ID of the worker that processed the event (optional)
         job_id: UUID of related job (optional)
         clip_id: UUID of related clip (optional)
+        durability: "buffered", "flush" or "transactional" (see
+            app.ledger.writer); default "buffered" if a LedgerWriter is
+            running, else "transactional" (always without a writer)
         
     Returns:
-        LedgerEvent instance if successful, None if failed
+        LedgerEvent instance if successful, None if failed (or dropped)
         
     Example:
         >>> await log_event(
@@ -70,8 +78,20 @@ async def log_event(
             clip_id=clip_id
         )
         
-        db.add(event)
-        # Note: We don't commit here - let the caller manage transaction
+        writer = get_ledger_writer()
+        mode = Durability(durability) if durability else Durability.BUFFERED
+        
+        if writer is None or mode == Durability.TRANSACTIONAL:
+            db.add(event)
+            # Note: We don't commit here - let the caller manage transaction
+        elif mode == Durability.FLUSH:
+            await writer.write(event)
+        elif not writer.enqueue(event):
+            logger.warning(
+                f"Ledger buffer full, event dropped: {event_type}",
+                extra={"event_type": event_type, "dropped": writer.dropped}
+            )
+            return None
         
         logger.info(
             f"Ledger event logged: {event_type}",
@@ -107,7 +127,8 @@ async def log_job_event(
     event_type: str,
     metadata: Optional[Dict[str, Any]] = None,
     severity: str = "INFO",
-    worker_id: Optional[str] = None
+    worker_id: Optional[str] = None,
+    durability: Optional[str] = None
 ) -> Optional[LedgerEvent]:
     """
     Log an event related to a job.
@@ -121,6 +142,7 @@ async def log_job_event(
         metadata: Additional data about the event (optional)
         severity: Event severity - INFO, WARN, or ERROR (default: INFO)
         worker_id: ID of the worker processing the job (optional)
+        durability: How the event is written (see log_event)
         
     Returns:
         LedgerEvent instance if successful, None if failed
@@ -141,7 +163,8 @@ async def log_job_event(
         metadata=metadata,
         severity=severity,
         worker_id=worker_id,
-        job_id=job_id
+        job_id=job_id,
+        durability=durability
     )
 
 
@@ -151,7 +174,8 @@ async def log_clip_event(
     event_type: str,
     metadata: Optional[Dict[str, Any]] = None,
     severity: str = "INFO",
-    job_id: Optional[UUID] = None
+    job_id: Optional[UUID] = None,
+    durability: Optional[str] = None
 ) -> Optional[LedgerEvent]:
     """
     Log an event related to a clip.
@@ -165,6 +189,7 @@ async def log_clip_event(
         metadata: Additional data about the event (optional)
         severity: Event severity - INFO, WARN, or ERROR (default: INFO)
         job_id: UUID of related job (optional)
+        durability: How the event is written (see log_event)
         
     Returns:
         LedgerEvent instance if successful, None if failed
@@ -189,5 +214,6 @@ async def log_clip_event(
         metadata=metadata,
         severity=severity,
         job_id=job_id,
-        clip_id=clip_id
+        clip_id=clip_id,
+        durability=durability
     )
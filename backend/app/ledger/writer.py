@@ -0,0 +1,300 @@
+"""
+Buffered bulk writer for ledger events.
+
+Without a writer, log_event() adds every event to the caller's session:
+one INSERT per event, inside (and holding open) the caller's transaction.
+With a LedgerWriter started (start_ledger_writer), log_event() appends the
+row to a bounded in-memory buffer instead, and a background task writes the
+buffer in its own session with one multi-row INSERT per batch, every
+batch_size events or flush_interval_ms.
+
+Durability per event (log_event(..., durability=...)):
+- "buffered": returns at once; lost if the process dies before the next
+  flush, dropped (and counted) if the buffer is full
+- "flush": waits until the event's batch is committed (group commit,
+  at most flush_interval_ms later); never dropped
+- "transactional": added to the caller's session as without a writer, so
+  it commits or rolls back with the caller's transaction
+
+Usage:
+    from app.ledger.writer import start_ledger_writer, stop_ledger_writer
+    
+    await start_ledger_writer(AsyncSessionLocal)   # startup
+    ...
+    await stop_ledger_writer()                      # shutdown (flushes)
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ledger.models import LedgerEvent, EventSeverity
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Durability(str, Enum):
+    """How log_event() writes an event."""
+    BUFFERED = "buffered"
+    FLUSH = "flush"
+    TRANSACTIONAL = "transactional"
+
+
+# Columns written by the bulk INSERT
+_COLUMNS = (
+    "id", "timestamp", "event_type", "entity_type", "entity_id", "event_data",
+    "severity", "worker_id", "job_id", "clip_id"
+)
+
+
+class LedgerWriter:
+    """
+    Bounded buffer of ledger events, written in batches by a background task.
+    
+    Metrics (stats()): queue depth, enqueued/written/dropped/retried/failed
+    counts, flushes and the duration of the last one.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 500,
+        flush_interval_ms: int = 200,
+        max_buffer: int = 10000
+    ):
+        """
+        Initialize writer (call start() to run the flush loop).
+        
+        Args:
+            session_factory: Creates the sessions batches are written in
+            batch_size: Rows per INSERT; a full batch triggers a flush
+            flush_interval_ms: Longest time an event waits in the buffer
+            max_buffer: Buffered events above this are dropped
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_buffer = max_buffer
+        
+        # (row, future of a "flush" event or None)
+        self._buffer: Deque[Tuple[Dict[str, Any], Optional[asyncio.Future]]] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.retried = 0
+        self.failed = 0
+        self.flushes = 0
+        self.max_queue_depth = 0
+        self.last_flush_ms = 0.0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Events waiting to be written."""
+        return len(self._buffer)
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the flush loop and write everything still buffered."""
+        if self._task is not None:
+            # Let the loop finish its current flush rather than cancel it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+    
+    def enqueue(self, event: LedgerEvent) -> bool:
+        """
+        Buffer an event ("buffered" durability).
+        
+        Returns:
+            False if the buffer was full and the event was dropped
+        """
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return False
+        
+        self._append(event, None)
+        return True
+    
+    async def write(self, event: LedgerEvent) -> None:
+        """
+        Buffer an event and wait until its batch is committed ("flush" durability).
+        
+        Raises:
+            Exception: If the batch could not be written
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._append(event, future)
+        if not self.running:
+            await self.flush()
+        await future
+    
+    async def flush(self) -> int:
+        """
+        Write every buffered event (one INSERT per batch_size rows).
+        
+        Returns:
+            Number of events written
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                written += await self._write_batch(batch)
+        return written
+    
+    def stats(self) -> Dict[str, Any]:
+        """Writer metrics."""
+        return {
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "max_buffer": self.max_buffer,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "retried": self.retried,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "last_flush_ms": self.last_flush_ms
+        }
+    
+    def _append(self, event: LedgerEvent, future: Optional[asyncio.Future]) -> None:
+        # Column defaults would only apply at INSERT time: keep log time order
+        if event.id is None:
+            event.id = uuid4()
+        if event.timestamp is None:
+            event.timestamp = datetime.utcnow()
+        if event.severity is None:
+            event.severity = EventSeverity.INFO
+        
+        self._buffer.append(({column: getattr(event, column) for column in _COLUMNS}, future))
+        self.enqueued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._buffer))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+    
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                # Keep the loop alive; the batch was already counted as failed
+                logger.error("Ledger writer flush failed", extra={"error": str(e)})
+    
+    async def _write_batch(self, batch: List[Tuple[Dict[str, Any], Optional[asyncio.Future]]]) -> int:
+        """One multi-row INSERT in its own transaction, retried once."""
+        start = time.perf_counter()
+        rows = [row for row, _ in batch]
+        try:
+            try:
+                await self._insert(rows)
+            except Exception as e:
+                # Transient errors (dropped connection, lock timeout): retry once
+                self.retried += len(batch)
+                logger.warning(
+                    f"Retrying {len(batch)} ledger events",
+                    extra={"error": str(e), "batch_size": len(batch)}
+                )
+                await self._insert(rows)
+        except Exception as e:
+            # Never break the flow - count and log, like log_event()
+            self.failed += len(batch)
+            logger.error(
+                f"Failed to write {len(batch)} ledger events",
+                extra={"error": str(e), "batch_size": len(batch)}
+            )
+            for _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return 0
+        
+        self.written += len(batch)
+        self.flushes += 1
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.set_result(None)
+        return len(batch)
+    
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as session:
+            await session.execute(insert(LedgerEvent.__table__), rows)
+            await session.commit()
+
+
+# Process-wide writer used by log_event() (None: write to the caller's session)
+_writer: Optional[LedgerWriter] = None
+
+
+def get_ledger_writer() -> Optional[LedgerWriter]:
+    """The running process-wide writer, if any."""
+    return _writer
+
+
+async def start_ledger_writer(
+    session_factory: Callable[[], AsyncSession],
+    batch_size: int = 500,
+    flush_interval_ms: int = 200,
+    max_buffer: int = 10000
+) -> LedgerWriter:
+    """
+    Start the process-wide writer; log_event() buffers through it from now on.
+    
+    Args:
+        session_factory: Creates the sessions batches are written in
+        batch_size: Rows per INSERT; a full batch triggers a flush
+        flush_interval_ms: Longest time an event waits in the buffer
+        max_buffer: Buffered events above this are dropped
+    
+    Returns:
+        Started LedgerWriter
+    """
+    global _writer
+    
+    if _writer is None:
+        _writer = LedgerWriter(
+            session_factory,
+            batch_size=batch_size,
+            flush_interval_ms=flush_interval_ms,
+            max_buffer=max_buffer
+        )
+    _writer.start()
+    return _writer
+
+
+async def stop_ledger_writer() -> None:
+    """Flush and stop the process-wide writer, if running."""
+    global _writer
+    
+    if _writer is not None:
+        writer, _writer = _writer, None
+        await writer.stop()
@@ -128,6 +128,24 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     
+    # Batch ledger writes off the request transactions
+    if settings.LEDGER_WRITER_ENABLED:
+        from app.core.database import AsyncSessionLocal
+        from app.ledger.writer import start_ledger_writer
+        
+        await start_ledger_writer(
+            AsyncSessionLocal,
+            batch_size=settings.LEDGER_WRITER_BATCH_SIZE,
+            flush_interval_ms=settings.LEDGER_WRITER_FLUSH_INTERVAL_MS,
+            max_buffer=settings.LEDGER_WRITER_MAX_BUFFER
+        )
+    
+    # Fork the vision workers before any background task starts a thread
+    if settings.VISION_POOL_ENABLED:
+        from app.core.vision import get_vision_pool
+        
+        get_vision_pool()
+    
     # Start telemetry broadcast background task
     telemetry_task = asyncio.create_task(telemetry_broadcast_loop())
     
@@ -231,6 +249,14 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    if settings.LEDGER_WRITER_ENABLED:
+        from app.ledger.writer import stop_ledger_writer
+        await stop_ledger_writer()
+    
+    if settings.VISION_POOL_ENABLED:
+        from app.ml.vision_pool import shutdown_vision_pool
+        shutdown_vision_pool()
+    
     # Cancel telemetry task
     telemetry_task.cancel()
     try:
@@ -14,6 +14,7 @@ from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.database import VideoAsset
 from app.meta_creative_intelligence.visual_analyzer import VisualAnalyzer
 from app.meta_creative_intelligence.variant_generator import VariantGenerator
 from app.meta_creative_intelligence.winner_engine import WinnerEngine
@@ -184,6 +185,12 @@ class MetaCreativeIntelligenceOrchestrator:
     async def _run_analysis(self, db: AsyncSession, video_asset_id: UUID):
         """Ejecuta análisis visual y persiste en DB"""
         try:
+            # En modo live la detección corre sobre el fichero local del video
+            video_path = None
+            if self.mode == "live":
+                video_asset = await db.get(VideoAsset, video_asset_id)
+                video_path = video_asset.file_path if video_asset else None
+            
             # Ejecutar análisis
             result = await self.visual_analyzer.analyze(
                 video_asset_id=video_asset_id,
@@ -192,6 +199,7 @@ class MetaCreativeIntelligenceOrchestrator:
                 detect_text=True,
                 extract_fragments=True,
                 max_fragments=5,
+                video_path=video_path,
             )
             
             # Persistir en DB
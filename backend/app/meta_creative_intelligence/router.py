@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 
 from app.core.database import get_db
+from app.models.database import VideoAsset
 from app.auth import require_role
 from app.meta_creative_intelligence.orchestrator import MetaCreativeIntelligenceOrchestrator
 from app.meta_creative_intelligence.visual_analyzer import VisualAnalyzer
@@ -63,6 +64,11 @@ async def analyze_video(
     try:
         analyzer = VisualAnalyzer(mode=request.mode)
         
+        video_path = None
+        if request.mode == "live":
+            video_asset = await db.get(VideoAsset, request.video_asset_id)
+            video_path = video_asset.file_path if video_asset else None
+        
         result = await analyzer.analyze(
             video_asset_id=request.video_asset_id,
             detect_objects=request.detect_objects,
@@ -70,6 +76,7 @@ async def analyze_video(
             detect_text=request.detect_text,
             extract_fragments=request.extract_fragments,
             max_fragments=request.max_fragments,
+            video_path=video_path,
         )
         
         # Persistir en DB
@@ -6,7 +6,7 @@ Detecta: objetos, rostros, texto, scoring visual, fragmentos con alto potencial.
 """
 import logging
 import random
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID, uuid4
 
 from app.meta_creative_intelligence.schemas import (
@@ -26,7 +26,8 @@ class VisualAnalyzer:
     Analiza creatividades usando computer vision.
     
     STUB Mode: Genera datos sintéticos realistas
-    LIVE Mode: TODO - Integrar YOLO, face detection, OCR real
+    LIVE Mode: YOLO vía Vision Engine (results store + pool de visión);
+               TODO - face detection, OCR real
     """
     
     def __init__(self, mode: str = "stub"):
@@ -45,6 +46,7 @@ class VisualAnalyzer:
         detect_text: bool = True,
         extract_fragments: bool = True,
         max_fragments: int = 5,
+        video_path: Optional[str] = None,
     ) -> VisualAnalysisResponse:
         """
         Ejecuta análisis visual completo.
@@ -56,7 +58,8 @@ class VisualAnalyzer:
             detect_text: Detectar texto (OCR)
             extract_fragments: Extraer fragmentos de alto potencial
             max_fragments: Máximo de fragmentos a extraer
-            
+            video_path: Ruta local del video (requerida en modo live)
+        
         Returns:
             VisualAnalysisResponse con todos los resultados
         """
@@ -68,7 +71,7 @@ class VisualAnalyzer:
         # Detectar objetos
         objects = []
         if detect_objects:
-            objects = await self._detect_objects_stub(video_asset_id) if self.mode == "stub" else await self._detect_objects_live(video_asset_id)
+            objects = await self._detect_objects_stub(video_asset_id) if self.mode == "stub" else await self._detect_objects_live(video_asset_id, video_path)
         
         # Detectar rostros
         faces = []
@@ -134,25 +137,42 @@ class VisualAnalyzer:
         
         return detections
     
-    async def _detect_objects_live(self, video_asset_id: UUID) -> list[ObjectDetection]:
+    async def _detect_objects_live(
+        self,
+        video_asset_id: UUID,
+        video_path: Optional[str] = None,
+    ) -> list[ObjectDetection]:
         """
-        TODO LIVE: Integrar YOLO v8+ para detección de objetos real
-        
-        from ultralytics import YOLO
-        model = YOLO('yolov8n.pt')
-        results = model(video_path)
-        
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                detections.append(ObjectDetection(
-                    label=model.names[int(box.cls)],
-                    confidence=float(box.conf),
-                    bbox=box.xyxy[0].tolist(),
-                    frame_number=frame_idx,
-                ))
+        LIVE: Detecciones YOLO del Vision Engine.
+        
+        Si el video ya fue analizado (mismo contenido, mismos modelos) el
+        resultado sale del vision results store en milisegundos; si no, se
+        analiza en el pool de visión y queda guardado para otros motores.
         """
-        raise NotImplementedError("LIVE object detection not implemented yet")
+        from app.core.vision import analyze_clips
+        
+        results = await analyze_clips(
+            video_path,
+            [{"clip_id": str(video_asset_id)}],
+            video_id=str(video_asset_id),
+        )
+        if results is None:
+            raise ValueError(f"LIVE object detection unavailable for video {video_asset_id} ({video_path})")
+        
+        return [
+            ObjectDetection(
+                label=enriched.detection.label,
+                confidence=enriched.detection.confidence,
+                bbox=[
+                    enriched.detection.bbox.x,
+                    enriched.detection.bbox.y,
+                    enriched.detection.bbox.x + enriched.detection.bbox.w,
+                    enriched.detection.bbox.y + enriched.detection.bbox.h,
+                ],
+                frame_number=enriched.frame_id or 0,
+            )
+            for enriched in results[0].detections
+        ]
     
     # ========================================================================
     # FACE DETECTION
@@ -198,7 +218,7 @@ class VisualAnalyzer:
             ret, frame = video.read()
             if not ret:
                 break
-                
+            
             face_locations = face_recognition.face_locations(frame)
             for top, right, bottom, left in face_locations:
                 detections.append(FaceDetection(
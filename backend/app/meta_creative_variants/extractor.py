@@ -8,8 +8,9 @@ from typing import Dict, List, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.models.database import Clip, Job
+from app.models.database import Clip, Job, VideoAsset
 from app.core.config import settings
+from app.core.vision import analyze_clips
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ class CreativeMaterialExtractor:
         
         Args:
             clip_id: ID del clip
-            
+        
         Returns:
             Dict con:
                 - clip_metadata
@@ -178,8 +179,15 @@ class CreativeMaterialExtractor:
     async def _detect_scenes(self, clip: Clip) -> List[Dict[str, Any]]:
         """
         Detecta escenas importantes en el video.
-        TODO: Integrar con AI para scene detection real.
+        
+        Usa las escenas CLIP del Vision Engine (vision results store o pool de
+        visión); si el video no está disponible localmente, divide el clip en
+        3 escenas iguales.
         """
+        scenes = await self._detect_scenes_vision(clip)
+        if scenes:
+            return scenes
+        
         duration = clip.duration or 30.0
         
         # Stub: dividir en 3 escenas iguales
@@ -206,6 +214,43 @@ class CreativeMaterialExtractor:
             },
         ]
     
+    async def _detect_scenes_vision(self, clip: Clip) -> List[Dict[str, Any]]:
+        """
+        Agrupa las escenas por frame del Vision Engine en segmentos consecutivos
+        del mismo tipo (tiempos en segundos relativos al clip).
+        """
+        result = await self.db.execute(
+            select(VideoAsset.file_path).where(VideoAsset.id == clip.video_asset_id)
+        )
+        video_path = result.scalar_one_or_none()
+        
+        results = await analyze_clips(
+            video_path,
+            [{"clip_id": str(clip.id), "start_ms": clip.start_ms, "end_ms": clip.end_ms}],
+            video_id=str(clip.video_asset_id),
+        )
+        if not results or not results[0].scenes:
+            return []
+        
+        clip_start_ms = clip.start_ms or 0
+        clip_end_s = (clip.end_ms - clip_start_ms) / 1000.0 if clip.end_ms else None
+        
+        segments: List[Dict[str, Any]] = []
+        for scene in sorted(results[0].scenes, key=lambda s: s.timestamp_ms):
+            t = max(0.0, (scene.timestamp_ms - clip_start_ms) / 1000.0)
+            if segments and segments[-1]["description"] == scene.scene_type:
+                segments[-1]["end"] = t
+                continue
+            if segments:
+                segments[-1]["end"] = t
+            segments.append({"start": t, "end": t, "description": scene.scene_type})
+        
+        segments[-1]["end"] = clip_end_s if clip_end_s is not None else segments[-1]["end"]
+        for segment in segments:
+            segment["timestamp"] = (segment["start"] + segment["end"]) / 2
+        
+        return segments
+    
     async def extract_video_fragments(
         self,
         clip_id: str,
@@ -217,7 +262,7 @@ class CreativeMaterialExtractor:
         Args:
             clip_id: ID del clip
             num_fragments: Número de fragmentos a generar
-            
+        
         Returns:
             Lista de fragmentos con start_time, end_time, duration
         """
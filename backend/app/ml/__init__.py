@@ -7,9 +7,13 @@ Componentes:
 - yolo_runner: Ultralytics YOLOv8/v11 integration
 - coco_mapper: COCO semantics → Stakazo internal tags
 - visual_embeddings: CLIP/VisionTransformer embeddings + FAISS
+- embedding_cache: Perceptual-hash cache for near-duplicate frames
 - scene_classifier: Scene detection (club, calle, coche, noche, trap-house)
 - color_extractor: Dominant palette + purple aesthetic scoring
+- frame_sampler: Single-pass streaming frame sampling
+- frame_cache: Persistent memory-mapped frame stacks (decode once per video)
 - clip_tagger: Fusion of all visual metadata
+- vision_pool: Multi-process worker pool sharing preloaded models
 - models: Pydantic models for all ML outputs
 
 Integrations:
@@ -40,7 +44,13 @@ from .coco_mapper import COCOMapper
 from .visual_embeddings import VisualEmbeddingsEngine
 from .scene_classifier import SceneClassifier
 from .color_extractor import ColorExtractor
+from .frame_sampler import FrameSampler, SampledFrame
+from .frame_cache import FrameCache
+from .results_store import VisionResultsStore
+from .cut_detector import CutDetector
+from .embedding_cache import PerceptualHashCache
 from .clip_tagger import ClipTagger
+from .vision_pool import VisionWorkerPool
 
 __all__ = [
     "YOLODetection",
@@ -54,5 +64,12 @@ __all__ = [
     "VisualEmbeddingsEngine",
     "SceneClassifier",
     "ColorExtractor",
+    "FrameSampler",
+    "SampledFrame",
+    "FrameCache",
+    "VisionResultsStore",
+    "CutDetector",
+    "PerceptualHashCache",
     "ClipTagger",
+    "VisionWorkerPool",
 ]
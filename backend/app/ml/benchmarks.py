@@ -0,0 +1,359 @@
+"""
+Vision Engine - Benchmarks
+
+Sprint 3: Micro-benchmarks for the vision pipeline hot paths.
+
+Usage (from backend/app):
+    python -m ml.benchmarks yolo path/to/video.mp4 --frames 120 --batch-size 8
+    python -m ml.benchmarks palette --frames 30 --width 1280 --height 720
+    python -m ml.benchmarks embeddings --images 64 --batch-size 16 --threads 4
+    python -m ml.benchmarks ann --vectors 100000 --queries 200 --k 10
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ml.color_extractor import ColorExtractor
+from ml.embedding_backends import (
+    DEFAULT_MIN_COSINE,
+    ONNXCLIPBackend,
+    TorchCLIPBackend,
+    compare_backends,
+    resolve_model_name,
+)
+from ml.models import VisionConfig
+from ml.storage.embeddings_store import build_faiss_index, set_search_params
+from ml.storage.schemas import IndexConfig, IndexType
+from ml.yolo_runner import YOLORunner
+
+
+def benchmark_yolo_pipeline(
+    video_path: str,
+    max_frames: int = 120,
+    target_fps: float = 5.0,
+    batch_size: int = 8,
+    prefetch: int = 16,
+    config: Optional[VisionConfig] = None
+) -> Dict[str, Any]:
+    """
+    Compare serialized vs pipelined YOLORunner.detect_video throughput.
+    
+    - sequential: decode inline, one frame per inference call
+    - pipelined: decode thread + bounded queue, batched inference
+    
+    Args:
+        video_path: Path to video file
+        max_frames: Frames to process per run
+        target_fps: Sampling FPS
+        batch_size: Frames per batch in pipelined mode
+        prefetch: Decode queue size in pipelined mode
+        config: Optional VisionConfig (model, device, ...)
+    
+    Returns:
+        Dict with frames/second for each mode and the speedup
+    """
+    runner = YOLORunner(config or VisionConfig())
+    runner.load_model()
+    
+    # Warm-up (model fuse, allocator, codec init)
+    runner.detect_video(video_path, max_frames=batch_size, target_fps=target_fps, batch_size=batch_size)
+    
+    results: Dict[str, Any] = {}
+    for mode, mode_batch, mode_prefetch in (
+        ("sequential", 1, 0),
+        ("pipelined", batch_size, prefetch),
+    ):
+        start = time.perf_counter()
+        detections = runner.detect_video(
+            video_path,
+            max_frames=max_frames,
+            target_fps=target_fps,
+            batch_size=mode_batch,
+            prefetch=mode_prefetch
+        )
+        elapsed = time.perf_counter() - start
+        results[mode] = {
+            "frames": len(detections),
+            "seconds": round(elapsed, 3),
+            "frames_per_second": round(len(detections) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+    
+    sequential_fps = results["sequential"]["frames_per_second"]
+    results["speedup"] = (
+        round(results["pipelined"]["frames_per_second"] / sequential_fps, 2)
+        if sequential_fps else None
+    )
+    return results
+
+
+def benchmark_palette_modes(
+    num_frames: int = 30,
+    height: int = 720,
+    width: int = 1280,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Compare exact vs fast ColorExtractor modes on a synthetic frame stack.
+    
+    Args:
+        num_frames: Frames in the stack
+        height: Frame height
+        width: Frame width
+        seed: RNG seed for the synthetic frames
+    
+    Returns:
+        Dict with seconds per mode, speedup and mean |purple_score| difference
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Smooth color fields + noise: closer to real footage than uniform noise
+    base = rng.integers(0, 256, (num_frames, 4, 4, 3)).astype(np.float32)
+    frames = np.repeat(np.repeat(base, height // 4, axis=1), width // 4, axis=2)
+    frames = np.clip(frames + rng.normal(0, 10, frames.shape), 0, 255).astype(np.uint8)
+    
+    results: Dict[str, Any] = {}
+    palettes = {}
+    for mode in ("exact", "fast"):
+        extractor = ColorExtractor(num_colors=5, mode=mode)
+        start = time.perf_counter()
+        palettes[mode] = extractor.extract_palettes(frames)
+        results[mode] = {"seconds": round(time.perf_counter() - start, 3)}
+    
+    results["speedup"] = round(results["exact"]["seconds"] / max(results["fast"]["seconds"], 1e-9), 1)
+    results["mean_purple_score_diff"] = round(float(np.mean([
+        abs(e.purple_score - f.purple_score)
+        for e, f in zip(palettes["exact"], palettes["fast"])
+    ])), 4)
+    return results
+
+
+def benchmark_embedding_backends(
+    num_images: int = 64,
+    batch_size: int = 16,
+    intra_op_threads: int = 0,
+    min_cosine: float = DEFAULT_MIN_COSINE,
+    config: Optional[VisionConfig] = None,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Compare PyTorch vs ONNX (int8) CLIP backends: accuracy and images/second.
+    
+    Args:
+        num_images: Number of synthetic 640x360 frames to embed
+        batch_size: Images per inference call
+        intra_op_threads: ONNX Runtime intra-op threads (0 = runtime default)
+        min_cosine: Accuracy threshold (per-image cosine vs PyTorch)
+        config: Optional VisionConfig (model name, ONNX directory, quantization)
+        seed: RNG seed for the synthetic frames
+    
+    Returns:
+        Dict with accuracy check and images/second per backend
+    """
+    config = (config or VisionConfig()).model_copy(update={"onnx_intra_op_threads": intra_op_threads})
+    model_name = resolve_model_name(config.embedding_model)
+    
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (num_images, 9, 16, 3)).astype(np.uint8)
+    images = list(np.repeat(np.repeat(base, 40, axis=1), 40, axis=2))
+    
+    backends = {"torch": TorchCLIPBackend(config), "onnx": ONNXCLIPBackend(config)}
+    for backend in backends.values():
+        backend.load(model_name)
+        backend.embed(images[:batch_size])  # warm-up
+    
+    results: Dict[str, Any] = {
+        "accuracy": compare_backends(backends["torch"], backends["onnx"], images, min_cosine=min_cosine)
+    }
+    
+    for name, backend in backends.items():
+        start = time.perf_counter()
+        for i in range(0, num_images, batch_size):
+            backend.embed(images[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "seconds": round(elapsed, 3),
+            "images_per_second": round(num_images / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+    
+    results["speedup"] = round(
+        results["onnx"]["images_per_second"] / max(results["torch"]["images_per_second"], 1e-9), 2
+    )
+    return results
+
+
+def benchmark_ann_indexes(
+    num_vectors: int = 100_000,
+    num_queries: int = 200,
+    dimension: int = 512,
+    k: int = 10,
+    nprobes: List[int] = (1, 4, 16, 64),
+    ef_searches: List[int] = (16, 64, 256),
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Recall@k vs latency of the EmbeddingsStore FAISS index types.
+    
+    Vectors are a Gaussian mixture (clustered, like CLIP embeddings of similar
+    clips); queries are perturbed database vectors. Ground truth is the flat
+    index. Queries are issued one at a time, as search_similar does.
+    
+    Args:
+        num_vectors: Indexed vectors
+        num_queries: Queries to time
+        dimension: Vector dimension
+        k: Neighbours per query
+        nprobes: IVF nprobe values to sweep
+        ef_searches: HNSW efSearch values to sweep
+        seed: RNG seed
+    
+    Returns:
+        Dict with build seconds per index type and one row per setting
+        (recall@k, mean and p95 latency in ms)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, num_vectors // 500), dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), num_vectors)]
+    vectors += 0.35 * rng.standard_normal(vectors.shape).astype(np.float32)
+    queries = vectors[rng.choice(num_vectors, num_queries, replace=False)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+    labels = np.arange(num_vectors, dtype=np.int64)
+    
+    def run(index: Any) -> Dict[str, Any]:
+        latencies = []
+        found = []
+        for query in queries:
+            start = time.perf_counter()
+            _, result = index.search(query[None, :], k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            found.append(result[0])
+        return {"found": np.array(found), "latencies": np.array(latencies)}
+    
+    results: Dict[str, Any] = {"build_seconds": {}, "rows": []}
+    indices = {}
+    for index_type in IndexType:
+        config = IndexConfig(index_type=index_type, train_threshold=0)
+        start = time.perf_counter()
+        indices[index_type] = (config, build_faiss_index(config, dimension, vectors, labels))
+        results["build_seconds"][index_type.value] = round(time.perf_counter() - start, 2)
+    
+    exact = run(indices[IndexType.FLAT][1])
+    settings = [(IndexType.FLAT, None)]
+    settings += [(IndexType.IVF, nprobe) for nprobe in nprobes]
+    settings += [(IndexType.HNSW, ef_search) for ef_search in ef_searches]
+    
+    for index_type, knob in settings:
+        config, index = indices[index_type]
+        if knob is not None:
+            field = "nprobe" if index_type == IndexType.IVF else "ef_search"
+            set_search_params(index, config.model_copy(update={field: knob}))
+        
+        run_result = exact if index_type == IndexType.FLAT else run(index)
+        recall = np.mean([
+            len(set(found) & set(truth)) / k
+            for found, truth in zip(run_result["found"], exact["found"])
+        ])
+        results["rows"].append({
+            "index_type": index_type.value,
+            "param": {IndexType.IVF: "nprobe", IndexType.HNSW: "efSearch"}.get(index_type),
+            "value": knob,
+            "recall_at_k": round(float(recall), 4),
+            "mean_ms": round(float(run_result["latencies"].mean()), 3),
+            "p95_ms": round(float(np.percentile(run_result["latencies"], 95)), 3),
+        })
+    
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vision Engine benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    yolo = subparsers.add_parser("yolo", help="Serialized vs pipelined YOLO video inference")
+    yolo.add_argument("video_path")
+    yolo.add_argument("--frames", type=int, default=120)
+    yolo.add_argument("--fps", type=float, default=5.0)
+    yolo.add_argument("--batch-size", type=int, default=8)
+    yolo.add_argument("--prefetch", type=int, default=16)
+    
+    palette = subparsers.add_parser("palette", help="Exact vs fast color palette extraction")
+    palette.add_argument("--frames", type=int, default=30)
+    palette.add_argument("--width", type=int, default=1280)
+    palette.add_argument("--height", type=int, default=720)
+    
+    embeddings = subparsers.add_parser("embeddings", help="PyTorch vs ONNX int8 CLIP backends")
+    embeddings.add_argument("--images", type=int, default=64)
+    embeddings.add_argument("--batch-size", type=int, default=16)
+    embeddings.add_argument("--threads", type=int, default=0)
+    embeddings.add_argument("--min-cosine", type=float, default=DEFAULT_MIN_COSINE)
+    
+    ann = subparsers.add_parser("ann", help="Recall@k vs latency of flat / IVF / HNSW embedding indices")
+    ann.add_argument("--vectors", type=int, default=100_000)
+    ann.add_argument("--queries", type=int, default=200)
+    ann.add_argument("--dimension", type=int, default=512)
+    ann.add_argument("--k", type=int, default=10)
+    
+    args = parser.parse_args()
+    
+    if args.benchmark == "yolo":
+        results = benchmark_yolo_pipeline(
+            args.video_path,
+            max_frames=args.frames,
+            target_fps=args.fps,
+            batch_size=args.batch_size,
+            prefetch=args.prefetch
+        )
+        print("🟣 YOLO pipeline benchmark")
+        for mode in ("sequential", "pipelined"):
+            r = results[mode]
+            print(f"   {mode:<11} {r['frames']:>5} frames  {r['seconds']:>8.2f}s  {r['frames_per_second']:>8.2f} fps")
+        print(f"   speedup     {results['speedup']}x")
+    
+    elif args.benchmark == "palette":
+        results = benchmark_palette_modes(args.frames, args.height, args.width)
+        print("🟣 Color palette benchmark")
+        print(f"   exact       {results['exact']['seconds']:>8.2f}s")
+        print(f"   fast        {results['fast']['seconds']:>8.2f}s")
+        print(f"   speedup     {results['speedup']}x")
+        print(f"   mean |purple_score diff| {results['mean_purple_score_diff']}")
+    
+    elif args.benchmark == "embeddings":
+        results = benchmark_embedding_backends(
+            num_images=args.images,
+            batch_size=args.batch_size,
+            intra_op_threads=args.threads,
+            min_cosine=args.min_cosine
+        )
+        accuracy = results["accuracy"]
+        print("🟣 CLIP embedding backends benchmark")
+        for name in ("torch", "onnx"):
+            print(f"   {name:<11} {results[name]['images_per_second']:>8.2f} images/s")
+        print(f"   speedup     {results['speedup']}x")
+        status = "✅" if accuracy["passed"] else "❌"
+        print(
+            f"   {status} cosine vs torch: min={accuracy['min_cosine']:.4f} "
+            f"mean={accuracy['mean_cosine']:.4f} (threshold {accuracy['threshold']})"
+        )
+    
+    elif args.benchmark == "ann":
+        results = benchmark_ann_indexes(
+            num_vectors=args.vectors,
+            num_queries=args.queries,
+            dimension=args.dimension,
+            k=args.k
+        )
+        print(f"🟣 ANN index benchmark ({args.vectors} vectors, recall@{args.k})")
+        for index_type, seconds in results["build_seconds"].items():
+            print(f"   build {index_type:<5} {seconds:>8.2f}s")
+        for row in results["rows"]:
+            setting = f"{row['param']}={row['value']}" if row["param"] else ""
+            print(
+                f"   {row['index_type']:<5} {setting:<13} recall={row['recall_at_k']:.3f}  "
+                f"mean={row['mean_ms']:>7.3f}ms  p95={row['p95_ms']:>7.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,8 @@ from .coco_mapper import COCOMapper
 from .visual_embeddings import VisualEmbeddingsEngine
 from .scene_classifier import SceneClassifier
 from .color_extractor import ColorExtractor
+from .frame_sampler import FrameSampler
+from .results_store import VisionResultsStore
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,7 @@ class ClipTagger:
     Complete vision pipeline orchestrator.
     
     Pipeline:
+    0. Single-pass frame sampling (FrameSampler)
     1. YOLO detection on sampled frames
     2. COCO semantic enrichment
     3. Visual embedding generation (CLIP)
@@ -67,7 +70,11 @@ class ClipTagger:
         self.coco_mapper = COCOMapper()
         self.embeddings_engine = VisualEmbeddingsEngine(self.config)
         self.scene_classifier = SceneClassifier()
-        self.color_extractor = ColorExtractor(num_colors=5)
+        self.color_extractor = ColorExtractor(num_colors=5, mode=self.config.palette_mode)
+        self.frame_sampler = FrameSampler(self.config)
+        self.results_store: Optional[VisionResultsStore] = None
+        if self.config.results_store_enabled:
+            self.results_store = VisionResultsStore(self.config.results_store_dir)
         
         # Cost tracking
         self.total_cost_eur = 0.0
@@ -104,171 +111,94 @@ class ClipTagger:
         video_path: str,
         clip_id: str,
         video_id: str,
-        max_frames: Optional[int] = None
+        max_frames: Optional[int] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
     ) -> ClipMetadata:
         """
         Process a video clip through the complete vision pipeline.
         
+        The video is decoded once: sampled frames are streamed from the
+        FrameSampler's decode thread in batches and fanned out to YOLO and color
+        extraction as they arrive, then reused for CLIP embeddings and scene
+        classification.
+        
         Args:
             video_path: Path to video file
             clip_id: Clip UUID
             video_id: Source video UUID
             max_frames: Max frames to process (overrides config)
+            start_ms: Clip start within the video (None = start of video)
+            end_ms: Clip end within the video (None = end of video)
         
         Returns:
-            ClipMetadata with all visual intelligence
+            ClipMetadata with all visual intelligence (incl. stage_timings_ms)
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        # Same clip of the same file with the same models: reuse the stored result
+        # (only for the configured frame budget, which is part of the store key)
+        use_store = self.results_store is not None and max_frames in (None, self.config.max_frames_per_clip)
+        if use_store:
+            cached = self.results_store.get(video_path, self.config, start_ms, end_ms, clip_id, video_id)
+            if cached is not None:
+                logger.info(f"✅ Clip {clip_id}: reused stored vision result")
+                return cached
         
         logger.info(
             f"Processing clip {clip_id} from video {video_id}: {video_path}"
         )
         
         max_frames = max_frames or self.config.max_frames_per_clip
+        timings = {"decode": 0.0, "yolo": 0.0, "color": 0.0}
         
         try:
-            # Step 1: YOLO detection on video frames
-            logger.debug("Step 1: YOLO detection...")
-            frame_detections_list = self.yolo_runner.detect_video(
-                video_path=video_path,
-                max_frames=max_frames,
-                target_fps=self.config.target_fps
-            )
-            
-            # Extract frames for further processing
-            import cv2
-            cap = cv2.VideoCapture(video_path)
-            
+            # Step 1: Single-pass decode, batched YOLO + per-frame palette on each sampled frame
+            logger.debug("Step 1: Streaming decode + YOLO detection + color extraction...")
             frames = []
-            frame_ids_to_process = [fd.frame_id for fd in frame_detections_list]
-            
-            for frame_id in frame_ids_to_process:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_id)
-                ret, frame = cap.read()
-                if ret:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frames.append(frame_rgb)
-            
-            cap.release()
-            
-            # Step 2: COCO semantic enrichment
-            logger.debug("Step 2: COCO semantic enrichment...")
-            all_enriched_detections = []
-            all_detections = []
-            
-            for frame_det in frame_detections_list:
-                enriched = self.coco_mapper.enrich_all(frame_det.detections)
-                all_enriched_detections.extend(enriched)
-                all_detections.extend(frame_det.detections)
-            
-            # Get unique objects
-            objects_detected = list(set(d.label for d in all_detections))
-            
-            # Step 3: Visual embeddings (CLIP)
-            logger.debug("Step 3: Generating visual embeddings...")
-            embeddings = []
+            frame_detections_list = []
+            frame_palettes = []
             
-            if frames:
-                embedding_ids = [f"{clip_id}_frame_{fd.frame_id}" for fd in frame_detections_list]
-                frame_ids = [fd.frame_id for fd in frame_detections_list]
-                timestamps_ms = [fd.timestamp_ms for fd in frame_detections_list]
+            for batch in self.frame_sampler.iter_batches(
+                video_path,
+                max_frames=max_frames,
+                target_fps=self.config.target_fps,
+                start_ms=start_ms,
+                end_ms=end_ms
+            ):
+                batch_frames = [sampled.image for sampled in batch]
                 
-                embeddings = self.embeddings_engine.generate_batch_embeddings(
-                    images=frames,
-                    embedding_ids=embedding_ids,
-                    frame_ids=frame_ids,
-                    timestamps_ms=timestamps_ms
+                stage_start = time.perf_counter()
+                frame_detections_list.extend(
+                    self.yolo_runner.detect_batch(
+                        frames=batch_frames,
+                        frame_ids=[sampled.frame_id for sampled in batch],
+                        timestamps_ms=[sampled.timestamp_ms for sampled in batch]
+                    )
                 )
+                timings["yolo"] += (time.perf_counter() - stage_start) * 1000
                 
-                # Add to FAISS index
-                if self.config.use_faiss:
-                    for emb in embeddings:
-                        self.embeddings_engine.add_to_index(
-                            emb,
-                            metadata={"clip_id": clip_id, "video_id": video_id}
-                        )
-            
-            # Calculate average embedding for clip
-            avg_embedding = None
-            if embeddings:
-                avg_embedding = self.embeddings_engine.average_embeddings(embeddings)
-            
-            # Step 4: Scene classification
-            logger.debug("Step 4: Scene classification...")
-            all_scenes = []
-            semantic_tags = self.coco_mapper.get_unique_tags(all_detections)
-            
-            for i, frame_det in enumerate(frame_detections_list):
-                # Extract color palette for this frame
-                frame_palette = None
-                if i < len(frames):
-                    frame_palette = self.color_extractor.extract_palette(frames[i])
-                
-                scenes = self.scene_classifier.classify_frame(
-                    detections=frame_det.detections,
-                    color_palette=frame_palette,
-                    frame_id=frame_det.frame_id,
-                    timestamp_ms=frame_det.timestamp_ms,
-                    semantic_tags=semantic_tags
-                )
+                stage_start = time.perf_counter()
+                frame_palettes.extend(self.color_extractor.extract_palettes(batch_frames))
+                timings["color"] += (time.perf_counter() - stage_start) * 1000
                 
-                if scenes:
-                    all_scenes.append(scenes)
+                frames.extend(batch_frames)
             
-            # Determine dominant scene
-            dominant_scene = self.scene_classifier.classify_clip(all_scenes)
+            timings["decode"] = self.frame_sampler.last_decode_time_ms
             
-            # Step 5: Color palette extraction (clip-level)
-            logger.debug("Step 5: Color palette extraction...")
-            color_palette = None
-            if frames:
-                color_palette = self.color_extractor.extract_average_palette(frames)
-            
-            # Step 6: Aggregate scoring
-            logger.debug("Step 6: Calculating aggregate scores...")
-            aggregate_scores = self.coco_mapper.calculate_aggregate_scores(all_detections)
-            
-            virality_score_visual = aggregate_scores.get("avg_virality", 0.0)
-            brand_affinity_score = aggregate_scores.get("avg_affinity", 0.0)
-            
-            # Aesthetic score (based on color palette)
-            aesthetic_score = 0.5
-            if color_palette:
-                aesthetic_score = color_palette.purple_score * 0.6 + 0.4
-            
-            # Step 7: Cost calculation
-            processing_time_s = time.time() - start_time
-            processing_cost_eur = self._estimate_cost(
-                num_frames=len(frames),
-                num_embeddings=len(embeddings)
-            )
-            
-            self.total_cost_eur += processing_cost_eur
-            
-            # Build ClipMetadata
-            metadata = ClipMetadata(
+            metadata = self._analyze_frames(
+                frames=frames,
+                frame_detections_list=frame_detections_list,
+                frame_palettes=frame_palettes,
                 clip_id=clip_id,
                 video_id=video_id,
-                detections=all_enriched_detections,
-                objects_detected=objects_detected,
-                embeddings=embeddings,
-                avg_embedding=avg_embedding,
-                scenes=[scene for scenes in all_scenes for scene in scenes],  # Flatten
-                dominant_scene=dominant_scene,
-                color_palette=color_palette,
-                virality_score_visual=virality_score_visual,
-                brand_affinity_score=brand_affinity_score,
-                aesthetic_score=aesthetic_score,
-                processed_at=datetime.utcnow(),
-                processing_cost_eur=processing_cost_eur
+                timings=timings,
+                start_time=start_time,
+                index_embeddings=self.config.use_faiss
             )
             
-            logger.info(
-                f"✅ Clip {clip_id} processed successfully. "
-                f"Time={processing_time_s:.2f}s, Cost={processing_cost_eur:.4f}€, "
-                f"Objects={len(objects_detected)}, Embeddings={len(embeddings)}, "
-                f"Scene={dominant_scene}"
-            )
+            if use_store:
+                self.results_store.put(video_path, self.config, metadata, start_ms, end_ms)
             
             return metadata
         
@@ -299,99 +229,39 @@ class ClipTagger:
         Returns:
             ClipMetadata
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         if frame_ids is None:
             frame_ids = list(range(len(frames)))
         if timestamps_ms is None:
             timestamps_ms = [i * 1000.0 for i in range(len(frames))]
         
+        timings: Dict[str, float] = {}
+        
         try:
             # YOLO detection
+            stage_start = time.perf_counter()
             frame_detections_list = self.yolo_runner.detect_batch(
                 frames=frames,
                 frame_ids=frame_ids,
                 timestamps_ms=timestamps_ms
             )
+            timings["yolo"] = (time.perf_counter() - stage_start) * 1000
             
-            # COCO enrichment
-            all_enriched_detections = []
-            all_detections = []
-            
-            for frame_det in frame_detections_list:
-                enriched = self.coco_mapper.enrich_all(frame_det.detections)
-                all_enriched_detections.extend(enriched)
-                all_detections.extend(frame_det.detections)
-            
-            objects_detected = list(set(d.label for d in all_detections))
-            
-            # Embeddings
-            embeddings = []
-            if frames:
-                embedding_ids = [f"{clip_id}_frame_{fid}" for fid in frame_ids]
-                
-                embeddings = self.embeddings_engine.generate_batch_embeddings(
-                    images=frames,
-                    embedding_ids=embedding_ids,
-                    frame_ids=frame_ids,
-                    timestamps_ms=timestamps_ms
-                )
-            
-            avg_embedding = None
-            if embeddings:
-                avg_embedding = self.embeddings_engine.average_embeddings(embeddings)
-            
-            # Scene classification
-            all_scenes = []
-            semantic_tags = self.coco_mapper.get_unique_tags(all_detections)
-            
-            for i, frame_det in enumerate(frame_detections_list):
-                frame_palette = self.color_extractor.extract_palette(frames[i])
-                
-                scenes = self.scene_classifier.classify_frame(
-                    detections=frame_det.detections,
-                    color_palette=frame_palette,
-                    frame_id=frame_det.frame_id,
-                    timestamp_ms=frame_det.timestamp_ms,
-                    semantic_tags=semantic_tags
-                )
-                
-                if scenes:
-                    all_scenes.append(scenes)
-            
-            dominant_scene = self.scene_classifier.classify_clip(all_scenes)
-            
-            # Color palette
-            color_palette = self.color_extractor.extract_average_palette(frames)
-            
-            # Scoring
-            aggregate_scores = self.coco_mapper.calculate_aggregate_scores(all_detections)
-            
-            virality_score_visual = aggregate_scores.get("avg_virality", 0.0)
-            brand_affinity_score = aggregate_scores.get("avg_affinity", 0.0)
-            aesthetic_score = color_palette.purple_score * 0.6 + 0.4 if color_palette else 0.5
-            
-            # Cost
-            processing_cost_eur = self._estimate_cost(
-                num_frames=len(frames),
-                num_embeddings=len(embeddings)
-            )
+            # Per-frame palettes
+            stage_start = time.perf_counter()
+            frame_palettes = self.color_extractor.extract_palettes(frames)
+            timings["color"] = (time.perf_counter() - stage_start) * 1000
             
-            metadata = ClipMetadata(
+            metadata = self._analyze_frames(
+                frames=frames,
+                frame_detections_list=frame_detections_list,
+                frame_palettes=frame_palettes,
                 clip_id=clip_id,
                 video_id=video_id,
-                detections=all_enriched_detections,
-                objects_detected=objects_detected,
-                embeddings=embeddings,
-                avg_embedding=avg_embedding,
-                scenes=[scene for scenes in all_scenes for scene in scenes],
-                dominant_scene=dominant_scene,
-                color_palette=color_palette,
-                virality_score_visual=virality_score_visual,
-                brand_affinity_score=brand_affinity_score,
-                aesthetic_score=aesthetic_score,
-                processed_at=datetime.utcnow(),
-                processing_cost_eur=processing_cost_eur
+                timings=timings,
+                start_time=start_time,
+                index_embeddings=False
             )
             
             logger.info(f"✅ Processed {len(frames)} frames for clip {clip_id}")
@@ -402,6 +272,161 @@ class ClipTagger:
             logger.error(f"Frame batch processing failed: {e}", exc_info=True)
             raise
     
+    def _analyze_frames(
+        self,
+        frames: List[np.ndarray],
+        frame_detections_list: List[FrameDetections],
+        frame_palettes: List[ColorPalette],
+        clip_id: str,
+        video_id: str,
+        timings: Dict[str, float],
+        start_time: float,
+        index_embeddings: bool
+    ) -> ClipMetadata:
+        """
+        Run the post-detection stages shared by video and in-memory processing.
+        
+        Args:
+            frames: Sampled RGB frames (aligned with frame_detections_list)
+            frame_detections_list: YOLO detections per frame
+            frame_palettes: Color palette per frame
+            clip_id: Clip UUID
+            video_id: Video UUID
+            timings: Stage timings collected so far (ms), completed in place
+            start_time: perf_counter() value when processing started
+            index_embeddings: Add generated embeddings to the FAISS index
+        
+        Returns:
+            ClipMetadata
+        """
+        # Step 2: COCO semantic enrichment
+        logger.debug("Step 2: COCO semantic enrichment...")
+        all_enriched_detections = []
+        all_detections = []
+        
+        for frame_det in frame_detections_list:
+            enriched = self.coco_mapper.enrich_all(frame_det.detections)
+            for enriched_detection in enriched:
+                enriched_detection.frame_id = frame_det.frame_id
+                enriched_detection.timestamp_ms = frame_det.timestamp_ms
+            all_enriched_detections.extend(enriched)
+            all_detections.extend(frame_det.detections)
+        
+        # Get unique objects
+        objects_detected = list(set(d.label for d in all_detections))
+        
+        # Step 3: Visual embeddings (CLIP)
+        logger.debug("Step 3: Generating visual embeddings...")
+        stage_start = time.perf_counter()
+        embeddings = []
+        
+        if frames:
+            embedding_ids = [f"{clip_id}_frame_{fd.frame_id}" for fd in frame_detections_list]
+            frame_ids = [fd.frame_id for fd in frame_detections_list]
+            timestamps_ms = [fd.timestamp_ms for fd in frame_detections_list]
+            
+            embeddings = self.embeddings_engine.generate_batch_embeddings(
+                images=frames,
+                embedding_ids=embedding_ids,
+                frame_ids=frame_ids,
+                timestamps_ms=timestamps_ms
+            )
+            
+            # Add to FAISS index
+            if index_embeddings:
+                for emb in embeddings:
+                    self.embeddings_engine.add_to_index(
+                        emb,
+                        metadata={"clip_id": clip_id, "video_id": video_id}
+                    )
+        
+        # Calculate average embedding for clip
+        avg_embedding = None
+        if embeddings:
+            avg_embedding = self.embeddings_engine.average_embeddings(embeddings)
+        timings["embeddings"] = (time.perf_counter() - stage_start) * 1000
+        
+        # Step 4: Scene classification
+        logger.debug("Step 4: Scene classification...")
+        stage_start = time.perf_counter()
+        all_scenes = []
+        semantic_tags = self.coco_mapper.get_unique_tags(all_detections)
+        
+        for frame_det, frame_palette in zip(frame_detections_list, frame_palettes):
+            scenes = self.scene_classifier.classify_frame(
+                detections=frame_det.detections,
+                color_palette=frame_palette,
+                frame_id=frame_det.frame_id,
+                timestamp_ms=frame_det.timestamp_ms,
+                semantic_tags=semantic_tags
+            )
+            
+            if scenes:
+                all_scenes.append(scenes)
+        
+        # Determine dominant scene
+        dominant_scene = self.scene_classifier.classify_clip(all_scenes)
+        timings["scene"] = (time.perf_counter() - stage_start) * 1000
+        
+        # Step 5: Color palette (clip-level, reusing the per-frame palettes)
+        logger.debug("Step 5: Color palette aggregation...")
+        stage_start = time.perf_counter()
+        color_palette = None
+        if frame_palettes:
+            color_palette = self.color_extractor.aggregate_palettes(frame_palettes)
+        timings["color"] = timings.get("color", 0.0) + (time.perf_counter() - stage_start) * 1000
+        
+        # Step 6: Aggregate scoring
+        logger.debug("Step 6: Calculating aggregate scores...")
+        aggregate_scores = self.coco_mapper.calculate_aggregate_scores(all_detections)
+        
+        virality_score_visual = aggregate_scores.get("avg_virality", 0.0)
+        brand_affinity_score = aggregate_scores.get("avg_affinity", 0.0)
+        
+        # Aesthetic score (based on color palette)
+        aesthetic_score = 0.5
+        if color_palette:
+            aesthetic_score = color_palette.purple_score * 0.6 + 0.4
+        
+        # Step 7: Cost calculation
+        processing_cost_eur = self._estimate_cost(
+            num_frames=len(frames),
+            num_embeddings=len(embeddings)
+        )
+        
+        self.total_cost_eur += processing_cost_eur
+        
+        timings["total"] = (time.perf_counter() - start_time) * 1000
+        stage_timings_ms = {stage: round(ms, 2) for stage, ms in timings.items()}
+        
+        # Build ClipMetadata
+        metadata = ClipMetadata(
+            clip_id=clip_id,
+            video_id=video_id,
+            detections=all_enriched_detections,
+            objects_detected=objects_detected,
+            embeddings=embeddings,
+            avg_embedding=avg_embedding,
+            scenes=[scene for scenes in all_scenes for scene in scenes],  # Flatten
+            dominant_scene=dominant_scene,
+            color_palette=color_palette,
+            virality_score_visual=virality_score_visual,
+            brand_affinity_score=brand_affinity_score,
+            aesthetic_score=aesthetic_score,
+            processed_at=datetime.utcnow(),
+            processing_cost_eur=processing_cost_eur,
+            stage_timings_ms=stage_timings_ms
+        )
+        
+        logger.info(
+            f"✅ Clip {clip_id} processed successfully. "
+            f"Time={timings['total'] / 1000:.2f}s, Cost={processing_cost_eur:.4f}€, "
+            f"Objects={len(objects_detected)}, Embeddings={len(embeddings)}, "
+            f"Scene={dominant_scene}, Stages={stage_timings_ms}"
+        )
+        
+        return metadata
+    
     def _estimate_cost(self, num_frames: int, num_embeddings: int) -> float:
         """
         Estimate processing cost.
@@ -429,11 +454,21 @@ class ClipTagger:
         return {
             "yolo_model": self.yolo_runner.get_model_info(),
             "embeddings_index": self.embeddings_engine.get_index_stats(),
+            "embedding_cache": self.embeddings_engine.get_cache_stats(),
+            "results_store": (
+                {"enabled": True, **self.results_store.get_stats()}
+                if self.results_store is not None else {"enabled": False}
+            ),
+            "frame_cache": (
+                {"enabled": True, **self.frame_sampler.frame_cache.get_stats()}
+                if self.frame_sampler.frame_cache is not None else {"enabled": False}
+            ),
             "total_cost_eur": self.total_cost_eur,
             "config": {
                 "target_fps": self.config.target_fps,
                 "max_frames_per_clip": self.config.max_frames_per_clip,
                 "yolo_confidence": self.config.yolo_confidence_threshold,
-                "use_faiss": self.config.use_faiss
+                "use_faiss": self.config.use_faiss,
+                "embedding_backend": self.config.embedding_backend
             }
         }
@@ -0,0 +1,450 @@
+"""
+Cut Detector - Shot-boundary detection and candidate clip windows
+
+Sprint 3: Vision Engine
+
+Features:
+- Streaming decode at low resolution (grab() every frame, retrieve only sampled ones)
+- Parallel decode of video chunks across threads (OpenCV releases the GIL)
+- Vectorized HSV histogram distance + frame-difference scoring over the whole video
+- Adaptive cut threshold (rolling median + k * MAD), min shot length
+- Candidate clip windows aligned to cuts, scored by motion, pacing and image quality
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .models import CutAnalysis, CutCandidate, ShotBoundary, VisionConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CutDetector:
+    """
+    CPU shot-boundary detector for whole videos.
+    
+    Each sampled frame is reduced to a small thumbnail right after decode;
+    everything after that (histograms, distances, thresholds, motion, window
+    scores) runs as NumPy array operations over all frames at once.
+    """
+    
+    DEFAULT_VIDEO_FPS = 30.0
+    
+    # Below this many frames per chunk, seeking costs more than it saves
+    MIN_FRAMES_PER_CHUNK = 1800
+    MAX_DECODE_WORKERS = 4
+    
+    # HSV histogram: 8 hue x 4 saturation x 4 value bins
+    HUE_BINS = 8
+    SAT_BINS = 4
+    VAL_BINS = 4
+    
+    # Rolling window of the adaptive threshold (seconds)
+    THRESHOLD_WINDOW_S = 4.0
+    
+    # Mean absolute luma difference (0-1) between sampled frames that maps to motion 1.0
+    MOTION_REFERENCE = 0.08
+    # Cuts per second that map to pacing 1.0
+    PACING_REFERENCE = 0.5
+    
+    def __init__(self, config: Optional[VisionConfig] = None):
+        """
+        Initialize cut detector.
+        
+        Args:
+            config: Vision configuration. Defaults to VisionConfig().
+        """
+        self.config = config or VisionConfig()
+        
+        # Telemetry of the last analyze() call
+        self.last_decode_time_ms = 0.0
+        self.last_score_time_ms = 0.0
+        self.last_decode_workers = 0
+    
+    def analyze(self, video_path: str) -> CutAnalysis:
+        """
+        Detect shot boundaries and score candidate clip windows.
+        
+        Args:
+            video_path: Path to video file
+        
+        Returns:
+            CutAnalysis with boundaries and the best candidate windows
+        
+        Raises:
+            ValueError: If the video can't be opened or has no frames
+        """
+        start = time.perf_counter()
+        
+        video_fps, frame_count = self._probe(video_path)
+        stride = max(1, int(round(video_fps / self.config.cut_analysis_fps)))
+        
+        frame_ids, gray, hsv = self._decode(video_path, frame_count, stride)
+        if len(frame_ids) == 0:
+            raise ValueError(f"No frames decoded from video: {video_path}")
+        
+        decoded = time.perf_counter()
+        self.last_decode_time_ms = (decoded - start) * 1000
+        
+        timestamps_ms = frame_ids / video_fps * 1000
+        last_frame = max(frame_count, int(frame_ids[-1]) + 1)
+        duration_ms = int(round(last_frame / video_fps * 1000))
+        
+        distances = self.histogram_distances(hsv)
+        cut_indices = self.detect_boundaries(distances, video_fps / stride)
+        motion = self.frame_motion(gray, cut_indices)
+        quality = self.frame_quality(gray)
+        
+        candidates = self.candidate_windows(timestamps_ms, duration_ms, cut_indices, motion, quality)
+        
+        self.last_score_time_ms = (time.perf_counter() - decoded) * 1000
+        
+        analysis = CutAnalysis(
+            duration_ms=duration_ms,
+            video_fps=video_fps,
+            frames_analyzed=len(frame_ids),
+            boundaries=[
+                ShotBoundary(
+                    frame_id=int(frame_ids[i]),
+                    timestamp_ms=float(timestamps_ms[i]),
+                    score=round(float(distances[i]), 4)
+                )
+                for i in cut_indices
+            ],
+            candidates=candidates,
+            processing_time_ms=round((time.perf_counter() - start) * 1000, 1)
+        )
+        
+        logger.info(
+            f"✅ Cut analysis {video_path}: {len(analysis.boundaries)} cuts, "
+            f"{len(candidates)} candidates, {analysis.frames_analyzed} frames "
+            f"in {analysis.processing_time_ms:.0f}ms (decode {self.last_decode_time_ms:.0f}ms)"
+        )
+        
+        return analysis
+    
+    # ========================================
+    # Decoding
+    # ========================================
+    
+    def _probe(self, video_path: str) -> Tuple[float, int]:
+        import cv2
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {video_path}")
+        
+        try:
+            video_fps = cap.get(cv2.CAP_PROP_FPS) or self.DEFAULT_VIDEO_FPS
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        finally:
+            cap.release()
+        
+        return video_fps, max(0, frame_count)
+    
+    def _decode(
+        self,
+        video_path: str,
+        frame_count: int,
+        stride: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decode every `stride`-th frame as thumbnails, in parallel chunks.
+        
+        Chunk boundaries are multiples of `stride`, so the sampled frames are
+        the same whatever the number of chunks.
+        
+        Returns:
+            (frame_ids, gray thumbnails (N, H, W), HSV thumbnails (N, H, W, 3))
+        """
+        workers = self.config.cut_decode_workers or min(os.cpu_count() or 1, self.MAX_DECODE_WORKERS)
+        workers = max(1, min(workers, frame_count // self.MIN_FRAMES_PER_CHUNK))
+        self.last_decode_workers = workers
+        
+        if workers == 1:
+            chunks = [self._decode_chunk(video_path, 0, None, stride)]
+        else:
+            chunk_frames = -(-frame_count // workers)
+            chunk_frames = -(-chunk_frames // stride) * stride
+            bounds = [
+                (i * chunk_frames, (i + 1) * chunk_frames if i < workers - 1 else None)
+                for i in range(workers)
+            ]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cut-decode") as executor:
+                chunks = list(executor.map(
+                    lambda bound: self._decode_chunk(video_path, bound[0], bound[1], stride),
+                    bounds
+                ))
+        
+        frame_ids = np.concatenate([chunk[0] for chunk in chunks])
+        if len(frame_ids) == 0:
+            return frame_ids, np.empty((0, 0, 0), np.uint8), np.empty((0, 0, 0, 3), np.uint8)
+        
+        return (
+            frame_ids,
+            np.concatenate([chunk[1] for chunk in chunks if len(chunk[0])]),
+            np.concatenate([chunk[2] for chunk in chunks if len(chunk[0])])
+        )
+    
+    def _decode_chunk(
+        self,
+        video_path: str,
+        first_frame: int,
+        end_frame: Optional[int],
+        stride: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decode frames [first_frame, end_frame) of one chunk (one seek, then sequential)."""
+        import cv2
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {video_path}")
+        
+        frame_ids: List[int] = []
+        gray: List[np.ndarray] = []
+        hsv: List[np.ndarray] = []
+        size: Optional[Tuple[int, int]] = None
+        
+        try:
+            if first_frame:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+            
+            frame_count = first_frame
+            while end_frame is None or frame_count < end_frame:
+                if not cap.grab():
+                    break
+                
+                if (frame_count - first_frame) % stride == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    
+                    if size is None:
+                        height, width = frame.shape[:2]
+                        thumb_width = min(self.config.cut_analysis_width, width)
+                        size = (thumb_width, max(1, int(round(height * thumb_width / width))))
+                    
+                    thumb = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    frame_ids.append(frame_count)
+                    gray.append(cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY))
+                    hsv.append(cv2.cvtColor(thumb, cv2.COLOR_BGR2HSV))
+                
+                frame_count += 1
+        finally:
+            cap.release()
+        
+        if not frame_ids:
+            return np.empty(0, np.int64), np.empty((0, 0, 0), np.uint8), np.empty((0, 0, 0, 3), np.uint8)
+        
+        return np.asarray(frame_ids, dtype=np.int64), np.stack(gray), np.stack(hsv)
+    
+    # ========================================
+    # Vectorized scoring
+    # ========================================
+    
+    @classmethod
+    def histogram_distances(cls, hsv: np.ndarray) -> np.ndarray:
+        """
+        Distance between the HSV histograms of consecutive frames.
+        
+        Args:
+            hsv: HSV thumbnails (N, H, W, 3), OpenCV ranges (H in [0, 180))
+        
+        Returns:
+            (N,) total variation distance in [0, 1] (first frame = 0)
+        """
+        n = len(hsv)
+        bins = cls.HUE_BINS * cls.SAT_BINS * cls.VAL_BINS
+        
+        h = hsv[..., 0].astype(np.int32) * cls.HUE_BINS // 180
+        s = hsv[..., 1].astype(np.int32) * cls.SAT_BINS // 256
+        v = hsv[..., 2].astype(np.int32) * cls.VAL_BINS // 256
+        bin_index = (h * cls.SAT_BINS + s) * cls.VAL_BINS + v
+        
+        # One bincount for every frame: offset each frame's bins by frame * bins
+        offsets = (np.arange(n, dtype=np.int32) * bins)[:, None]
+        flat = (bin_index.reshape(n, -1) + offsets).ravel()
+        hist = np.bincount(flat, minlength=n * bins).reshape(n, bins).astype(np.float32)
+        hist /= hist.sum(axis=1, keepdims=True)
+        
+        distances = np.zeros(n, dtype=np.float32)
+        if n > 1:
+            distances[1:] = 0.5 * np.abs(hist[1:] - hist[:-1]).sum(axis=1)
+        return distances
+    
+    def detect_boundaries(self, distances: np.ndarray, analysis_fps: float) -> np.ndarray:
+        """
+        Pick cuts with an adaptive threshold.
+        
+        A frame is a cut when its histogram distance exceeds
+        max(cut_min_threshold, rolling median + k * 1.4826 * rolling MAD);
+        cuts closer than cut_min_shot_ms keep only the strongest one.
+        
+        Args:
+            distances: Output of histogram_distances()
+            analysis_fps: Sampled frames per second
+        
+        Returns:
+            Sorted indices of the frames starting a new shot
+        """
+        n = len(distances)
+        if n < 2:
+            return np.empty(0, dtype=np.int64)
+        
+        half = max(1, int(self.THRESHOLD_WINDOW_S * analysis_fps / 2))
+        padded = np.pad(distances, half, mode="edge")
+        windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * half + 1)
+        median = np.median(windows, axis=1)
+        mad = np.median(np.abs(windows - median[:, None]), axis=1)
+        
+        threshold = np.maximum(self.config.cut_min_threshold, median + self.config.cut_threshold_k * 1.4826 * mad)
+        above = np.flatnonzero(distances > threshold)
+        above = above[above > 0]
+        
+        # Non-maximum suppression within the min shot length, strongest first
+        min_gap = max(1, int(round(self.config.cut_min_shot_ms / 1000 * analysis_fps)))
+        taken = np.zeros(n, dtype=bool)
+        cuts = []
+        for i in above[np.argsort(-distances[above], kind="stable")]:
+            if taken[max(0, i - min_gap + 1):i + min_gap].any():
+                continue
+            taken[i] = True
+            cuts.append(i)
+        
+        return np.asarray(sorted(cuts), dtype=np.int64)
+    
+    @staticmethod
+    def frame_motion(gray: np.ndarray, cut_indices: np.ndarray) -> np.ndarray:
+        """
+        Mean absolute luma difference to the previous frame, in [0, 1].
+        
+        Differences across cuts are replaced by the previous frame's value so
+        hard cuts don't read as motion.
+        """
+        n = len(gray)
+        motion = np.zeros(n, dtype=np.float32)
+        if n < 2:
+            return motion
+        
+        # Chunked to bound the int16 temporaries on long videos
+        step = 512
+        for start in range(1, n, step):
+            stop = min(n, start + step)
+            diff = np.abs(gray[start:stop].astype(np.int16) - gray[start - 1:stop - 1].astype(np.int16))
+            motion[start:stop] = diff.reshape(stop - start, -1).mean(axis=1) / 255.0
+        
+        for i in cut_indices:
+            motion[i] = motion[i - 1] if i > 1 else 0.0
+        return motion
+    
+    @staticmethod
+    def frame_quality(gray: np.ndarray) -> np.ndarray:
+        """
+        Per-frame image quality in [0, 1]: contrast (luma std) and sharpness
+        (mean gradient magnitude) of the thumbnails.
+        """
+        n = len(gray)
+        pixels = gray.reshape(n, -1).astype(np.float32)
+        contrast = np.clip(pixels.std(axis=1) / 64.0, 0.0, 1.0)
+        
+        frames = gray.astype(np.float32)
+        grad_x = np.abs(np.diff(frames, axis=2)).reshape(n, -1).mean(axis=1)
+        grad_y = np.abs(np.diff(frames, axis=1)).reshape(n, -1).mean(axis=1)
+        sharpness = np.clip((grad_x + grad_y) / 24.0, 0.0, 1.0)
+        
+        return 0.5 * contrast + 0.5 * sharpness
+    
+    # ========================================
+    # Candidate windows
+    # ========================================
+    
+    def candidate_windows(
+        self,
+        timestamps_ms: np.ndarray,
+        duration_ms: int,
+        cut_indices: np.ndarray,
+        motion: np.ndarray,
+        quality: np.ndarray
+    ) -> List[CutCandidate]:
+        """
+        Build clip windows starting on shot boundaries and keep the best ones.
+        
+        Windows start on a cut (or every cut_max_clip_ms inside long shots),
+        extend over whole shots until cut_min_clip_ms and are capped at
+        cut_max_clip_ms. The best non-overlapping windows are returned.
+        
+        Args:
+            timestamps_ms: Timestamp of each sampled frame
+            duration_ms: Video duration
+            cut_indices: Output of detect_boundaries()
+            motion: Output of frame_motion()
+            quality: Output of frame_quality()
+        
+        Returns:
+            Up to cut_max_clips candidates, sorted by start time
+        """
+        min_clip = self.config.cut_min_clip_ms
+        max_clip = max(self.config.cut_max_clip_ms, min_clip)
+        
+        cut_times = timestamps_ms[cut_indices] if len(cut_indices) else np.empty(0)
+        shot_starts = np.concatenate([[0.0], cut_times])
+        shot_ends = np.concatenate([cut_times, [float(duration_ms)]])
+        
+        # Window starts: every shot start, plus regular starts inside long shots
+        starts = [
+            t
+            for shot_start, shot_end in zip(shot_starts, shot_ends)
+            for t in np.arange(shot_start, max(shot_start + 1, shot_end - min_clip + 1), max_clip)
+        ]
+        
+        # Cumulative sums give the mean of any frame range in O(1)
+        motion_sum = np.concatenate([[0.0], np.cumsum(motion, dtype=np.float64)])
+        quality_sum = np.concatenate([[0.0], np.cumsum(quality, dtype=np.float64)])
+        
+        windows = []
+        for start in starts:
+            # Smallest whole-shot end reaching min_clip, else the max_clip cap
+            later_ends = shot_ends[shot_ends >= start + min_clip]
+            end = float(later_ends[0]) if len(later_ends) else float(duration_ms)
+            ends_on_cut = end - start <= max_clip and len(later_ends) > 0
+            end = min(end, start + max_clip, float(duration_ms))
+            
+            if end - start < min(min_clip, duration_ms) or end - start < 1000:
+                continue
+            
+            lo, hi = np.searchsorted(timestamps_ms, [start, end])
+            if hi <= lo:
+                continue
+            
+            frames = hi - lo
+            motion_intensity = min(1.0, (motion_sum[hi] - motion_sum[lo]) / frames / self.MOTION_REFERENCE)
+            image_quality = (quality_sum[hi] - quality_sum[lo]) / frames
+            inner_cuts = int(((cut_times > start) & (cut_times < end)).sum())
+            pacing = min(1.0, inner_cuts / ((end - start) / 1000) / self.PACING_REFERENCE)
+            
+            starts_on_cut = start == 0 or bool(np.isin(start, cut_times))
+            windows.append(CutCandidate(
+                start_ms=int(start),
+                end_ms=int(end),
+                duration_ms=int(end) - int(start),
+                visual_score=round(float(0.5 * motion_intensity + 0.2 * pacing + 0.3 * image_quality), 4),
+                motion_intensity=round(float(motion_intensity), 4),
+                shot_count=inner_cuts + 1,
+                confidence=0.5 + 0.25 * starts_on_cut + 0.25 * ends_on_cut
+            ))
+        
+        # Greedy selection of the best non-overlapping windows
+        selected: List[CutCandidate] = []
+        for window in sorted(windows, key=lambda w: (-w.visual_score, w.start_ms)):
+            if len(selected) >= self.config.cut_max_clips:
+                break
+            if any(window.start_ms < other.end_ms and other.start_ms < window.end_ms for other in selected):
+                continue
+            selected.append(window)
+        
+        return sorted(selected, key=lambda w: w.start_ms)
@@ -0,0 +1,335 @@
+"""
+Embedding Backends - Pluggable CLIP inference backends
+
+Sprint 3: Vision Engine
+
+Backends:
+- torch: PyTorch CLIP model from HuggingFace transformers (fp32, CPU/GPU)
+- onnx: exported CLIP image encoder run with ONNX Runtime on CPU, optionally
+  with dynamic int8 quantization and a configurable intra-op thread count
+
+Features:
+- One-time ONNX export + int8 quantization (cached on disk per model)
+- Accuracy check of a backend against the PyTorch reference (cosine similarity)
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+try:
+    from transformers import CLIPProcessor, CLIPModel
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+    logging.warning("Transformers/PyTorch not installed. PyTorch CLIP embeddings will fail.")
+
+try:
+    from transformers import CLIPImageProcessor
+    CLIP_IMAGE_PROCESSOR_AVAILABLE = True
+except ImportError:
+    CLIP_IMAGE_PROCESSOR_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    logging.warning("onnxruntime not installed. ONNX embedding backend will be unavailable.")
+
+from .models import VisionConfig
+
+logger = logging.getLogger(__name__)
+
+
+# Map friendly names to HuggingFace model IDs
+HF_MODEL_MAPPING = {
+    "clip-vit-base-patch32": "openai/clip-vit-base-patch32",
+    "clip-vit-large-patch14": "openai/clip-vit-large-patch14",
+}
+
+# Minimum per-image cosine similarity between a backend and the PyTorch reference
+DEFAULT_MIN_COSINE = 0.97
+
+
+def resolve_model_name(model_name: str) -> str:
+    """Map a friendly model name to its HuggingFace ID."""
+    return HF_MODEL_MAPPING.get(model_name, model_name)
+
+
+def _to_pil(images: List[Any]) -> List[Any]:
+    """Convert numpy RGB frames to PIL images (PIL images pass through)."""
+    return [
+        Image.fromarray(img.astype('uint8'), 'RGB') if isinstance(img, np.ndarray) else img
+        for img in images
+    ]
+
+
+class EmbeddingBackend:
+    """Base class for CLIP image-embedding inference backends."""
+    
+    name = "base"
+    
+    def __init__(self, config: Optional[VisionConfig] = None, device: str = "cpu"):
+        """
+        Initialize backend.
+        
+        Args:
+            config: Vision configuration
+            device: Inference device ('cpu' or 'cuda')
+        """
+        self.config = config or VisionConfig()
+        self.device = device
+        self.model: Optional[Any] = None
+        self.processor: Optional[Any] = None
+    
+    def load(self, model_name: str) -> None:
+        """Load weights for a HuggingFace model ID."""
+        raise NotImplementedError
+    
+    def embed(self, images: List[Any]) -> np.ndarray:
+        """
+        Embed a batch of images.
+        
+        Args:
+            images: List of images (numpy RGB arrays or PIL images)
+        
+        Returns:
+            (N, D) array of L2-normalized embedding vectors
+        """
+        raise NotImplementedError
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Get information about the backend."""
+        return {"backend": self.name, "loaded": self.model is not None, "device": self.device}
+
+
+class TorchCLIPBackend(EmbeddingBackend):
+    """Full-precision PyTorch CLIP (transformers)."""
+    
+    name = "torch"
+    
+    def load(self, model_name: str) -> None:
+        if not TORCH_AVAILABLE:
+            raise RuntimeError(
+                "Transformers not installed. Install with: pip install transformers"
+            )
+        
+        self.processor = CLIPProcessor.from_pretrained(model_name)
+        self.model = CLIPModel.from_pretrained(model_name).to(self.device)
+        self.model.eval()
+    
+    def embed(self, images: List[Any]) -> np.ndarray:
+        inputs = self.processor(images=_to_pil(images), return_tensors="pt", padding=True)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        
+        with torch.no_grad():
+            image_features = self.model.get_image_features(**inputs)
+            # Normalize
+            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+            return image_features.cpu().numpy()
+
+
+class ONNXCLIPBackend(EmbeddingBackend):
+    """
+    CLIP image encoder exported to ONNX and run with ONNX Runtime on CPU.
+    
+    The graph is exported once per model (and int8-quantized if
+    config.onnx_quantize_int8) into config.onnx_model_dir; later loads only
+    need onnxruntime and the CLIP image processor, not PyTorch.
+    """
+    
+    name = "onnx"
+    
+    INPUT_NAME = "pixel_values"
+    OUTPUT_NAME = "image_embeds"
+    
+    def model_path(self, model_name: str) -> Path:
+        """On-disk path of the (quantized) ONNX graph for a model."""
+        suffix = "int8" if self.config.onnx_quantize_int8 else "fp32"
+        return Path(self.config.onnx_model_dir) / f"{model_name.replace('/', '__')}.{suffix}.onnx"
+    
+    def load(self, model_name: str) -> None:
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError(
+                "onnxruntime not installed. Install with: pip install onnxruntime"
+            )
+        if not CLIP_IMAGE_PROCESSOR_AVAILABLE:
+            raise RuntimeError(
+                "Transformers not installed. Install with: pip install transformers"
+            )
+        
+        path = self.model_path(model_name)
+        if not path.exists():
+            export_clip_onnx(model_name, path, quantize=self.config.onnx_quantize_int8)
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.config.onnx_intra_op_threads > 0:
+            session_options.intra_op_num_threads = self.config.onnx_intra_op_threads
+        
+        self.processor = CLIPImageProcessor.from_pretrained(model_name)
+        self.model = ort.InferenceSession(
+            str(path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.device = "cpu"
+        
+        logger.info(
+            f"ONNX CLIP session ready: {path} "
+            f"(intra_op_threads={self.config.onnx_intra_op_threads or 'default'})"
+        )
+    
+    def embed(self, images: List[Any]) -> np.ndarray:
+        pixel_values = self.processor(images=_to_pil(images), return_tensors="np")["pixel_values"]
+        
+        image_features = self.model.run(
+            [self.OUTPUT_NAME],
+            {self.INPUT_NAME: pixel_values.astype(np.float32)}
+        )[0]
+        
+        # Normalize
+        norms = np.linalg.norm(image_features, axis=-1, keepdims=True)
+        return image_features / np.maximum(norms, 1e-12)
+    
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            **super().get_info(),
+            "quantized_int8": self.config.onnx_quantize_int8,
+            "intra_op_threads": self.config.onnx_intra_op_threads,
+        }
+
+
+BACKENDS = {
+    TorchCLIPBackend.name: TorchCLIPBackend,
+    ONNXCLIPBackend.name: ONNXCLIPBackend,
+}
+
+
+def create_backend(config: VisionConfig, device: str = "cpu") -> EmbeddingBackend:
+    """
+    Instantiate the backend selected by config.embedding_backend.
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend_cls = BACKENDS.get(config.embedding_backend)
+    if backend_cls is None:
+        raise ValueError(
+            f"Invalid embedding backend: {config.embedding_backend}. "
+            f"Must be one of {sorted(BACKENDS)}"
+        )
+    return backend_cls(config, device=device)
+
+
+def export_clip_onnx(
+    model_name: str,
+    output_path: Path,
+    quantize: bool = True,
+    opset_version: int = 17
+) -> Path:
+    """
+    Export the CLIP image encoder (vision tower + projection) to ONNX.
+    
+    Requires PyTorch; run once per model (e.g. at image build time) and ship
+    the resulting file to CPU-only nodes.
+    
+    Args:
+        model_name: HuggingFace model ID
+        output_path: Destination .onnx file
+        quantize: Apply dynamic int8 weight quantization
+        opset_version: ONNX opset
+    
+    Returns:
+        Path to the exported graph
+    """
+    if not TORCH_AVAILABLE:
+        raise RuntimeError(
+            "PyTorch + transformers are required to export CLIP to ONNX. "
+            "Install with: pip install torch transformers"
+        )
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_path.with_suffix(".fp32.onnx") if quantize else output_path
+    
+    logger.info(f"Exporting CLIP image encoder {model_name} to ONNX: {fp32_path}")
+    
+    model = CLIPModel.from_pretrained(model_name).eval()
+    image_size = model.config.vision_config.image_size
+    
+    class _ImageEncoder(torch.nn.Module):
+        def __init__(self, clip_model):
+            super().__init__()
+            self.clip_model = clip_model
+        
+        def forward(self, pixel_values):
+            return self.clip_model.get_image_features(pixel_values=pixel_values)
+    
+    with torch.no_grad():
+        torch.onnx.export(
+            _ImageEncoder(model),
+            torch.zeros(1, 3, image_size, image_size),
+            str(fp32_path),
+            input_names=[ONNXCLIPBackend.INPUT_NAME],
+            output_names=[ONNXCLIPBackend.OUTPUT_NAME],
+            dynamic_axes={
+                ONNXCLIPBackend.INPUT_NAME: {0: "batch"},
+                ONNXCLIPBackend.OUTPUT_NAME: {0: "batch"},
+            },
+            opset_version=opset_version
+        )
+    
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        quantize_dynamic(str(fp32_path), str(output_path), weight_type=QuantType.QInt8)
+        logger.info(f"✅ Quantized (dynamic int8) CLIP graph written to {output_path}")
+    
+    return output_path
+
+
+def compare_backends(
+    reference: EmbeddingBackend,
+    candidate: EmbeddingBackend,
+    images: List[Any],
+    min_cosine: float = DEFAULT_MIN_COSINE
+) -> Dict[str, Any]:
+    """
+    Check a backend's embeddings against a reference backend.
+    
+    Args:
+        reference: Reference backend (normally TorchCLIPBackend)
+        candidate: Backend under test (e.g. ONNXCLIPBackend)
+        images: Sample images
+        min_cosine: Minimum per-image cosine similarity to pass
+    
+    Returns:
+        Dict with min/mean cosine similarity and 'passed'
+    """
+    start = time.perf_counter()
+    expected = reference.embed(images)
+    reference_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    actual = candidate.embed(images)
+    candidate_s = time.perf_counter() - start
+    
+    # Both backends return L2-normalized vectors
+    cosines = (expected * actual).sum(axis=1)
+    
+    return {
+        "num_images": len(images),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "threshold": min_cosine,
+        "passed": bool(cosines.min() >= min_cosine),
+        "reference_seconds": round(reference_s, 4),
+        "candidate_seconds": round(candidate_s, 4),
+    }
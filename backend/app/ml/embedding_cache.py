@@ -0,0 +1,164 @@
+"""
+Embedding Cache - Perceptual-hash keyed embedding reuse
+
+Sprint 3: Vision Engine
+
+Features:
+- dHash (difference hash) of a downscaled grayscale frame (64 bits)
+- Near-duplicate lookup by Hamming distance
+- LRU bound on cached vectors
+- Hit/miss/eviction counters for pipeline telemetry
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PerceptualHashCache:
+    """
+    LRU cache of embedding vectors keyed by a frame's perceptual hash.
+    
+    Static shots and talking heads produce runs of sampled frames that are
+    visually identical; any frame whose dHash is within `max_hamming` bits of
+    an already-embedded frame reuses that frame's vector instead of running
+    CLIP again.
+    """
+    
+    HASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+    
+    def __init__(self, max_size: int = 2048, max_hamming: int = 4):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached vectors (LRU eviction)
+            max_hamming: Max Hamming distance (bits) to treat two frames as duplicates
+        """
+        self.max_size = max_size
+        self.max_hamming = max_hamming
+        self._entries: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        
+        # Telemetry
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def dhash(cls, image: np.ndarray) -> int:
+        """
+        Compute the 64-bit difference hash of an RGB frame.
+        
+        The frame is converted to grayscale, resized to 9x8 and each bit
+        encodes whether a pixel is brighter than its right neighbour.
+        
+        Args:
+            image: Frame as numpy array (H, W, 3) RGB
+        
+        Returns:
+            Hash as a Python int
+        """
+        import cv2
+        
+        gray = cv2.cvtColor(image.astype(np.uint8, copy=False), cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(gray, (cls.HASH_SIZE + 1, cls.HASH_SIZE), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+    
+    @staticmethod
+    def hamming(hash_a: int, hash_b: int) -> int:
+        """Number of differing bits between two hashes."""
+        return (hash_a ^ hash_b).bit_count()
+    
+    def find(self, frame_hash: int) -> Optional[int]:
+        """
+        Find the cached hash closest to frame_hash within max_hamming.
+        
+        Args:
+            frame_hash: dHash of the query frame
+        
+        Returns:
+            Matching cached hash, or None
+        """
+        if frame_hash in self._entries:
+            return frame_hash
+        
+        if self.max_hamming <= 0 or not self._entries:
+            return None
+        
+        best_hash, best_distance = None, self.max_hamming + 1
+        for cached_hash in self._entries:
+            distance = self.hamming(frame_hash, cached_hash)
+            if distance < best_distance:
+                best_hash, best_distance = cached_hash, distance
+                if distance == 0:
+                    break
+        
+        return best_hash
+    
+    def get(self, frame_hash: int, count: bool = True) -> Optional[np.ndarray]:
+        """
+        Get the vector of a near-duplicate frame, if cached.
+        
+        Args:
+            frame_hash: dHash of the query frame
+            count: Update hit/miss counters
+        
+        Returns:
+            Cached embedding vector, or None
+        """
+        match = self.find(frame_hash)
+        
+        if match is None:
+            if count:
+                self.misses += 1
+            return None
+        
+        self._entries.move_to_end(match)
+        if count:
+            self.hits += 1
+        return self._entries[match]
+    
+    def put(self, frame_hash: int, vector: np.ndarray) -> None:
+        """
+        Cache the embedding vector of a frame.
+        
+        Args:
+            frame_hash: dHash of the frame
+            vector: Embedding vector
+        """
+        self._entries[frame_hash] = vector
+        self._entries.move_to_end(frame_hash)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """Add externally resolved lookups (e.g. in-batch duplicates) to the counters."""
+        self.hits += hits
+        self.misses += misses
+    
+    def clear(self) -> None:
+        """Drop all cached vectors (e.g. when the embedding model changes)."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "max_hamming": self.max_hamming,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,319 @@
+"""
+Frame Cache - Persistent memory-mapped frame stacks
+
+Sprint 3: Vision Engine
+
+Features:
+- Sampled RGB frames of a video stored once as a (N, H, W, 3) uint8 .npy stack
+- Keyed by file content hash + sampling parameters
+- Zero-copy reads (np.load(mmap_mode="r")), shared across processes
+- Atomic writes (temp file + rename), safe with concurrent workers
+- LRU eviction by total size on disk
+- Invalidation per video or for entries sampled with other parameters
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFrames:
+    """A cached frame stack (read-only memory map) with its frame positions."""
+    key: str
+    frames: np.ndarray
+    frame_ids: List[int]
+    timestamps_ms: List[float]
+    
+    def __len__(self) -> int:
+        return len(self.frame_ids)
+
+
+class FrameCache:
+    """
+    On-disk cache of sampled frame stacks, one entry per (video, sampling).
+    
+    Every vision stage consumes the same sampled frames; with the cache the
+    video is decoded once per sampling configuration and later passes (other
+    stages, other workers, re-analysis) map the stored stack instead.
+    
+    Each entry is a `<key>.npy` stack plus a `<key>.json` sidecar (frame ids,
+    timestamps, source hash, sampling parameters). The sidecar is written
+    last and acts as the commit marker; its mtime is the LRU clock.
+    """
+    
+    FORMAT_VERSION = 1
+    HASH_CHUNK_BYTES = 8 * 1024 * 1024
+    
+    # (realpath, size, mtime_ns) -> content hash, shared by all instances
+    _hash_memo: Dict[Tuple[str, int, int], str] = {}
+    _hash_memo_lock = threading.Lock()
+    
+    def __init__(self, cache_dir: str = "storage/frame_cache", max_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the .npy stacks
+            max_bytes: Max total size on disk before LRU eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        # Telemetry
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def file_hash(cls, video_path: str) -> str:
+        """
+        SHA-256 of a video file's content (memoized per path, size and mtime).
+        
+        Args:
+            video_path: Path to video file
+        
+        Returns:
+            Hex digest
+        """
+        stat = os.stat(video_path)
+        memo_key = (os.path.realpath(video_path), stat.st_size, stat.st_mtime_ns)
+        
+        with cls._hash_memo_lock:
+            cached = cls._hash_memo.get(memo_key)
+        if cached is not None:
+            return cached
+        
+        digest = hashlib.sha256()
+        with open(video_path, "rb") as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        
+        file_hash = digest.hexdigest()
+        with cls._hash_memo_lock:
+            cls._hash_memo[memo_key] = file_hash
+        return file_hash
+    
+    def make_key(self, file_hash: str, params: Dict[str, Any]) -> str:
+        """Cache key for a file hash and sampling parameters."""
+        payload = json.dumps(
+            {"v": self.FORMAT_VERSION, "file": file_hash, "params": params},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+    
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.npy", self.cache_dir / f"{key}.json"
+    
+    def get(self, video_path: str, params: Dict[str, Any]) -> Optional[CachedFrames]:
+        """
+        Look up the frame stack of a video sampled with `params`.
+        
+        Args:
+            video_path: Path to video file
+            params: Sampling parameters (fps, max frames, size, segment)
+        
+        Returns:
+            CachedFrames backed by a read-only memory map, or None
+        """
+        key = self.make_key(self.file_hash(video_path), params)
+        stack_path, meta_path = self._paths(key)
+        
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            frames = np.load(stack_path, mmap_mode="r")
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        if len(frames) != len(meta["frame_ids"]):
+            logger.warning(f"Corrupt frame cache entry {key}, dropping it")
+            self._remove(key)
+            self.misses += 1
+            return None
+        
+        # Touch for LRU
+        os.utime(meta_path)
+        self.hits += 1
+        
+        return CachedFrames(
+            key=key,
+            frames=frames,
+            frame_ids=meta["frame_ids"],
+            timestamps_ms=meta["timestamps_ms"]
+        )
+    
+    def put(
+        self,
+        video_path: str,
+        params: Dict[str, Any],
+        frames: List[np.ndarray],
+        frame_ids: List[int],
+        timestamps_ms: List[float]
+    ) -> Optional[str]:
+        """
+        Store the sampled frames of a video.
+        
+        Args:
+            video_path: Path to video file
+            params: Sampling parameters used to produce the frames
+            frames: Sampled RGB frames (same shape)
+            frame_ids: Source frame number of each frame
+            timestamps_ms: Source timestamp of each frame
+        
+        Returns:
+            Cache key, or None if nothing was stored
+        """
+        if not frames:
+            return None
+        
+        file_hash = self.file_hash(video_path)
+        key = self.make_key(file_hash, params)
+        stack_path, meta_path = self._paths(key)
+        
+        # Unique temp names: concurrent writers of the same entry just race on rename
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_stack = stack_path.with_name(stack_path.name + suffix)
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        
+        try:
+            stack = np.lib.format.open_memmap(
+                tmp_stack, mode="w+", dtype=np.uint8, shape=(len(frames),) + frames[0].shape
+            )
+            for i, frame in enumerate(frames):
+                stack[i] = frame
+            stack.flush()
+            del stack
+            
+            with open(tmp_meta, "w") as f:
+                json.dump({
+                    "video_path": str(video_path),
+                    "file_hash": file_hash,
+                    "params": params,
+                    "frame_ids": [int(i) for i in frame_ids],
+                    "timestamps_ms": [float(t) for t in timestamps_ms],
+                    "created_at": time.time()
+                }, f)
+            
+            os.replace(tmp_stack, stack_path)
+            os.replace(tmp_meta, meta_path)
+        
+        except OSError as e:
+            logger.warning(f"Failed to write frame cache entry for {video_path}: {e}")
+            for path in (tmp_stack, tmp_meta):
+                path.unlink(missing_ok=True)
+            return None
+        
+        logger.debug(f"Cached {len(frames)} frames of {video_path} as {key}")
+        self.evict()
+        return key
+    
+    def _entries(self) -> List[Tuple[str, float, int, Dict[str, Any]]]:
+        """(key, last_used, size_bytes, meta) for every committed entry."""
+        entries = []
+        for meta_path in self.cache_dir.glob("*.json"):
+            key = meta_path.stem
+            stack_path = meta_path.with_suffix(".npy")
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                meta_stat = meta_path.stat()
+                size = meta_stat.st_size + stack_path.stat().st_size
+                entries.append((key, meta_stat.st_mtime, size, meta))
+            except (OSError, ValueError):
+                continue
+        return entries
+    
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+    
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until the cache fits in max_bytes.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(entry[2] for entry in entries)
+        
+        removed = 0
+        for key, _, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+        
+        self.evictions += removed
+        return removed
+    
+    def invalidate_video(self, video_path: str) -> int:
+        """
+        Drop every entry of a video (e.g. after the file was replaced).
+        
+        Returns:
+            Number of entries removed
+        """
+        file_hash = self.file_hash(video_path)
+        removed = 0
+        for key, _, _, meta in self._entries():
+            if meta.get("file_hash") == file_hash or meta.get("video_path") == str(video_path):
+                self._remove(key)
+                removed += 1
+        return removed
+    
+    def invalidate_sampling(self, params: Dict[str, Any]) -> int:
+        """
+        Drop entries sampled with parameters other than `params`.
+        
+        Call after the sampling config changes: those entries can no longer
+        be hit and would only hold disk space until evicted. Segment bounds
+        (start_ms/end_ms) are ignored.
+        
+        Returns:
+            Number of entries removed
+        """
+        current = self._sampling_only(params)
+        removed = 0
+        for key, _, _, meta in self._entries():
+            if self._sampling_only(meta.get("params", {})) != current:
+                self._remove(key)
+                removed += 1
+        return removed
+    
+    @staticmethod
+    def _sampling_only(params: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in params.items() if k not in ("start_ms", "end_ms")}
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        for key, _, _, _ in self._entries():
+            self._remove(key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "size_bytes": sum(entry[2] for entry in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,403 @@
+"""
+Frame Sampler - Single-pass streaming frame sampling
+
+Sprint 3: Vision Engine
+
+Features:
+- Decode a video exactly once (no per-frame seeks)
+- FPS throttling via grab()/retrieve() (skipped frames are never converted)
+- Yields sampled RGB frames with frame_id + timestamp
+- Optional decode thread with a bounded queue (producer/consumer + backpressure)
+- Decode timing for pipeline telemetry
+- Optional downscaling + persistent frame cache (decode once per video and sampling)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .models import VisionConfig
+from .frame_cache import FrameCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SampledFrame:
+    """A single sampled frame (RGB) with its position in the source video."""
+    frame_id: int
+    timestamp_ms: float
+    image: np.ndarray
+
+
+class FrameSampler:
+    """
+    Streaming frame sampler shared by every vision stage.
+    
+    A single sequential pass over the capture replaces the previous
+    "detect, then seek back for every sampled frame" pattern: frames that
+    are not sampled are only grabbed (demuxed/decoded) and never converted
+    to RGB, sampled frames are retrieved once and fanned out to YOLO, CLIP,
+    color extraction and scene classification by the caller.
+    """
+    
+    DEFAULT_VIDEO_FPS = 30.0
+    
+    # Poll interval used by the decode thread while the queue is full
+    _PUT_TIMEOUT_S = 0.1
+    
+    def __init__(self, config: Optional[VisionConfig] = None, frame_cache: Optional[FrameCache] = None):
+        """
+        Initialize frame sampler.
+        
+        Args:
+            config: Vision configuration. Defaults to VisionConfig().
+            frame_cache: Frame cache to read/write. If None and
+                config.frame_cache_enabled, one is created from the config.
+        """
+        self.config = config or VisionConfig()
+        
+        self.frame_cache = frame_cache
+        if self.frame_cache is None and self.config.frame_cache_enabled:
+            self.frame_cache = FrameCache(
+                cache_dir=self.config.frame_cache_dir,
+                max_bytes=self.config.frame_cache_max_bytes
+            )
+        
+        # Telemetry (last run)
+        self.last_decode_time_ms = 0.0
+        self.last_frames_decoded = 0
+        self.last_cache_hit = False
+    
+    def sampling_params(
+        self,
+        max_frames: int,
+        target_fps: float,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Parameters that determine which frames are sampled (frame cache key)."""
+        return {
+            "target_fps": target_fps,
+            "max_frames": max_frames,
+            "frame_max_side": self.config.frame_max_side,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+        }
+    
+    def invalidate_stale_cache(self) -> int:
+        """
+        Drop cached stacks sampled with settings other than this config's
+        (target_fps, max_frames_per_clip, frame_max_side).
+        
+        Returns:
+            Number of cache entries removed
+        """
+        if self.frame_cache is None:
+            return 0
+        
+        removed = self.frame_cache.invalidate_sampling(
+            self.sampling_params(self.config.max_frames_per_clip, self.config.target_fps)
+        )
+        if removed:
+            logger.info(f"Frame cache: dropped {removed} entries from a previous sampling config")
+        return removed
+    
+    def iter_frames(
+        self,
+        video_path: str,
+        max_frames: Optional[int] = None,
+        target_fps: Optional[float] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> Iterator[SampledFrame]:
+        """
+        Stream sampled RGB frames from a video file.
+        
+        Args:
+            video_path: Path to video file
+            max_frames: Maximum number of frames to yield
+            target_fps: Target FPS for sampling. If None, uses config.target_fps.
+            start_ms: Start of the segment to sample (single seek). None = start of video.
+            end_ms: End of the segment to sample (exclusive). None = end of video.
+        
+        With a frame cache, a video already sampled with the same parameters
+        is read back from its memory-mapped stack (read-only frames) instead of
+        being decoded; a complete decode pass is written to the cache.
+        
+        Yields:
+            SampledFrame for every sampled position, in order
+        
+        Raises:
+            ValueError: If the video cannot be opened
+        """
+        target_fps = target_fps or self.config.target_fps
+        max_frames = max_frames or self.config.max_frames_per_clip
+        self.last_cache_hit = False
+        
+        if self.frame_cache is None or not os.path.isfile(video_path):
+            yield from self._decode_frames(video_path, max_frames, target_fps, start_ms, end_ms)
+            return
+        
+        params = self.sampling_params(max_frames, target_fps, start_ms, end_ms)
+        cached = self.frame_cache.get(video_path, params)
+        
+        if cached is not None:
+            # Zero-copy views into the memory-mapped stack
+            self.last_decode_time_ms = 0.0
+            self.last_frames_decoded = 0
+            self.last_cache_hit = True
+            for i, (frame_id, timestamp_ms) in enumerate(zip(cached.frame_ids, cached.timestamps_ms)):
+                yield SampledFrame(frame_id=frame_id, timestamp_ms=timestamp_ms, image=cached.frames[i])
+            return
+        
+        decoded: List[SampledFrame] = []
+        for sampled in self._decode_frames(video_path, max_frames, target_fps, start_ms, end_ms):
+            decoded.append(sampled)
+            yield sampled
+        
+        # Only complete passes are cached (an abandoned generator never gets here)
+        self.frame_cache.put(
+            video_path,
+            params,
+            frames=[sampled.image for sampled in decoded],
+            frame_ids=[sampled.frame_id for sampled in decoded],
+            timestamps_ms=[sampled.timestamp_ms for sampled in decoded]
+        )
+    
+    def _decode_frames(
+        self,
+        video_path: str,
+        max_frames: int,
+        target_fps: float,
+        start_ms: Optional[float],
+        end_ms: Optional[float]
+    ) -> Iterator[SampledFrame]:
+        """Decode and sample frames (single sequential pass, see iter_frames)."""
+        import cv2
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {video_path}")
+        
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or self.DEFAULT_VIDEO_FPS
+        frame_interval = max(1, int(video_fps / target_fps))
+        
+        logger.debug(
+            f"Sampling {video_path}: fps={video_fps}, "
+            f"frame_interval={frame_interval}, max_frames={max_frames}"
+        )
+        
+        self.last_decode_time_ms = 0.0
+        self.last_frames_decoded = 0
+        
+        frame_count = 0
+        first_frame = 0
+        sampled_count = 0
+        end_frame = int(end_ms / 1000 * video_fps) if end_ms is not None else None
+        
+        if start_ms:
+            # One seek to the segment start, then decode sequentially as usual
+            first_frame = frame_count = int(start_ms / 1000 * video_fps)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+        
+        try:
+            while sampled_count < max_frames:
+                if end_frame is not None and frame_count >= end_frame:
+                    break
+                
+                decode_start = time.perf_counter()
+                
+                if not cap.grab():
+                    break
+                
+                if (frame_count - first_frame) % frame_interval != 0:
+                    self.last_decode_time_ms += (time.perf_counter() - decode_start) * 1000
+                    frame_count += 1
+                    continue
+                
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame_rgb = self._resize(frame_rgb)
+                self.last_decode_time_ms += (time.perf_counter() - decode_start) * 1000
+                self.last_frames_decoded += 1
+                
+                yield SampledFrame(
+                    frame_id=frame_count,
+                    timestamp_ms=(frame_count / video_fps) * 1000,
+                    image=frame_rgb
+                )
+                
+                sampled_count += 1
+                frame_count += 1
+        
+        finally:
+            cap.release()
+    
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame to config.frame_max_side (longer side), keeping aspect ratio."""
+        max_side = self.config.frame_max_side
+        height, width = frame.shape[:2]
+        
+        if max_side <= 0 or max(height, width) <= max_side:
+            return frame
+        
+        import cv2
+        
+        scale = max_side / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    def sample_frames(
+        self,
+        video_path: str,
+        max_frames: Optional[int] = None,
+        target_fps: Optional[float] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> List[SampledFrame]:
+        """
+        Collect all sampled frames of a video in a single decode pass.
+        
+        Args:
+            video_path: Path to video file
+            max_frames: Maximum number of frames to return
+            target_fps: Target FPS for sampling
+            start_ms: Segment start (see iter_frames)
+            end_ms: Segment end (see iter_frames)
+        
+        Returns:
+            List of SampledFrame
+        """
+        return list(self.iter_frames(video_path, max_frames, target_fps, start_ms, end_ms))
+    
+    def iter_frames_prefetched(
+        self,
+        video_path: str,
+        max_frames: Optional[int] = None,
+        target_fps: Optional[float] = None,
+        prefetch: Optional[int] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> Iterator[SampledFrame]:
+        """
+        Stream sampled frames decoded ahead of time by a background thread.
+        
+        The decode thread fills a bounded queue while the caller runs
+        inference, so decode and inference overlap. The queue size caps how
+        many decoded frames can be held in memory: when it is full the decode
+        thread blocks (backpressure) until the consumer catches up.
+        
+        Args:
+            video_path: Path to video file
+            max_frames: Maximum number of frames to yield
+            target_fps: Target FPS for sampling
+            prefetch: Max frames buffered ahead of the consumer. If None, uses
+                config.decode_prefetch_frames. 0 falls back to inline decoding.
+            start_ms: Segment start (see iter_frames)
+            end_ms: Segment end (see iter_frames)
+        
+        Yields:
+            SampledFrame for every sampled position, in order
+        
+        Raises:
+            ValueError: If the video cannot be opened
+        """
+        prefetch = self.config.decode_prefetch_frames if prefetch is None else prefetch
+        
+        if prefetch <= 0:
+            yield from self.iter_frames(video_path, max_frames, target_fps, start_ms, end_ms)
+            return
+        
+        frame_queue: "queue.Queue" = queue.Queue(maxsize=prefetch)
+        stop_event = threading.Event()
+        end_of_stream = object()
+        errors: List[BaseException] = []
+        
+        def _put(item: object) -> bool:
+            while not stop_event.is_set():
+                try:
+                    frame_queue.put(item, timeout=self._PUT_TIMEOUT_S)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def _decode() -> None:
+            try:
+                for sampled in self.iter_frames(video_path, max_frames, target_fps, start_ms, end_ms):
+                    if not _put(sampled):
+                        return
+            except BaseException as e:  # surfaced in the consumer thread
+                errors.append(e)
+            finally:
+                _put(end_of_stream)
+        
+        decoder = threading.Thread(
+            target=_decode,
+            name="frame-sampler-decode",
+            daemon=True
+        )
+        decoder.start()
+        
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is end_of_stream:
+                    break
+                yield item
+        finally:
+            # Consumer finished or aborted: unblock and reap the decode thread
+            stop_event.set()
+            decoder.join()
+        
+        if errors:
+            raise errors[0]
+    
+    def iter_batches(
+        self,
+        video_path: str,
+        batch_size: Optional[int] = None,
+        max_frames: Optional[int] = None,
+        target_fps: Optional[float] = None,
+        prefetch: Optional[int] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> Iterator[List[SampledFrame]]:
+        """
+        Stream sampled frames grouped into inference batches.
+        
+        Args:
+            video_path: Path to video file
+            batch_size: Frames per batch. If None, uses config.yolo_batch_size.
+            max_frames: Maximum number of frames in total
+            target_fps: Target FPS for sampling
+            prefetch: Decode queue size (see iter_frames_prefetched)
+            start_ms: Segment start (see iter_frames)
+            end_ms: Segment end (see iter_frames)
+        
+        Yields:
+            Lists of up to batch_size SampledFrames, in order
+        """
+        batch_size = batch_size or self.config.yolo_batch_size
+        batch: List[SampledFrame] = []
+        
+        for sampled in self.iter_frames_prefetched(
+            video_path, max_frames, target_fps, prefetch, start_ms, end_ms
+        ):
+            batch.append(sampled)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        
+        if batch:
+            yield batch
@@ -4,7 +4,7 @@ Pydantic models for Vision Engine (Sprint 3)
 All ML outputs are strongly typed for validation and serialization.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, List, Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
@@ -89,6 +89,8 @@ class EnrichedDetection(BaseModel):
     """YOLO detection + COCO semantic enrichment."""
     detection: YOLODetection
     mapping: COCOMapping
+    frame_id: Optional[int] = Field(None, description="Source frame ID")
+    timestamp_ms: Optional[float] = Field(None, description="Source timestamp")
 
 
 # ========================================
@@ -143,7 +145,7 @@ class SceneClassification(BaseModel):
     timestamp_ms: float
     
     # Valid scene types for Stakazo
-    VALID_SCENES = [
+    VALID_SCENES: ClassVar[List[str]] = [
         "calle",
         "coche",
         "noche",
@@ -253,6 +255,10 @@ class ClipMetadata(BaseModel):
     # Metadata
     processed_at: datetime = Field(default_factory=datetime.utcnow)
     processing_cost_eur: float = Field(0.0, description="Processing cost in EUR")
+    stage_timings_ms: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Wall time per pipeline stage (decode, yolo, embeddings, color, scene, total)"
+    )
     
     model_config = {"json_schema_extra": {
         "example": {
@@ -264,13 +270,58 @@ class ClipMetadata(BaseModel):
             "brand_affinity_score": 0.76,
             "aesthetic_score": 0.88,
             "processed_at": "2025-12-07T10:30:00Z",
-            "processing_cost_eur": 0.0023
+            "processing_cost_eur": 0.0023,
+            "stage_timings_ms": {"decode": 410.2, "yolo": 1320.5, "embeddings": 980.1, "total": 2890.4}
         }
     }}
 
 
 # ========================================
-# 7. Processing Configuration
+# 7. Cut Analysis Models
+# ========================================
+
+class ShotBoundary(BaseModel):
+    """A detected hard cut between two shots."""
+    frame_id: int = Field(..., description="First frame of the new shot")
+    timestamp_ms: float = Field(..., description="Timestamp in video (milliseconds)")
+    score: float = Field(..., ge=0.0, le=1.0, description="Histogram distance across the cut")
+
+
+class CutCandidate(BaseModel):
+    """A candidate clip window aligned to shot boundaries."""
+    start_ms: int = Field(..., ge=0)
+    end_ms: int = Field(..., gt=0)
+    duration_ms: int = Field(..., gt=0)
+    visual_score: float = Field(..., ge=0.0, le=1.0, description="Motion, pacing and image quality")
+    motion_intensity: float = Field(..., ge=0.0, le=1.0, description="Mean inter-frame motion")
+    shot_count: int = Field(..., ge=1, description="Shots (fully or partially) inside the window")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="How cleanly the window starts/ends on cuts")
+    
+    model_config = {"json_schema_extra": {
+        "example": {
+            "start_ms": 12400,
+            "end_ms": 27900,
+            "duration_ms": 15500,
+            "visual_score": 0.74,
+            "motion_intensity": 0.61,
+            "shot_count": 4,
+            "confidence": 0.9
+        }
+    }}
+
+
+class CutAnalysis(BaseModel):
+    """Result of shot-boundary cut analysis over a whole video."""
+    duration_ms: int = Field(..., ge=0)
+    video_fps: float
+    frames_analyzed: int
+    boundaries: List[ShotBoundary] = Field(default_factory=list)
+    candidates: List[CutCandidate] = Field(default_factory=list, description="Best windows, by start time")
+    processing_time_ms: float = 0.0
+
+
+# ========================================
+# 8. Processing Configuration
 # ========================================
 
 class VisionConfig(BaseModel):
@@ -284,10 +335,75 @@ class VisionConfig(BaseModel):
     # Frame sampling
     target_fps: float = Field(1.0, ge=0.1, le=30.0, description="Target FPS for processing")
     max_frames_per_clip: int = Field(30, ge=1, description="Max frames to process per clip")
+    yolo_batch_size: int = Field(8, ge=1, description="Frames per YOLO inference batch")
+    decode_prefetch_frames: int = Field(
+        16,
+        ge=0,
+        description="Max decoded frames buffered ahead of inference (backpressure). 0 = decode inline"
+    )
+    frame_max_side: int = Field(
+        0,
+        ge=0,
+        description="Downscale sampled frames so the longer side is at most this (0 = native size)"
+    )
+    frame_cache_enabled: bool = Field(False, description="Persist sampled frames as memory-mapped .npy stacks")
+    frame_cache_dir: str = Field("storage/frame_cache", description="Frame cache directory")
+    frame_cache_max_bytes: int = Field(2 * 1024 ** 3, ge=0, description="Frame cache size on disk (LRU eviction)")
+    results_store_enabled: bool = Field(False, description="Persist/reuse clip results keyed by content hash")
+    results_store_dir: str = Field("storage/vision_results", description="Vision results store directory")
+    
+    # Cut analysis (shot boundaries + candidate clip windows)
+    cut_analysis_fps: float = Field(6.0, ge=1.0, le=30.0, description="Frames per second scored for cuts")
+    cut_analysis_width: int = Field(96, ge=16, description="Width of the thumbnails cuts are scored on")
+    cut_threshold_k: float = Field(
+        4.0,
+        ge=0.0,
+        description="Cut when the histogram distance exceeds local median + k * MAD"
+    )
+    cut_min_threshold: float = Field(0.25, ge=0.0, le=1.0, description="Floor of the adaptive cut threshold")
+    cut_min_shot_ms: int = Field(500, ge=0, description="Min shot length (suppresses flashes / double cuts)")
+    cut_min_clip_ms: int = Field(5000, ge=1000, description="Min candidate clip duration")
+    cut_max_clip_ms: int = Field(15000, ge=1000, description="Max candidate clip duration")
+    cut_max_clips: int = Field(8, ge=1, description="Max candidate clips returned")
+    cut_decode_workers: int = Field(0, ge=0, description="Parallel decode threads over video chunks (0 = CPU count, max 4)")
+    
+    # Color extraction
+    palette_mode: str = Field(
+        "fast",
+        description="'fast' (quantized histogram, vectorized) or 'exact' (full-resolution KMeans)"
+    )
     
     # Embeddings
     embedding_model: str = Field("clip-vit-base-patch32", description="CLIP model")
+    embedding_backend: str = Field(
+        "torch",
+        description="'torch' (PyTorch fp32) or 'onnx' (ONNX Runtime on CPU, optional int8)"
+    )
+    onnx_model_dir: str = Field("storage/models/onnx", description="Exported ONNX graphs directory")
+    onnx_quantize_int8: bool = Field(True, description="Dynamic int8 quantization of the ONNX graph")
+    onnx_intra_op_threads: int = Field(0, ge=0, description="ONNX Runtime intra-op threads (0 = runtime default)")
     use_faiss: bool = Field(True, description="Enable FAISS similarity search")
+    embedding_cache_enabled: bool = Field(True, description="Reuse embeddings of near-duplicate frames")
+    embedding_cache_size: int = Field(2048, ge=1, description="Max cached embeddings (LRU)")
+    embedding_cache_max_hamming: int = Field(
+        4,
+        ge=0,
+        le=64,
+        description="Max dHash Hamming distance (bits) for two frames to share an embedding"
+    )
+    
+    # Worker pool (multi-process inference)
+    pool_workers: int = Field(0, ge=0, description="Vision worker processes (0 = CPU count)")
+    pool_max_in_flight: int = Field(
+        0,
+        ge=0,
+        description="Max clips queued or running across the pool (0 = 2 x workers)"
+    )
+    pool_threads_per_worker: int = Field(
+        1,
+        ge=1,
+        description="Intra-op threads per worker process (avoids oversubscribing cores)"
+    )
     
     # Cost guards
     max_cost_per_clip_eur: float = Field(0.01, description="Max cost per clip")
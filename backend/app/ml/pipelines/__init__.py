@@ -4,15 +4,17 @@ ML Pipelines Package - Learning pipelines for STAKAZO
 Provides:
 - DailyLearningPipeline: Automated daily learning
 - ViralityPredictor: Virality score prediction
+- ViralityPredictionBatch: Batch predictions kept as score arrays
 - BestTimeToPostAnalyzer: Optimal posting time analysis
 """
 
 from .daily_learning import DailyLearningPipeline
-from .virality_predictor import ViralityPredictor
+from .virality_predictor import ViralityPredictor, ViralityPredictionBatch
 from .best_time_to_post import BestTimeToPostAnalyzer
 
 __all__ = [
     "DailyLearningPipeline",
     "ViralityPredictor",
+    "ViralityPredictionBatch",
     "BestTimeToPostAnalyzer"
 ]
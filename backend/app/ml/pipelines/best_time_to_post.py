@@ -3,13 +3,11 @@ Best Time to Post - Analyze optimal posting times based on historical performanc
 """
 
 from typing import Dict, Any, List
-from datetime import datetime, date, timedelta
 from collections import defaultdict
 import logging
-import statistics
 
 from ..storage.model_metrics_store import ModelMetricsStore
-from ..storage.schemas_metrics import BestTimeToPost, Platform, ChannelType, MetricsReadRequest, MetricType
+from ..storage.schemas_metrics import BestTimeToPost, Platform, ChannelType
 
 logger = logging.getLogger(__name__)
 
@@ -24,37 +22,27 @@ class BestTimeToPostAnalyzer:
     async def analyze_best_times(
         self,
         platform: Platform,
-        channel_type: ChannelType = ChannelType.OFFICIAL,
-        days_back: int = 30
+        channel_type: ChannelType = ChannelType.OFFICIAL
     ) -> BestTimeToPost:
         """
         Analyze best posting times.
         
+        Reads the store's hour-of-week engagement rollup (at most 168 cells,
+        maintained as engagement metrics are written), so the cost doesn't
+        grow with history and no rows are left out. The rollup has no date
+        dimension, so the analysis always covers the whole history.
+        
         Args:
             platform: Platform to analyze
             channel_type: Channel type
-            days_back: Days of history to analyze
-            
+        
         Returns:
             BestTimeToPost with recommendations
         """
-        # Read historical engagement data
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days_back)
-        
-        request = MetricsReadRequest(
-            metric_types=[MetricType.ENGAGEMENT],
-            platform=platform,
-            channel_type=channel_type,
-            date_from=start_date,
-            date_to=end_date,
-            limit=1000
-        )
-        
-        metrics = await self.metrics_store.read_metrics(request)
-        engagement_data = metrics["metrics"].get("engagement", [])
+        cells = await self.metrics_store.read_hour_of_week_engagement(platform, channel_type)
+        sample_size = sum(c["samples"] for c in cells)
         
-        if not engagement_data:
+        if not sample_size:
             # Return defaults
             return BestTimeToPost(
                 platform=platform,
@@ -67,31 +55,28 @@ class BestTimeToPostAnalyzer:
                 sample_size=0
             )
         
-        # Analyze by hour and day
-        hourly_stats = defaultdict(list)
-        daily_stats = defaultdict(list)
+        # Sum the cells by hour and by day
+        hourly_totals = defaultdict(lambda: [0, 0.0])
+        daily_totals = defaultdict(lambda: [0, 0.0])
+        hour_of_week_performance = {}
         
-        for e in engagement_data:
-            # Parse timestamp
-            measured_at = e.get("measured_at")
-            if measured_at:
-                dt = datetime.fromisoformat(measured_at.replace("Z", "+00:00"))
-                hour = dt.hour
-                day = dt.strftime("%A")
-                
-                engagement_rate = e.get("engagement_rate", 0)
-                hourly_stats[hour].append(engagement_rate)
-                daily_stats[day].append(engagement_rate)
+        for c in cells:
+            for totals in (hourly_totals[c["hour"]], daily_totals[c["day"]]):
+                totals[0] += c["samples"]
+                totals[1] += c["engagement_rate_sum"]
+            # Monday = 0 ... Sunday = 6
+            hour_of_week = ((c["day_of_week"] - 1) % 7) * 24 + c["hour"]
+            hour_of_week_performance[hour_of_week] = c["engagement_rate_sum"] / c["samples"]
         
         # Calculate averages
         hourly_performance = {
-            hour: statistics.mean(rates)
-            for hour, rates in hourly_stats.items()
+            hour: rate_sum / samples
+            for hour, (samples, rate_sum) in hourly_totals.items()
         }
         
         daily_performance = {
-            day: statistics.mean(rates)
-            for day, rates in daily_stats.items()
+            day: rate_sum / samples
+            for day, (samples, rate_sum) in daily_totals.items()
         }
         
         # Find best hours (top 3)
@@ -103,7 +88,7 @@ class BestTimeToPostAnalyzer:
         best_days = [day for day, _ in sorted_days[:3]]
         
         # Calculate confidence
-        confidence = min(0.95, len(engagement_data) / 100)
+        confidence = min(0.95, sample_size / 100)
         
         return BestTimeToPost(
             platform=platform,
@@ -112,6 +97,7 @@ class BestTimeToPostAnalyzer:
             best_days=best_days,
             hourly_performance=hourly_performance,
             daily_performance=daily_performance,
+            hour_of_week_performance=dict(sorted(hour_of_week_performance.items())),
             confidence=confidence,
-            sample_size=len(engagement_data)
+            sample_size=sample_size
         )
@@ -1,17 +1,23 @@
 """
 Daily Learning Pipeline - Automated learning from real performance data
 
-Runs daily to:
+Runs daily (or as often as hourly) to:
 - Analyze content performance
 - Detect retention patterns
 - Update recommendations
 - Produce learning reports
+
+The retention and content-insight stages are incremental: each keeps a
+watermark (last processed row id) and mergeable running aggregates in the
+metrics store, and only reads the rows written since its previous run.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime, date, timedelta
+from collections import Counter, defaultdict
 import logging
 import asyncio
+import json
 
 from ..storage.model_metrics_store import ModelMetricsStore
 from ..storage.metrics_aggregator import MetricsAggregator
@@ -20,9 +26,13 @@ from ..storage.schemas_metrics import (
     MetricType,
     MetricsReadRequest
 )
+from .running_stats import RunningStats, RunningHistogram, RunningTopK
 
 logger = logging.getLogger(__name__)
 
+PIPELINE_NAME = "daily_learning"
+READ_BATCH_ROWS = 5000  # rows read per step when catching up to the latest metrics
+
 
 class DailyLearningPipeline:
     """
@@ -56,7 +66,7 @@ class DailyLearningPipeline:
         
         Args:
             target_date: Date to analyze (default: yesterday)
-            
+        
         Returns:
             Results dict with report and insights
         """
@@ -110,7 +120,7 @@ class DailyLearningPipeline:
                 "learning_state": learning_state,
                 "processing_time_sec": processing_time
             }
-            
+        
         except Exception as e:
             logger.error(f"Daily learning failed: {e}")
             return {
@@ -119,84 +129,140 @@ class DailyLearningPipeline:
                 "target_date": target_date.isoformat()
             }
     
+    async def _advance_stage(
+        self,
+        stage: str,
+        metric_type: MetricType,
+        load: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
+        update: Callable[[Dict[str, Any], List[Dict[str, Any]]], None],
+        dump: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Fold the rows written since a stage's watermark into its running state.
+        
+        Rows are read in id order, READ_BATCH_ROWS at a time; the watermark
+        and the state are saved together after each batch, so an interrupted
+        run resumes where it stopped.
+        
+        Returns:
+            (state, number of new rows)
+        """
+        last_row_id, saved = await self.metrics_store.get_watermark(PIPELINE_NAME, stage)
+        state = load(saved)
+        new_rows = 0
+        
+        while True:
+            rows = await self.metrics_store.read_metrics_since(metric_type, last_row_id, READ_BATCH_ROWS)
+            if not rows:
+                break
+            
+            update(state, rows)
+            new_rows += len(rows)
+            last_row_id = rows[-1]["id"]
+            await self.metrics_store.set_watermark(PIPELINE_NAME, stage, last_row_id, dump(state))
+        
+        return state, new_rows
+    
     async def _analyze_retention_patterns(
         self,
         target_date: date
     ) -> Dict[str, Any]:
-        """Analyze retention patterns for the day."""
-        request = MetricsReadRequest(
-            metric_types=[MetricType.RETENTION],
-            date_from=target_date,
-            date_to=target_date,
-            limit=1000
+        """Analyze retention patterns (running aggregates over all rows so far)."""
+        state, new_rows = await self._advance_stage(
+            "retention",
+            MetricType.RETENTION,
+            self._load_retention_state,
+            self._update_retention_state,
+            self._dump_retention_state
         )
         
-        metrics = await self.metrics_store.read_metrics(request)
-        retention_data = metrics["metrics"].get("retention", [])
-        
-        if not retention_data:
+        if not state["watch"].count:
             return {
                 "total_analyzed": 0,
+                "new_rows": new_rows,
                 "patterns": []
             }
         
-        # Analyze drop-off points
-        drop_off_analysis = self._analyze_drop_off_points(retention_data)
-        
-        # Analyze completion rates
-        completion_analysis = self._analyze_completion_rates(retention_data)
-        
-        # Identify best retention content
-        best_retention = sorted(
-            retention_data,
-            key=lambda x: x.get("avg_watch_percentage", 0),
-            reverse=True
-        )[:10]
-        
         return {
-            "total_analyzed": len(retention_data),
-            "avg_retention": sum(r.get("avg_watch_percentage", 0) for r in retention_data) / len(retention_data),
-            "drop_off_analysis": drop_off_analysis,
-            "completion_analysis": completion_analysis,
-            "best_retention_ids": [r["content_id"] for r in best_retention],
+            "total_analyzed": state["watch"].count,
+            "new_rows": new_rows,
+            "avg_retention": state["watch"].mean,
+            "drop_off_analysis": self._analyze_drop_off_points(state["drop_offs"]),
+            "completion_analysis": self._analyze_completion_rates(state),
+            "best_retention_ids": state["best"].keys(),
             "patterns": [
                 {
                     "type": "high_retention",
-                    "count": len([r for r in retention_data if r.get("avg_watch_percentage", 0) >= 0.7]),
+                    "count": state["high_retention_count"],
                     "description": "Content with ≥70% retention"
                 },
                 {
                     "type": "low_retention",
-                    "count": len([r for r in retention_data if r.get("avg_watch_percentage", 0) < 0.4]),
+                    "count": state["low_retention_count"],
                     "description": "Content with <40% retention (needs improvement)"
                 }
             ]
         }
     
-    def _analyze_drop_off_points(
-        self,
-        retention_data: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Analyze common drop-off points."""
-        # TODO: Implement sophisticated drop-off analysis
-        # For now, simple analysis
+    @staticmethod
+    def _load_retention_state(saved: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        saved = saved or {}
+        return {
+            "watch": RunningStats.from_dict(saved.get("watch")),
+            "high_retention_count": saved.get("high_retention_count", 0),
+            "low_retention_count": saved.get("low_retention_count", 0),
+            "completion": RunningStats.from_dict(saved.get("completion")),
+            "completion_histogram": RunningHistogram.from_dict(saved.get("completion_histogram")),
+            "high_completion_count": saved.get("high_completion_count", 0),
+            "low_completion_count": saved.get("low_completion_count", 0),
+            "drop_offs": Counter({int(k): v for k, v in saved.get("drop_offs", {}).items()}),
+            "best": RunningTopK.from_dict(saved.get("best")),
+        }
+    
+    @staticmethod
+    def _dump_retention_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **{k: v.to_dict() for k, v in state.items() if hasattr(v, "to_dict")},
+            "high_retention_count": state["high_retention_count"],
+            "low_retention_count": state["low_retention_count"],
+            "high_completion_count": state["high_completion_count"],
+            "low_completion_count": state["low_completion_count"],
+            "drop_offs": {str(k): v for k, v in state["drop_offs"].items()},
+        }
+    
+    @staticmethod
+    def _update_retention_state(state: Dict[str, Any], rows: List[Dict[str, Any]]):
+        watch = [r.get("avg_watch_percentage") or 0 for r in rows]
+        completion = [r["completion_rate"] for r in rows if r.get("completion_rate") is not None]
+        
+        state["watch"].update(watch)
+        state["high_retention_count"] += sum(1 for w in watch if w >= 0.7)
+        state["low_retention_count"] += sum(1 for w in watch if w < 0.4)
+        
+        state["completion"].update(completion)
+        state["completion_histogram"].update(completion)
+        state["high_completion_count"] += sum(1 for c in completion if c >= 0.7)
+        state["low_completion_count"] += sum(1 for c in completion if c < 0.3)
         
-        all_drop_offs = []
-        for r in retention_data:
+        for r in rows:
             drop_offs = r.get("drop_off_points")
             if drop_offs:
-                import json
                 if isinstance(drop_offs, str):
                     drop_offs = json.loads(drop_offs)
-                all_drop_offs.extend(drop_offs)
+                state["drop_offs"].update(drop_offs)
         
-        if not all_drop_offs:
+        state["best"].update(zip(watch, (r["content_id"] for r in rows)))
+    
+    def _analyze_drop_off_points(
+        self,
+        drop_offs: Counter
+    ) -> Dict[str, Any]:
+        """Analyze common drop-off points."""
+        if not drop_offs:
             return {"common_drop_offs": []}
         
         # Find most common drop-off times
-        from collections import Counter
-        drop_off_counter = Counter(all_drop_offs)
-        common_drop_offs = drop_off_counter.most_common(5)
+        common_drop_offs = drop_offs.most_common(5)
         
         return {
             "common_drop_offs": [
@@ -211,81 +277,49 @@ class DailyLearningPipeline:
     
     def _analyze_completion_rates(
         self,
-        retention_data: List[Dict[str, Any]]
+        state: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Analyze completion rates."""
-        completion_rates = [
-            r.get("completion_rate", 0)
-            for r in retention_data
-            if r.get("completion_rate") is not None
-        ]
-        
-        if not completion_rates:
+        if not state["completion"].count:
             return {"avg_completion": 0.0}
         
-        import statistics
-        
         return {
-            "avg_completion": statistics.mean(completion_rates),
-            "median_completion": statistics.median(completion_rates),
-            "high_completion_count": len([c for c in completion_rates if c >= 0.7]),
-            "low_completion_count": len([c for c in completion_rates if c < 0.3])
+            "avg_completion": state["completion"].mean,
+            "median_completion": state["completion_histogram"].quantile(0.5),
+            "high_completion_count": state["high_completion_count"],
+            "low_completion_count": state["low_completion_count"]
         }
     
     async def _discover_content_insights(
         self,
         target_date: date
     ) -> Dict[str, Any]:
-        """Discover insights from content performance."""
-        # Read engagement metrics
-        request = MetricsReadRequest(
-            metric_types=[MetricType.ENGAGEMENT],
-            date_from=target_date,
-            date_to=target_date,
-            limit=1000
+        """Discover insights from content performance (running aggregates over all rows so far)."""
+        state, new_rows = await self._advance_stage(
+            "content_insights",
+            MetricType.ENGAGEMENT,
+            self._load_content_state,
+            self._update_content_state,
+            self._dump_content_state
         )
         
-        metrics = await self.metrics_store.read_metrics(request)
-        engagement_data = metrics["metrics"].get("engagement", [])
-        
-        if not engagement_data:
+        if not state["engagement"].count:
             return {
                 "total_analyzed": 0,
+                "new_rows": new_rows,
                 "insights": []
             }
         
-        import statistics
-        
-        # Analyze engagement patterns
-        avg_engagement = statistics.mean([
-            e.get("engagement_rate", 0) for e in engagement_data
-        ])
-        
-        avg_save_rate = statistics.mean([
-            e.get("save_rate", 0) for e in engagement_data
-        ])
-        
-        # Identify viral content (high velocity)
-        viral_content = [
-            e for e in engagement_data
-            if e.get("views_velocity", 0) >= 500
-        ]
-        
-        # Platform performance
-        platform_stats = {}
-        for e in engagement_data:
-            platform = e.get("platform")
-            if platform:
-                if platform not in platform_stats:
-                    platform_stats[platform] = []
-                platform_stats[platform].append(e.get("engagement_rate", 0))
+        avg_engagement = state["engagement"].mean
+        avg_save_rate = state["save_rate"].mean
+        viral_count = state["viral_count"]
         
         platform_insights = {
             platform: {
-                "count": len(rates),
-                "avg_engagement": statistics.mean(rates)
+                "count": stats.count,
+                "avg_engagement": stats.mean
             }
-            for platform, rates in platform_stats.items()
+            for platform, stats in state["platforms"].items()
         }
         
         insights = []
@@ -298,18 +332,55 @@ class DailyLearningPipeline:
         if avg_save_rate >= 0.05:
             insights.append("📌 High save rate - content provides value")
         
-        if viral_content:
-            insights.append(f"🚀 {len(viral_content)} viral pieces detected")
+        if viral_count:
+            insights.append(f"🚀 {viral_count} viral pieces detected")
         
         return {
-            "total_analyzed": len(engagement_data),
+            "total_analyzed": state["engagement"].count,
+            "new_rows": new_rows,
             "avg_engagement": avg_engagement,
             "avg_save_rate": avg_save_rate,
-            "viral_count": len(viral_content),
+            "viral_count": viral_count,
             "platform_insights": platform_insights,
             "insights": insights
         }
     
+    @staticmethod
+    def _load_content_state(saved: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        saved = saved or {}
+        return {
+            "engagement": RunningStats.from_dict(saved.get("engagement")),
+            "save_rate": RunningStats.from_dict(saved.get("save_rate")),
+            "viral_count": saved.get("viral_count", 0),
+            "platforms": {
+                platform: RunningStats.from_dict(stats)
+                for platform, stats in saved.get("platforms", {}).items()
+            },
+        }
+    
+    @staticmethod
+    def _dump_content_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "engagement": state["engagement"].to_dict(),
+            "save_rate": state["save_rate"].to_dict(),
+            "viral_count": state["viral_count"],
+            "platforms": {platform: stats.to_dict() for platform, stats in state["platforms"].items()},
+        }
+    
+    @staticmethod
+    def _update_content_state(state: Dict[str, Any], rows: List[Dict[str, Any]]):
+        state["engagement"].update(e.get("engagement_rate") or 0 for e in rows)
+        state["save_rate"].update(e.get("save_rate") or 0 for e in rows)
+        # Identify viral content (high velocity)
+        state["viral_count"] += sum(1 for e in rows if (e.get("views_velocity") or 0) >= 500)
+        
+        by_platform = defaultdict(list)
+        for e in rows:
+            if e.get("platform"):
+                by_platform[e["platform"]].append(e.get("engagement_rate") or 0)
+        for platform, rates in by_platform.items():
+            state["platforms"].setdefault(platform, RunningStats()).update(rates)
+    
     async def _generate_recommendations(
         self,
         report: LearningReport,
@@ -0,0 +1,131 @@
+"""
+Running Statistics - mergeable aggregates for incremental pipelines
+
+Each aggregate can absorb a new batch of values and be merged with another
+aggregate of the same kind, so a pipeline stage only has to look at the
+rows written since its last run. All of them round-trip through plain
+dicts (JSON-serializable) to be stored next to the stage watermark.
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    """Count / mean / variance / min / max (Welford, merged with Chan et al.)."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    
+    def update(self, values: Iterable[float]) -> "RunningStats":
+        values = np.asarray(list(values), dtype=np.float64)
+        if len(values):
+            self.merge(RunningStats(
+                count=len(values),
+                mean=float(values.mean()),
+                m2=float(((values - values.mean()) ** 2).sum()),
+                min=float(values.min()),
+                max=float(values.max())
+            ))
+        return self
+    
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return self
+        
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RunningStats":
+        return cls(**data) if data else cls()
+
+
+@dataclass
+class RunningHistogram:
+    """Fixed-bin histogram over [low, high] for approximate quantiles."""
+    low: float = 0.0
+    high: float = 1.0
+    bins: int = 100
+    counts: List[int] = field(default_factory=list)
+    
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * self.bins
+    
+    def update(self, values: Iterable[float]) -> "RunningHistogram":
+        values = np.clip(np.asarray(list(values), dtype=np.float64), self.low, self.high)
+        if len(values):
+            idx = np.minimum(((values - self.low) / (self.high - self.low) * self.bins).astype(int), self.bins - 1)
+            self.counts = (np.asarray(self.counts) + np.bincount(idx, minlength=self.bins)).tolist()
+        return self
+    
+    def merge(self, other: "RunningHistogram") -> "RunningHistogram":
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+    
+    def quantile(self, q: float) -> float:
+        """Bin-midpoint estimate of the q-quantile (error <= half a bin)."""
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        idx = int(np.searchsorted(cumulative, q * total))
+        width = (self.high - self.low) / self.bins
+        return self.low + (min(idx, self.bins - 1) + 0.5) * width
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RunningHistogram":
+        return cls(**data) if data else cls()
+
+
+@dataclass
+class RunningTopK:
+    """The k largest (score, key) pairs seen so far."""
+    k: int = 10
+    items: List[Tuple[float, str]] = field(default_factory=list)
+    
+    def update(self, pairs: Iterable[Tuple[float, str]]) -> "RunningTopK":
+        self.items = heapq.nlargest(self.k, [tuple(item) for item in self.items] + list(pairs))
+        return self
+    
+    def merge(self, other: "RunningTopK") -> "RunningTopK":
+        return self.update(other.items)
+    
+    def keys(self) -> List[str]:
+        return [key for _, key in self.items]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "items": [list(item) for item in self.items]}
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RunningTopK":
+        if not data:
+            return cls()
+        return cls(k=data["k"], items=[tuple(item) for item in data["items"]])
@@ -7,16 +7,114 @@ Uses:
 - Engagement patterns
 """
 
-from typing import Dict, Any, Optional, List
+from collections.abc import Sequence
+from typing import Dict, Any, Optional, List, Tuple, Union, overload
 from datetime import datetime, date, timedelta
 import logging
 import statistics
 
+import numpy as np
+
 from ..storage.model_metrics_store import ModelMetricsStore
 from ..storage.schemas_metrics import ViralityPrediction, Platform
 
 logger = logging.getLogger(__name__)
 
+# Feature matrix columns
+FEATURE_COLUMNS = ("quality_score", "aesthetic_score", "duration", "caption_length")
+QUALITY, AESTHETIC, DURATION, CAPTION_LENGTH = range(len(FEATURE_COLUMNS))
+
+# Platform recommendation codes (see ViralityPredictor._recommend_platform)
+PLATFORMS = (Platform.INSTAGRAM, Platform.TIKTOK, Platform.YOUTUBE)
+
+
+class ViralityPredictionBatch(Sequence):
+    """
+    Predictions of a batch, as arrays; a ViralityPrediction is built on access.
+    
+    Behaves like a list of ViralityPrediction in input order (indexing,
+    slicing, iteration, len, ==). Ranking callers can use the arrays
+    (scores, confidence, boost_recommended) without building any object.
+    """
+    
+    def __init__(
+        self,
+        content_ids: List[str],
+        columns: Dict[str, np.ndarray],
+        timing_score: float,
+        predicted_at: datetime
+    ):
+        self.content_ids = content_ids
+        self.columns = columns
+        self.timing_score = timing_score
+        self.predicted_at = predicted_at
+        self._items: List[Optional[ViralityPrediction]] = [None] * len(content_ids)
+    
+    @property
+    def scores(self) -> np.ndarray:
+        """(n,) virality scores (0-100)."""
+        return self.columns["virality_score"]
+    
+    @property
+    def confidence(self) -> np.ndarray:
+        return self.columns["confidence"]
+    
+    @property
+    def boost_recommended(self) -> np.ndarray:
+        return self.columns["boost_recommended"]
+    
+    def __len__(self) -> int:
+        return len(self.content_ids)
+    
+    @overload
+    def __getitem__(self, index: int) -> ViralityPrediction: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> List[ViralityPrediction]: ...
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[ViralityPrediction, List[ViralityPrediction]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("prediction index out of range")
+        
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._build(index)
+        return item
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    def __repr__(self) -> str:
+        return f"ViralityPredictionBatch(n={len(self)})"
+    
+    def _build(self, i: int) -> ViralityPrediction:
+        c = self.columns
+        return ViralityPrediction(
+            content_id=self.content_ids[i],
+            virality_score=float(c["virality_score"][i]),
+            predicted_views=int(c["predicted_views"][i]),
+            predicted_engagement_rate=float(c["predicted_engagement_rate"][i]),
+            confidence=float(c["confidence"][i]),
+            confidence_interval=(float(c["interval_low"][i]), float(c["interval_high"][i])),
+            factors={
+                "retention": float(c["retention"][i]),
+                "engagement": float(c["engagement"][i]),
+                "quality": float(c["quality"][i]),
+                "timing": self.timing_score
+            },
+            boost_recommended=bool(c["boost_recommended"][i]),
+            optimal_post_time=None,  # TODO: Implement timing optimization
+            platform_recommendation=PLATFORMS[c["platform"][i]],
+            predicted_at=self.predicted_at
+        )
+
 
 class ViralityPredictor:
     """Predict virality score for content based on historical data."""
@@ -42,17 +140,84 @@ class ViralityPredictor:
         Args:
             content_id: Content identifier
             metadata: Content metadata from Vision Engine
-            
+        
         Returns:
             ViralityPrediction with score and recommendations
         """
-        # Extract features
-        features = self._extract_features(metadata)
+        predictions = await self.predict_virality_batch([content_id], [metadata])
+        return predictions[0]
+    
+    async def predict_virality_batch(
+        self,
+        content_ids: List[str],
+        metadata_list: List[Dict[str, Any]]
+    ) -> ViralityPredictionBatch:
+        """
+        Predict virality scores for many content items at once.
+        
+        Features of all items go into one matrix (FEATURE_COLUMNS) and the
+        retention, engagement and timing models are applied column-wise,
+        so the cost per item is a few array operations. The result keeps
+        the columns; each ViralityPrediction is built when first accessed.
         
+        Args:
+            content_ids: Content identifiers
+            metadata_list: Vision Engine metadata, one per content ID
+        
+        Returns:
+            ViralityPredictionBatch (a sequence of ViralityPrediction) in
+            input order
+        
+        Raises:
+            ValueError: If the two lists differ in length
+        """
+        if len(content_ids) != len(metadata_list):
+            raise ValueError(
+                f"Got {len(content_ids)} content IDs and {len(metadata_list)} metadata dicts"
+            )
+        
+        X = self._extract_feature_matrix(metadata_list)
+        retention_score, engagement_score, quality_score, timing_score, virality_score = self._score_matrix(X)
+        
+        columns = {
+            "virality_score": virality_score,
+            # Predict views and engagement
+            "predicted_views": (virality_score * 100).astype(np.int64),  # Simple heuristic
+            "predicted_engagement_rate": virality_score / 1000,
+            # Calculate confidence
+            "confidence": np.minimum(0.95, 0.5 + (virality_score / 200)),
+            "interval_low": np.maximum(0, virality_score - 15),
+            "interval_high": np.minimum(100, virality_score + 15),
+            "retention": retention_score,
+            "engagement": engagement_score,
+            "quality": quality_score,
+            # Recommendations
+            "boost_recommended": virality_score >= 70,
+            "platform": self._recommend_platform(quality_score)
+        }
+        
+        return ViralityPredictionBatch(list(content_ids), columns, timing_score, datetime.utcnow())
+    
+    async def predict_virality_scores(self, metadata_list: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Virality scores (0-100) only, for ranking many candidates.
+        
+        Same scores as predict_virality_batch(...).scores.
+        
+        Args:
+            metadata_list: Vision Engine metadata per content item
+        
+        Returns:
+            (n,) array of virality scores in input order
+        """
+        return self._score_matrix(self._extract_feature_matrix(metadata_list))[-1]
+    
+    def _score_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, np.ndarray]:
+        """(retention, engagement, quality, timing, virality) for a feature matrix."""
         # Calculate component scores
-        retention_score = await self._predict_retention(features)
-        engagement_score = await self._predict_engagement(features)
-        quality_score = features.get("quality_score", 0.5)
+        retention_score = self._predict_retention(X)
+        engagement_score = self._predict_engagement(X)
+        quality_score = X[:, QUALITY]
         timing_score = self._predict_timing_score()
         
         # Weighted composite score
@@ -63,75 +228,33 @@ class ViralityPredictor:
             timing_score * self.model_weights["timing"]
         ) * 100  # Scale to 0-100
         
-        # Predict views and engagement
-        predicted_views = int(virality_score * 100)  # Simple heuristic
-        predicted_engagement_rate = virality_score / 1000
-        
-        # Calculate confidence
-        confidence = min(0.95, 0.5 + (virality_score / 200))
-        
-        # Recommendations
-        boost_recommended = virality_score >= 70
-        optimal_time = None  # TODO: Implement timing optimization
-        platform_rec = self._recommend_platform(features)
-        
-        return ViralityPrediction(
-            content_id=content_id,
-            virality_score=virality_score,
-            predicted_views=predicted_views,
-            predicted_engagement_rate=predicted_engagement_rate,
-            confidence=confidence,
-            confidence_interval=(
-                max(0, virality_score - 15),
-                min(100, virality_score + 15)
-            ),
-            factors={
-                "retention": retention_score,
-                "engagement": engagement_score,
-                "quality": quality_score,
-                "timing": timing_score
-            },
-            boost_recommended=boost_recommended,
-            optimal_post_time=optimal_time,
-            platform_recommendation=platform_rec
-        )
+        return retention_score, engagement_score, quality_score, timing_score, virality_score
     
-    def _extract_features(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract predictive features from metadata."""
-        return {
-            "quality_score": metadata.get("quality_score", 0.5),
-            "aesthetic_score": metadata.get("aesthetic_score", 0.5),
-            "objects": metadata.get("scene_objects", []),
-            "colors": metadata.get("dominant_colors", []),
-            "duration": metadata.get("duration", 30),
-            "platform": metadata.get("platform"),
-            "caption_length": len(metadata.get("caption", ""))
-        }
+    def _extract_feature_matrix(self, metadata_list: List[Dict[str, Any]]) -> np.ndarray:
+        """(n, len(FEATURE_COLUMNS)) matrix of predictive features (column-major)."""
+        columns = np.empty((len(FEATURE_COLUMNS), len(metadata_list)))
+        columns[QUALITY] = [metadata.get("quality_score", 0.5) for metadata in metadata_list]
+        columns[AESTHETIC] = [metadata.get("aesthetic_score", 0.5) for metadata in metadata_list]
+        columns[DURATION] = [metadata.get("duration", 30) for metadata in metadata_list]
+        columns[CAPTION_LENGTH] = [len(metadata.get("caption", "")) for metadata in metadata_list]
+        return columns.T
     
-    async def _predict_retention(self, features: Dict[str, Any]) -> float:
-        """Predict retention score based on features."""
+    def _predict_retention(self, X: np.ndarray) -> np.ndarray:
+        """Predict retention scores based on features."""
         # Simple heuristic based on quality and aesthetics
-        base_score = (
-            features.get("quality_score", 0.5) * 0.6 +
-            features.get("aesthetic_score", 0.5) * 0.4
-        )
+        base_score = X[:, QUALITY] * 0.6 + X[:, AESTHETIC] * 0.4
         
         # Adjust for duration (shorter = better retention)
-        duration = features.get("duration", 30)
-        duration_factor = 1.0 if duration <= 30 else 0.8
+        duration_factor = np.where(X[:, DURATION] <= 30, 1.0, 0.8)
         
-        return min(1.0, base_score * duration_factor)
+        return np.minimum(1.0, base_score * duration_factor)
     
-    async def _predict_engagement(self, features: Dict[str, Any]) -> float:
-        """Predict engagement score based on features."""
-        # Simple heuristic
-        base_score = features.get("quality_score", 0.5)
+    def _predict_engagement(self, X: np.ndarray) -> np.ndarray:
+        """Predict engagement scores based on features."""
+        # Simple heuristic, boosted for captions
+        base_score = X[:, QUALITY] * np.where(X[:, CAPTION_LENGTH] > 10, 1.1, 1.0)
         
-        # Boost for captions
-        if features.get("caption_length", 0) > 10:
-            base_score *= 1.1
-        
-        return min(1.0, base_score)
+        return np.minimum(1.0, base_score)
     
     def _predict_timing_score(self) -> float:
         """Predict timing score (current time vs optimal)."""
@@ -144,13 +267,7 @@ class ViralityPredictor:
         else:
             return 0.4
     
-    def _recommend_platform(self, features: Dict[str, Any]) -> Optional[Platform]:
-        """Recommend best platform for content."""
-        quality = features.get("quality_score", 0.5)
-        
-        if quality >= 0.8:
-            return Platform.INSTAGRAM
-        elif quality >= 0.6:
-            return Platform.TIKTOK
-        else:
-            return Platform.YOUTUBE
+    def _recommend_platform(self, quality: np.ndarray) -> np.ndarray:
+        """Recommend best platform per content item (index into PLATFORMS)."""
+        # 0 (Instagram) from 0.8, 1 (TikTok) from 0.6, else 2 (YouTube)
+        return 2 - (quality >= 0.6).astype(np.int8) - (quality >= 0.8)
@@ -0,0 +1,255 @@
+"""
+Vision Results Store - Content-addressed ClipTagger results
+
+Sprint 3: Vision Engine
+
+Features:
+- ClipMetadata persisted per (video content hash, clip time range, model signature)
+- Compact format: one .npz per clip (float32 embedding matrix + zlib'd JSON)
+- Millisecond lookups for engines asking for an already-processed clip
+- Results re-labelled with the requesting clip/video IDs on read
+- Per-video invalidation, hit/miss telemetry
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .models import ClipMetadata, VisionConfig
+from .frame_cache import FrameCache
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when ClipTagger's scoring / aggregation changes what a result contains
+PIPELINE_VERSION = 1
+
+
+class VisionResultsStore:
+    """
+    On-disk store of ClipTagger results, shared by every engine.
+    
+    Keys are content based: the same clip of the same video file analyzed with
+    the same models and sampling settings maps to the same entry, whichever
+    engine (cut analysis, creative intelligence, creative variants) asked
+    first and whatever clip ID it used.
+    
+    Layout: `<store_dir>/<file_hash>/<key>.npz`, so all results of a video can
+    be dropped at once.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, store_dir: str = "storage/vision_results"):
+        """
+        Initialize the store.
+        
+        Args:
+            store_dir: Root directory of the store
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Telemetry
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+    
+    @staticmethod
+    def model_signature(config: VisionConfig) -> Dict[str, Any]:
+        """Everything in the config that changes the result of a clip analysis."""
+        return {
+            "pipeline_version": PIPELINE_VERSION,
+            "yolo_model": config.yolo_model,
+            "yolo_confidence_threshold": config.yolo_confidence_threshold,
+            "embedding_model": config.embedding_model,
+            "embedding_backend": config.embedding_backend,
+            "onnx_quantize_int8": config.onnx_quantize_int8 if config.embedding_backend == "onnx" else None,
+            "palette_mode": config.palette_mode,
+            "target_fps": config.target_fps,
+            "max_frames_per_clip": config.max_frames_per_clip,
+            "frame_max_side": config.frame_max_side,
+        }
+    
+    def make_key(
+        self,
+        file_hash: str,
+        start_ms: Optional[float],
+        end_ms: Optional[float],
+        signature: Dict[str, Any]
+    ) -> str:
+        """Store key for a clip range of a video and a model signature."""
+        payload = json.dumps(
+            {
+                "v": self.FORMAT_VERSION,
+                "file": file_hash,
+                "range": [start_ms, end_ms],
+                "models": signature
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+    
+    def _path(self, file_hash: str, key: str) -> Path:
+        return self.store_dir / file_hash / f"{key}.npz"
+    
+    def get(
+        self,
+        video_path: str,
+        config: VisionConfig,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None,
+        clip_id: Optional[str] = None,
+        video_id: Optional[str] = None
+    ) -> Optional[ClipMetadata]:
+        """
+        Look up the analysis of a clip.
+        
+        Args:
+            video_path: Path to video file
+            config: Vision configuration the result must have been produced with
+            start_ms: Clip start within the video
+            end_ms: Clip end within the video
+            clip_id: Clip ID to label the result with (defaults to the stored one)
+            video_id: Video ID to label the result with (defaults to the stored one)
+        
+        Returns:
+            ClipMetadata, or None if the clip was not analyzed yet
+        """
+        file_hash = FrameCache.file_hash(video_path)
+        path = self._path(file_hash, self.make_key(file_hash, start_ms, end_ms, self.model_signature(config)))
+        
+        try:
+            metadata = self._read(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zlib.error) as e:
+            logger.warning(f"Unreadable vision result {path}, ignoring it: {e}")
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return self._relabel(metadata, clip_id, video_id)
+    
+    def put(
+        self,
+        video_path: str,
+        config: VisionConfig,
+        metadata: ClipMetadata,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> str:
+        """
+        Persist the analysis of a clip.
+        
+        Args:
+            video_path: Path to video file
+            config: Vision configuration used to produce the result
+            metadata: ClipTagger result
+            start_ms: Clip start within the video
+            end_ms: Clip end within the video
+        
+        Returns:
+            Store key
+        """
+        file_hash = FrameCache.file_hash(video_path)
+        key = self.make_key(file_hash, start_ms, end_ms, self.model_signature(config))
+        path = self._path(file_hash, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Vectors go to a float32 matrix, everything else to compressed JSON
+        data = metadata.model_dump(mode="json")
+        vectors = np.asarray([emb.pop("vector") for emb in data["embeddings"]], dtype=np.float32)
+        avg_embedding = np.asarray(data.pop("avg_embedding") or [], dtype=np.float32)
+        payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            vectors=vectors,
+            avg_embedding=avg_embedding,
+            metadata=np.frombuffer(payload, dtype=np.uint8)
+        )
+        
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(tmp_path, path)
+        
+        self.writes += 1
+        return key
+    
+    @staticmethod
+    def _read(path: Path) -> ClipMetadata:
+        with np.load(path) as entry:
+            data = json.loads(zlib.decompress(entry["metadata"].tobytes()))
+            vectors = entry["vectors"]
+            avg_embedding = entry["avg_embedding"]
+        
+        for emb, vector in zip(data["embeddings"], vectors):
+            emb["vector"] = vector.tolist()
+        data["avg_embedding"] = avg_embedding.tolist() if len(avg_embedding) else None
+        
+        return ClipMetadata.model_validate(data)
+    
+    @staticmethod
+    def _relabel(
+        metadata: ClipMetadata,
+        clip_id: Optional[str],
+        video_id: Optional[str]
+    ) -> ClipMetadata:
+        """Return the stored result under the requesting clip/video IDs."""
+        if clip_id and clip_id != metadata.clip_id:
+            prefix = f"{metadata.clip_id}_"
+            for emb in metadata.embeddings:
+                if emb.embedding_id.startswith(prefix):
+                    emb.embedding_id = f"{clip_id}_{emb.embedding_id[len(prefix):]}"
+            metadata.clip_id = clip_id
+        
+        if video_id:
+            metadata.video_id = video_id
+        
+        return metadata
+    
+    def invalidate_video(self, video_path: str) -> int:
+        """
+        Drop every stored result of a video.
+        
+        Returns:
+            Number of results removed
+        """
+        video_dir = self.store_dir / FrameCache.file_hash(video_path)
+        if not video_dir.is_dir():
+            return 0
+        
+        removed = len(list(video_dir.glob("*.npz")))
+        shutil.rmtree(video_dir, ignore_errors=True)
+        return removed
+    
+    def clear(self) -> None:
+        """Drop all stored results."""
+        for video_dir in self.store_dir.iterdir():
+            if video_dir.is_dir():
+                shutil.rmtree(video_dir, ignore_errors=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        files = list(self.store_dir.glob("*/*.npz"))
+        lookups = self.hits + self.misses
+        return {
+            "results": len(files),
+            "size_bytes": sum(f.stat().st_size for f in files),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
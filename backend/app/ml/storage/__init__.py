@@ -17,7 +17,11 @@ from .schemas import (
     EmbeddingMetadata,
     SimilaritySearchRequest,
     SimilaritySearchResponse,
-    ContentSource
+    BatchSimilaritySearchRequest,
+    BatchSimilaritySearchResponse,
+    ContentSource,
+    IndexConfig,
+    IndexType
 )
 
 from .schemas_metrics import (
@@ -43,7 +47,11 @@ __all__ = [
     "EmbeddingMetadata",
     "SimilaritySearchRequest",
     "SimilaritySearchResponse",
+    "BatchSimilaritySearchRequest",
+    "BatchSimilaritySearchResponse",
     "ContentSource",
+    "IndexConfig",
+    "IndexType",
     
     # Metrics schemas
     "MetricType",
@@ -1,23 +1,30 @@
 """
-Embeddings Store - CRUD for embeddings with dual backend support
+Embeddings Store - CRUD for embeddings with multiple backend support
 
 Supports:
 - FAISS (local, fast, for development/small scale)
+- mmap (on-disk flat vectors shared by every worker process through the page cache)
 - pgvector (cloud, scalable, for production)
 
 Features:
 - store_embedding()
-- search_similar()
+- search_similar() / search_similar_batch()
 - delete_embedding()
 - update_embedding()
 - batch operations
+- Per-type FAISS index: flat, IVF (trained automatically) or HNSW, with real deletes
+- Write-behind persistence: append-only operation log + periodic checkpoints
 """
 
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 from pathlib import Path
+import base64
 import logging
 import json
+import os
+import shutil
+import threading
 import time
 import uuid
 
@@ -30,42 +37,199 @@ from .schemas import (
     SimilaritySearchRequest,
     SimilaritySearchResponse,
     SimilaritySearchResult,
+    BatchSimilaritySearchRequest,
+    BatchSimilaritySearchResponse,
     BatchEmbeddingRequest,
     BatchEmbeddingResponse,
     EmbeddingDeletionRequest,
-    EmbeddingDeletionResponse
+    EmbeddingDeletionResponse,
+    IndexConfig,
+    IndexType
 )
+from .mmap_vectors import MmapVectorIndex
 
 logger = logging.getLogger(__name__)
 
+WAL_DIR = "wal"
+CHECKPOINT_POINTER = "CURRENT"
+MMAP_DIR = "vectors"
+
+
+def _encode_vector(vector: List[float]) -> str:
+    """float32 vector as base64 (~4x smaller and faster to parse than a JSON list)."""
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32).tolist()
+
+
+def build_faiss_index(
+    config: IndexConfig,
+    dimension: int,
+    vectors: Optional[np.ndarray] = None,
+    labels: Optional[np.ndarray] = None,
+    seed: int = 42
+) -> Any:
+    """
+    Build a FAISS index (wrapped in IndexIDMap2) over the given vectors.
+    
+    IVF indices are only trained once `config.train_threshold` vectors are
+    available; below it an exact flat index is returned instead.
+    
+    Args:
+        config: Index configuration
+        dimension: Vector dimension
+        vectors: float32 (n, dimension) vectors to add
+        labels: int64 (n,) labels for the vectors
+        seed: RNG seed for the IVF training sample
+    
+    Returns:
+        faiss.IndexIDMap2 searchable by label
+    """
+    import faiss
+    
+    n = 0 if vectors is None else len(vectors)
+    
+    if config.index_type == IndexType.HNSW:
+        base = faiss.IndexHNSWFlat(dimension, config.hnsw_m)
+        base.hnsw.efConstruction = config.ef_construction
+    elif config.index_type == IndexType.IVF and n and n >= config.train_threshold:
+        nlist = config.nlist or max(1, int(4 * np.sqrt(n)))
+        base = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimension), dimension, nlist)
+        
+        # k-means doesn't need more than ~256 points per list
+        sample = vectors
+        if n > 256 * nlist:
+            rng = np.random.default_rng(seed)
+            sample = vectors[rng.choice(n, 256 * nlist, replace=False)]
+        base.train(np.ascontiguousarray(sample, dtype=np.float32))
+    else:
+        base = faiss.IndexFlatL2(dimension)
+    
+    index = faiss.IndexIDMap2(base)
+    set_search_params(index, config)
+    
+    if n:
+        index.add_with_ids(
+            np.ascontiguousarray(vectors, dtype=np.float32),
+            np.ascontiguousarray(labels, dtype=np.int64)
+        )
+    return index
+
+
+def faiss_index_type(index: Any) -> IndexType:
+    """IndexType of an index built by build_faiss_index."""
+    import faiss
+    
+    base = faiss.downcast_index(index.index)
+    if isinstance(base, faiss.IndexHNSW):
+        return IndexType.HNSW
+    if isinstance(base, faiss.IndexIVF):
+        return IndexType.IVF
+    return IndexType.FLAT
+
+
+def set_search_params(index: Any, config: IndexConfig):
+    """Apply the query-time knobs (nprobe / efSearch) of config to an index."""
+    import faiss
+    
+    base = faiss.downcast_index(index.index)
+    if isinstance(base, faiss.IndexIVF):
+        base.nprobe = config.nprobe
+    elif isinstance(base, faiss.IndexHNSW):
+        base.hnsw.efSearch = config.ef_search
+
 
 class EmbeddingsStore:
     """
-    Main embeddings store with dual backend support.
+    Main embeddings store with multiple backend support.
     
     Backends:
     - FAISS: Local, fast, good for dev/testing
+    - mmap: Exact search over memory-mapped float32/float16 files
+      (see MmapVectorIndex); vectors are not kept in RAM, and read-only
+      stores in other worker processes share the same pages
     - pgvector: Cloud, scalable, good for production
+    
+    mmap backend:
+    - The label of a vector is its row in the mapped file, so replaying the
+      log rewrites the same rows and every process derives the same labels.
+    - StoredEmbedding.vector is left empty in metadata_store; search results
+      with include_metadata read it back from the mapped row.
+    - A read_only store replays the writer's checkpoint and log at start-up
+      and never writes; reopen it to see embeddings stored since.
+    
+    FAISS indices (per EmbeddingType, see IndexConfig):
+    - Vectors are added under int64 labels (IndexIDMap2), so deletes remove
+      them from flat and IVF indices; HNSW can't remove, so deleted labels are
+      skipped at query time and the graph is rebuilt past max_tombstone_ratio.
+    - IVF indices stay exact (flat) until train_threshold vectors exist, then
+      are trained and rebuilt once.
+    - Filtered queries over-fetch (and widen until top_k matches are found or
+      the index is exhausted), so filters don't shrink the result list.
+    
+    Persistence (write-behind):
+    - Every store/update/delete appends one compact record to the operation
+      log (wal/*.log), so writes cost O(1) instead of rewriting metadata and
+      indices.
+    - A background flusher fsyncs the log every `flush_interval_s` and writes
+      a checkpoint (metadata + live vectors per type) once
+      `checkpoint_max_records` records or `checkpoint_interval_s` seconds
+      have accumulated; log segments covered by it are then deleted.
+    - On start-up the latest checkpoint is loaded and the log tail replayed.
+      Up to `flush_interval_s` of writes can be lost on a machine crash.
     """
     
     def __init__(
         self,
-        backend: str = "faiss",  # "faiss" or "pgvector"
+        backend: str = "faiss",  # "faiss", "mmap" or "pgvector"
         storage_path: Optional[str] = None,
         db_connection: Optional[Any] = None,
-        dimension: int = 512  # Default CLIP dimension
+        dimension: int = 512,  # Default CLIP dimension
+        checkpoint_interval_s: float = 300.0,
+        checkpoint_max_records: int = 50_000,
+        flush_interval_s: float = 1.0,
+        background_flush: bool = True,
+        index_config: Optional[Union[IndexConfig, Dict[EmbeddingType, IndexConfig]]] = None,
+        filter_overfetch: int = 4,
+        vector_dtype: str = "float32",
+        read_only: bool = False
     ):
         """
         Initialize embeddings store.
         
         Args:
-            backend: "faiss" or "pgvector"
+            backend: "faiss", "mmap" or "pgvector"
             storage_path: Path for FAISS indices
             db_connection: PostgreSQL connection for pgvector
             dimension: Embedding dimension
+            checkpoint_interval_s: Max seconds between checkpoints (if there are new records)
+            checkpoint_max_records: Log records that trigger a checkpoint
+            flush_interval_s: How often the log is fsynced
+            background_flush: Run the flusher thread (if False, call flush()
+                and checkpoint() explicitly)
+            index_config: FAISS index configuration, for every type or per
+                EmbeddingType (missing types use IndexConfig())
+            filter_overfetch: Candidates fetched per requested result when
+                a search has filters
+            vector_dtype: Storage dtype of new mmap indices ("float32" or "float16")
+            read_only: Open an existing mmap store without writing to it
+                (other worker processes of the process that owns the store);
+                raises FileNotFoundError if storage_path does not exist
         """
+        if read_only and backend != "mmap":
+            raise ValueError("read_only is only supported by the mmap backend")
+        
         self.backend = backend
         self.dimension = dimension
+        self.vector_dtype = vector_dtype
+        self.read_only = read_only
+        self.index_config = index_config or IndexConfig()
+        self.filter_overfetch = filter_overfetch
+        self.checkpoint_interval_s = checkpoint_interval_s
+        self.checkpoint_max_records = checkpoint_max_records
+        self.flush_interval_s = flush_interval_s
         
         # Storage paths
         if storage_path:
@@ -73,11 +237,27 @@ class EmbeddingsStore:
         else:
             self.storage_path = Path("/workspaces/stakazo/backend/storage/embeddings")
         
-        self.storage_path.mkdir(parents=True, exist_ok=True)
+        if read_only:
+            # Never create files in another process's store
+            if not self.storage_path.is_dir():
+                raise FileNotFoundError(f"Embeddings store not found: {self.storage_path}")
+        else:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            (self.storage_path / WAL_DIR).mkdir(exist_ok=True)
+        
+        # Operation log state (guarded by _lock, shared with the flusher thread)
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._checkpoint_seq = 0
+        self._last_checkpoint_time = time.monotonic()
+        self._wal = None
+        self._wal_path: Optional[Path] = None
         
         # Backend-specific setup
         if backend == "faiss":
             self._init_faiss()
+        elif backend == "mmap":
+            self._init_mmap()
         elif backend == "pgvector":
             self.db_connection = db_connection
             self._init_pgvector()
@@ -87,7 +267,23 @@ class EmbeddingsStore:
         # In-memory metadata store (for FAISS)
         # TODO: Replace with proper database for production
         self.metadata_store: Dict[str, StoredEmbedding] = {}
-        self._load_metadata()
+        legacy = self._recover()
+        if not read_only:
+            self._open_wal_segment()
+        
+        if legacy and not read_only:
+            # Move a metadata.json-era store to the checkpoint format
+            self.checkpoint(force=True)
+        
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if background_flush and not read_only:
+            self._flusher = threading.Thread(
+                target=self._flusher_loop,
+                name="embeddings-store-flusher",
+                daemon=True
+            )
+            self._flusher.start()
         
         logger.info(f"EmbeddingsStore initialized with backend: {backend}")
     
@@ -97,25 +293,64 @@ class EmbeddingsStore:
             import faiss
             self.faiss = faiss
             
-            # Create indices for each embedding type
+            # Create indices for each embedding type (filled by _recover)
             self.indices: Dict[EmbeddingType, Any] = {}
-            self.id_maps: Dict[EmbeddingType, Dict[str, int]] = {}
+            self.id_maps: Dict[EmbeddingType, Dict[str, int]] = {}  # embedding_id -> label
+            self.reverse_id_maps: Dict[EmbeddingType, Dict[int, str]] = {}
+            self._next_labels: Dict[EmbeddingType, int] = {}
+            self._tombstones: Dict[EmbeddingType, set] = {}  # Deleted labels still in an HNSW graph
             
             for emb_type in EmbeddingType:
                 self.indices[emb_type] = None
                 self.id_maps[emb_type] = {}
-                
-                # Try to load existing index
-                index_path = self.storage_path / f"{emb_type.value}.index"
-                if index_path.exists():
-                    self._load_faiss_index(emb_type)
+                self.reverse_id_maps[emb_type] = {}
+                self._next_labels[emb_type] = 0
+                self._tombstones[emb_type] = set()
             
             logger.info("FAISS backend initialized")
-            
+        
         except ImportError:
             logger.error("FAISS not installed. Install with: pip install faiss-cpu")
             raise
     
+    def _init_mmap(self):
+        """Initialize memory-mapped backend (opens the index files that already exist)."""
+        self.mmap_path = self.storage_path / MMAP_DIR
+        if not self.read_only:
+            self.mmap_path.mkdir(exist_ok=True)
+        
+        # Same label bookkeeping as FAISS; indices are MmapVectorIndex
+        self.indices: Dict[EmbeddingType, Any] = {}
+        self.id_maps: Dict[EmbeddingType, Dict[str, int]] = {}
+        self.reverse_id_maps: Dict[EmbeddingType, Dict[int, str]] = {}
+        self._next_labels: Dict[EmbeddingType, int] = {}
+        self._tombstones: Dict[EmbeddingType, set] = {}  # Always empty: rows are freed in place
+        
+        for emb_type in EmbeddingType:
+            self.indices[emb_type] = None
+            if (self.mmap_path / f"{emb_type.value}.json").exists():
+                self.indices[emb_type] = self._open_mmap_index(emb_type)
+            self.id_maps[emb_type] = {}
+            self.reverse_id_maps[emb_type] = {}
+            self._next_labels[emb_type] = 0
+            self._tombstones[emb_type] = set()
+        
+        logger.info(f"Memory-mapped backend initialized ({self.mmap_path}, read_only={self.read_only})")
+    
+    def _open_mmap_index(self, emb_type: EmbeddingType) -> MmapVectorIndex:
+        return MmapVectorIndex(
+            str(self.mmap_path),
+            emb_type.value,
+            self.dimension,
+            dtype=self.vector_dtype,
+            read_only=self.read_only
+        )
+    
+    def _index_type_name(self, index: Any) -> str:
+        if self.backend == "mmap":
+            return f"mmap_{index.dtype.name}"
+        return faiss_index_type(index).value
+    
     def _init_pgvector(self):
         """Initialize pgvector backend."""
         if not self.db_connection:
@@ -134,8 +369,156 @@ class EmbeddingsStore:
         
         logger.info("pgvector backend initialized")
     
+    # ================== Persistence ==================
+    
+    def _recover(self) -> bool:
+        """
+        Rebuild the in-memory state: latest checkpoint, then the log tail.
+        
+        Returns:
+            True if the state came from a legacy metadata.json store
+        """
+        legacy = False
+        pointer = self.storage_path / CHECKPOINT_POINTER
+        
+        if pointer.exists():
+            self._load_checkpoint(self.storage_path / pointer.read_text().strip())
+        elif (self.storage_path / "metadata.json").exists():
+            # metadata.json holds every vector: rebuild the indices from it
+            # (the legacy .index files still contain deleted embeddings)
+            self._load_metadata()
+            if self.backend != "pgvector":
+                for emb_type in EmbeddingType:
+                    self._rebuild_index(emb_type, [
+                        emb_id for emb_id, emb in self.metadata_store.items()
+                        if emb.embedding_type == emb_type
+                    ])
+            legacy = True
+        
+        replayed = self._replay_wal()
+        if replayed:
+            logger.info(f"Replayed {replayed} embeddings log records")
+        
+        if self.backend == "mmap" and not self.read_only:
+            # Drop rows whose records were lost, restore rows whose delete was
+            for emb_type, index in self.indices.items():
+                if index is not None:
+                    index.retain(
+                        np.fromiter(self.id_maps[emb_type].values(), dtype=np.int64),
+                        self._next_labels[emb_type]
+                    )
+        
+        return legacy
+    
+    def _load_checkpoint(self, checkpoint_dir: Path):
+        """Load metadata and vectors written by checkpoint()."""
+        with open(checkpoint_dir / "checkpoint.json", "r") as f:
+            info = json.load(f)
+        self._checkpoint_seq = info["seq"]
+        self._seq = self._checkpoint_seq
+        
+        vectors: Dict[EmbeddingType, np.ndarray] = {}
+        rows: Dict[EmbeddingType, Dict[str, int]] = {}
+        if self.backend == "mmap":
+            for emb_type in EmbeddingType:
+                ids_path = checkpoint_dir / f"{emb_type.value}_ids.json"
+                if not ids_path.exists():
+                    continue
+                
+                # Vectors stay in the mapped files; only the label maps are checkpointed
+                with open(ids_path, "r") as f:
+                    ids = json.load(f)
+                labels = np.load(checkpoint_dir / f"{emb_type.value}_labels.npy")
+                info_type = info.get("indices", {}).get(emb_type.value, {})
+                self.id_maps[emb_type] = dict(zip(ids, labels.tolist()))
+                self.reverse_id_maps[emb_type] = dict(zip(labels.tolist(), ids))
+                self._next_labels[emb_type] = max(info_type.get("next_label", 0), int(labels.max()) + 1 if len(labels) else 0)
+        elif self.backend == "faiss":
+            for emb_type in EmbeddingType:
+                vectors_path = checkpoint_dir / f"{emb_type.value}.npy"
+                if not vectors_path.exists():
+                    continue
+                
+                vectors[emb_type] = np.load(vectors_path)
+                with open(checkpoint_dir / f"{emb_type.value}_ids.json", "r") as f:
+                    ids = json.load(f)
+                rows[emb_type] = {emb_id: row for row, emb_id in enumerate(ids)}
+                
+                labels_path = checkpoint_dir / f"{emb_type.value}_labels.npy"
+                labels = np.load(labels_path) if labels_path.exists() else np.arange(len(ids), dtype=np.int64)
+                self._load_index(emb_type, checkpoint_dir, info.get("indices", {}).get(emb_type.value, {}),
+                                 vectors[emb_type], ids, labels)
+        
+        with open(checkpoint_dir / "metadata.jsonl", "r") as f:
+            for line in f:
+                data = json.loads(line)
+                if "vector" not in data and self.backend == "mmap":
+                    data["vector"] = []
+                elif "vector" not in data:
+                    emb_type = EmbeddingType(data["embedding_type"])
+                    data["vector"] = vectors[emb_type][rows[emb_type][data["embedding_id"]]].tolist()
+                self.metadata_store[data["embedding_id"]] = StoredEmbedding(**data)
+        
+        logger.info(
+            f"Loaded embeddings checkpoint {checkpoint_dir.name}: "
+            f"{len(self.metadata_store)} embeddings"
+        )
+    
+    def _wal_segments(self) -> List[Path]:
+        # Segment names are the zero-padded seq of their first record
+        return sorted((self.storage_path / WAL_DIR).glob("*.log"))
+    
+    def _replay_wal(self) -> int:
+        """Apply log records newer than the loaded checkpoint."""
+        replayed = 0
+        
+        for segment in self._wal_segments():
+            with open(segment, "r") as f:
+                for line in f:
+                    # A torn last line means the process died mid-write
+                    if not line.endswith("\n"):
+                        logger.warning(f"Ignoring incomplete record at the end of {segment.name}")
+                        break
+                    
+                    record = json.loads(line)
+                    if record["seq"] <= self._checkpoint_seq:
+                        continue
+                    
+                    op = record["op"]
+                    if op == "put":
+                        data = record["embedding"]
+                        data["vector"] = _decode_vector(record["vector"])
+                        self._apply_put(StoredEmbedding(**data))
+                    elif op == "update":
+                        self._apply_update(
+                            record["embedding_id"],
+                            record["updates"],
+                            datetime.fromisoformat(record["updated_at"])
+                        )
+                    elif op == "delete":
+                        self._apply_delete(record["embedding_ids"])
+                    
+                    self._seq = record["seq"]
+                    replayed += 1
+        
+        return replayed
+    
+    def _open_wal_segment(self):
+        """Start a new log segment; called with _lock held (or before the flusher exists)."""
+        if self._wal is not None:
+            self._wal.close()
+        
+        self._wal_path = self.storage_path / WAL_DIR / f"{self._seq + 1:012d}.log"
+        self._wal = open(self._wal_path, "a")
+    
+    def _log(self, record: Dict[str, Any]):
+        """Append one record to the operation log; called with _lock held."""
+        self._seq += 1
+        record["seq"] = self._seq
+        self._wal.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+    
     def _load_metadata(self):
-        """Load metadata from disk."""
+        """Load metadata from a legacy metadata.json store."""
         metadata_path = self.storage_path / "metadata.json"
         
         if metadata_path.exists():
@@ -150,61 +533,355 @@ class EmbeddingsStore:
             except Exception as e:
                 logger.error(f"Failed to load metadata: {e}")
     
-    def _save_metadata(self):
-        """Save metadata to disk."""
-        metadata_path = self.storage_path / "metadata.json"
+    def _load_index(
+        self,
+        emb_type: EmbeddingType,
+        checkpoint_dir: Path,
+        info: Dict[str, Any],
+        vectors: np.ndarray,
+        ids: List[str],
+        labels: np.ndarray
+    ):
+        """Restore a checkpointed index (rebuilt if its type is no longer the configured one)."""
+        config = self._index_config(emb_type)
+        index_path = checkpoint_dir / f"{emb_type.value}.faiss"
+        
+        index = None
+        if index_path.exists() and info.get("index_type") == config.index_type.value:
+            index = self.faiss.read_index(str(index_path))
+            set_search_params(index, config)
+        
+        if index is None:
+            index = build_faiss_index(config, self.dimension, vectors, labels)
         
+        self.indices[emb_type] = index
+        self.id_maps[emb_type] = dict(zip(ids, labels.tolist()))
+        self.reverse_id_maps[emb_type] = dict(zip(labels.tolist(), ids))
+        self._next_labels[emb_type] = max(info.get("next_label", 0), int(labels.max()) + 1 if len(labels) else 0)
+        self._tombstones[emb_type] = set()
+        if index.ntotal > len(ids):
+            indexed = self.faiss.vector_to_array(index.id_map).tolist()
+            self._tombstones[emb_type] = set(indexed) - self.reverse_id_maps[emb_type].keys()
+        
+        logger.info(
+            f"Loaded FAISS index for {emb_type.value}: {len(ids)} vectors "
+            f"({faiss_index_type(index).value})"
+        )
+    
+    def flush(self):
+        """Force buffered log records to disk."""
+        with self._lock:
+            if self._wal is None:
+                return
+            self._wal.flush()
+            fileno = self._wal.fileno()
+        
+        # fsync outside the lock: writers only need the (already flushed) buffer
         try:
-            data = {
-                emb_id: emb.dict()
-                for emb_id, emb in self.metadata_store.items()
-            }
+            os.fsync(fileno)
+        except OSError:
+            # The segment was rotated and closed meanwhile; it's synced by checkpoint()
+            pass
+    
+    def checkpoint(self, force: bool = False) -> bool:
+        """
+        Write a checkpoint and drop the log segments it covers.
+        
+        Only the snapshot (shallow metadata copy + label maps, serialized
+        IVF/HNSW indices) is taken under the lock; serialization runs while
+        writers keep appending to a new log segment.
+        
+        Args:
+            force: Write even if nothing changed since the last checkpoint
+        
+        Returns:
+            True if a checkpoint was written
+        """
+        with self._lock:
+            if self.read_only or (self._seq == self._checkpoint_seq and not force):
+                return False
             
-            with open(metadata_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            seq = self._seq
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._open_wal_segment()
             
-            logger.debug(f"Saved {len(self.metadata_store)} embeddings metadata")
-        except Exception as e:
-            logger.error(f"Failed to save metadata: {e}")
+            embeddings = list(self.metadata_store.values())
+            snapshot: Dict[EmbeddingType, Tuple[Dict[str, int], Optional[np.ndarray]]] = {}
+            indices_info: Dict[str, Any] = {}
+            if self.backend != "pgvector":
+                for emb_type, index in self.indices.items():
+                    if index is None:
+                        continue
+                    
+                    # Flat indices are rebuilt from the vectors on load
+                    serialized = None
+                    if self.backend == "faiss" and faiss_index_type(index) != IndexType.FLAT:
+                        serialized = self.faiss.serialize_index(index)
+                    snapshot[emb_type] = (dict(self.id_maps[emb_type]), serialized)
+                    indices_info[emb_type.value] = {
+                        "index_type": self._index_type_name(index),
+                        "next_label": self._next_labels[emb_type]
+                    }
+        
+        checkpoint_dir = self.storage_path / f"checkpoint-{seq:012d}"
+        tmp_dir = self.storage_path / f".checkpoint-{seq:012d}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+        
+        by_type: Dict[EmbeddingType, List[StoredEmbedding]] = {}
+        for emb in embeddings:
+            by_type.setdefault(emb.embedding_type, []).append(emb)
+        
+        indexed = set()
+        for emb_type, (id_map, serialized) in snapshot.items():
+            # Deleted and superseded embeddings are compacted away here
+            live = [emb for emb in by_type.get(emb_type, []) if emb.embedding_id in id_map]
+            ids = [emb.embedding_id for emb in live]
+            if self.backend == "faiss":
+                vectors = np.array([emb.vector for emb in live], dtype=np.float32).reshape(-1, self.dimension)
+                np.save(tmp_dir / f"{emb_type.value}.npy", vectors)
+            else:
+                # The checkpoint references mapped rows: make them durable first
+                self.indices[emb_type].flush()
+            
+            np.save(tmp_dir / f"{emb_type.value}_labels.npy", np.array([id_map[i] for i in ids], dtype=np.int64))
+            with open(tmp_dir / f"{emb_type.value}_ids.json", "w") as f:
+                json.dump(ids, f, separators=(",", ":"))
+            if serialized is not None:
+                serialized.tofile(tmp_dir / f"{emb_type.value}.faiss")  # write_index format
+            indexed.update((emb_type, emb_id) for emb_id in ids)
+        
+        with open(tmp_dir / "metadata.jsonl", "w") as f:
+            for emb in embeddings:
+                # Vectors held by a .npy file aren't repeated in the metadata
+                exclude = {"vector"} if (emb.embedding_type, emb.embedding_id) in indexed else None
+                f.write(json.dumps(emb.model_dump(mode="json", exclude=exclude), separators=(",", ":")) + "\n")
+        
+        with open(tmp_dir / "checkpoint.json", "w") as f:
+            json.dump({
+                "seq": seq,
+                "dimension": self.dimension,
+                "created_at": datetime.utcnow().isoformat(),
+                "indices": indices_info
+            }, f)
+        
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+        os.replace(tmp_dir, checkpoint_dir)
+        
+        # Switching the pointer is the commit point
+        pointer_tmp = self.storage_path / f"{CHECKPOINT_POINTER}.tmp"
+        pointer_tmp.write_text(checkpoint_dir.name)
+        os.replace(pointer_tmp, self.storage_path / CHECKPOINT_POINTER)
+        
+        with self._lock:
+            self._checkpoint_seq = seq
+            self._last_checkpoint_time = time.monotonic()
+            current_segment = self._wal_path
+        
+        for segment in self._wal_segments():
+            if segment != current_segment and int(segment.stem) <= seq:
+                segment.unlink()
+        for old_dir in self.storage_path.glob("checkpoint-*"):
+            if old_dir != checkpoint_dir:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        
+        logger.debug(f"Embeddings checkpoint written: seq={seq}, embeddings={len(embeddings)}")
+        return True
+    
+    def _checkpoint_due(self) -> bool:
+        with self._lock:
+            pending = self._seq - self._checkpoint_seq
+            elapsed = time.monotonic() - self._last_checkpoint_time
+        return pending >= self.checkpoint_max_records or (pending > 0 and elapsed >= self.checkpoint_interval_s)
+    
+    def _flusher_loop(self):
+        while not self._stop_flusher.wait(self.flush_interval_s):
+            try:
+                self.flush()
+                if self._checkpoint_due():
+                    self.checkpoint()
+            except Exception as e:
+                logger.error(f"Embeddings store flush failed: {e}")
     
-    def _load_faiss_index(self, emb_type: EmbeddingType):
-        """Load FAISS index from disk."""
-        index_path = self.storage_path / f"{emb_type.value}.index"
-        id_map_path = self.storage_path / f"{emb_type.value}_ids.json"
+    def close(self):
+        """Stop the flusher and checkpoint pending log records."""
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
         
-        try:
-            self.indices[emb_type] = self.faiss.read_index(str(index_path))
+        if self._wal is None:
+            return
+        
+        self.checkpoint()
+        with self._lock:
+            self._wal.close()
+            self._wal = None
+    
+    # ================== State changes (shared by live writes and replay) ==================
+    
+    def _index_config(self, emb_type: EmbeddingType) -> IndexConfig:
+        if isinstance(self.index_config, IndexConfig):
+            return self.index_config
+        return self.index_config.get(emb_type) or IndexConfig()
+    
+    def _rebuild_index(self, emb_type: EmbeddingType, embedding_ids: Optional[List[str]] = None):
+        """
+        Rebuild a type's index from the stored vectors, keeping labels.
+        
+        Used to train IVF indices, to compact HNSW tombstones and to index
+        legacy stores (embedding_ids given: those get fresh labels).
+        """
+        if embedding_ids is not None:
+            start = self._next_labels[emb_type]
+            self.id_maps[emb_type] = {emb_id: start + i for i, emb_id in enumerate(embedding_ids)}
+            self._next_labels[emb_type] = start + len(embedding_ids)
+        
+        id_map = self.id_maps[emb_type]
+        if not id_map and self.indices[emb_type] is None:
+            return
+        
+        vectors = np.array(
+            [self.metadata_store[emb_id].vector for emb_id in id_map],
+            dtype=np.float32
+        ).reshape(-1, self.dimension)
+        labels = np.fromiter(id_map.values(), dtype=np.int64, count=len(id_map))
+        
+        if self.backend == "mmap":
+            if self.indices[emb_type] is None:
+                self.indices[emb_type] = self._open_mmap_index(emb_type)
+            self.indices[emb_type].add_with_ids(vectors, labels)
+            self.reverse_id_maps[emb_type] = {label: emb_id for emb_id, label in id_map.items()}
+            for emb_id in id_map:
+                self.metadata_store[emb_id] = self.metadata_store[emb_id].model_copy(update={"vector": []})
+            logger.info(f"Wrote {len(id_map)} vectors to memory-mapped index {emb_type.value}")
+            return
+        
+        self.indices[emb_type] = build_faiss_index(self._index_config(emb_type), self.dimension, vectors, labels)
+        self.reverse_id_maps[emb_type] = {label: emb_id for emb_id, label in id_map.items()}
+        self._tombstones[emb_type] = set()
+        
+        logger.info(
+            f"Rebuilt FAISS index for {emb_type.value}: {len(id_map)} vectors "
+            f"({faiss_index_type(self.indices[emb_type]).value})"
+        )
+    
+    def _remove_labels(self, emb_type: EmbeddingType, labels: List[int]):
+        """Remove vectors from a type's index (tombstoned for HNSW)."""
+        index = self.indices[emb_type]
+        if index is None or not labels:
+            return
+        
+        if self.backend == "mmap" and self.read_only:
+            return  # The writer already freed the rows
+        
+        if self.backend == "mmap" or faiss_index_type(index) != IndexType.HNSW:
+            index.remove_ids(np.array(labels, dtype=np.int64))
+            return
+        
+        tombstones = self._tombstones[emb_type]
+        tombstones.update(labels)
+        if len(tombstones) > self._index_config(emb_type).max_tombstone_ratio * index.ntotal:
+            self._rebuild_index(emb_type)
+    
+    def _apply_put(self, embedding: StoredEmbedding) -> Optional[int]:
+        """Index (FAISS/mmap) and register an embedding. Returns its label."""
+        label = None
+        self.metadata_store[embedding.embedding_id] = embedding
+        
+        if self.backend == "mmap":
+            emb_type = embedding.embedding_type
             
-            if id_map_path.exists():
-                with open(id_map_path, 'r') as f:
-                    # Convert string keys to int for reverse lookup
-                    id_map = json.load(f)
-                    self.id_maps[emb_type] = {v: int(k) for k, v in id_map.items()}
+            previous = self.id_maps[emb_type].pop(embedding.embedding_id, None)
+            if previous is not None:
+                self.reverse_id_maps[emb_type].pop(previous, None)
+                self._remove_labels(emb_type, [previous])
             
-            logger.info(f"Loaded FAISS index for {emb_type.value}: {self.indices[emb_type].ntotal} vectors")
-        except Exception as e:
-            logger.error(f"Failed to load FAISS index for {emb_type.value}: {e}")
-            self.indices[emb_type] = None
+            label = self._next_labels[emb_type]
+            self._next_labels[emb_type] += 1
+            if not self.read_only:
+                if self.indices[emb_type] is None:
+                    self.indices[emb_type] = self._open_mmap_index(emb_type)
+                    logger.info(f"Created new memory-mapped index for {emb_type.value}")
+                self.indices[emb_type].add_with_ids(
+                    np.array([embedding.vector], dtype=np.float32),
+                    np.array([label], dtype=np.int64)
+                )
+            self.id_maps[emb_type][embedding.embedding_id] = label
+            self.reverse_id_maps[emb_type][label] = embedding.embedding_id
+            
+            # The vector lives in the mapped file only
+            self.metadata_store[embedding.embedding_id] = embedding.model_copy(update={"vector": []})
+        
+        elif self.backend == "faiss":
+            emb_type = embedding.embedding_type
+            
+            # Initialize index if needed
+            if self.indices[emb_type] is None:
+                self.indices[emb_type] = build_faiss_index(self._index_config(emb_type), self.dimension)
+                logger.info(f"Created new FAISS index for {emb_type.value}")
+            
+            # A re-stored ID replaces its previous vector
+            previous = self.id_maps[emb_type].pop(embedding.embedding_id, None)
+            if previous is not None:
+                self.reverse_id_maps[emb_type].pop(previous, None)
+                self._remove_labels(emb_type, [previous])
+            
+            label = self._next_labels[emb_type]
+            self._next_labels[emb_type] += 1
+            self.indices[emb_type].add_with_ids(
+                np.array([embedding.vector], dtype=np.float32),
+                np.array([label], dtype=np.int64)
+            )
+            self.id_maps[emb_type][embedding.embedding_id] = label
+            self.reverse_id_maps[emb_type][label] = embedding.embedding_id
+            
+            # Train the IVF index once there is enough data for it
+            config = self._index_config(emb_type)
+            if (
+                config.index_type == IndexType.IVF
+                and len(self.id_maps[emb_type]) >= config.train_threshold
+                and faiss_index_type(self.indices[emb_type]) == IndexType.FLAT
+            ):
+                self._rebuild_index(emb_type)
+        
+        return label
     
-    def _save_faiss_index(self, emb_type: EmbeddingType):
-        """Save FAISS index to disk."""
-        if self.indices[emb_type] is None:
+    def _apply_update(self, embedding_id: str, updates: Dict[str, Any], updated_at: datetime):
+        embedding = self.metadata_store.get(embedding_id)
+        if embedding is None:
             return
         
-        index_path = self.storage_path / f"{emb_type.value}.index"
-        id_map_path = self.storage_path / f"{emb_type.value}_ids.json"
+        # Update metadata fields
+        for key, value in updates.items():
+            if hasattr(embedding.metadata, key):
+                setattr(embedding.metadata, key, value)
         
-        try:
-            self.faiss.write_index(self.indices[emb_type], str(index_path))
-            
-            # Save ID map (int -> embedding_id)
-            id_map = {idx: emb_id for emb_id, idx in self.id_maps[emb_type].items()}
-            with open(id_map_path, 'w') as f:
-                json.dump(id_map, f, indent=2)
+        embedding.updated_at = updated_at
+    
+    def _apply_delete(self, embedding_ids: List[str]) -> List[str]:
+        """Unregister embeddings and remove their vectors from the FAISS index."""
+        deleted = []
+        removed: Dict[EmbeddingType, List[int]] = {}
+        
+        for emb_id in embedding_ids:
+            embedding = self.metadata_store.pop(emb_id, None)
+            if embedding is None:
+                continue
             
-            logger.debug(f"Saved FAISS index for {emb_type.value}")
-        except Exception as e:
-            logger.error(f"Failed to save FAISS index for {emb_type.value}: {e}")
+            if self.backend != "pgvector":
+                label = self.id_maps[embedding.embedding_type].pop(emb_id, None)
+                if label is not None:
+                    self.reverse_id_maps[embedding.embedding_type].pop(label, None)
+                    removed.setdefault(embedding.embedding_type, []).append(label)
+            deleted.append(emb_id)
+        
+        # One remove_ids call per type (each one is a pass over the index)
+        for emb_type, labels in removed.items():
+            self._remove_labels(emb_type, labels)
+        
+        return deleted
     
     async def store_embedding(
         self,
@@ -217,10 +894,17 @@ class EmbeddingsStore:
         Args:
             embedding: StoredEmbedding to store
             skip_if_exists: Skip if embedding_id already exists
-            
+        
         Returns:
             Result dict with status
         """
+        if self.read_only:
+            return {
+                "success": False,
+                "error": "READ_ONLY",
+                "embedding_id": embedding.embedding_id
+            }
+        
         # Check if exists
         if skip_if_exists and embedding.embedding_id in self.metadata_store:
             return {
@@ -241,20 +925,28 @@ class EmbeddingsStore:
         try:
             if self.backend == "faiss":
                 result = await self._store_embedding_faiss(embedding)
+            elif self.backend == "mmap":
+                result = await self._store_embedding_mmap(embedding)
             elif self.backend == "pgvector":
                 result = await self._store_embedding_pgvector(embedding)
             else:
                 raise ValueError(f"Unknown backend: {self.backend}")
             
             if result["success"]:
-                # Update metadata store
+                # Update metadata store; the log record is the only disk write
                 embedding.indexed = True
                 embedding.stored_at = datetime.utcnow()
-                self.metadata_store[embedding.embedding_id] = embedding
-                self._save_metadata()
+                with self._lock:
+                    if self.backend != "faiss":
+                        self._apply_put(embedding)
+                    self._log({
+                        "op": "put",
+                        "embedding": embedding.model_dump(mode="json", exclude={"vector"}),
+                        "vector": _encode_vector(embedding.vector)
+                    })
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"Failed to store embedding {embedding.embedding_id}: {e}")
             return {
@@ -264,27 +956,9 @@ class EmbeddingsStore:
             }
     
     async def _store_embedding_faiss(self, embedding: StoredEmbedding) -> Dict[str, Any]:
-        """Store embedding in FAISS."""
-        emb_type = embedding.embedding_type
-        
-        # Initialize index if needed
-        if self.indices[emb_type] is None:
-            self.indices[emb_type] = self.faiss.IndexFlatL2(self.dimension)
-            logger.info(f"Created new FAISS index for {emb_type.value}")
-        
-        # Convert to numpy array
-        vector = np.array([embedding.vector], dtype=np.float32)
-        
-        # Add to index
-        idx = self.indices[emb_type].ntotal
-        self.indices[emb_type].add(vector)
-        
-        # Update ID map
-        self.id_maps[emb_type][embedding.embedding_id] = idx
-        
-        # Save index periodically (every 10 embeddings)
-        if idx % 10 == 0:
-            self._save_faiss_index(emb_type)
+        """Store embedding in FAISS (persisted by the next checkpoint)."""
+        with self._lock:
+            idx = self._apply_put(embedding)
         
         return {
             "success": True,
@@ -293,6 +967,14 @@ class EmbeddingsStore:
             "backend": "faiss"
         }
     
+    async def _store_embedding_mmap(self, embedding: StoredEmbedding) -> Dict[str, Any]:
+        """Store embedding in the memory-mapped index (row written with its log record)."""
+        return {
+            "success": True,
+            "embedding_id": embedding.embedding_id,
+            "backend": "mmap"
+        }
+    
     async def _store_embedding_pgvector(self, embedding: StoredEmbedding) -> Dict[str, Any]:
         """Store embedding in pgvector."""
         # TODO: Implement pgvector storage
@@ -313,14 +995,14 @@ class EmbeddingsStore:
         
         Args:
             request: Search request with query vector and filters
-            
+        
         Returns:
             Search response with results
         """
         start_time = time.time()
         
         try:
-            if self.backend == "faiss":
+            if self.backend in ("faiss", "mmap"):
                 results = await self._search_similar_faiss(request)
             elif self.backend == "pgvector":
                 results = await self._search_similar_pgvector(request)
@@ -337,76 +1019,192 @@ class EmbeddingsStore:
                 filters_applied=request.filters,
                 index_used=self.backend
             )
-            
+        
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise
     
+    async def search_similar_batch(
+        self,
+        request: BatchSimilaritySearchRequest
+    ) -> BatchSimilaritySearchResponse:
+        """
+        Search for similar embeddings of many query vectors at once.
+        
+        The whole query matrix goes to the index in one search call, and
+        candidates shared by several queries are resolved, filtered and
+        hydrated once for the batch.
+        
+        Args:
+            request: Batch search request with query vectors and filters
+        
+        Returns:
+            Batch response with one result list per query vector
+        """
+        start_time = time.time()
+        
+        try:
+            if self.backend in ("faiss", "mmap"):
+                queries = np.asarray(request.query_vectors, dtype=np.float32).reshape(-1, self.dimension)
+                results = self._search_batch_faiss(
+                    request.embedding_type,
+                    queries,
+                    request.top_k,
+                    request.filters,
+                    request.min_score,
+                    request.include_metadata
+                )
+            elif self.backend == "pgvector":
+                results = [
+                    await self._search_similar_pgvector(SimilaritySearchRequest(
+                        query_vector=query_vector,
+                        **request.model_dump(exclude={"query_vectors"})
+                    ))
+                    for query_vector in request.query_vectors
+                ]
+            else:
+                raise ValueError(f"Unknown backend: {self.backend}")
+            
+            search_time_ms = (time.time() - start_time) * 1000
+            
+            return BatchSimilaritySearchResponse(
+                query_type=request.embedding_type,
+                results=results,
+                total_queries=len(results),
+                search_time_ms=search_time_ms,
+                filters_applied=request.filters,
+                index_used=self.backend
+            )
+        
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}")
+            raise
+    
     async def _search_similar_faiss(
         self,
         request: SimilaritySearchRequest
     ) -> List[SimilaritySearchResult]:
-        """Search using FAISS."""
-        emb_type = request.embedding_type
+        """Search using FAISS (or the memory-mapped index, same interface)."""
+        return self._search_batch_faiss(
+            request.embedding_type,
+            np.array([request.query_vector], dtype=np.float32),
+            request.top_k,
+            request.filters,
+            request.min_score,
+            request.include_metadata
+        )[0]
+    
+    def _search_batch_faiss(
+        self,
+        emb_type: EmbeddingType,
+        queries: np.ndarray,
+        top_k: int,
+        filters: Dict[str, Any],
+        min_score: Optional[float],
+        include_metadata: bool
+    ) -> List[List[SimilaritySearchResult]]:
+        """
+        Search a batch of queries in a FAISS or memory-mapped index.
         
-        if self.indices[emb_type] is None or self.indices[emb_type].ntotal == 0:
-            return []
+        Fetches top_k candidates (plus HNSW tombstones); with filters, fetches
+        filter_overfetch x top_k and keeps widening the search (for the
+        queries still short of top_k matches only) until top_k matches are
+        found or the whole index has been returned.
+        """
+        index = self.indices[emb_type]
         
-        # Convert query to numpy
-        query = np.array([request.query_vector], dtype=np.float32)
+        if index is None or not self.id_maps[emb_type]:
+            return [[] for _ in range(len(queries))]
         
-        # Search
-        k = min(request.top_k, self.indices[emb_type].ntotal)
-        distances, indices = self.indices[emb_type].search(query, k)
+        reverse_id_map = self.reverse_id_maps[emb_type]
+        fetch = top_k * (self.filter_overfetch if filters else 1)
+        fetch += len(self._tombstones[emb_type])
         
-        # Convert results
-        results = []
-        reverse_id_map = {idx: emb_id for emb_id, idx in self.id_maps[emb_type].items()}
+        # label -> (embedding_id or None if deleted, passes the filters)
+        candidates: Dict[int, Tuple[Optional[str], bool]] = {-1: (None, False)}
+        hits: List[List[Tuple[str, float, int]]] = [[] for _ in range(len(queries))]
+        pending = np.arange(len(queries))
         
-        for rank, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx == -1:  # No result
-                continue
-            
-            embedding_id = reverse_id_map.get(idx)
-            if not embedding_id:
-                continue
-            
-            # Convert L2 distance to similarity score (0-1)
-            similarity_score = 1.0 / (1.0 + float(distance))
+        while len(pending):
+            k = min(fetch, index.ntotal)
+            distances, labels = index.search(queries[pending], k)
             
-            # Apply min_score filter
-            if request.min_score and similarity_score < request.min_score:
-                continue
+            # Resolve each distinct candidate once for the whole batch
+            for label in np.unique(labels).tolist():
+                if label in candidates:
+                    continue
+                embedding_id = reverse_id_map.get(label)
+                passes = embedding_id is not None and not (filters and any(
+                    hasattr(self.metadata_store[embedding_id].metadata, key)
+                    and getattr(self.metadata_store[embedding_id].metadata, key) != value
+                    for key, value in filters.items()
+                ))
+                candidates[label] = (embedding_id, passes)
             
-            # Get metadata if requested
-            embedding = None
-            metadata = None
-            if request.include_metadata and embedding_id in self.metadata_store:
-                stored_emb = self.metadata_store[embedding_id]
-                metadata = stored_emb.metadata
-                if request.include_metadata:
-                    embedding = stored_emb
+            # Convert L2 distances to similarity scores (0-1); rows come sorted by distance
+            below_min_score = (1.0 / (1.0 + distances) < min_score) if min_score else np.zeros(distances.shape, dtype=bool)
             
-            # Apply filters
-            if request.filters and metadata:
-                skip = False
-                for key, value in request.filters.items():
-                    if hasattr(metadata, key) and getattr(metadata, key) != value:
-                        skip = True
+            retry = []
+            for row, query in enumerate(pending.tolist()):
+                found = []
+                stopped = False
+                for distance, label, below in zip(distances[row].tolist(), labels[row].tolist(), below_min_score[row]):
+                    embedding_id, passes = candidates[label]
+                    if embedding_id is None:  # No result / deleted (HNSW tombstone)
+                        continue
+                    if below:
+                        stopped = True
                         break
-                if skip:
-                    continue
+                    if passes:
+                        found.append((embedding_id, distance, label))
+                        if len(found) == top_k:
+                            break
+                
+                if len(found) >= top_k or stopped or k >= index.ntotal:
+                    hits[query] = found
+                else:
+                    retry.append(query)
             
-            results.append(SimilaritySearchResult(
-                embedding_id=embedding_id,
-                similarity_score=similarity_score,
-                distance=float(distance),
-                embedding=embedding,
-                metadata=metadata,
-                rank=rank + 1
-            ))
+            pending = np.array(retry, dtype=np.int64)
+            fetch = 4 * k
         
-        return results[:request.top_k]
+        embeddings = self._hydrate(emb_type, hits) if include_metadata else {}
+        
+        return [
+            [
+                SimilaritySearchResult(
+                    embedding_id=embedding_id,
+                    similarity_score=1.0 / (1.0 + distance),
+                    distance=distance,
+                    embedding=embeddings.get(label),
+                    metadata=embeddings[label].metadata if include_metadata else None,
+                    rank=rank
+                )
+                for rank, (embedding_id, distance, label) in enumerate(found, start=1)
+            ]
+            for found in hits
+        ]
+    
+    def _hydrate(
+        self,
+        emb_type: EmbeddingType,
+        hits: List[List[Tuple[str, float, int]]]
+    ) -> Dict[int, StoredEmbedding]:
+        """
+        Stored embeddings of every distinct hit label.
+        
+        On the mmap backend their vectors are read back from the mapped rows
+        with one gather for the whole batch.
+        """
+        labels = {label: embedding_id for found in hits for embedding_id, _, label in found}
+        if self.backend != "mmap" or not labels:
+            return {label: self.metadata_store[embedding_id] for label, embedding_id in labels.items()}
+        
+        vectors = self.indices[emb_type].reconstruct_batch(np.fromiter(labels, dtype=np.int64, count=len(labels)))
+        return {
+            label: self.metadata_store[embedding_id].model_copy(update={"vector": vector})
+            for (label, embedding_id), vector in zip(labels.items(), vectors.tolist())
+        }
     
     async def _search_similar_pgvector(
         self,
@@ -427,7 +1225,7 @@ class EmbeddingsStore:
         
         Args:
             request: Deletion request with IDs or filters
-            
+        
         Returns:
             Deletion response
         """
@@ -441,25 +1239,26 @@ class EmbeddingsStore:
         deleted_ids = []
         errors = {}
         
+        if self.read_only:
+            return EmbeddingDeletionResponse(
+                deleted_count=0,
+                deleted_ids=[],
+                errors={emb_id: "READ_ONLY" for emb_id in request.embedding_ids or []}
+            )
+        
         # Delete by IDs
         if request.embedding_ids:
+            with self._lock:
+                deleted_ids = self._apply_delete(request.embedding_ids)
+                if deleted_ids:
+                    self._log({"op": "delete", "embedding_ids": deleted_ids})
+            
             for emb_id in request.embedding_ids:
-                try:
-                    if emb_id in self.metadata_store:
-                        del self.metadata_store[emb_id]
-                        deleted_ids.append(emb_id)
-                    else:
-                        errors[emb_id] = "NOT_FOUND"
-                except Exception as e:
-                    errors[emb_id] = str(e)
+                if emb_id not in deleted_ids:
+                    errors[emb_id] = "NOT_FOUND"
         
         # TODO: Delete by filters
         
-        # Save metadata
-        if deleted_ids:
-            self._save_metadata()
-            # TODO: Rebuild indices
-        
         return EmbeddingDeletionResponse(
             deleted_count=len(deleted_ids),
             deleted_ids=deleted_ids,
@@ -477,10 +1276,17 @@ class EmbeddingsStore:
         Args:
             embedding_id: ID of embedding to update
             updates: Fields to update
-            
+        
         Returns:
             Result dict
         """
+        if self.read_only:
+            return {
+                "success": False,
+                "error": "READ_ONLY",
+                "embedding_id": embedding_id
+            }
+        
         if embedding_id not in self.metadata_store:
             return {
                 "success": False,
@@ -489,23 +1295,22 @@ class EmbeddingsStore:
             }
         
         try:
-            embedding = self.metadata_store[embedding_id]
-            
-            # Update metadata fields
-            for key, value in updates.items():
-                if hasattr(embedding.metadata, key):
-                    setattr(embedding.metadata, key, value)
-            
-            embedding.updated_at = datetime.utcnow()
-            self.metadata_store[embedding_id] = embedding
-            self._save_metadata()
+            updated_at = datetime.utcnow()
+            with self._lock:
+                self._apply_update(embedding_id, updates, updated_at)
+                self._log({
+                    "op": "update",
+                    "embedding_id": embedding_id,
+                    "updates": updates,
+                    "updated_at": updated_at.isoformat()
+                })
             
             return {
                 "success": True,
                 "embedding_id": embedding_id,
                 "updated_fields": list(updates.keys())
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to update embedding {embedding_id}: {e}")
             return {
@@ -523,7 +1328,7 @@ class EmbeddingsStore:
         
         Args:
             request: Batch request with embeddings
-            
+        
         Returns:
             Batch response with results
         """
@@ -551,11 +1356,9 @@ class EmbeddingsStore:
                 failed_ids.append(embedding.embedding_id)
                 errors[embedding.embedding_id] = result.get("error", "UNKNOWN")
         
-        # Rebuild indices if requested
+        # Persist indices now if requested
         if request.rebuild_index:
-            for emb_type in EmbeddingType:
-                if self.indices.get(emb_type):
-                    self._save_faiss_index(emb_type)
+            self.checkpoint()
         
         processing_time_ms = (time.time() - start_time) * 1000
         
@@ -572,27 +1375,38 @@ class EmbeddingsStore:
     
     def get_stats(self, emb_type: Optional[EmbeddingType] = None) -> Dict[str, Any]:
         """Get statistics for embeddings store."""
-        if self.backend == "faiss":
+        if self.backend in ("faiss", "mmap"):
             if emb_type:
-                total = self.indices[emb_type].ntotal if self.indices[emb_type] else 0
-                return {
+                index = self.indices[emb_type]
+                stats = {
                     "embedding_type": emb_type.value,
-                    "total_embeddings": total,
-                    "backend": "faiss"
+                    "total_embeddings": len(self.id_maps[emb_type]),
+                    "index_type": self._index_type_name(index) if index else None,
+                    "tombstones": len(self._tombstones[emb_type]),
+                    "backend": self.backend
                 }
+                if self.backend == "mmap" and index:
+                    stats["index"] = index.get_stats()
+                return stats
             else:
                 return {
-                    "backend": "faiss",
-                    "total_embeddings": sum(
-                        idx.ntotal for idx in self.indices.values() if idx
-                    ),
+                    "backend": self.backend,
+                    "total_embeddings": sum(len(id_map) for id_map in self.id_maps.values()),
                     "by_type": {
-                        emb_type.value: idx.ntotal
+                        emb_type.value: len(self.id_maps[emb_type])
                         for emb_type, idx in self.indices.items() if idx
-                    }
+                    },
+                    "index_types": {
+                        emb_type.value: self._index_type_name(idx)
+                        for emb_type, idx in self.indices.items() if idx
+                    },
+                    "log_records_pending": self._seq - self._checkpoint_seq,
+                    "last_checkpoint_seq": self._checkpoint_seq
                 }
         else:
             return {
                 "backend": "pgvector",
-                "total_embeddings": len(self.metadata_store)
+                "total_embeddings": len(self.metadata_store),
+                "log_records_pending": self._seq - self._checkpoint_seq,
+                "last_checkpoint_seq": self._checkpoint_seq
             }
@@ -15,7 +15,10 @@ import logging
 import statistics
 import uuid
 
+import numpy as np
+
 from .model_metrics_store import ModelMetricsStore
+from .retention_curves import mini_batch_kmeans, curve_archetype
 from .schemas_metrics import (
     DailySnapshot,
     RetentionCluster,
@@ -60,7 +63,7 @@ class MetricsAggregator:
         
         Args:
             target_date: Date to build snapshot for (default: yesterday)
-            
+        
         Returns:
             DailySnapshot with aggregated metrics
         """
@@ -362,74 +365,73 @@ class MetricsAggregator:
     
     async def compute_retention_clusters(
         self,
-        min_cluster_size: int = 5
+        min_cluster_size: int = 5,
+        num_clusters: int = 6,
+        limit: int = 10000
     ) -> List[RetentionCluster]:
         """
-        Compute clusters of content with similar retention patterns.
+        Compute clusters of content with similar retention curve shapes.
+        
+        All stored curves (fixed-length, see retention_curves.py) are loaded
+        as one matrix and grouped with mini-batch k-means; each cluster is
+        named after the drop-off archetype of its centroid.
         
         Args:
             min_cluster_size: Minimum number of items per cluster
-            
+            num_clusters: Number of k-means clusters (before the size filter)
+            limit: Max retention rows read
+        
         Returns:
-            List of retention clusters
+            List of retention clusters, largest first
         """
-        # Read recent retention data
+        # Read recent retention curves
         request = MetricsReadRequest(
             metric_types=[MetricType.RETENTION],
             date_from=date.today() - timedelta(days=30),
-            limit=1000
+            limit=limit
         )
         
-        metrics = await self.metrics_store.read_metrics(request)
-        retention_data = metrics["metrics"].get("retention", [])
+        rows, curves = await self.metrics_store.read_retention_curves(request)
         
-        if not retention_data:
+        if not rows:
             return []
         
-        # Simple clustering by retention percentage ranges
-        clusters_dict = {
-            "high": {"range": (0.7, 1.0), "items": []},
-            "medium": {"range": (0.4, 0.7), "items": []},
-            "low": {"range": (0.0, 0.4), "items": []}
-        }
+        centers, labels = mini_batch_kmeans(curves, num_clusters)
+        counts = np.bincount(labels, minlength=len(centers))
         
-        for r in retention_data:
-            retention = r.get("avg_watch_percentage", 0)
-            if 0.7 <= retention <= 1.0:
-                clusters_dict["high"]["items"].append(r)
-            elif 0.4 <= retention < 0.7:
-                clusters_dict["medium"]["items"].append(r)
-            else:
-                clusters_dict["low"]["items"].append(r)
+        avg_watch = np.array([np.nan if r.get("avg_watch_percentage") is None else r["avg_watch_percentage"] for r in rows], dtype=np.float64)
+        completion = np.array([np.nan if r.get("completion_rate") is None else r["completion_rate"] for r in rows], dtype=np.float64)
+        # Without a stored average, the mean of the curve stands in for it
+        avg_watch = np.where(np.isnan(avg_watch), curves.mean(axis=1), avg_watch)
         
         # Create cluster objects
         clusters = []
-        for cluster_name, data in clusters_dict.items():
-            items = data["items"]
-            if len(items) >= min_cluster_size:
-                avg_retention = statistics.mean([
-                    i["avg_watch_percentage"] for i in items
-                ])
-                
-                cluster = RetentionCluster(
-                    cluster_id=f"cluster_{cluster_name}_{uuid.uuid4().hex[:8]}",
-                    cluster_name=f"{cluster_name.capitalize()} Retention",
-                    avg_retention=avg_retention,
-                    content_count=len(items),
-                    content_ids=[i["content_id"] for i in items],
-                    common_features={
-                        "retention_range": data["range"],
-                        "avg_completion": statistics.mean([
-                            i.get("completion_rate", 0) for i in items if i.get("completion_rate")
-                        ]) if items else 0
-                    },
-                    avg_engagement_rate=0.0,  # TODO: Join with engagement data
-                    avg_virality_score=0.0
-                )
-                
-                clusters.append(cluster)
+        for cluster_idx in np.argsort(-counts, kind="stable"):
+            if counts[cluster_idx] < min_cluster_size:
+                continue
+            
+            members = np.flatnonzero(labels == cluster_idx)
+            shape = curve_archetype(centers[cluster_idx])
+            member_completion = completion[members]
+            
+            cluster = RetentionCluster(
+                cluster_id=f"cluster_{shape['archetype']}_{uuid.uuid4().hex[:8]}",
+                cluster_name=shape["name"],
+                avg_retention=float(avg_watch[members].mean()),
+                content_count=len(members),
+                content_ids=[rows[i]["content_id"] for i in members],
+                common_features={
+                    **shape,
+                    "centroid": np.round(centers[cluster_idx], 4).tolist(),
+                    "avg_completion": float(np.nanmean(member_completion)) if not np.isnan(member_completion).all() else 0
+                },
+                avg_engagement_rate=0.0,  # TODO: Join with engagement data
+                avg_virality_score=0.0
+            )
+            
+            clusters.append(cluster)
         
-        logger.info(f"Created {len(clusters)} retention clusters")
+        logger.info(f"Created {len(clusters)} retention clusters from {len(rows)} curves")
         
         return clusters
     
@@ -442,7 +444,7 @@ class MetricsAggregator:
         
         Args:
             report_date: Date for report (default: yesterday)
-            
+        
         Returns:
             LearningReport with insights and recommendations
         """
@@ -0,0 +1,280 @@
+"""
+Memory-mapped flat vector index - on-disk vectors shared through the page cache
+
+Layout per index (one per embedding type), all under one directory:
+- <name>.vec     row-major float32 / float16 matrix (capacity x dimension)
+- <name>.labels  int64 sidecar, one per row: the row's label, -1 if free/deleted
+- <name>.norms   float32 sidecar, squared L2 norm per row
+- <name>.json    header (dtype, dimension, capacity)
+
+Labels are row numbers: a vector added under label L lives in row L, so
+writes are idempotent (replaying a log rewrites the same rows) and readers
+can resolve labels without an id table.
+
+Features:
+- Exact L2 search with vectorized NumPy over the mapped pages, in row chunks
+- Batched multi-query search (one pass over the matrix for all queries)
+- Same add_with_ids / remove_ids / search / ntotal surface as the FAISS
+  indices used by EmbeddingsStore
+- Read-only mappings for reader processes: N processes, one copy in RAM
+"""
+
+from typing import Any, Dict, Tuple
+from pathlib import Path
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DTYPES = ("float32", "float16")
+INITIAL_CAPACITY = 1024
+SEARCH_CHUNK_ROWS = 32768
+
+
+class MmapVectorIndex:
+    """
+    Flat L2 index over memory-mapped files.
+    
+    One writer process at a time (the EmbeddingsStore that owns the log);
+    any number of read-only openers map the same files. Readers see deletes
+    immediately (the label sidecar is shared) and rows appended after they
+    opened once they reopen.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        dimension: int,
+        dtype: str = "float32",
+        read_only: bool = False
+    ):
+        """
+        Open (or create) a memory-mapped index.
+        
+        Args:
+            directory: Directory holding the index files
+            name: File name prefix (embedding type)
+            dimension: Vector dimension
+            dtype: Storage dtype ("float32" or "float16"); an existing index keeps its own
+            read_only: Map the files read-only (reader processes)
+        
+        Raises:
+            ValueError: If dtype is unsupported or the dimension doesn't match the files
+            FileNotFoundError: If read_only and the index doesn't exist
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype} (expected one of {SUPPORTED_DTYPES})")
+        
+        self.directory = Path(directory)
+        self.name = name
+        self.dimension = dimension
+        self.read_only = read_only
+        
+        header_path = self._path("json")
+        if header_path.exists():
+            with open(header_path, "r") as f:
+                header = json.load(f)
+            if header["dimension"] != dimension:
+                raise ValueError(
+                    f"Index {name} has dimension {header['dimension']}, expected {dimension}"
+                )
+            self.dtype = np.dtype(header["dtype"])
+            self.capacity = header["capacity"]
+        elif read_only:
+            raise FileNotFoundError(f"No memory-mapped index at {header_path}")
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.dtype = np.dtype(dtype)
+            self.capacity = 0
+        
+        self._map()
+        if self.capacity == 0 and not read_only:
+            self._grow(INITIAL_CAPACITY)
+        
+        # Rows in use: everything up to the last labelled row
+        used = np.flatnonzero(self.labels >= 0)
+        self.count = int(used[-1]) + 1 if len(used) else 0
+        self.ntotal = len(used)
+    
+    def _path(self, suffix: str) -> Path:
+        return self.directory / f"{self.name}.{suffix}"
+    
+    def _map(self):
+        mode = "r" if self.read_only else "r+"
+        if self.capacity == 0:
+            self.vectors = np.zeros((0, self.dimension), dtype=self.dtype)
+            self.labels = np.zeros(0, dtype=np.int64)
+            self.norms = np.zeros(0, dtype=np.float32)
+            return
+        
+        self.vectors = np.memmap(self._path("vec"), dtype=self.dtype, mode=mode, shape=(self.capacity, self.dimension))
+        self.labels = np.memmap(self._path("labels"), dtype=np.int64, mode=mode, shape=(self.capacity,))
+        self.norms = np.memmap(self._path("norms"), dtype=np.float32, mode=mode, shape=(self.capacity,))
+    
+    def _grow(self, capacity: int):
+        """Extend the files to `capacity` rows (new rows are free) and remap."""
+        old_capacity = self.capacity
+        self.flush()
+        
+        for suffix, itemsize in (
+            ("vec", self.dtype.itemsize * self.dimension),
+            ("labels", 8),
+            ("norms", 4),
+        ):
+            with open(self._path(suffix), "ab") as f:
+                f.truncate(capacity * itemsize)
+        
+        self.capacity = capacity
+        self._map()
+        self.labels[old_capacity:] = -1
+        
+        # Header last (and atomically): readers never map past the end of the files
+        header_tmp = self._path("json.tmp")
+        with open(header_tmp, "w") as f:
+            json.dump({"dtype": self.dtype.name, "dimension": self.dimension, "capacity": capacity}, f)
+        os.replace(header_tmp, self._path("json"))
+    
+    def add_with_ids(self, vectors: np.ndarray, labels: np.ndarray):
+        """Write vectors into the rows given by their labels."""
+        if self.read_only:
+            raise PermissionError(f"Memory-mapped index {self.name} is read-only")
+        
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        labels = np.asarray(labels, dtype=np.int64)
+        if not len(labels):
+            return
+        
+        needed = int(labels.max()) + 1
+        if needed > self.capacity:
+            self._grow(max(needed, 2 * self.capacity))
+        
+        self.ntotal += int(np.count_nonzero(self.labels[labels] < 0))
+        self.vectors[labels] = vectors
+        # Norms of the stored (possibly float16-rounded) vectors, so distances are consistent
+        stored = np.asarray(self.vectors[labels], dtype=np.float32)
+        self.norms[labels] = np.einsum("ij,ij->i", stored, stored)
+        # Label last: a concurrent reader never sees a labelled row without its vector
+        self.labels[labels] = labels
+        self.count = max(self.count, needed)
+    
+    def remove_ids(self, labels: np.ndarray) -> int:
+        """Free the rows of the given labels. Returns how many were live."""
+        if self.read_only:
+            raise PermissionError(f"Memory-mapped index {self.name} is read-only")
+        
+        labels = np.asarray(labels, dtype=np.int64)
+        labels = labels[(labels >= 0) & (labels < self.capacity)]
+        live = labels[self.labels[labels] >= 0]
+        self.labels[live] = -1
+        self.ntotal -= len(live)
+        return len(live)
+    
+    def retain(self, labels: np.ndarray, count: int):
+        """
+        Free every row that isn't in `labels` or is at/after `count`.
+        
+        Called after log replay: rows written before a crash whose log
+        records never reached the disk are dropped, and rows freed by a
+        delete whose record was lost are relabelled (the vector is still in
+        place).
+        """
+        keep = np.zeros(self.capacity, dtype=bool)
+        labels = np.asarray(labels, dtype=np.int64)
+        keep[labels[labels < min(count, self.capacity)]] = True
+        
+        stale = (self.labels >= 0) & ~keep
+        if stale.any():
+            self.labels[stale] = -1
+            logger.info(f"Freed {int(stale.sum())} stale rows in memory-mapped index {self.name}")
+        
+        revived = np.flatnonzero(keep & (self.labels < 0))
+        if len(revived):
+            self.labels[revived] = revived
+            logger.info(f"Restored {len(revived)} rows in memory-mapped index {self.name}")
+        
+        self.count = count
+        self.ntotal = int(np.count_nonzero(self.labels >= 0))
+    
+    def reconstruct(self, label: int) -> np.ndarray:
+        """Stored vector of a label (float32)."""
+        return np.asarray(self.vectors[label], dtype=np.float32)
+    
+    def reconstruct_batch(self, labels: np.ndarray) -> np.ndarray:
+        """Stored vectors of several labels (float32, one gather over the mapped rows)."""
+        return np.asarray(self.vectors[np.asarray(labels, dtype=np.int64)], dtype=np.float32)
+    
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        chunk_rows: int = SEARCH_CHUNK_ROWS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact k-nearest-neighbour search (squared L2, like faiss.IndexFlatL2).
+        
+        All queries are scored against each chunk of rows with one matrix
+        product, so a batch costs one pass over the mapped matrix.
+        
+        Args:
+            queries: (n, dimension) query vectors
+            k: Neighbours per query
+            chunk_rows: Rows scored per step (bounds the temporary memory)
+        
+        Returns:
+            (distances, labels), each (n, k), sorted by distance; missing
+            neighbours have label -1 and distance inf
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dimension)
+        num_queries = len(queries)
+        best_distances = np.full((num_queries, k), np.inf, dtype=np.float32)
+        best_labels = np.full((num_queries, k), -1, dtype=np.int64)
+        if k <= 0 or self.count == 0:
+            return best_distances, best_labels
+        
+        query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        
+        for start in range(0, self.count, chunk_rows):
+            end = min(start + chunk_rows, self.count)
+            labels = np.asarray(self.labels[start:end])
+            live = labels >= 0
+            if not live.any():
+                continue
+            
+            rows = np.asarray(self.vectors[start:end], dtype=np.float32)
+            distances = query_norms - 2.0 * (queries @ rows.T) + self.norms[start:end]
+            distances[:, ~live] = np.inf
+            
+            # Merge this chunk's candidates with the running top-k
+            merged_distances = np.concatenate([best_distances, distances], axis=1)
+            merged_labels = np.concatenate([best_labels, np.broadcast_to(labels, distances.shape)], axis=1)
+            top = np.argpartition(merged_distances, k - 1, axis=1)[:, :k]
+            best_distances = np.take_along_axis(merged_distances, top, axis=1)
+            best_labels = np.take_along_axis(merged_labels, top, axis=1)
+        
+        order = np.argsort(best_distances, axis=1)
+        best_distances = np.maximum(np.take_along_axis(best_distances, order, axis=1), 0.0)
+        best_labels = np.take_along_axis(best_labels, order, axis=1)
+        best_labels[np.isinf(best_distances)] = -1
+        return best_distances, best_labels
+    
+    def flush(self):
+        """Write dirty mapped pages to disk."""
+        if self.read_only or self.capacity == 0:
+            return
+        for array in (self.vectors, self.labels, self.norms):
+            array.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "dtype": self.dtype.name,
+            "dimension": self.dimension,
+            "capacity": self.capacity,
+            "rows_used": self.count,
+            "live": self.ntotal,
+            "read_only": self.read_only,
+            "size_mb": round(self.capacity * (self.dtype.itemsize * self.dimension + 12) / 1e6, 2),
+        }
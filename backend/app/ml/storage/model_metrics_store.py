@@ -8,16 +8,30 @@ Stores:
 - Engine performance
 - Satellite performance
 - Meta-learning scores
+
+Retention curves are stored as fixed-length float32 BLOBs (resampled to
+CURVE_POINTS over the video's relative position, see retention_curves.py).
+
+All SQLite work runs on one dedicated thread (the connection is only ever
+used there), so the async methods never block the event loop. File
+databases use WAL mode; write_metrics_batch() inserts many rows with
+executemany inside one transaction.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime, date, timedelta
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import logging
 import json
 import sqlite3
 from collections import defaultdict
 
+import numpy as np
+
+from .retention_curves import encode_curve, decode_curve, decode_curve_matrix
 from .schemas_metrics import (
     MetricType,
     RetentionMetrics,
@@ -35,12 +49,82 @@ from .schemas_metrics import (
 
 logger = logging.getLogger(__name__)
 
+# Applied to every connection. WAL lets readers run alongside the writer and,
+# with synchronous=NORMAL, makes a commit an append to the WAL (no fsync).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA recursive_triggers=ON",  # REPLACE deletes fire the rollup delete trigger
+)
+
+DAY_NAMES = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")  # strftime('%w') order
+
+RETENTION_INSERT = """
+    INSERT OR REPLACE INTO retention_metrics (
+        content_id, platform, channel_type,
+        avg_watch_time_sec, avg_watch_percentage,
+        retention_curve, drop_off_points,
+        peak_rewatch_time, completion_rate, rewatch_rate
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ENGAGEMENT_INSERT = """
+    INSERT OR REPLACE INTO engagement_metrics (
+        content_id, platform, channel_type,
+        views, likes, comments, shares, saves,
+        ctr, engagement_rate, save_rate,
+        views_velocity, engagement_velocity
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+VIEWER_BEHAVIOR_INSERT = """
+    INSERT OR REPLACE INTO viewer_behavior (
+        content_id, platform,
+        avg_session_duration, bounce_rate, return_viewer_rate,
+        avg_time_to_first_interaction, avg_time_to_like, avg_time_to_comment,
+        mobile_vs_desktop, time_of_day_distribution
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ENGINE_PERFORMANCE_INSERT = """
+    INSERT INTO engine_performance (
+        engine_name, predictions_made, predictions_correct,
+        accuracy, mae, rmse,
+        best_predictions, worst_predictions,
+        avg_inference_time_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SATELLITE_PERFORMANCE_INSERT = """
+    INSERT OR REPLACE INTO satellite_performance (
+        satellite_account_id, platform,
+        followers_start, followers_end, followers_growth, followers_growth_rate,
+        posts_count, avg_views, avg_engagement_rate, avg_retention,
+        top_content_ids, cost_per_follower, roi,
+        period_start, period_end
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+META_LEARNING_SCORE_INSERT = """
+    INSERT INTO meta_learning_scores (
+        content_id, overall_score,
+        retention_score, engagement_score, virality_score, brand_alignment_score,
+        factors, strengths, weaknesses, improvement_suggestions
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class ModelMetricsStore:
     """
     Storage for ML model metrics and performance data.
     
     Uses SQLite for structured storage (can be replaced with PostgreSQL for production).
+    The connection lives on a single worker thread; async methods hand their
+    SQL to it, so concurrent callers are serialized without blocking the loop.
     """
     
     def __init__(
@@ -64,14 +148,42 @@ class ModelMetricsStore:
             storage_path.mkdir(parents=True, exist_ok=True)
             self.db_path = str(storage_path / "metrics.db")
         
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-sqlite")
+        self.conn = self._executor.submit(self._connect).result()
+        self._executor.submit(self._init_tables).result()
+        
+        self._row_builders: Dict[MetricType, Callable[[MetricsWriteRequest], Tuple[str, tuple, Dict[str, Any]]]] = {
+            MetricType.RETENTION: self._retention_row,
+            MetricType.ENGAGEMENT: self._engagement_row,
+            MetricType.VIEWER_BEHAVIOR: self._viewer_behavior_row,
+            MetricType.ENGINE_PERFORMANCE: self._engine_performance_row,
+            MetricType.SATELLITE_PERFORMANCE: self._satellite_performance_row,
+            MetricType.LEARNING_SCORE: self._meta_learning_score_row,
+        }
         
-        self._init_tables()
         logger.info(f"ModelMetricsStore initialized: {self.db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the connection (on the store thread) and apply the pragmas."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the store thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+    
+    def _execute_writes(self, statements: List[Tuple[str, List[tuple]]]):
+        """executemany each (sql, rows) pair in one transaction (store thread)."""
+        with self.conn:
+            for sql, rows in statements:
+                self.conn.executemany(sql, rows)
+    
     def _init_tables(self):
-        """Initialize database tables."""
+        """Initialize database tables (store thread)."""
         cursor = self.conn.cursor()
         
         # Retention metrics
@@ -83,7 +195,7 @@ class ModelMetricsStore:
                 channel_type TEXT NOT NULL,
                 avg_watch_time_sec REAL,
                 avg_watch_percentage REAL,
-                retention_curve TEXT,
+                retention_curve BLOB,
                 drop_off_points TEXT,
                 peak_rewatch_time INTEGER,
                 completion_rate REAL,
@@ -222,6 +334,81 @@ class ModelMetricsStore:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_meta_learning_content ON meta_learning_scores(content_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_snapshots_date ON daily_snapshots(snapshot_date)")
         
+        # Hour-of-week engagement rollup: one row per (platform, channel_type,
+        # day, hour), kept current by triggers on engagement_metrics so it
+        # always covers the whole history
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS engagement_hour_of_week (
+                platform TEXT NOT NULL,
+                channel_type TEXT NOT NULL,
+                day_of_week INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                samples INTEGER NOT NULL DEFAULT 0,
+                engagement_rate_sum REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (platform, channel_type, day_of_week, hour)
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_engagement_hour_of_week_insert
+            AFTER INSERT ON engagement_metrics
+            BEGIN
+                INSERT INTO engagement_hour_of_week (
+                    platform, channel_type, day_of_week, hour, samples, engagement_rate_sum
+                ) VALUES (
+                    NEW.platform, NEW.channel_type,
+                    CAST(strftime('%w', NEW.measured_at) AS INTEGER),
+                    CAST(strftime('%H', NEW.measured_at) AS INTEGER),
+                    1, COALESCE(NEW.engagement_rate, 0)
+                )
+                ON CONFLICT (platform, channel_type, day_of_week, hour) DO UPDATE SET
+                    samples = samples + 1,
+                    engagement_rate_sum = engagement_rate_sum + excluded.engagement_rate_sum;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_engagement_hour_of_week_delete
+            AFTER DELETE ON engagement_metrics
+            BEGIN
+                UPDATE engagement_hour_of_week SET
+                    samples = samples - 1,
+                    engagement_rate_sum = engagement_rate_sum - COALESCE(OLD.engagement_rate, 0)
+                WHERE platform = OLD.platform
+                    AND channel_type = OLD.channel_type
+                    AND day_of_week = CAST(strftime('%w', OLD.measured_at) AS INTEGER)
+                    AND hour = CAST(strftime('%H', OLD.measured_at) AS INTEGER);
+            END
+        """)
+        
+        # Per-stage watermarks (last processed row id) and running state of
+        # incremental pipelines
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_watermarks (
+                pipeline TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                last_row_id INTEGER NOT NULL DEFAULT 0,
+                state TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (pipeline, stage)
+            )
+        """)
+        
+        # Databases created before the rollup existed: build it once from history
+        has_rollup = cursor.execute("SELECT 1 FROM engagement_hour_of_week LIMIT 1").fetchone()
+        if not has_rollup:
+            cursor.execute("""
+                INSERT INTO engagement_hour_of_week (
+                    platform, channel_type, day_of_week, hour, samples, engagement_rate_sum
+                )
+                SELECT
+                    platform, channel_type,
+                    CAST(strftime('%w', measured_at) AS INTEGER),
+                    CAST(strftime('%H', measured_at) AS INTEGER),
+                    COUNT(*), SUM(COALESCE(engagement_rate, 0))
+                FROM engagement_metrics
+                WHERE measured_at IS NOT NULL
+                GROUP BY 1, 2, 3, 4
+            """)
+        
         self.conn.commit()
         logger.info("Database tables initialized")
     
@@ -234,28 +421,21 @@ class ModelMetricsStore:
         
         Args:
             request: Metrics write request
-            
+        
         Returns:
             Result dict
         """
         try:
-            if request.metric_type == MetricType.RETENTION:
-                return await self._write_retention_metrics(request)
-            elif request.metric_type == MetricType.ENGAGEMENT:
-                return await self._write_engagement_metrics(request)
-            elif request.metric_type == MetricType.VIEWER_BEHAVIOR:
-                return await self._write_viewer_behavior(request)
-            elif request.metric_type == MetricType.ENGINE_PERFORMANCE:
-                return await self._write_engine_performance(request)
-            elif request.metric_type == MetricType.SATELLITE_PERFORMANCE:
-                return await self._write_satellite_performance(request)
-            elif request.metric_type == MetricType.LEARNING_SCORE:
-                return await self._write_meta_learning_score(request)
-            else:
+            builder = self._row_builders.get(request.metric_type)
+            if builder is None:
                 return {
                     "success": False,
                     "error": f"Unknown metric type: {request.metric_type}"
                 }
+            
+            sql, row, result = builder(request)
+            await self._run(self._execute_writes, [(sql, [row])])
+            return result
         except Exception as e:
             logger.error(f"Failed to write metrics: {e}")
             return {
@@ -263,52 +443,80 @@ class ModelMetricsStore:
                 "error": str(e)
             }
     
-    async def _write_retention_metrics(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write retention metrics."""
+    async def write_metrics_batch(
+        self,
+        requests: List[MetricsWriteRequest]
+    ) -> Dict[str, Any]:
+        """
+        Write many metrics in one transaction.
+        
+        Rows are grouped per table and inserted with executemany; either all
+        of them are stored or none (an unknown metric type rejects the batch).
+        
+        Args:
+            requests: Metrics write requests (any mix of metric types)
+        
+        Returns:
+            Result dict with the number of rows written per metric type
+        """
+        try:
+            grouped: Dict[str, List[tuple]] = {}
+            counts: Dict[str, int] = defaultdict(int)
+            
+            for request in requests:
+                builder = self._row_builders.get(request.metric_type)
+                if builder is None:
+                    return {
+                        "success": False,
+                        "error": f"Unknown metric type: {request.metric_type}"
+                    }
+                
+                sql, row, result = builder(request)
+                grouped.setdefault(sql, []).append(row)
+                counts[result["metric_type"]] += 1
+            
+            if grouped:
+                await self._run(self._execute_writes, list(grouped.items()))
+            
+            return {
+                "success": True,
+                "written": len(requests),
+                "counts": dict(counts)
+            }
+        except Exception as e:
+            logger.error(f"Failed to write metrics batch: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _retention_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Retention metrics row."""
         data = request.data
-        cursor = self.conn.cursor()
+        curve = data.get("retention_curve")
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO retention_metrics (
-                content_id, platform, channel_type,
-                avg_watch_time_sec, avg_watch_percentage,
-                retention_curve, drop_off_points,
-                peak_rewatch_time, completion_rate, rewatch_rate
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return RETENTION_INSERT, (
             request.content_id,
             request.platform.value if request.platform else data.get("platform"),
             request.channel_type.value if request.channel_type else data.get("channel_type"),
             data.get("avg_watch_time_sec"),
             data.get("avg_watch_percentage"),
-            json.dumps(data.get("retention_curve", [])),
+            encode_curve(curve) if curve is not None and len(curve) else None,
             json.dumps(data.get("drop_off_points", [])),
             data.get("peak_rewatch_time"),
             data.get("completion_rate"),
             data.get("rewatch_rate")
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "retention",
             "content_id": request.content_id
         }
     
-    async def _write_engagement_metrics(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write engagement metrics."""
+    def _engagement_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Engagement metrics row."""
         data = request.data
-        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO engagement_metrics (
-                content_id, platform, channel_type,
-                views, likes, comments, shares, saves,
-                ctr, engagement_rate, save_rate,
-                views_velocity, engagement_velocity
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return ENGAGEMENT_INSERT, (
             request.content_id,
             request.platform.value if request.platform else data.get("platform"),
             request.channel_type.value if request.channel_type else data.get("channel_type"),
@@ -322,29 +530,17 @@ class ModelMetricsStore:
             data.get("save_rate"),
             data.get("views_velocity"),
             data.get("engagement_velocity")
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "engagement",
             "content_id": request.content_id
         }
     
-    async def _write_viewer_behavior(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write viewer behavior metrics."""
+    def _viewer_behavior_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Viewer behavior metrics row."""
         data = request.data
-        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO viewer_behavior (
-                content_id, platform,
-                avg_session_duration, bounce_rate, return_viewer_rate,
-                avg_time_to_first_interaction, avg_time_to_like, avg_time_to_comment,
-                mobile_vs_desktop, time_of_day_distribution
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return VIEWER_BEHAVIOR_INSERT, (
             request.content_id,
             request.platform.value if request.platform else data.get("platform"),
             data.get("avg_session_duration"),
@@ -355,29 +551,17 @@ class ModelMetricsStore:
             data.get("avg_time_to_comment"),
             json.dumps(data.get("mobile_vs_desktop", {})),
             json.dumps(data.get("time_of_day_distribution", {}))
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "viewer_behavior",
             "content_id": request.content_id
         }
     
-    async def _write_engine_performance(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write engine performance metrics."""
+    def _engine_performance_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Engine performance metrics row."""
         data = request.data
-        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO engine_performance (
-                engine_name, predictions_made, predictions_correct,
-                accuracy, mae, rmse,
-                best_predictions, worst_predictions,
-                avg_inference_time_ms
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return ENGINE_PERFORMANCE_INSERT, (
             data.get("engine_name"),
             data.get("predictions_made"),
             data.get("predictions_correct"),
@@ -387,30 +571,17 @@ class ModelMetricsStore:
             json.dumps(data.get("best_predictions", [])),
             json.dumps(data.get("worst_predictions", [])),
             data.get("avg_inference_time_ms")
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "engine_performance",
             "engine_name": data.get("engine_name")
         }
     
-    async def _write_satellite_performance(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write satellite performance metrics."""
+    def _satellite_performance_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Satellite performance metrics row."""
         data = request.data
-        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO satellite_performance (
-                satellite_account_id, platform,
-                followers_start, followers_end, followers_growth, followers_growth_rate,
-                posts_count, avg_views, avg_engagement_rate, avg_retention,
-                top_content_ids, cost_per_follower, roi,
-                period_start, period_end
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return SATELLITE_PERFORMANCE_INSERT, (
             data.get("satellite_account_id"),
             request.platform.value if request.platform else data.get("platform"),
             data.get("followers_start"),
@@ -426,28 +597,17 @@ class ModelMetricsStore:
             data.get("roi"),
             data.get("period_start"),
             data.get("period_end")
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "satellite_performance",
             "satellite_account_id": data.get("satellite_account_id")
         }
     
-    async def _write_meta_learning_score(self, request: MetricsWriteRequest) -> Dict[str, Any]:
-        """Write meta-learning score."""
+    def _meta_learning_score_row(self, request: MetricsWriteRequest) -> Tuple[str, tuple, Dict[str, Any]]:
+        """Meta-learning score row."""
         data = request.data
-        cursor = self.conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO meta_learning_scores (
-                content_id, overall_score,
-                retention_score, engagement_score, virality_score, brand_alignment_score,
-                factors, strengths, weaknesses, improvement_suggestions
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return META_LEARNING_SCORE_INSERT, (
             request.content_id,
             data.get("overall_score"),
             data.get("retention_score"),
@@ -458,11 +618,7 @@ class ModelMetricsStore:
             json.dumps(data.get("strengths", [])),
             json.dumps(data.get("weaknesses", [])),
             json.dumps(data.get("improvement_suggestions", []))
-        ))
-        
-        self.conn.commit()
-        
-        return {
+        ), {
             "success": True,
             "metric_type": "meta_learning_score",
             "content_id": request.content_id
@@ -477,28 +633,19 @@ class ModelMetricsStore:
         
         Args:
             request: Metrics read request
-            
+        
         Returns:
             Metrics data
         """
         try:
-            results = {}
-            
-            if not request.metric_types or MetricType.RETENTION in request.metric_types:
-                results["retention"] = await self._read_retention_metrics(request)
-            
-            if not request.metric_types or MetricType.ENGAGEMENT in request.metric_types:
-                results["engagement"] = await self._read_engagement_metrics(request)
-            
-            if not request.metric_types or MetricType.LEARNING_SCORE in request.metric_types:
-                results["learning_scores"] = await self._read_meta_learning_scores(request)
+            results = await self._run(self._read_metrics, request)
             
             return {
                 "success": True,
                 "metrics": results,
                 "count": sum(len(v) for v in results.values() if isinstance(v, list))
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to read metrics: {e}")
             return {
@@ -506,13 +653,82 @@ class ModelMetricsStore:
                 "error": str(e)
             }
     
-    async def _read_retention_metrics(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
-        """Read retention metrics."""
-        cursor = self.conn.cursor()
+    def _read_metrics(self, request: MetricsReadRequest) -> Dict[str, List[Dict[str, Any]]]:
+        """All requested metric types (store thread)."""
+        results = {}
+        
+        if not request.metric_types or MetricType.RETENTION in request.metric_types:
+            results["retention"] = self._read_retention_metrics(request)
+        
+        if not request.metric_types or MetricType.ENGAGEMENT in request.metric_types:
+            results["engagement"] = self._read_engagement_metrics(request)
         
-        query = "SELECT * FROM retention_metrics WHERE 1=1"
+        if not request.metric_types or MetricType.LEARNING_SCORE in request.metric_types:
+            results["learning_scores"] = self._read_meta_learning_scores(request)
+        
+        return results
+    
+    async def read_retention_curves(
+        self,
+        request: MetricsReadRequest
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        Read retention rows with their curves as one matrix.
+        
+        Args:
+            request: Metrics read request (content_ids / platform /
+                date_from / date_to on measured_at / limit)
+        
+        Returns:
+            (rows without "retention_curve", (len(rows), CURVE_POINTS) float32
+            matrix); rows without a curve are left out
+        """
+        return await self._run(self._read_retention_curves, request)
+    
+    def _read_retention_curves(self, request: MetricsReadRequest) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Retention rows and curve matrix (store thread)."""
+        # Legacy rows stored a missing curve as the JSON text '[]'
+        condition = "retention_curve IS NOT NULL AND retention_curve != '[]'"
         params = []
         
+        if request.date_from:
+            condition += " AND date(measured_at) >= ?"
+            params.append(request.date_from.isoformat())
+        
+        if request.date_to:
+            condition += " AND date(measured_at) <= ?"
+            params.append(request.date_to.isoformat())
+        
+        rows = self._select_retention_rows(request, condition, params)
+        curves = decode_curve_matrix([row.pop("retention_curve") for row in rows])
+        
+        # Drop curves that decode to NaN (empty or non-finite legacy values)
+        valid = np.isfinite(curves).all(axis=1)
+        if not valid.all():
+            rows = [row for row, keep in zip(rows, valid) if keep]
+            curves = curves[valid]
+        return rows, curves
+    
+    def _read_retention_metrics(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
+        """Read retention metrics (curves decoded to CURVE_POINTS-long lists)."""
+        rows = self._select_retention_rows(request)
+        for row in rows:
+            if row["retention_curve"] is not None:
+                row["retention_curve"] = decode_curve(row["retention_curve"]).tolist()
+        return rows
+    
+    def _select_retention_rows(
+        self,
+        request: MetricsReadRequest,
+        condition: str = "1=1",
+        condition_params: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Raw retention rows matching the request."""
+        cursor = self.conn.cursor()
+        
+        query = f"SELECT * FROM retention_metrics WHERE {condition}"
+        params = list(condition_params or [])
+        
         if request.content_ids:
             placeholders = ",".join("?" * len(request.content_ids))
             query += f" AND content_id IN ({placeholders})"
@@ -529,7 +745,7 @@ class ModelMetricsStore:
         
         return [dict(row) for row in rows]
     
-    async def _read_engagement_metrics(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
+    def _read_engagement_metrics(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
         """Read engagement metrics."""
         cursor = self.conn.cursor()
         
@@ -552,7 +768,7 @@ class ModelMetricsStore:
         
         return [dict(row) for row in rows]
     
-    async def _read_meta_learning_scores(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
+    def _read_meta_learning_scores(self, request: MetricsReadRequest) -> List[Dict[str, Any]]:
         """Read meta-learning scores."""
         cursor = self.conn.cursor()
         
@@ -571,15 +787,124 @@ class ModelMetricsStore:
         
         return [dict(row) for row in rows]
     
+    async def read_hour_of_week_engagement(
+        self,
+        platform: Platform,
+        channel_type: ChannelType
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the hour-of-week engagement rollup (all history).
+        
+        Args:
+            platform: Platform
+            channel_type: Channel type
+        
+        Returns:
+            Up to 168 dicts with day (name), day_of_week (0 = Sunday), hour,
+            samples and engagement_rate_sum
+        """
+        rows = await self._run(self._read_hour_of_week_engagement, platform.value, channel_type.value)
+        return [{**row, "day": DAY_NAMES[row["day_of_week"]]} for row in rows]
+    
+    def _read_hour_of_week_engagement(self, platform: str, channel_type: str) -> List[Dict[str, Any]]:
+        """Rollup cells with samples (store thread)."""
+        cursor = self.conn.execute("""
+            SELECT day_of_week, hour, samples, engagement_rate_sum
+            FROM engagement_hour_of_week
+            WHERE platform = ? AND channel_type = ? AND samples > 0
+        """, (platform, channel_type))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    async def read_metrics_since(
+        self,
+        metric_type: MetricType,
+        after_row_id: int,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Read rows written after a watermark, oldest first.
+        
+        Row ids only grow (AUTOINCREMENT), so a replaced row comes back
+        as a new one.
+        
+        Args:
+            metric_type: RETENTION or ENGAGEMENT
+            after_row_id: Last row id already processed
+            limit: Max rows
+        
+        Returns:
+            Row dicts including "id" (retention curves decoded)
+        """
+        table = {
+            MetricType.RETENTION: "retention_metrics",
+            MetricType.ENGAGEMENT: "engagement_metrics",
+        }[metric_type]
+        return await self._run(self._read_metrics_since, table, after_row_id, limit)
+    
+    def _read_metrics_since(self, table: str, after_row_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Rows with id > after_row_id (store thread)."""
+        cursor = self.conn.execute(
+            f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+            (after_row_id, limit)
+        )
+        rows = [dict(row) for row in cursor.fetchall()]
+        if table == "retention_metrics":
+            for row in rows:
+                if row["retention_curve"] is not None:
+                    row["retention_curve"] = decode_curve(row["retention_curve"]).tolist()
+        return rows
+    
+    async def get_watermark(self, pipeline: str, stage: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(last processed row id, saved state) of a pipeline stage; (0, None) if never run."""
+        row = await self._run(lambda: self.conn.execute(
+            "SELECT last_row_id, state FROM pipeline_watermarks WHERE pipeline = ? AND stage = ?",
+            (pipeline, stage)
+        ).fetchone())
+        if row is None:
+            return 0, None
+        return row["last_row_id"], json.loads(row["state"]) if row["state"] else None
+    
+    async def set_watermark(
+        self,
+        pipeline: str,
+        stage: str,
+        last_row_id: int,
+        state: Optional[Dict[str, Any]] = None
+    ):
+        """Save a stage's watermark together with its running state (one transaction)."""
+        await self._run(self._execute_writes, [(
+            """
+            INSERT OR REPLACE INTO pipeline_watermarks (pipeline, stage, last_row_id, state, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            [(pipeline, stage, last_row_id, json.dumps(state) if state is not None else None)]
+        )])
+    
     async def write_daily_snapshot(
         self,
         snapshot: DailySnapshot
     ) -> Dict[str, Any]:
         """Write daily snapshot."""
         try:
-            cursor = self.conn.cursor()
+            await self._run(self._write_daily_snapshot, snapshot)
             
-            cursor.execute("""
+            return {
+                "success": True,
+                "snapshot_id": snapshot.snapshot_id,
+                "snapshot_date": snapshot.snapshot_date.isoformat()
+            }
+        
+        except Exception as e:
+            logger.error(f"Failed to write daily snapshot: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _write_daily_snapshot(self, snapshot: DailySnapshot):
+        """Insert or replace a daily snapshot (store thread)."""
+        with self.conn:
+            self.conn.execute("""
                 INSERT OR REPLACE INTO daily_snapshots (
                     snapshot_date, snapshot_id,
                     total_content_analyzed, total_views, total_engagement,
@@ -604,21 +929,6 @@ class ModelMetricsStore:
                 json.dumps(snapshot.insights),
                 json.dumps(snapshot.recommendations)
             ))
-            
-            self.conn.commit()
-            
-            return {
-                "success": True,
-                "snapshot_id": snapshot.snapshot_id,
-                "snapshot_date": snapshot.snapshot_date.isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to write daily snapshot: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
     
     async def read_daily_snapshots(
         self,
@@ -627,6 +937,29 @@ class ModelMetricsStore:
         limit: int = 30
     ) -> List[DailySnapshot]:
         """Read daily snapshots."""
+        rows = await self._run(self._read_daily_snapshot_rows, start_date, end_date, limit)
+        
+        snapshots = []
+        for row_dict in rows:
+            # Parse JSON fields
+            row_dict["best_content_ids"] = json.loads(row_dict["best_content_ids"])
+            row_dict["best_patterns"] = json.loads(row_dict["best_patterns"])
+            row_dict["satellite_metrics"] = json.loads(row_dict["satellite_metrics"])
+            row_dict["engine_metrics"] = json.loads(row_dict["engine_metrics"])
+            row_dict["insights"] = json.loads(row_dict["insights"])
+            row_dict["recommendations"] = json.loads(row_dict["recommendations"])
+            
+            snapshots.append(DailySnapshot(**row_dict))
+        
+        return snapshots
+    
+    def _read_daily_snapshot_rows(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Daily snapshot rows as dicts (store thread)."""
         cursor = self.conn.cursor()
         
         query = "SELECT * FROM daily_snapshots WHERE 1=1"
@@ -643,25 +976,12 @@ class ModelMetricsStore:
         query += f" ORDER BY snapshot_date DESC LIMIT {limit}"
         
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        snapshots = []
-        for row in rows:
-            row_dict = dict(row)
-            # Parse JSON fields
-            row_dict["best_content_ids"] = json.loads(row_dict["best_content_ids"])
-            row_dict["best_patterns"] = json.loads(row_dict["best_patterns"])
-            row_dict["satellite_metrics"] = json.loads(row_dict["satellite_metrics"])
-            row_dict["engine_metrics"] = json.loads(row_dict["engine_metrics"])
-            row_dict["insights"] = json.loads(row_dict["insights"])
-            row_dict["recommendations"] = json.loads(row_dict["recommendations"])
-            
-            snapshots.append(DailySnapshot(**row_dict))
-        
-        return snapshots
+        return [dict(row) for row in cursor.fetchall()]
     
     def close(self):
         """Close database connection."""
         if self.conn:
-            self.conn.close()
+            self._executor.submit(self.conn.close).result()
+            self.conn = None
             logger.info("Database connection closed")
+        self._executor.shutdown(wait=True)
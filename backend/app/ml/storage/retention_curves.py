@@ -0,0 +1,194 @@
+"""
+Retention Curves - fixed-length curve encoding and shape clustering
+
+Retention curves arrive with one point per second, so their lengths differ
+from clip to clip. They are stored resampled over the relative position in
+the video (0 = start, 1 = end) to CURVE_POINTS float32 values, as one BLOB per
+row; a batch of rows decodes into an (n, CURVE_POINTS) matrix with a single
+np.frombuffer.
+
+Features:
+- resample_curve / encode_curve / decode_curve (legacy JSON text decodes too)
+- Mini-batch k-means (k-means++ seeding) over the curve matrix, vectorized
+- Drop-off archetypes per cluster centroid (hook drop, mid/late drop,
+  steady decline, strong hold)
+"""
+
+from typing import Any, Dict, Iterable, Tuple, Union
+import json
+
+import numpy as np
+
+CURVE_POINTS = 64
+CURVE_DTYPE = np.float32
+
+ARCHETYPE_NAMES = {
+    "strong_hold": "Strong Hold",
+    "hook_drop": "Hook Drop-off",
+    "mid_drop": "Mid-video Drop-off",
+    "late_drop": "Late Drop-off",
+    "steady_decline": "Steady Decline",
+}
+
+
+def resample_curve(curve: Iterable[float], points: int = CURVE_POINTS) -> np.ndarray:
+    """Linearly resample a curve to `points` values over its relative position."""
+    curve = np.asarray(curve, dtype=np.float64).ravel()
+    if len(curve) == 0:
+        return np.full(points, np.nan, dtype=CURVE_DTYPE)
+    if len(curve) == 1:
+        return np.full(points, curve[0], dtype=CURVE_DTYPE)
+    
+    return np.interp(
+        np.linspace(0.0, 1.0, points),
+        np.linspace(0.0, 1.0, len(curve)),
+        curve
+    ).astype(CURVE_DTYPE)
+
+
+def encode_curve(curve: Iterable[float], points: int = CURVE_POINTS) -> bytes:
+    """Resampled float32 curve as a BLOB."""
+    return resample_curve(curve, points).tobytes()
+
+
+def decode_curve(value: Union[bytes, str, None], points: int = CURVE_POINTS) -> np.ndarray:
+    """Curve from a BLOB, or from legacy JSON text (resampled)."""
+    if value is None:
+        return np.full(points, np.nan, dtype=CURVE_DTYPE)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        curve = np.frombuffer(value, dtype=CURVE_DTYPE)
+        return curve if len(curve) == points else resample_curve(curve, points)
+    return resample_curve(json.loads(value), points)
+
+
+def decode_curve_matrix(values: Iterable[Union[bytes, str, None]], points: int = CURVE_POINTS) -> np.ndarray:
+    """(n, points) matrix; one frombuffer when every value is a current BLOB."""
+    values = list(values)
+    if all(isinstance(v, bytes) and len(v) == points * CURVE_DTYPE().itemsize for v in values):
+        return np.frombuffer(b"".join(values), dtype=CURVE_DTYPE).reshape(len(values), points)
+    return np.stack([decode_curve(v, points) for v in values]) if values else np.zeros((0, points), dtype=CURVE_DTYPE)
+
+
+def _squared_distances(X: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """(n, k) squared L2 distances."""
+    return (
+        np.einsum("ij,ij->i", X, X)[:, None]
+        - 2.0 * (X @ centers.T)
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+
+
+def _kmeans_plus_plus(X: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centers = [X[rng.integers(len(X))]]
+    closest = _squared_distances(X, centers[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            break
+        idx = rng.choice(len(X), p=np.maximum(closest, 0) / total)
+        centers.append(X[idx])
+        closest = np.minimum(closest, _squared_distances(X, X[idx][None, :])[:, 0])
+    return np.array(centers, dtype=np.float64)
+
+
+def mini_batch_kmeans(
+    X: np.ndarray,
+    k: int,
+    batch_size: int = 1024,
+    max_iter: int = 100,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mini-batch k-means (Sculley, 2010) over the rows of X.
+    
+    Each step assigns one random batch to its nearest centres with a single
+    matrix product and moves every centre toward the mean of its batch points
+    with a per-centre learning rate (1 / points seen). A final full pass
+    assigns every row.
+    
+    Args:
+        X: (n, d) data
+        k: Clusters (capped at the number of distinct rows)
+        batch_size: Rows per step
+        max_iter: Steps
+        seed: Random seed
+    
+    Returns:
+        (centers (k', d), labels (n,))
+    """
+    X = np.asarray(X, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    
+    centers = _kmeans_plus_plus(X, min(k, len(X)), rng)
+    counts = np.zeros(len(centers))
+    
+    if len(X) > batch_size:
+        for _ in range(max_iter):
+            batch = X[rng.integers(len(X), size=batch_size)]
+            labels = _squared_distances(batch, centers).argmin(axis=1)
+            
+            batch_counts = np.bincount(labels, minlength=len(centers))
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, batch)
+            
+            hit = batch_counts > 0
+            counts[hit] += batch_counts[hit]
+            rate = (batch_counts[hit] / counts[hit])[:, None]
+            centers[hit] = (1 - rate) * centers[hit] + rate * (sums[hit] / batch_counts[hit][:, None])
+    else:
+        # Small inputs: plain Lloyd iterations on the whole matrix
+        for _ in range(max_iter):
+            labels = _squared_distances(X, centers).argmin(axis=1)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, X)
+            batch_counts = np.bincount(labels, minlength=len(centers))
+            hit = batch_counts > 0
+            updated = centers.copy()
+            updated[hit] = sums[hit] / batch_counts[hit][:, None]
+            if np.allclose(updated, centers):
+                break
+            centers = updated
+    
+    labels = _squared_distances(X, centers).argmin(axis=1)
+    return centers, labels
+
+
+def curve_archetype(centroid: np.ndarray) -> Dict[str, Any]:
+    """
+    Drop-off archetype of a retention curve shape.
+    
+    Looks at when the curve has lost half of its audience loss (the drop-off
+    position) and how concentrated the loss is: within the first tenth
+    (hook), mostly inside one quarter of the video later on (mid / late
+    drop), spread over the video (steady decline), or hardly any loss at all
+    (strong hold).
+    """
+    c = np.asarray(centroid, dtype=np.float64)
+    n = len(c)
+    total_loss = float(c[0] - c[-1])
+    half_lost = int(np.argmax(c[0] - c >= 0.5 * total_loss)) if total_loss > 0 else 0
+    drop_off_position = round(half_lost / (n - 1), 2)
+    
+    quarter = max(1, n // 4)
+    concentration = float((c[:-quarter] - c[quarter:]).max() / total_loss) if total_loss > 0 else 0.0
+    
+    if total_loss < 0.25:
+        archetype = "strong_hold"
+    elif drop_off_position <= 0.1:
+        archetype = "hook_drop"
+    elif concentration >= 0.5:
+        archetype = "late_drop" if drop_off_position >= 0.6 else "mid_drop"
+    else:
+        archetype = "steady_decline"
+    
+    quartiles = [c[int(round(q * (n - 1)))] for q in (0.25, 0.5, 0.75)]
+    return {
+        "archetype": archetype,
+        "name": ARCHETYPE_NAMES[archetype],
+        "drop_off_position": drop_off_position,
+        "total_drop": round(total_loss, 4),
+        "retention_at_25": round(float(quartiles[0]), 4),
+        "retention_at_50": round(float(quartiles[1]), 4),
+        "retention_at_75": round(float(quartiles[2]), 4),
+        "final_retention": round(float(c[-1]), 4),
+    }
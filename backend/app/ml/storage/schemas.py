@@ -24,6 +24,13 @@ class EmbeddingType(str, Enum):
     AUDIO_FEATURE = "audio_feature"
 
 
+class IndexType(str, Enum):
+    """FAISS index families for an embedding type."""
+    FLAT = "flat"  # Exact brute-force scan
+    IVF = "ivf"    # Inverted lists (trained once train_threshold is reached)
+    HNSW = "hnsw"  # Graph index (deletes are tombstoned until compaction)
+
+
 class ContentSource(str, Enum):
     """Source of the content."""
     VISION_ENGINE = "vision_engine"
@@ -139,6 +146,33 @@ class SimilaritySearchResponse(BaseModel):
     index_used: str
 
 
+class BatchSimilaritySearchRequest(BaseModel):
+    """Request for similarity search with many query vectors at once."""
+    query_vectors: List[List[float]]
+    embedding_type: EmbeddingType
+    top_k: int = 10
+    
+    # Filters (shared by every query)
+    filters: Dict[str, Any] = Field(default_factory=dict)
+    
+    # Options
+    include_metadata: bool = True
+    include_distances: bool = True
+    min_score: Optional[float] = None  # Minimum similarity score
+
+
+class BatchSimilaritySearchResponse(BaseModel):
+    """Response from batched similarity search."""
+    query_type: EmbeddingType
+    results: List[List[SimilaritySearchResult]]  # One list per query vector, in request order
+    total_queries: int
+    search_time_ms: float
+    
+    # Search metadata
+    filters_applied: Dict[str, Any] = Field(default_factory=dict)
+    index_used: str
+
+
 class BatchEmbeddingRequest(BaseModel):
     """Request for batch embedding storage."""
     embeddings: List[StoredEmbedding]
@@ -165,6 +199,24 @@ class BatchEmbeddingResponse(BaseModel):
     errors: Dict[str, str] = Field(default_factory=dict)
 
 
+class IndexConfig(BaseModel):
+    """FAISS index configuration for one embedding type."""
+    index_type: IndexType = IndexType.FLAT
+    
+    # IVF
+    train_threshold: int = 10_000  # Stay flat (exact) until this many vectors
+    nlist: Optional[int] = None  # Inverted lists (None = 4 * sqrt(n) at training time)
+    nprobe: int = 16  # Lists visited per query
+    
+    # HNSW
+    hnsw_m: int = 32  # Graph neighbours per node
+    ef_construction: int = 80
+    ef_search: int = 64  # Candidate list size per query
+    
+    # HNSW deleted vectors tolerated (fraction of the index) before a rebuild
+    max_tombstone_ratio: float = 0.2
+
+
 class IndexStats(BaseModel):
     """Statistics for an embedding index."""
     index_name: str
@@ -281,6 +281,7 @@ class BestTimeToPost(BaseModel):
     # Performance by time
     hourly_performance: Dict[int, float]  # hour -> avg_engagement_rate
     daily_performance: Dict[str, float]  # day -> avg_engagement_rate
+    hour_of_week_performance: Dict[int, float] = Field(default_factory=dict)  # day * 24 + hour (Monday = 0) -> avg_engagement_rate
     
     # Confidence
     confidence: float
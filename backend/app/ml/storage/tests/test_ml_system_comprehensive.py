@@ -2,7 +2,7 @@
 Comprehensive tests for ML Storage & Learning System
 
 Tests:
-- EmbeddingsStore (FAISS backend)
+- EmbeddingsStore (FAISS and mmap backends)
 - ModelMetricsStore
 - MetricsAggregator
 - DailyLearningPipeline
@@ -31,8 +31,11 @@ from backend.app.ml.storage.schemas import (
     EmbeddingMetadata,
     ContentSource,
     SimilaritySearchRequest,
+    BatchSimilaritySearchRequest,
     BatchEmbeddingRequest,
-    EmbeddingDeletionRequest
+    EmbeddingDeletionRequest,
+    IndexConfig,
+    IndexType
 )
 
 from backend.app.ml.storage.schemas_metrics import (
@@ -55,11 +58,13 @@ def temp_storage_dir():
 @pytest.fixture
 def embeddings_store(temp_storage_dir):
     """Create EmbeddingsStore instance."""
-    return EmbeddingsStore(
+    store = EmbeddingsStore(
         backend="faiss",
         storage_path=temp_storage_dir,
         dimension=512
     )
+    yield store
+    store.close()
 
 
 @pytest.fixture
@@ -240,6 +245,337 @@ async def test_update_embedding_metadata(embeddings_store):
     assert "views" in result["updated_fields"]
 
 
+def _visual_embedding(i: int) -> StoredEmbedding:
+    rng = np.random.default_rng(i)
+    return StoredEmbedding(
+        embedding_id=f"wal_{i:03d}",
+        embedding_type=EmbeddingType.CLIP_VISUAL,
+        vector=rng.standard_normal(512).astype(np.float32).tolist(),
+        dimension=512,
+        metadata=EmbeddingMetadata(
+            content_id=f"content_wal_{i:03d}",
+            content_type="video",
+            source=ContentSource.VISION_ENGINE,
+            views=i
+        )
+    )
+
+
+def _reopen(temp_storage_dir: str, **kwargs) -> EmbeddingsStore:
+    return EmbeddingsStore(
+        backend="faiss",
+        storage_path=temp_storage_dir,
+        dimension=512,
+        background_flush=False,
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_embedding_appends_to_log(temp_storage_dir):
+    """Test inserts append one log record each instead of rewriting state."""
+    store = _reopen(temp_storage_dir)
+    
+    for i in range(5):
+        await store.store_embedding(_visual_embedding(i))
+    store.flush()
+    
+    storage = Path(temp_storage_dir)
+    segments = list((storage / "wal").glob("*.log"))
+    assert len(segments) == 1
+    assert len(segments[0].read_text().splitlines()) == 5
+    assert not (storage / "metadata.json").exists()
+    assert not list(storage.glob("checkpoint-*"))
+    assert store.get_stats()["log_records_pending"] == 5
+
+
+@pytest.mark.asyncio
+async def test_embeddings_recovered_from_log_after_crash(temp_storage_dir):
+    """Test a store that never checkpointed is rebuilt by replaying its log."""
+    store = _reopen(temp_storage_dir)
+    
+    for i in range(3):
+        await store.store_embedding(_visual_embedding(i))
+    await store.update_embedding("wal_001", {"views": 5000})
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_002"],
+        confirm_deletion=True
+    ))
+    store.flush()  # No close(): simulates the process dying here
+    
+    recovered = _reopen(temp_storage_dir)
+    
+    assert set(recovered.metadata_store) == {"wal_000", "wal_001"}
+    assert recovered.metadata_store["wal_001"].metadata.views == 5000
+    assert recovered.metadata_store["wal_001"].updated_at is not None
+    
+    response = await recovered.search_similar(SimilaritySearchRequest(
+        query_vector=_visual_embedding(1).vector,
+        embedding_type=EmbeddingType.CLIP_VISUAL,
+        top_k=3
+    ))
+    assert [r.embedding_id for r in response.results] == ["wal_001", "wal_000"]
+    assert response.results[0].distance < 1e-3
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_compacts_and_truncates_log(temp_storage_dir):
+    """Test a checkpoint drops covered log segments and deleted vectors."""
+    store = _reopen(temp_storage_dir)
+    
+    for i in range(6):
+        await store.store_embedding(_visual_embedding(i))
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_000"],
+        confirm_deletion=True
+    ))
+    assert store.checkpoint() is True
+    assert store.checkpoint() is False  # Nothing new
+    
+    # Writes after the checkpoint go to a fresh segment
+    await store.store_embedding(_visual_embedding(6))
+    store.close()
+    
+    storage = Path(temp_storage_dir)
+    assert (storage / "CURRENT").read_text() == "checkpoint-000000000008"
+    assert len(list(storage.glob("checkpoint-*"))) == 1
+    assert not any(segment.stat().st_size for segment in (storage / "wal").glob("*.log"))
+    
+    reopened = _reopen(temp_storage_dir)
+    
+    assert reopened.indices[EmbeddingType.CLIP_VISUAL].ntotal == 6
+    assert set(reopened.metadata_store) == {f"wal_{i:03d}" for i in range(1, 7)}
+    assert np.allclose(
+        reopened.metadata_store["wal_006"].vector,
+        _visual_embedding(6).vector
+    )
+    assert reopened.get_stats()["log_records_pending"] == 0
+
+
+async def _search_ids(store: EmbeddingsStore, vector, top_k: int = 5, **kwargs):
+    response = await store.search_similar(SimilaritySearchRequest(
+        query_vector=vector,
+        embedding_type=EmbeddingType.CLIP_VISUAL,
+        top_k=top_k,
+        **kwargs
+    ))
+    return [r.embedding_id for r in response.results]
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_vector_from_index(temp_storage_dir):
+    """Test deleted embeddings leave the FAISS index and never come back in searches."""
+    store = _reopen(temp_storage_dir)
+    for i in range(10):
+        await store.store_embedding(_visual_embedding(i))
+    
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_003", "wal_007"],
+        confirm_deletion=True
+    ))
+    
+    assert store.indices[EmbeddingType.CLIP_VISUAL].ntotal == 8
+    assert "wal_003" not in await _search_ids(store, _visual_embedding(3).vector, top_k=10)
+    assert (await _search_ids(store, _visual_embedding(4).vector, top_k=1)) == ["wal_004"]
+
+
+@pytest.mark.asyncio
+async def test_ivf_index_trained_at_threshold(temp_storage_dir):
+    """Test an IVF-configured type stays flat until train_threshold, then trains and persists."""
+    config = IndexConfig(index_type=IndexType.IVF, train_threshold=100, nlist=4, nprobe=4)
+    store = _reopen(temp_storage_dir, index_config=config)
+    
+    for i in range(99):
+        await store.store_embedding(_visual_embedding(i))
+    assert store.get_stats(EmbeddingType.CLIP_VISUAL)["index_type"] == "flat"
+    
+    await store.store_embedding(_visual_embedding(99))
+    assert store.get_stats(EmbeddingType.CLIP_VISUAL)["index_type"] == "ivf"
+    assert (await _search_ids(store, _visual_embedding(42).vector, top_k=1)) == ["wal_042"]
+    
+    await store.delete_embedding(EmbeddingDeletionRequest(embedding_ids=["wal_042"], confirm_deletion=True))
+    store.close()
+    
+    reopened = _reopen(temp_storage_dir, index_config=config)
+    assert reopened.get_stats(EmbeddingType.CLIP_VISUAL)["index_type"] == "ivf"
+    assert reopened.indices[EmbeddingType.CLIP_VISUAL].ntotal == 99
+    assert (await _search_ids(reopened, _visual_embedding(17).vector, top_k=1)) == ["wal_017"]
+
+
+@pytest.mark.asyncio
+async def test_hnsw_deletes_are_tombstoned_then_compacted(temp_storage_dir):
+    """Test HNSW deletes are hidden from searches and rebuilt away past the tombstone ratio."""
+    config = IndexConfig(index_type=IndexType.HNSW, hnsw_m=8, max_tombstone_ratio=0.2)
+    store = _reopen(temp_storage_dir, index_config=config)
+    for i in range(20):
+        await store.store_embedding(_visual_embedding(i))
+    
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_000", "wal_001"],
+        confirm_deletion=True
+    ))
+    assert store.get_stats(EmbeddingType.CLIP_VISUAL)["tombstones"] == 2
+    found = await _search_ids(store, _visual_embedding(0).vector, top_k=18)
+    assert len(found) == 18 and "wal_000" not in found
+    
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_002", "wal_003", "wal_004"],
+        confirm_deletion=True
+    ))
+    assert store.get_stats(EmbeddingType.CLIP_VISUAL)["tombstones"] == 0
+    assert store.indices[EmbeddingType.CLIP_VISUAL].ntotal == 15
+
+
+@pytest.mark.asyncio
+async def test_filtered_search_returns_top_k(temp_storage_dir):
+    """Test filters are applied before top_k is cut, even for rare matches."""
+    store = _reopen(temp_storage_dir)
+    for i in range(60):
+        embedding = _visual_embedding(i)
+        embedding.metadata.platform = "tiktok" if i % 20 == 0 else "instagram"
+        await store.store_embedding(embedding)
+    
+    found = await _search_ids(store, _visual_embedding(5).vector, top_k=3, filters={"platform": "tiktok"})
+    
+    assert sorted(found) == ["wal_000", "wal_020", "wal_040"]
+
+
+def _reopen_mmap(temp_storage_dir: str, **kwargs) -> EmbeddingsStore:
+    return EmbeddingsStore(
+        backend="mmap",
+        storage_path=temp_storage_dir,
+        dimension=512,
+        background_flush=False,
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_mmap_backend_store_search_delete(temp_storage_dir):
+    """Test the mmap backend searches exactly and keeps vectors out of the metadata store."""
+    store = _reopen_mmap(temp_storage_dir)
+    for i in range(10):
+        await store.store_embedding(_visual_embedding(i))
+    
+    await store.delete_embedding(EmbeddingDeletionRequest(
+        embedding_ids=["wal_003"],
+        confirm_deletion=True
+    ))
+    
+    assert store.metadata_store["wal_004"].vector == []
+    assert store.indices[EmbeddingType.CLIP_VISUAL].ntotal == 9
+    assert "wal_003" not in await _search_ids(store, _visual_embedding(3).vector, top_k=10)
+    
+    response = await store.search_similar(SimilaritySearchRequest(
+        query_vector=_visual_embedding(4).vector,
+        embedding_type=EmbeddingType.CLIP_VISUAL,
+        top_k=1
+    ))
+    assert response.index_used == "mmap"
+    assert response.results[0].embedding_id == "wal_004"
+    assert np.allclose(response.results[0].embedding.vector, _visual_embedding(4).vector)
+    assert (Path(temp_storage_dir) / "vectors" / "clip_visual.vec").exists()
+
+
+@pytest.mark.asyncio
+async def test_mmap_backend_recovers_and_shares_with_readers(temp_storage_dir):
+    """Test checkpoint + log recovery of the mmap backend and a read-only store over the same files."""
+    store = _reopen_mmap(temp_storage_dir)
+    for i in range(5):
+        await store.store_embedding(_visual_embedding(i))
+    assert store.checkpoint() is True
+    
+    await store.store_embedding(_visual_embedding(5))
+    await store.delete_embedding(EmbeddingDeletionRequest(embedding_ids=["wal_000"], confirm_deletion=True))
+    store.flush()  # No close(): the last records are only in the log
+    
+    reader = _reopen_mmap(temp_storage_dir, read_only=True)
+    assert set(reader.metadata_store) == {f"wal_{i:03d}" for i in range(1, 6)}
+    assert (await _search_ids(reader, _visual_embedding(5).vector, top_k=1)) == ["wal_005"]
+    assert (await reader.store_embedding(_visual_embedding(6)))["error"] == "READ_ONLY"
+    
+    recovered = _reopen_mmap(temp_storage_dir)
+    assert recovered.indices[EmbeddingType.CLIP_VISUAL].ntotal == 5
+    assert (await _search_ids(recovered, _visual_embedding(2).vector, top_k=1)) == ["wal_002"]
+    assert "wal_000" not in await _search_ids(recovered, _visual_embedding(0).vector, top_k=10)
+
+
+def test_read_only_store_creates_no_files(temp_storage_dir):
+    """Test a read-only store needs an existing store directory and never writes to it."""
+    missing = Path(temp_storage_dir) / "missing"
+    with pytest.raises(FileNotFoundError):
+        _reopen_mmap(str(missing), read_only=True)
+    assert not missing.exists()
+    
+    # Owner has not written anything yet
+    empty = Path(temp_storage_dir) / "empty"
+    empty.mkdir()
+    reader = _reopen_mmap(str(empty), read_only=True)
+    assert reader.metadata_store == {}
+    assert list(empty.iterdir()) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["faiss", "mmap"])
+async def test_search_similar_batch_matches_single_queries(temp_storage_dir, backend):
+    """Test batched search returns, per query, what search_similar returns for it."""
+    store = EmbeddingsStore(backend=backend, storage_path=temp_storage_dir, dimension=512, background_flush=False)
+    for i in range(40):
+        embedding = _visual_embedding(i)
+        embedding.metadata.platform = "tiktok" if i % 10 == 0 else "instagram"
+        await store.store_embedding(embedding)
+    
+    queries = [_visual_embedding(i).vector for i in (3, 10, 27)]
+    for filters in ({}, {"platform": "tiktok"}):
+        batch = await store.search_similar_batch(BatchSimilaritySearchRequest(
+            query_vectors=queries,
+            embedding_type=EmbeddingType.CLIP_VISUAL,
+            top_k=4,
+            filters=filters
+        ))
+        assert batch.total_queries == 3
+        assert batch.index_used == backend
+        
+        for query, results in zip(queries, batch.results):
+            single = await store.search_similar(SimilaritySearchRequest(
+                query_vector=query,
+                embedding_type=EmbeddingType.CLIP_VISUAL,
+                top_k=4,
+                filters=filters
+            ))
+            assert [r.embedding_id for r in results] == [r.embedding_id for r in single.results]
+            assert [r.rank for r in results] == [1, 2, 3, 4]
+            assert np.allclose(results[0].embedding.vector, single.results[0].embedding.vector)
+    
+    assert batch.results[1][0].embedding_id == "wal_010"
+
+
+def test_mmap_index_batched_search_matches_brute_force(temp_storage_dir):
+    """Test MmapVectorIndex batched search (float16 rows, several chunks) against NumPy brute force."""
+    from backend.app.ml.storage.mmap_vectors import MmapVectorIndex
+    
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((300, 32)).astype(np.float32)
+    queries = rng.standard_normal((7, 32)).astype(np.float32)
+    
+    index = MmapVectorIndex(temp_storage_dir, "test", 32, dtype="float16")
+    index.add_with_ids(vectors, np.arange(300))
+    index.remove_ids(np.array([5, 17]))
+    
+    distances, labels = index.search(queries, 5, chunk_rows=64)
+    
+    stored = vectors.astype(np.float16).astype(np.float32)
+    expected = ((queries[:, None, :] - stored[None, :, :]) ** 2).sum(axis=2)
+    expected[:, [5, 17]] = np.inf
+    assert labels.shape == (7, 5)
+    assert (labels == np.argsort(expected, axis=1)[:, :5]).all()
+    assert np.allclose(distances, np.sort(expected, axis=1)[:, :5], rtol=1e-3, atol=1e-2)
+    
+    reader = MmapVectorIndex(temp_storage_dir, "test", 32, read_only=True)
+    assert reader.ntotal == 298
+    assert (reader.search(queries, 5)[1] == labels).all()
+
+
 # ================== ModelMetricsStore Tests ==================
 
 @pytest.mark.asyncio
@@ -352,6 +688,69 @@ async def test_write_meta_learning_score(metrics_store):
     assert result["success"] is True
 
 
+@pytest.mark.asyncio
+async def test_write_metrics_batch(metrics_store):
+    """Test batched writes land in one transaction and are readable."""
+    requests = []
+    for i in range(500):
+        requests.append(MetricsWriteRequest(
+            metric_type=MetricType.ENGAGEMENT,
+            content_id=f"batch_video_{i:03d}",
+            platform=Platform.TIKTOK,
+            channel_type=ChannelType.OFFICIAL,
+            data={"views": 1000 + i, "likes": 100, "engagement_rate": 0.1}
+        ))
+    requests.append(MetricsWriteRequest(
+        metric_type=MetricType.RETENTION,
+        content_id="batch_video_000",
+        platform=Platform.TIKTOK,
+        channel_type=ChannelType.OFFICIAL,
+        data={"retention_curve": [1.0, 0.8], "completion_rate": 0.7}
+    ))
+    
+    result = await metrics_store.write_metrics_batch(requests)
+    
+    assert result["success"] is True
+    assert result["written"] == 501
+    assert result["counts"] == {"engagement": 500, "retention": 1}
+    
+    read = await metrics_store.read_metrics(MetricsReadRequest(
+        metric_types=[MetricType.ENGAGEMENT, MetricType.RETENTION],
+        limit=1000
+    ))
+    assert len(read["metrics"]["engagement"]) == 500
+    assert len(read["metrics"]["retention"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_metrics_batch_is_all_or_nothing(metrics_store):
+    """Test a batch with an unsupported metric type writes nothing."""
+    result = await metrics_store.write_metrics_batch([
+        MetricsWriteRequest(metric_type=MetricType.ENGAGEMENT, content_id="ok", data={"views": 1}),
+        MetricsWriteRequest(metric_type=MetricType.CONTENT_PERFORMANCE, content_id="bad", data={}),
+    ])
+    
+    assert result["success"] is False
+    read = await metrics_store.read_metrics(MetricsReadRequest(metric_types=[MetricType.ENGAGEMENT]))
+    assert read["metrics"]["engagement"] == []
+
+
+@pytest.mark.asyncio
+async def test_metrics_store_uses_wal_off_the_event_loop(temp_storage_dir):
+    """Test file stores use WAL and run SQLite on the store thread."""
+    import threading
+    
+    store = ModelMetricsStore(db_path=str(Path(temp_storage_dir) / "metrics.db"))
+    try:
+        journal_mode = await store._run(lambda: store.conn.execute("PRAGMA journal_mode").fetchone()[0])
+        assert journal_mode == "wal"
+        
+        sqlite_thread = await store._run(threading.get_ident)
+        assert sqlite_thread != threading.get_ident()
+    finally:
+        store.close()
+
+
 # ================== MetricsAggregator Tests ==================
 
 @pytest.mark.asyncio
@@ -429,6 +828,119 @@ async def test_compute_retention_clusters(metrics_store, metrics_aggregator):
         assert 0 <= cluster.avg_retention <= 1
 
 
+def _shaped_curve(shape: str, seconds: int, rng) -> list:
+    """Synthetic retention curve (one point per second) of a given shape."""
+    t = np.linspace(0.0, 1.0, seconds)
+    if shape == "hook_drop":
+        curve = np.where(t < 0.08, 1.0 - 6.0 * t, 0.52 - 0.1 * t)
+    elif shape == "late_drop":
+        curve = np.where(t < 0.75, 1.0 - 0.1 * t, 0.925 - 2.5 * (t - 0.75))
+    else:
+        curve = 1.0 - 0.1 * t
+    return np.clip(curve + rng.normal(0, 0.01, seconds), 0, 1).tolist()
+
+
+def test_retention_curve_blob_roundtrip():
+    """Test curves are resampled to fixed-length float32 BLOBs."""
+    from backend.app.ml.storage.retention_curves import (
+        CURVE_POINTS, encode_curve, decode_curve, decode_curve_matrix
+    )
+    
+    blob = encode_curve(np.linspace(1.0, 0.5, 37))
+    assert len(blob) == CURVE_POINTS * 4
+    
+    curve = decode_curve(blob)
+    assert curve.dtype == np.float32
+    assert curve[0] == pytest.approx(1.0) and curve[-1] == pytest.approx(0.5)
+    # Legacy JSON text decodes to the same shape
+    assert np.allclose(decode_curve("[1.0, 0.75, 0.5]"), curve, atol=1e-6)
+    assert decode_curve_matrix([blob, blob]).shape == (2, CURVE_POINTS)
+
+
+@pytest.mark.asyncio
+async def test_retention_clusters_group_curves_by_shape(metrics_store, metrics_aggregator):
+    """Test curve clustering recovers drop-off archetypes."""
+    rng = np.random.default_rng(0)
+    shapes = ["hook_drop", "late_drop", "strong_hold"]
+    requests = []
+    for i in range(300):
+        shape = shapes[i % 3]
+        requests.append(MetricsWriteRequest(
+            metric_type=MetricType.RETENTION,
+            content_id=f"{shape}_{i}",
+            platform=Platform.TIKTOK,
+            channel_type=ChannelType.OFFICIAL,
+            data={
+                "avg_watch_percentage": 0.5,
+                "retention_curve": _shaped_curve(shape, int(rng.integers(15, 90)), rng),
+                "completion_rate": 0.4
+            }
+        ))
+    await metrics_store.write_metrics_batch(requests)
+    
+    clusters = await metrics_aggregator.compute_retention_clusters(min_cluster_size=10, num_clusters=3)
+    
+    assert sorted(c.common_features["archetype"] for c in clusters) == sorted(shapes)
+    for cluster in clusters:
+        assert cluster.content_count == 100
+        assert all(cid.startswith(cluster.common_features["archetype"]) for cid in cluster.content_ids)
+    
+    late = next(c for c in clusters if c.common_features["archetype"] == "late_drop")
+    assert late.common_features["drop_off_position"] >= 0.6
+
+
+@pytest.mark.asyncio
+async def test_retention_clusters_skip_empty_legacy_curves(metrics_store, metrics_aggregator):
+    """Test legacy rows with an empty or non-finite JSON curve are not clustered."""
+    cursor = metrics_store.conn.cursor()
+    legacy = [("legacy_empty", "[]"), ("legacy_nan", "[NaN, 0.5]"), ("legacy_ok", "[1.0, 0.9, 0.8]")]
+    for content_id, curve in legacy:
+        cursor.execute(
+            "INSERT INTO retention_metrics (content_id, platform, channel_type, avg_watch_percentage, retention_curve) "
+            "VALUES (?, 'tiktok', 'official', 0.5, ?)",
+            (content_id, curve)
+        )
+    metrics_store.conn.commit()
+    
+    await metrics_store.write_metrics(MetricsWriteRequest(
+        metric_type=MetricType.RETENTION,
+        content_id="no_curve",
+        platform=Platform.TIKTOK,
+        channel_type=ChannelType.OFFICIAL,
+        data={"avg_watch_percentage": 0.5, "retention_curve": np.array([])}
+    ))
+    
+    rows, curves = await metrics_store.read_retention_curves(MetricsReadRequest(metric_types=[MetricType.RETENTION]))
+    assert [row["content_id"] for row in rows] == ["legacy_ok"]
+    assert np.isfinite(curves).all()
+    
+    clusters = await metrics_aggregator.compute_retention_clusters(min_cluster_size=1, num_clusters=2)
+    assert [c.content_ids for c in clusters] == [["legacy_ok"]]
+
+
+@pytest.mark.asyncio
+async def test_retention_clusters_keep_zero_watch_and_skip_old_rows(metrics_store, metrics_aggregator):
+    """Test a stored 0.0 watch percentage is kept and rows older than 30 days are left out."""
+    cursor = metrics_store.conn.cursor()
+    rows = [
+        ("zero_watch", 0.0, date.today()),
+        ("stale", 0.9, date.today() - timedelta(days=60)),
+    ]
+    for content_id, avg_watch, measured in rows:
+        cursor.execute(
+            "INSERT INTO retention_metrics (content_id, platform, channel_type, avg_watch_percentage, "
+            "completion_rate, retention_curve, measured_at) VALUES (?, 'tiktok', 'official', ?, 0.0, ?, ?)",
+            (content_id, avg_watch, "[1.0, 0.9, 0.8]", f"{measured.isoformat()} 12:00:00")
+        )
+    metrics_store.conn.commit()
+    
+    clusters = await metrics_aggregator.compute_retention_clusters(min_cluster_size=1, num_clusters=1)
+    
+    assert [c.content_ids for c in clusters] == [["zero_watch"]]
+    assert clusters[0].avg_retention == 0.0
+    assert clusters[0].common_features["avg_completion"] == 0.0
+
+
 # ================== DailyLearningPipeline Tests ==================
 
 @pytest.mark.asyncio
@@ -480,6 +992,75 @@ async def test_daily_learning_pipeline(metrics_store, daily_learning):
     assert result["processing_time_sec"] > 0
 
 
+def _learning_batch(start: int, count: int):
+    rng = np.random.default_rng(start)
+    requests = []
+    for i in range(start, start + count):
+        requests.append(MetricsWriteRequest(
+            metric_type=MetricType.RETENTION,
+            content_id=f"inc_video_{i}",
+            platform=Platform.TIKTOK,
+            channel_type=ChannelType.OFFICIAL,
+            data={
+                "avg_watch_percentage": float(rng.uniform(0.2, 0.95)),
+                "drop_off_points": [int(rng.integers(1, 4)), 15],
+                "completion_rate": float(rng.uniform(0.1, 0.9))
+            }
+        ))
+        requests.append(MetricsWriteRequest(
+            metric_type=MetricType.ENGAGEMENT,
+            content_id=f"inc_video_{i}",
+            platform=Platform.TIKTOK if i % 2 else Platform.INSTAGRAM,
+            channel_type=ChannelType.OFFICIAL,
+            data={
+                "engagement_rate": float(rng.uniform(0.01, 0.2)),
+                "save_rate": 0.03,
+                "views_velocity": 800.0 if i % 5 == 0 else 100.0
+            }
+        ))
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_daily_learning_stages_are_incremental(metrics_store, daily_learning):
+    """Test stages only read rows after their watermark and keep exact running aggregates."""
+    first_batch = _learning_batch(0, 40)
+    await metrics_store.write_metrics_batch(first_batch)
+    
+    first = await daily_learning._analyze_retention_patterns(date.today())
+    assert first["new_rows"] == 40
+    
+    # Nothing new: nothing read, same aggregates
+    again = await daily_learning._analyze_retention_patterns(date.today())
+    assert again["new_rows"] == 0
+    assert again["avg_retention"] == pytest.approx(first["avg_retention"])
+    
+    second_batch = _learning_batch(40, 25)
+    await metrics_store.write_metrics_batch(second_batch)
+    
+    retention = await daily_learning._analyze_retention_patterns(date.today())
+    insights = await daily_learning._discover_content_insights(date.today())
+    
+    watch = [r.data["avg_watch_percentage"] for r in first_batch + second_batch if r.metric_type == MetricType.RETENTION]
+    completion = [r.data["completion_rate"] for r in first_batch + second_batch if r.metric_type == MetricType.RETENTION]
+    engagement = [r for r in first_batch + second_batch if r.metric_type == MetricType.ENGAGEMENT]
+    
+    assert retention["new_rows"] == 25
+    assert retention["total_analyzed"] == 65
+    assert retention["avg_retention"] == pytest.approx(np.mean(watch))
+    assert retention["patterns"][0]["count"] == sum(w >= 0.7 for w in watch)
+    assert retention["completion_analysis"]["avg_completion"] == pytest.approx(np.mean(completion))
+    assert retention["completion_analysis"]["median_completion"] == pytest.approx(np.median(completion), abs=0.02)
+    assert retention["drop_off_analysis"]["common_drop_offs"][0] == {"time_sec": 15, "frequency": 65}
+    top = sorted(zip(watch, [f"inc_video_{i}" for i in range(65)]), reverse=True)[:10]
+    assert retention["best_retention_ids"] == [content_id for _, content_id in top]
+    
+    assert insights["new_rows"] == 65
+    assert insights["avg_engagement"] == pytest.approx(np.mean([r.data["engagement_rate"] for r in engagement]))
+    assert insights["viral_count"] == 13
+    assert insights["platform_insights"]["tiktok"]["count"] == 32
+
+
 # ================== ViralityPredictor Tests ==================
 
 @pytest.mark.asyncio
@@ -504,6 +1085,103 @@ async def test_virality_prediction(virality_predictor):
     assert prediction.boost_recommended in [True, False]
 
 
+@pytest.mark.asyncio
+async def test_virality_prediction_batch(virality_predictor):
+    """Test batch predictions match single predictions, in input order."""
+    metadata_list = [
+        {"quality_score": 0.95, "aesthetic_score": 0.9, "duration": 20, "caption": "Live tonight! #music"},
+        {"quality_score": 0.7, "aesthetic_score": 0.4, "duration": 45},
+        {"quality_score": 0.3, "caption": "hi"},
+        {}
+    ]
+    content_ids = [f"batch_content_{i}" for i in range(len(metadata_list))]
+    
+    predictions = await virality_predictor.predict_virality_batch(content_ids, metadata_list)
+    scores = await virality_predictor.predict_virality_scores(metadata_list)
+    
+    assert [p.content_id for p in predictions] == content_ids
+    assert [p.platform_recommendation for p in predictions] == [
+        Platform.INSTAGRAM, Platform.TIKTOK, Platform.YOUTUBE, Platform.YOUTUBE
+    ]
+    for content_id, metadata, prediction, score in zip(content_ids, metadata_list, predictions, scores):
+        single = await virality_predictor.predict_virality(content_id, metadata)
+        assert single.model_dump(exclude={"predicted_at"}) == prediction.model_dump(exclude={"predicted_at"})
+        assert score == pytest.approx(prediction.virality_score)
+    
+    # Column access and sequence behaviour without building every item
+    assert predictions.scores.tolist() == pytest.approx(list(scores))
+    assert len(predictions) == len(content_ids)
+    assert predictions[-1].content_id == content_ids[-1]
+    assert [p.content_id for p in predictions[1:3]] == content_ids[1:3]
+    with pytest.raises(IndexError):
+        predictions[len(content_ids)]
+    
+    assert await virality_predictor.predict_virality_batch([], []) == []
+    with pytest.raises(ValueError):
+        await virality_predictor.predict_virality_batch(content_ids, metadata_list[:2])
+
+
+# ================== BestTimeToPostAnalyzer Tests ==================
+
+def _insert_engagement_at(store: ModelMetricsStore, rows):
+    """Insert engagement rows with explicit measured_at (content_id, measured_at, engagement_rate)."""
+    def insert():
+        with store.conn:
+            store.conn.executemany(
+                "INSERT OR REPLACE INTO engagement_metrics "
+                "(content_id, platform, channel_type, engagement_rate, measured_at) VALUES (?, 'tiktok', 'official', ?, ?)",
+                [(content_id, rate, measured_at) for content_id, measured_at, rate in rows]
+            )
+    store._executor.submit(insert).result()
+
+
+@pytest.mark.asyncio
+async def test_best_times_use_full_history_rollup(metrics_store):
+    """Test best times come from the hour-of-week rollup over all rows."""
+    rows = []
+    for week in range(60):
+        monday = datetime(2025, 1, 6) + timedelta(weeks=week)
+        rows.append((f"mon_{week}", (monday + timedelta(hours=18)).isoformat(" "), 0.20))
+        rows.append((f"tue_{week}", (monday + timedelta(days=1, hours=7)).isoformat(" "), 0.05))
+        for i in range(20):
+            rows.append((f"wed_{week}_{i}", (monday + timedelta(days=2, hours=12)).isoformat(" "), 0.10))
+    _insert_engagement_at(metrics_store, rows)
+    # Replacing a row (same content/platform/time) must not double count
+    _insert_engagement_at(metrics_store, rows[:1])
+    
+    result = await BestTimeToPostAnalyzer(metrics_store).analyze_best_times(Platform.TIKTOK, ChannelType.OFFICIAL)
+    
+    assert result.sample_size == 60 * 22  # more than the old 1000-row read cap
+    assert result.best_hours == [18, 12, 7]
+    assert result.best_days == ["Monday", "Wednesday", "Tuesday"]
+    assert result.hourly_performance[18] == pytest.approx(0.20)
+    assert result.hour_of_week_performance[0 * 24 + 18] == pytest.approx(0.20)
+    assert result.hour_of_week_performance[2 * 24 + 12] == pytest.approx(0.10)
+    
+    other = await BestTimeToPostAnalyzer(metrics_store).analyze_best_times(Platform.INSTAGRAM, ChannelType.OFFICIAL)
+    assert other.sample_size == 0
+
+
+def test_hour_of_week_rollup_backfilled_for_existing_databases(temp_storage_dir):
+    """Test a database without the rollup gets it built from history on open."""
+    db_path = str(Path(temp_storage_dir) / "metrics.db")
+    store = ModelMetricsStore(db_path=db_path)
+    _insert_engagement_at(store, [("a", "2025-01-06 18:30:00", 0.3), ("b", "2025-01-06 18:45:00", 0.1)])
+    store._executor.submit(lambda: store.conn.execute("DELETE FROM engagement_hour_of_week") and store.conn.commit()).result()
+    store.close()
+    
+    reopened = ModelMetricsStore(db_path=db_path)
+    try:
+        cells = asyncio.run(reopened.read_hour_of_week_engagement(Platform.TIKTOK, ChannelType.OFFICIAL))
+    finally:
+        reopened.close()
+    
+    assert len(cells) == 1
+    assert cells[0]["day"] == "Monday" and cells[0]["hour"] == 18
+    assert cells[0]["samples"] == 2
+    assert cells[0]["engagement_rate_sum"] == pytest.approx(0.4)
+
+
 # ================== Integration Tests ==================
 
 @pytest.mark.asyncio
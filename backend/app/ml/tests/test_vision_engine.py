@@ -37,6 +37,19 @@ from ml.visual_embeddings import VisualEmbeddingsEngine
 from ml.scene_classifier import SceneClassifier
 from ml.color_extractor import ColorExtractor
 from ml.clip_tagger import ClipTagger
+from ml.frame_sampler import FrameSampler
+from ml.cut_detector import CutDetector
+from ml.frame_cache import FrameCache
+from ml.results_store import VisionResultsStore
+from ml.embedding_cache import PerceptualHashCache
+from ml.embedding_backends import (
+    EmbeddingBackend,
+    ONNXCLIPBackend,
+    compare_backends,
+    create_backend,
+)
+from ml.models import FrameDetections
+from ml.vision_pool import VisionWorkerPool
 
 
 # ========================================
@@ -361,6 +374,66 @@ def test_color_extractor_purple_detection():
         pytest.skip("scikit-learn not available")
 
 
+def test_color_extractor_fast_mode_palette(sample_frame):
+    """Test fast (quantized histogram) palette extraction."""
+    extractor = ColorExtractor(num_colors=5, mode="fast")
+    
+    palette = extractor.extract_palette(sample_frame)
+    
+    assert len(palette.colors_hex) == 5
+    assert sum(palette.percentages) == pytest.approx(1.0, abs=0.01)
+    assert palette.percentages == sorted(palette.percentages, reverse=True)
+    
+    purple_frame = np.full((100, 100, 3), [139, 68, 255], dtype=np.uint8)
+    assert extractor.extract_palette(purple_frame).purple_score > 0.5
+
+
+def test_color_extractor_fast_mode_stack_matches_list(sample_frame):
+    """Test one vectorized call over a stack equals per-frame extraction."""
+    extractor = ColorExtractor(num_colors=5, mode="fast")
+    frames = [sample_frame, np.full_like(sample_frame, 120), sample_frame[::-1].copy()]
+    
+    stacked = extractor.extract_palettes(np.stack(frames))
+    single = [extractor.extract_palette(f) for f in frames]
+    
+    assert [p.colors_hex for p in stacked] == [p.colors_hex for p in single]
+    assert [p.purple_score for p in stacked] == [p.purple_score for p in single]
+
+
+def test_color_extractor_fast_mode_within_tolerance():
+    """Test fast mode purple_score/morado_ratio stay within the documented tolerance."""
+    rng = np.random.default_rng(7)
+    colors = [(139, 68, 200), (30, 30, 46), (200, 120, 40), (40, 160, 90), (150, 60, 210)]
+    frames = []
+    for i in range(4):
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        widths = rng.permutation([40, 50, 60, 70, 100])
+        x = 0
+        for color, width in zip(colors, widths):
+            frame[:, x:x + width] = color
+            x += width
+        frames.append(np.clip(frame + rng.normal(0, 6, frame.shape), 0, 255).astype(np.uint8))
+    
+    fast = ColorExtractor(num_colors=5, mode="fast")
+    exact = ColorExtractor(num_colors=5, mode="exact")
+    
+    try:
+        exact_palettes = [exact.extract_palette(f) for f in frames]
+    except RuntimeError:
+        pytest.skip("scikit-learn not available")
+    fast_palettes = fast.extract_palettes(np.stack(frames))
+    
+    for e, f in zip(exact_palettes, fast_palettes):
+        assert abs(e.purple_score - f.purple_score) <= ColorExtractor.FAST_MODE_PURPLE_TOLERANCE
+        assert abs(e.morado_ratio - f.morado_ratio) <= ColorExtractor.FAST_MODE_PURPLE_TOLERANCE
+
+
+def test_color_extractor_invalid_mode():
+    """Test unknown palette modes are rejected."""
+    with pytest.raises(ValueError):
+        ColorExtractor(mode="approximate")
+
+
 def test_color_extractor_rgb_to_hex():
     """Test RGB to hex conversion."""
     extractor = ColorExtractor()
@@ -400,6 +473,150 @@ def test_color_extractor_aesthetic_category():
     assert category == "morado_dominante"
 
 
+# ========================================
+# Test Embedding Cache
+# ========================================
+
+def test_dhash_near_duplicates(sample_frame):
+    """Test dHash is stable under small noise and differs for other content."""
+    noisy = np.clip(sample_frame.astype(int) + np.random.randint(-3, 4, sample_frame.shape), 0, 255).astype(np.uint8)
+    gradient = np.tile(np.linspace(0, 255, 640, dtype=np.uint8)[None, :, None], (480, 1, 3))
+    
+    h1 = PerceptualHashCache.dhash(sample_frame)
+    assert PerceptualHashCache.dhash(sample_frame) == h1
+    assert PerceptualHashCache.hamming(h1, PerceptualHashCache.dhash(noisy)) <= 8
+    assert PerceptualHashCache.hamming(h1, PerceptualHashCache.dhash(gradient)) > 8
+
+
+def test_perceptual_hash_cache_lru():
+    """Test Hamming lookup, LRU eviction and counters."""
+    cache = PerceptualHashCache(max_size=2, max_hamming=2)
+    
+    cache.put(0b0000, np.zeros(3))
+    cache.put(0b1111 << 8, np.ones(3))
+    
+    assert cache.get(0b0011) is not None  # 2 bits from 0b0000
+    assert cache.get(0b0111) is None  # 3 bits away
+    
+    cache.put(0b1111 << 16, np.ones(3))  # evicts least recently used (0b1111 << 8)
+    
+    assert cache.get(0b1111 << 8) is None
+    assert cache.get(0b0000) is not None
+    stats = cache.get_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_embeddings_skip_near_duplicate_frames(sample_frame, vision_config):
+    """Test near-duplicate frames reuse cached vectors instead of running CLIP."""
+    engine = VisualEmbeddingsEngine(vision_config)
+    engine.model, engine.processor = Mock(), Mock()
+    engine._compute_embeddings = Mock(
+        side_effect=lambda images: np.stack([np.full(512, float(i + 1)) for i in range(len(images))])
+    )
+    other = np.tile(np.linspace(0, 255, 640, dtype=np.uint8)[None, :, None], (480, 1, 3))
+    
+    first = engine.generate_batch_embeddings(
+        images=[sample_frame, sample_frame.copy(), other],
+        embedding_ids=["a", "b", "c"]
+    )
+    second = engine.generate_batch_embeddings(images=[sample_frame], embedding_ids=["d"])
+    
+    assert [len(c.args[0]) for c in engine._compute_embeddings.call_args_list] == [2]
+    assert first[0].vector == first[1].vector
+    assert first[0].vector != first[2].vector
+    assert second[0].vector == first[0].vector
+    
+    stats = engine.get_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_pipeline_stats_expose_embedding_cache(vision_config):
+    """Test embedding cache counters are exposed by ClipTagger."""
+    tagger = ClipTagger(vision_config)
+    
+    stats = tagger.get_pipeline_stats()
+    
+    assert stats["embedding_cache"]["enabled"] is True
+    assert stats["embedding_cache"]["hits"] == 0
+
+
+# ========================================
+# Test Embedding Backends
+# ========================================
+
+def test_create_backend_selection():
+    """Test backend selection through VisionConfig."""
+    assert create_backend(VisionConfig(embedding_backend="torch")).name == "torch"
+    assert create_backend(VisionConfig(embedding_backend="onnx")).name == "onnx"
+    
+    with pytest.raises(ValueError):
+        create_backend(VisionConfig(embedding_backend="tensorrt"))
+
+
+def test_compare_backends_cosine_threshold():
+    """Test accuracy check flags backends that drift from the reference."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(4, 512))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    
+    reference = Mock(spec=EmbeddingBackend)
+    reference.embed.return_value = vectors
+    close = Mock(spec=EmbeddingBackend)
+    noisy = vectors + rng.normal(scale=0.005, size=vectors.shape)
+    close.embed.return_value = noisy / np.linalg.norm(noisy, axis=1, keepdims=True)
+    far = Mock(spec=EmbeddingBackend)
+    far.embed.return_value = vectors[::-1]
+    
+    assert compare_backends(reference, close, [None] * 4, min_cosine=0.97)["passed"] is True
+    result = compare_backends(reference, far, [None] * 4, min_cosine=0.97)
+    assert result["passed"] is False
+    assert result["min_cosine"] < 0.97
+
+
+def test_onnx_backend_runs_exported_graph(tmp_path, sample_frame):
+    """Test ONNX backend loads a graph from onnx_model_dir and returns normalized vectors."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import helper, TensorProto, numpy_helper
+    
+    config = VisionConfig(embedding_backend="onnx", onnx_model_dir=str(tmp_path), onnx_intra_op_threads=1)
+    backend = ONNXCLIPBackend(config)
+    
+    # Stand-in image encoder: flatten (N, 3, 4, 4) -> MatMul -> (N, 512)
+    weights = np.random.default_rng(0).normal(size=(48, 512)).astype(np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Flatten", ["pixel_values"], ["flat"], axis=1),
+            helper.make_node("MatMul", ["flat", "W"], ["image_embeds"]),
+        ],
+        "clip_stub",
+        [helper.make_tensor_value_info("pixel_values", TensorProto.FLOAT, ["batch", 3, 4, 4])],
+        [helper.make_tensor_value_info("image_embeds", TensorProto.FLOAT, ["batch", 512])],
+        initializer=[numpy_helper.from_array(weights, "W")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(backend.model_path("openai/clip-stub")))
+    
+    processor = Mock(side_effect=lambda images, return_tensors: {
+        "pixel_values": np.ones((len(images), 3, 4, 4), dtype=np.float32)
+    })
+    with patch("ml.embedding_backends.CLIPImageProcessor", create=True) as mock_processor_cls, \
+            patch("ml.embedding_backends.CLIP_IMAGE_PROCESSOR_AVAILABLE", True):
+        mock_processor_cls.from_pretrained.return_value = processor
+        backend.load("openai/clip-stub")
+    
+    vectors = backend.embed([sample_frame, sample_frame])
+    
+    assert vectors.shape == (2, 512)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert backend.get_info()["intra_op_threads"] == 1
+
+
 # ========================================
 # Test Integration
 # ========================================
@@ -436,6 +653,477 @@ def test_full_pipeline_mock(sample_frame, vision_config):
         assert enriched.mapping.coco_label == "car"
 
 
+@pytest.fixture
+def sample_video(tmp_path):
+    """Write a 10s, 30 FPS synthetic video (frame i has red channel = i % 255)."""
+    import cv2
+    
+    video_path = str(tmp_path / "sample.mp4")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (160, 120))
+    for i in range(300):
+        writer.write(np.full((120, 160, 3), (200, 50, i % 255), dtype=np.uint8))
+    writer.release()
+    return video_path
+
+
+def test_frame_sampler_single_pass(sample_video):
+    """Test FrameSampler samples at target FPS in one sequential pass."""
+    sampler = FrameSampler(VisionConfig(target_fps=1.0, max_frames_per_clip=5))
+    
+    frames = sampler.sample_frames(sample_video)
+    
+    assert [f.frame_id for f in frames] == [0, 30, 60, 90, 120]
+    assert frames[1].timestamp_ms == pytest.approx(1000.0)
+    assert frames[0].image.shape == (120, 160, 3)
+    assert sampler.last_frames_decoded == 5
+
+
+def test_frame_sampler_invalid_video(tmp_path):
+    """Test FrameSampler raises on unreadable video."""
+    sampler = FrameSampler()
+    
+    with pytest.raises(ValueError):
+        sampler.sample_frames(str(tmp_path / "missing.mp4"))
+
+
+def test_frame_sampler_prefetched_batches(sample_video):
+    """Test decode thread + bounded queue yields ordered batches."""
+    sampler = FrameSampler(VisionConfig(target_fps=1.0, max_frames_per_clip=10))
+    
+    batches = list(sampler.iter_batches(sample_video, batch_size=4, prefetch=2))
+    
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [f.frame_id for b in batches for f in b] == list(range(0, 300, 30))
+
+
+def test_frame_sampler_prefetch_early_stop(sample_video):
+    """Test abandoning the stream stops the decode thread."""
+    import threading
+    
+    sampler = FrameSampler(VisionConfig(target_fps=30.0, max_frames_per_clip=300))
+    
+    stream = sampler.iter_frames_prefetched(sample_video, prefetch=1)
+    next(stream)
+    stream.close()
+    
+    assert not any(t.name == "frame-sampler-decode" for t in threading.enumerate())
+
+
+def test_yolo_detect_video_batched(sample_video, vision_config):
+    """Test detect_video consumes the decode queue through detect_batch."""
+    runner = YOLORunner(vision_config)
+    runner.model = Mock()
+    runner.detect_batch = Mock(
+        side_effect=lambda frames, frame_ids, timestamps_ms: [
+            FrameDetections(frame_id=fid, timestamp_ms=ts, detections=[], processing_time_ms=0.0)
+            for fid, ts in zip(frame_ids, timestamps_ms)
+        ]
+    )
+    
+    results = runner.detect_video(sample_video, batch_size=3)
+    
+    assert [len(c.kwargs["frames"]) for c in runner.detect_batch.call_args_list] == [3, 3, 3, 1]
+    assert [r.frame_id for r in results] == list(range(0, 300, 30))
+
+
+def test_clip_tagger_stage_timings(sample_video, vision_config):
+    """Test process_video_clip decodes once and reports stage timings."""
+    tagger = ClipTagger(vision_config)
+    tagger.yolo_runner.detect_batch = Mock(
+        side_effect=lambda frames, frame_ids, timestamps_ms: [
+            FrameDetections(frame_id=fid, timestamp_ms=ts, detections=[], processing_time_ms=0.0)
+            for fid, ts in zip(frame_ids, timestamps_ms)
+        ]
+    )
+    tagger.embeddings_engine.generate_batch_embeddings = Mock(
+        side_effect=lambda images, embedding_ids, frame_ids, timestamps_ms: [
+            VisualEmbedding(embedding_id=eid, vector=[0.1] * 512, model_name="clip", frame_id=fid)
+            for eid, fid in zip(embedding_ids, frame_ids)
+        ]
+    )
+    
+    with patch("cv2.VideoCapture.set") as mock_seek:
+        metadata = tagger.process_video_clip(sample_video, "clip_1", "video_1")
+        mock_seek.assert_not_called()
+    
+    # 10 sampled frames in batches of 8
+    assert tagger.yolo_runner.detect_batch.call_count == 2
+    assert len(metadata.embeddings) == 10
+    assert metadata.color_palette is not None
+    for stage in ("decode", "yolo", "embeddings", "color", "scene", "total"):
+        assert stage in metadata.stage_timings_ms
+
+
+def test_frame_sampler_segment(sample_video):
+    """Test FrameSampler samples only inside [start_ms, end_ms)."""
+    sampler = FrameSampler(VisionConfig(target_fps=1.0, max_frames_per_clip=30))
+    
+    frames = sampler.sample_frames(sample_video, start_ms=2500, end_ms=6000)
+    
+    assert [f.frame_id for f in frames] == [75, 105, 135, 165]
+    assert frames[0].timestamp_ms == pytest.approx(2500.0)
+
+
+def test_frame_sampler_resizes_frames(sample_video):
+    """Test frame_max_side downscales sampled frames keeping aspect ratio."""
+    sampler = FrameSampler(VisionConfig(max_frames_per_clip=2, frame_max_side=80))
+    
+    frames = sampler.sample_frames(sample_video)
+    
+    assert frames[0].image.shape == (60, 80, 3)
+
+
+# ========================================
+# Test Cut Detector
+# ========================================
+
+@pytest.fixture
+def shot_video(tmp_path):
+    """Write a 20s, 30 FPS video of 4 shots of 5s (flat colors, a square moving faster each shot)."""
+    import cv2
+    
+    video_path = str(tmp_path / "shots.mp4")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240))
+    colors = [(200, 50, 50), (30, 180, 40), (40, 40, 220), (220, 220, 30)]
+    speeds = [0, 2, 4, 8]
+    for shot in range(4):
+        for i in range(150):
+            frame = np.full((240, 320, 3), colors[shot], dtype=np.uint8)
+            x = (i * speeds[shot]) % 280
+            frame[100:140, x:x + 40] = 255
+            writer.write(frame)
+    writer.release()
+    return video_path
+
+
+def test_cut_detector_finds_shot_boundaries(shot_video):
+    """Test hard cuts are detected at the first frame of each shot."""
+    analysis = CutDetector(VisionConfig(cut_min_clip_ms=3000, cut_max_clip_ms=8000)).analyze(shot_video)
+    
+    assert [b.frame_id for b in analysis.boundaries] == [150, 300, 450]
+    assert analysis.duration_ms == 20000
+    assert analysis.frames_analyzed == 120  # 6 FPS
+    assert all(b.score > 0.5 for b in analysis.boundaries)
+
+
+def test_cut_detector_candidates_follow_cuts_and_motion(shot_video):
+    """Test candidate windows are aligned to shots and scored by motion."""
+    analysis = CutDetector(VisionConfig(cut_min_clip_ms=3000, cut_max_clip_ms=8000)).analyze(shot_video)
+    
+    candidates = analysis.candidates
+    assert [(c.start_ms, c.end_ms) for c in candidates] == [(0, 5000), (5000, 10000), (10000, 15000), (15000, 20000)]
+    assert all(c.confidence == 1.0 and c.shot_count == 1 for c in candidates)
+    assert candidates[0].motion_intensity == 0.0
+    assert candidates[0].motion_intensity < candidates[1].motion_intensity < candidates[2].motion_intensity
+
+
+def test_cut_detector_max_clips_and_long_shots(shot_video):
+    """Test long windows are capped and only the best non-overlapping ones are kept."""
+    analysis = CutDetector(
+        VisionConfig(cut_min_clip_ms=2000, cut_max_clip_ms=2000, cut_max_clips=3)
+    ).analyze(shot_video)
+    
+    candidates = analysis.candidates
+    assert len(candidates) == 3
+    assert all(c.duration_ms == 2000 for c in candidates)
+    assert all(a.end_ms <= b.start_ms for a, b in zip(candidates, candidates[1:]))
+
+
+def test_cut_detector_parallel_decode_matches_sequential(shot_video):
+    """Test chunked multi-threaded decode samples exactly the same frames."""
+    sequential = CutDetector(VisionConfig(cut_decode_workers=1)).analyze(shot_video)
+    
+    detector = CutDetector(VisionConfig(cut_decode_workers=3))
+    detector.MIN_FRAMES_PER_CHUNK = 100
+    parallel = detector.analyze(shot_video)
+    
+    assert detector.last_decode_workers == 3
+    assert parallel.frames_analyzed == sequential.frames_analyzed
+    assert parallel.boundaries == sequential.boundaries
+    assert parallel.candidates == sequential.candidates
+
+
+def test_cut_detector_invalid_video(tmp_path):
+    """Test CutDetector raises on unreadable video."""
+    with pytest.raises(ValueError):
+        CutDetector().analyze(str(tmp_path / "missing.mp4"))
+
+
+# ========================================
+# Test Frame Cache
+# ========================================
+
+def test_frame_cache_decodes_once(sample_video, tmp_path):
+    """Test a second pass reads the memory-mapped stack instead of decoding."""
+    config = VisionConfig(max_frames_per_clip=5, frame_cache_enabled=True, frame_cache_dir=str(tmp_path / "cache"))
+    
+    first = FrameSampler(config).sample_frames(sample_video)
+    
+    sampler = FrameSampler(config)
+    with patch("cv2.VideoCapture") as mock_capture:
+        second = sampler.sample_frames(sample_video)
+        mock_capture.assert_not_called()
+    
+    assert sampler.last_cache_hit is True
+    assert [f.frame_id for f in second] == [f.frame_id for f in first]
+    assert isinstance(second[0].image, np.memmap)
+    assert not second[0].image.flags.writeable
+    np.testing.assert_array_equal(second[3].image, first[3].image)
+    assert sampler.frame_cache.get_stats()["hits"] == 1
+
+
+def test_clip_tagger_reads_cached_frames(sample_video, tmp_path):
+    """Test the full pipeline runs on read-only cached frames."""
+    config = VisionConfig(
+        max_frames_per_clip=4,
+        use_faiss=False,
+        frame_cache_enabled=True,
+        frame_cache_dir=str(tmp_path / "cache")
+    )
+    tagger = ClipTagger(config)
+    tagger.yolo_runner.detect_batch = Mock(
+        side_effect=lambda frames, frame_ids, timestamps_ms: [
+            FrameDetections(frame_id=fid, timestamp_ms=ts, detections=[], processing_time_ms=0.0)
+            for fid, ts in zip(frame_ids, timestamps_ms)
+        ]
+    )
+    tagger.embeddings_engine.generate_batch_embeddings = Mock(
+        side_effect=lambda images, embedding_ids, frame_ids, timestamps_ms: [
+            VisualEmbedding(embedding_id=eid, vector=[0.1] * 512, model_name="clip", frame_id=fid)
+            for eid, fid in zip(embedding_ids, frame_ids)
+        ]
+    )
+    
+    first = tagger.process_video_clip(sample_video, "clip_1", "video_1")
+    second = tagger.process_video_clip(sample_video, "clip_1", "video_1")
+    
+    assert tagger.frame_sampler.last_cache_hit is True
+    assert second.color_palette == first.color_palette
+    assert tagger.get_pipeline_stats()["frame_cache"]["hits"] == 1
+
+
+def test_frame_cache_key_includes_sampling(sample_video, tmp_path):
+    """Test different sampling parameters or segments get their own entries."""
+    cache = FrameCache(str(tmp_path / "cache"))
+    
+    FrameSampler(VisionConfig(max_frames_per_clip=3), frame_cache=cache).sample_frames(sample_video)
+    FrameSampler(VisionConfig(max_frames_per_clip=3, target_fps=2.0), frame_cache=cache).sample_frames(sample_video)
+    FrameSampler(VisionConfig(max_frames_per_clip=3), frame_cache=cache).sample_frames(sample_video, start_ms=2000)
+    
+    assert cache.get_stats()["entries"] == 3
+    assert cache.hits == 0
+
+
+def test_frame_cache_lru_eviction(sample_video, tmp_path):
+    """Test the cache evicts least recently used entries beyond max_bytes."""
+    import time
+    
+    cache = FrameCache(str(tmp_path / "cache"), max_bytes=10 ** 9)
+    sampler = FrameSampler(VisionConfig(max_frames_per_clip=3), frame_cache=cache)
+    
+    sampler.sample_frames(sample_video, start_ms=0)
+    time.sleep(0.01)
+    sampler.sample_frames(sample_video, start_ms=1000)
+    entry_bytes = cache.get_stats()["size_bytes"] // 2
+    time.sleep(0.01)
+    sampler.sample_frames(sample_video, start_ms=0)  # hit refreshes LRU position
+    
+    cache.max_bytes = entry_bytes + 1
+    assert cache.evict() == 1
+    
+    sampler.sample_frames(sample_video, start_ms=0)
+    assert sampler.last_cache_hit is True
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_frame_cache_invalidation(sample_video, tmp_path):
+    """Test invalidation per video and after a sampling config change."""
+    cache = FrameCache(str(tmp_path / "cache"))
+    
+    FrameSampler(VisionConfig(max_frames_per_clip=3), frame_cache=cache).sample_frames(sample_video)
+    new_sampler = FrameSampler(VisionConfig(max_frames_per_clip=3, frame_max_side=64), frame_cache=cache)
+    new_sampler.sample_frames(sample_video)
+    
+    assert new_sampler.invalidate_stale_cache() == 1
+    assert cache.get_stats()["entries"] == 1
+    
+    assert cache.invalidate_video(sample_video) == 1
+    assert cache.get_stats()["entries"] == 0
+
+
+# ========================================
+# Test Vision Results Store
+# ========================================
+
+def _mock_inference(tagger):
+    tagger.yolo_runner.detect_batch = Mock(
+        side_effect=lambda frames, frame_ids, timestamps_ms: [
+            FrameDetections(
+                frame_id=fid,
+                timestamp_ms=ts,
+                detections=[YOLODetection(label="car", confidence=0.9, bbox=BoundingBox(x=1, y=2, w=30, h=40), class_id=2)],
+                processing_time_ms=0.0
+            )
+            for fid, ts in zip(frame_ids, timestamps_ms)
+        ]
+    )
+    tagger.embeddings_engine.generate_batch_embeddings = Mock(
+        side_effect=lambda images, embedding_ids, frame_ids, timestamps_ms: [
+            VisualEmbedding(embedding_id=eid, vector=[0.25] * 512, model_name="clip", frame_id=fid)
+            for eid, fid in zip(embedding_ids, frame_ids)
+        ]
+    )
+
+
+def test_results_store_serves_repeated_clip(sample_video, tmp_path):
+    """Test a second analysis of the same clip skips decoding and inference."""
+    config = VisionConfig(
+        max_frames_per_clip=4,
+        use_faiss=False,
+        results_store_enabled=True,
+        results_store_dir=str(tmp_path / "results")
+    )
+    tagger = ClipTagger(config)
+    _mock_inference(tagger)
+    
+    first = tagger.process_video_clip(sample_video, "clip_1", "video_1", start_ms=0, end_ms=5000)
+    tagger.yolo_runner.detect_batch.reset_mock()
+    tagger.embeddings_engine.generate_batch_embeddings.reset_mock()
+    
+    with patch("cv2.VideoCapture") as mock_capture:
+        second = tagger.process_video_clip(sample_video, "clip_2", "video_2", start_ms=0, end_ms=5000)
+        mock_capture.assert_not_called()
+    
+    tagger.yolo_runner.detect_batch.assert_not_called()
+    tagger.embeddings_engine.generate_batch_embeddings.assert_not_called()
+    
+    assert second.clip_id == "clip_2"
+    assert second.video_id == "video_2"
+    assert all(emb.embedding_id.startswith("clip_2_") for emb in second.embeddings)
+    assert [emb.vector for emb in second.embeddings] == [emb.vector for emb in first.embeddings]
+    assert second.detections[0].frame_id == first.detections[0].frame_id
+    assert second.color_palette == first.color_palette
+    assert tagger.get_pipeline_stats()["results_store"]["hits"] == 1
+
+
+def test_results_store_key_sensitivity(sample_video, tmp_path):
+    """Test clip range and model changes get their own entries."""
+    store = VisionResultsStore(str(tmp_path / "results"))
+    config = VisionConfig(max_frames_per_clip=4, use_faiss=False)
+    metadata = ClipMetadata(clip_id="clip_1", video_id="video_1")
+    
+    store.put(sample_video, config, metadata, start_ms=0, end_ms=5000)
+    
+    assert store.get(sample_video, config, start_ms=0, end_ms=5000) is not None
+    assert store.get(sample_video, config, start_ms=0, end_ms=6000) is None
+    assert store.get(sample_video, config.model_copy(update={"yolo_model": "yolov8s.pt"}), 0, 5000) is None
+    assert store.get(sample_video, config.model_copy(update={"use_faiss": True}), 0, 5000) is not None
+    assert store.get_stats()["hits"] == 2
+
+
+def test_results_store_invalidate_video(sample_video, tmp_path):
+    """Test invalidate_video drops every result of a video."""
+    store = VisionResultsStore(str(tmp_path / "results"))
+    config = VisionConfig()
+    metadata = ClipMetadata(clip_id="clip_1", video_id="video_1")
+    
+    store.put(sample_video, config, metadata, start_ms=0, end_ms=5000)
+    store.put(sample_video, config, metadata, start_ms=5000, end_ms=10000)
+    
+    assert store.invalidate_video(sample_video) == 2
+    assert store.get(sample_video, config, start_ms=0, end_ms=5000) is None
+    assert store.get_stats()["results"] == 0
+
+
+# ========================================
+# Test Vision Worker Pool
+# ========================================
+
+class _FakeTagger:
+    """Picklable-free stand-in for a preloaded ClipTagger (inherited through fork)."""
+    
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.yolo_runner = Mock()
+        self.results_store = None
+    
+    def process_video_clip(self, video_path, clip_id, video_id, max_frames=None, start_ms=None, end_ms=None):
+        import time
+        
+        if video_path == "broken.mp4":
+            raise ValueError(f"Failed to open video: {video_path}")
+        time.sleep(self.delay_s)
+        return ClipMetadata(
+            clip_id=clip_id,
+            video_id=video_id,
+            objects_detected=[str(os.getpid())],
+            stage_timings_ms={"start": start_ms or 0.0, "end": end_ms or 0.0}
+        )
+
+
+def test_vision_pool_processes_clips_in_workers():
+    """Test clips run in forked workers that inherit the preloaded tagger."""
+    with VisionWorkerPool(num_workers=2, tagger=_FakeTagger()) as pool:
+        futures = [
+            pool.submit("clip.mp4", f"clip_{i}", "video_1", start_ms=i * 1000, end_ms=(i + 1) * 1000)
+            for i in range(6)
+        ]
+        results = [future.result(timeout=30) for future in futures]
+        stats = pool.get_stats()
+    
+    assert [r.clip_id for r in results] == [f"clip_{i}" for i in range(6)]
+    assert results[3].stage_timings_ms == {"start": 3000.0, "end": 4000.0}
+    assert {int(r.objects_detected[0]) for r in results} <= set(stats["worker_pids"])
+    assert os.getpid() not in stats["worker_pids"]
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+
+
+def test_vision_pool_bounds_in_flight_work():
+    """Test submit() blocks once max_in_flight tasks are queued or running."""
+    with VisionWorkerPool(num_workers=2, max_in_flight=3, tagger=_FakeTagger(delay_s=0.05)) as pool:
+        futures = [pool.submit("clip.mp4", f"clip_{i}", "video_1") for i in range(10)]
+        for future in futures:
+            future.result(timeout=30)
+        stats = pool.get_stats()
+    
+    assert stats["max_in_flight_seen"] <= 3
+    assert stats["submitted"] == stats["completed"] == 10
+
+
+def test_vision_pool_propagates_worker_errors():
+    """Test exceptions raised in a worker surface on the future."""
+    with VisionWorkerPool(num_workers=1, tagger=_FakeTagger()) as pool:
+        with pytest.raises(ValueError, match="Failed to open video"):
+            pool.submit("broken.mp4", "clip_1", "video_1").result(timeout=30)
+        
+        # Worker is still usable
+        assert pool.submit("clip.mp4", "clip_2", "video_1").result(timeout=30).clip_id == "clip_2"
+        assert pool.get_stats()["failed"] == 1
+
+
+def test_vision_pool_async_dispatch():
+    """Test process_clips awaits all clips and keeps their order."""
+    import asyncio
+    
+    async def run(pool):
+        return await pool.process_clips([
+            {"video_path": "clip.mp4", "clip_id": f"clip_{i}", "video_id": "video_1"}
+            for i in range(4)
+        ])
+    
+    with VisionWorkerPool(num_workers=2, max_in_flight=2, tagger=_FakeTagger()) as pool:
+        results = asyncio.run(run(pool))
+    
+    assert [r.clip_id for r in results] == ["clip_0", "clip_1", "clip_2", "clip_3"]
+
+
+def test_vision_pool_rejects_cuda():
+    """Test the pool refuses CUDA configs (contexts cannot be forked)."""
+    with pytest.raises(ValueError, match="yolo_device='cpu'"):
+        VisionWorkerPool(VisionConfig(yolo_device="cuda"))
+
+
 def test_clip_metadata_creation():
     """Test ClipMetadata creation."""
     metadata = ClipMetadata(
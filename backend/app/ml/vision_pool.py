@@ -0,0 +1,381 @@
+"""
+Vision Worker Pool - Multi-process clip analysis with preloaded models
+
+Sprint 3: Vision Engine
+
+Features:
+- YOLO + CLIP loaded once in the parent, shared copy-on-write by forked workers
+- Bounded in-flight work (submitters block when the pool is saturated)
+- Sync (Future) and async (awaitable) dispatch of clips and YOLO-only jobs
+- Clips already in the vision results store are answered from the parent
+- Per-worker intra-op thread cap so N workers don't oversubscribe the cores
+- Process-wide default pool for job handlers (cut_analysis, creative analysis)
+"""
+
+import asyncio
+import gc
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .models import ClipMetadata, FrameDetections, VisionConfig
+from .clip_tagger import ClipTagger
+
+logger = logging.getLogger(__name__)
+
+
+# Set in each worker by _init_worker (inherited from the parent through fork)
+_worker_tagger: Optional[ClipTagger] = None
+
+
+def _init_worker(tagger: ClipTagger, threads_per_worker: int) -> None:
+    """
+    Worker process initializer.
+    
+    Runs right after fork: the tagger argument is the parent's object, not a
+    pickled copy, so the model weights stay in pages shared with the parent.
+    """
+    global _worker_tagger
+    _worker_tagger = tagger
+    
+    # Only cap libraries that the parent already imported
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads_per_worker)
+    
+    cv2 = sys.modules.get("cv2")
+    if cv2 is not None:
+        cv2.setNumThreads(threads_per_worker)
+    
+    # ONNX Runtime sessions are not fork-safe (their thread pools stay in the
+    # parent): rebuild the session from the already exported graph
+    embeddings_engine = getattr(tagger, "embeddings_engine", None)
+    backend = getattr(embeddings_engine, "backend", None)
+    if backend is not None and backend.name == "onnx":
+        embeddings_engine.load_model()
+
+
+def _worker_ready() -> int:
+    """No-op task used to fork every worker at start-up."""
+    return os.getpid()
+
+
+def _get_worker_tagger() -> ClipTagger:
+    if _worker_tagger is None:
+        raise RuntimeError("Vision worker has no preloaded ClipTagger")
+    return _worker_tagger
+
+
+def _process_clip_task(kwargs: Dict[str, Any]) -> ClipMetadata:
+    """Full vision pipeline for one clip, run inside a worker."""
+    return _get_worker_tagger().process_video_clip(**kwargs)
+
+
+def _detect_video_task(kwargs: Dict[str, Any]) -> List[FrameDetections]:
+    """YOLO-only detection over a video, run inside a worker."""
+    return _get_worker_tagger().yolo_runner.detect_video(**kwargs)
+
+
+class VisionWorkerPool:
+    """
+    Pool of forked vision workers sharing one set of preloaded models.
+    
+    The parent builds and initializes a ClipTagger, then forks `num_workers`
+    processes that inherit it: YOLO and CLIP weights are loaded once and
+    shared copy-on-write instead of being reloaded per caller, and every
+    clip's pre/post-processing runs outside the caller's GIL.
+    
+    At most `max_in_flight` clips are queued or running at any time; submit()
+    blocks once that limit is reached so producers can't pile up decoded work.
+    
+    Workers never touch the parent's FAISS index (the pool runs the tagger with
+    use_faiss=False); callers index the returned embeddings themselves.
+    """
+    
+    def __init__(
+        self,
+        config: Optional[VisionConfig] = None,
+        num_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        tagger: Optional[ClipTagger] = None
+    ):
+        """
+        Initialize the pool (workers are forked by start()).
+        
+        Args:
+            config: Vision configuration. Defaults to VisionConfig().
+            num_workers: Worker processes. If None, uses config.pool_workers (0 = CPU count).
+            max_in_flight: Max queued + running tasks. If None, uses
+                config.pool_max_in_flight (0 = 2 x workers).
+            tagger: Already initialized ClipTagger to share. If None, one is
+                built and initialized by start().
+        
+        Raises:
+            ValueError: If the config targets CUDA (CUDA contexts cannot be forked)
+        """
+        config = config or VisionConfig()
+        if config.yolo_device != "cpu":
+            raise ValueError(
+                f"VisionWorkerPool requires yolo_device='cpu', got '{config.yolo_device}' "
+                f"(CUDA contexts cannot be shared with forked workers)"
+            )
+        
+        self.config = config.model_copy(update={
+            "use_faiss": False,
+            "onnx_intra_op_threads": config.onnx_intra_op_threads or config.pool_threads_per_worker
+        })
+        self.num_workers = num_workers or config.pool_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or config.pool_max_in_flight or 2 * self.num_workers
+        self.tagger = tagger
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self.worker_pids: List[int] = []
+        
+        # Telemetry
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_in_flight_seen = 0
+        self.store_hits = 0
+    
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+    
+    def start(self) -> None:
+        """
+        Load the models in this process and fork the workers.
+        
+        Call once at process start-up, before other threads are running.
+        """
+        if self._executor is not None:
+            return
+        
+        if self.tagger is None:
+            self.tagger = ClipTagger(self.config)
+            self.tagger.initialize()
+            
+            # Cached frame stacks from an older sampling config can't be hit anymore
+            self.tagger.frame_sampler.invalidate_stale_cache()
+        
+        # Move the loaded objects to the GC's permanent generation: collections
+        # in the workers then never write to (and un-share) their pages
+        gc.collect()
+        gc.freeze()
+        
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.tagger, self.config.pool_threads_per_worker)
+        )
+        
+        # Fork every worker now, while the weights are freshly loaded
+        ready = [self._executor.submit(_worker_ready) for _ in range(self.num_workers)]
+        for future in ready:
+            future.result()
+        self.worker_pids = sorted(self._executor._processes)
+        
+        logger.info(
+            f"✅ Vision worker pool started: workers={self.num_workers}, "
+            f"max_in_flight={self.max_in_flight}, "
+            f"threads_per_worker={self.config.pool_threads_per_worker}"
+        )
+    
+    def submit(
+        self,
+        video_path: str,
+        clip_id: str,
+        video_id: str,
+        max_frames: Optional[int] = None,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> "Future[ClipMetadata]":
+        """
+        Queue a clip for ClipTagger.process_video_clip in a worker.
+        
+        Blocks while max_in_flight tasks are already queued or running.
+        
+        Args:
+            video_path: Path to video file
+            clip_id: Clip UUID
+            video_id: Source video UUID
+            max_frames: Max frames to process (overrides config)
+            start_ms: Clip start within the video
+            end_ms: Clip end within the video
+        
+        Returns:
+            Future resolving to ClipMetadata (already resolved when the
+            tagger's results store has the clip)
+        """
+        if self._executor is None:
+            self.start()
+        
+        # Stored results are served from the parent without using a worker slot
+        if self.tagger.results_store is not None and max_frames is None:
+            cached = self.tagger.results_store.get(
+                video_path, self.tagger.config, start_ms, end_ms, clip_id, video_id
+            )
+            if cached is not None:
+                future: "Future[ClipMetadata]" = Future()
+                future.set_result(cached)
+                with self._lock:
+                    self.store_hits += 1
+                return future
+        
+        return self._submit(_process_clip_task, {
+            "video_path": video_path,
+            "clip_id": clip_id,
+            "video_id": video_id,
+            "max_frames": max_frames,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+        })
+    
+    def submit_detect(
+        self,
+        video_path: str,
+        max_frames: Optional[int] = None,
+        target_fps: Optional[float] = None
+    ) -> "Future[List[FrameDetections]]":
+        """
+        Queue YOLO-only detection over a video (YOLORunner.detect_video).
+        
+        Args:
+            video_path: Path to video file
+            max_frames: Maximum frames to process
+            target_fps: Target FPS for sampling
+        
+        Returns:
+            Future resolving to a list of FrameDetections
+        """
+        return self._submit(_detect_video_task, {
+            "video_path": video_path,
+            "max_frames": max_frames,
+            "target_fps": target_fps,
+        })
+    
+    async def process_clip(self, video_path: str, clip_id: str, video_id: str, **kwargs: Any) -> ClipMetadata:
+        """Async wrapper around submit() (waits for a slot off the event loop)."""
+        future = await asyncio.to_thread(self.submit, video_path, clip_id, video_id, **kwargs)
+        return await asyncio.wrap_future(future)
+    
+    async def process_clips(self, clips: List[Dict[str, Any]]) -> List[ClipMetadata]:
+        """
+        Process several clips concurrently across the pool.
+        
+        Args:
+            clips: submit() keyword arguments, one dict per clip
+        
+        Returns:
+            ClipMetadata list in the same order as clips
+        """
+        return list(await asyncio.gather(*(self.process_clip(**clip) for clip in clips)))
+    
+    async def detect_video(self, video_path: str, **kwargs: Any) -> List[FrameDetections]:
+        """Async wrapper around submit_detect()."""
+        future = await asyncio.to_thread(self.submit_detect, video_path, **kwargs)
+        return await asyncio.wrap_future(future)
+    
+    def _submit(self, task: Callable[[Dict[str, Any]], Any], kwargs: Dict[str, Any]) -> Future:
+        if self._executor is None:
+            self.start()
+        
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(task, kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_in_flight_seen = max(self.max_in_flight_seen, self.in_flight)
+        
+        future.add_done_callback(self._on_done)
+        return future
+    
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        
+        self._slots.release()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers (queued tasks are cancelled if wait=False)."""
+        if self._executor is None:
+            return
+        
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._executor = None
+        self.worker_pids = []
+        logger.info("Vision worker pool stopped")
+    
+    def __enter__(self) -> "VisionWorkerPool":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                "started": self.started,
+                "num_workers": self.num_workers,
+                "worker_pids": list(self.worker_pids),
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "max_in_flight_seen": self.max_in_flight_seen,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "store_hits": self.store_hits,
+            }
+
+
+_default_pool: Optional[VisionWorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_vision_pool(config: Optional[VisionConfig] = None) -> VisionWorkerPool:
+    """
+    Get the process-wide vision pool, starting it on first use.
+    
+    Args:
+        config: Vision configuration (only used when the pool is created)
+    
+    Returns:
+        Started VisionWorkerPool
+    """
+    global _default_pool
+    
+    with _default_pool_lock:
+        if _default_pool is None:
+            pool = VisionWorkerPool(config)
+            pool.start()
+            _default_pool = pool
+        return _default_pool
+
+
+def shutdown_vision_pool() -> None:
+    """Stop the process-wide vision pool, if running."""
+    global _default_pool
+    
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.shutdown()
+            _default_pool = None
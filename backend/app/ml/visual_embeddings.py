@@ -5,10 +5,12 @@ Sprint 3: Vision Engine
 
 Features:
 - CLIP (Contrastive Language-Image Pre-training) embeddings
+- Pluggable inference backend (PyTorch or int8 ONNX Runtime on CPU)
 - Vision Transformer embeddings
 - FAISS vector similarity search
 - Embedding persistence and retrieval
 - Clip-level similarity for content discovery
+- Near-duplicate frame skipping (perceptual-hash embedding cache)
 """
 
 import logging
@@ -17,14 +19,6 @@ from typing import List, Optional, Dict, Any, Tuple
 import numpy as np
 from pathlib import Path
 
-try:
-    from transformers import CLIPProcessor, CLIPModel
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logging.warning("Transformers not installed. CLIP embeddings will fail.")
-
 try:
     import faiss
     FAISS_AVAILABLE = True
@@ -32,9 +26,9 @@ except ImportError:
     FAISS_AVAILABLE = False
     logging.warning("FAISS not installed. Similarity search will be limited.")
 
-from PIL import Image
-
 from .models import VisualEmbedding, SimilarityResult, VisionConfig
+from .embedding_cache import PerceptualHashCache
+from .embedding_backends import EmbeddingBackend, create_backend, resolve_model_name
 
 logger = logging.getLogger(__name__)
 
@@ -59,15 +53,25 @@ class VisualEmbeddingsEngine:
         self.config = config or VisionConfig()
         self.model: Optional[Any] = None
         self.processor: Optional[Any] = None
+        self.backend: Optional[EmbeddingBackend] = None
         self.device = self._detect_device()
         
         # FAISS index
         self.faiss_index: Optional[Any] = None
         self.embedding_metadata: Dict[str, Dict] = {}  # embedding_id -> metadata
         
+        # Near-duplicate frame cache (dHash -> vector)
+        self.embedding_cache: Optional[PerceptualHashCache] = None
+        if self.config.embedding_cache_enabled:
+            self.embedding_cache = PerceptualHashCache(
+                max_size=self.config.embedding_cache_size,
+                max_hamming=self.config.embedding_cache_max_hamming
+            )
+        
         logger.info(
             f"VisualEmbeddingsEngine initialized with model={self.config.embedding_model}, "
-            f"device={self.device}, faiss_enabled={self.config.use_faiss}"
+            f"backend={self.config.embedding_backend}, device={self.device}, "
+            f"faiss_enabled={self.config.use_faiss}"
         )
     
     def _detect_device(self) -> str:
@@ -82,35 +86,36 @@ class VisualEmbeddingsEngine:
     
     def load_model(self, model_name: Optional[str] = None) -> None:
         """
-        Load CLIP model from HuggingFace.
+        Load CLIP model through the configured inference backend.
+        
+        config.embedding_backend selects 'torch' (PyTorch fp32 via
+        transformers) or 'onnx' (ONNX Runtime, int8-quantized on CPU).
         
         Args:
             model_name: Model name. If None, uses config.embedding_model.
         
         Raises:
-            RuntimeError: If transformers is not installed
+            RuntimeError: If the backend's dependencies are not installed
         """
-        if not TRANSFORMERS_AVAILABLE:
-            raise RuntimeError(
-                "Transformers not installed. Install with: pip install transformers"
-            )
-        
         model_name = model_name or self.config.embedding_model
+        hf_model_name = resolve_model_name(model_name)
         
-        # Map friendly names to HuggingFace model IDs
-        model_mapping = {
-            "clip-vit-base-patch32": "openai/clip-vit-base-patch32",
-            "clip-vit-large-patch14": "openai/clip-vit-large-patch14",
-        }
-        
-        hf_model_name = model_mapping.get(model_name, model_name)
+        backend = create_backend(self.config, device=self.device)
         
         try:
-            logger.info(f"Loading CLIP model: {hf_model_name}...")
-            self.processor = CLIPProcessor.from_pretrained(hf_model_name)
-            self.model = CLIPModel.from_pretrained(hf_model_name).to(self.device)
-            self.model.eval()
-            logger.info(f"✅ CLIP model loaded successfully: {hf_model_name}")
+            logger.info(f"Loading CLIP model: {hf_model_name} (backend={backend.name})...")
+            backend.load(hf_model_name)
+            
+            self.backend = backend
+            self.model = backend.model
+            self.processor = backend.processor
+            self.device = backend.device
+            
+            # Cached vectors belong to the previous model
+            if self.embedding_cache is not None:
+                self.embedding_cache.clear()
+            
+            logger.info(f"✅ CLIP model loaded successfully: {hf_model_name} (backend={backend.name})")
         except Exception as e:
             logger.error(f"Failed to load CLIP model: {e}")
             raise RuntimeError(f"CLIP model load failed: {e}")
@@ -138,22 +143,7 @@ class VisualEmbeddingsEngine:
             raise RuntimeError("CLIP model not loaded. Call load_model() first.")
         
         try:
-            # Convert numpy to PIL
-            if isinstance(image, np.ndarray):
-                pil_image = Image.fromarray(image.astype('uint8'), 'RGB')
-            else:
-                pil_image = image
-            
-            # Process image
-            inputs = self.processor(images=pil_image, return_tensors="pt")
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Generate embedding
-            with torch.no_grad():
-                image_features = self.model.get_image_features(**inputs)
-                # Normalize embedding
-                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
-                embedding_vector = image_features.cpu().numpy()[0].tolist()
+            embedding_vector = self._embed_with_cache([image])[0].tolist()
             
             return VisualEmbedding(
                 embedding_id=embedding_id,
@@ -195,24 +185,7 @@ class VisualEmbeddingsEngine:
             timestamps_ms = [None] * len(images)
         
         try:
-            # Convert to PIL images
-            pil_images = []
-            for img in images:
-                if isinstance(img, np.ndarray):
-                    pil_images.append(Image.fromarray(img.astype('uint8'), 'RGB'))
-                else:
-                    pil_images.append(img)
-            
-            # Process batch
-            inputs = self.processor(images=pil_images, return_tensors="pt", padding=True)
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Generate embeddings
-            with torch.no_grad():
-                image_features = self.model.get_image_features(**inputs)
-                # Normalize
-                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
-                embedding_vectors = image_features.cpu().numpy()
+            embedding_vectors = self._embed_with_cache(images)
             
             # Create VisualEmbedding objects
             embeddings = []
@@ -233,6 +206,77 @@ class VisualEmbeddingsEngine:
             logger.error(f"Batch embedding generation failed: {e}")
             raise
     
+    def _embed_with_cache(self, images: List[np.ndarray]) -> np.ndarray:
+        """
+        Embed images, reusing vectors of near-duplicate frames.
+        
+        Frames whose dHash is within the Hamming threshold of a cached frame,
+        or of an earlier frame in the same batch, reuse that vector; only the
+        remaining unique frames go through CLIP (in a single batch).
+        
+        Args:
+            images: List of images as numpy arrays (H, W, 3) RGB
+        
+        Returns:
+            (N, D) array of normalized embedding vectors, in input order
+        """
+        cache = self.embedding_cache
+        if cache is None or not all(isinstance(img, np.ndarray) for img in images):
+            return self._compute_embeddings(images)
+        
+        hashes = [cache.dhash(img) for img in images]
+        vectors: List[Optional[np.ndarray]] = [None] * len(images)
+        to_embed: List[int] = []  # indices of unique frames to run through CLIP
+        aliases: Dict[int, int] = {}  # in-batch duplicate index -> to_embed position
+        
+        for i, frame_hash in enumerate(hashes):
+            cached = cache.get(frame_hash, count=False)
+            if cached is not None:
+                vectors[i] = cached
+                continue
+            
+            for position, j in enumerate(to_embed):
+                if cache.hamming(frame_hash, hashes[j]) <= cache.max_hamming:
+                    aliases[i] = position
+                    break
+            else:
+                to_embed.append(i)
+        
+        cache.record(hits=len(images) - len(to_embed), misses=len(to_embed))
+        
+        if to_embed:
+            computed = self._compute_embeddings([images[i] for i in to_embed])
+            for position, i in enumerate(to_embed):
+                vectors[i] = computed[position]
+                cache.put(hashes[i], computed[position])
+            for i, position in aliases.items():
+                vectors[i] = computed[position]
+        
+        logger.debug(
+            f"Embedding cache: {len(images) - len(to_embed)}/{len(images)} frames reused"
+        )
+        
+        return np.stack(vectors)
+    
+    def _compute_embeddings(self, images: List[Any]) -> np.ndarray:
+        """
+        Run the inference backend on a batch of images.
+        
+        Args:
+            images: List of images (numpy RGB arrays or PIL images)
+        
+        Returns:
+            (N, D) array of L2-normalized embedding vectors
+        """
+        return self.backend.embed(images)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get near-duplicate embedding cache statistics."""
+        if self.embedding_cache is None:
+            return {"enabled": False}
+        
+        return {"enabled": True, **self.embedding_cache.get_stats()}
+    
     def average_embeddings(self, embeddings: List[VisualEmbedding]) -> List[float]:
         """
         Average multiple embeddings into a single clip-level embedding.
@@ -372,6 +416,81 @@ class VisualEmbeddingsEngine:
                 search_time_ms=(time.time() - start_time) * 1000
             )
     
+    def search_similar_batch(
+        self,
+        query_embeddings: List[VisualEmbedding],
+        top_k: int = 5
+    ) -> List[SimilarityResult]:
+        """
+        Search for similar embeddings of many queries with one FAISS call.
+        
+        The query matrix is searched at once; scores are computed for the
+        whole batch and each distinct neighbour's metadata is looked up once.
+        
+        Args:
+            query_embeddings: Query embeddings
+            top_k: Number of results per query
+        
+        Returns:
+            One SimilarityResult per query, in order (search_time_ms is the
+            batch time split evenly across queries)
+        """
+        if not query_embeddings:
+            return []
+        
+        if self.faiss_index is None or self.faiss_index.ntotal == 0:
+            logger.warning("FAISS index is empty or not initialized.")
+            return [
+                SimilarityResult(
+                    query_embedding_id=query.embedding_id,
+                    similar_embeddings=[],
+                    search_time_ms=0.0
+                )
+                for query in query_embeddings
+            ]
+        
+        start_time = time.time()
+        
+        try:
+            query_vectors = np.array([query.vector for query in query_embeddings], dtype=np.float32)
+            distances, indices = self.faiss_index.search(query_vectors, min(top_k, self.faiss_index.ntotal))
+            similarities = 1.0 / (1.0 + distances)
+            
+            metadata_by_idx = {
+                idx: self.embedding_metadata.get(str(idx), {})
+                for idx in np.unique(indices).tolist() if idx != -1
+            }
+            
+            results_per_query = []
+            for dists, idxs, sims in zip(distances.tolist(), indices.tolist(), similarities.tolist()):
+                results_per_query.append([
+                    {
+                        "rank": i + 1,
+                        "embedding_id": metadata_by_idx[idx].get("embedding_id", f"idx_{idx}"),
+                        "distance": dist,
+                        "similarity": sim,
+                        "metadata": metadata_by_idx[idx]
+                    }
+                    for i, (dist, idx, sim) in enumerate(zip(dists, idxs, sims))
+                    if idx != -1  # FAISS returns -1 for invalid indices
+                ])
+            
+            search_time_ms = (time.time() - start_time) * 1000 / len(query_embeddings)
+        
+        except Exception as e:
+            logger.error(f"FAISS batch search failed: {e}")
+            results_per_query = [[] for _ in query_embeddings]
+            search_time_ms = (time.time() - start_time) * 1000 / len(query_embeddings)
+        
+        return [
+            SimilarityResult(
+                query_embedding_id=query.embedding_id,
+                similar_embeddings=similar_embeddings,
+                search_time_ms=search_time_ms
+            )
+            for query, similar_embeddings in zip(query_embeddings, results_per_query)
+        ]
+    
     def cosine_similarity(self, emb1: VisualEmbedding, emb2: VisualEmbedding) -> float:
         """
         Calculate cosine similarity between two embeddings.
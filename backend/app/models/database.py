@@ -212,6 +212,19 @@ class RuleEngineWeights(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
+# Rule Engine Training Checkpoints
+class RuleEngineTrainingCheckpoint(Base):
+    """Rule engine trainer ledger position and solver state per platform."""
+    __tablename__ = "rules_engine_training_checkpoints"
+    
+    platform = Column(String(50), primary_key=True)
+    last_event_timestamp = Column(DateTime, nullable=True)
+    last_event_id = Column(String(36), nullable=True)
+    weights = Column(JSON, nullable=False)
+    examples_seen = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 # Best Clip Decisions (Campaigns Orchestrator)
 class BestClipDecisionModel(Base):
     """Best clip decision model for campaigns orchestrator."""
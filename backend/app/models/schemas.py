@@ -46,6 +46,7 @@ class Job(BaseModel):
     job_type: str
     status: str
     params: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -54,7 +54,8 @@ async def execute_actions(
                     "params": action.params,
                     "result": result,
                     "status": "success"
-                }
+                },
+                durability="transactional"
             )
             
         except Exception as e:
@@ -79,7 +80,8 @@ async def execute_actions(
                     "error": str(e),
                     "status": "error"
                 },
-                is_error=True
+                is_error=True,
+                durability="transactional"
             )
     
     return {
@@ -93,7 +93,8 @@ async def publish_clip(
             "platform": request.platform,
             "social_account_id": str(request.social_account_id) if request.social_account_id else None,
             "publish_log_id": str(publish_log.id)
-        }
+        },
+        durability="transactional"
     )
     
     # 4. Determine publishing method: Provider Client (if credentials) or Simulator
@@ -121,7 +122,8 @@ async def publish_clip(
                                 "platform": request.platform,
                                 "provider": provider_client.platform_name,
                                 "publish_log_id": str(publish_log.id)
-                            }
+                            },
+                            durability="transactional"
                         )
                     else:
                         # Provider exists but doesn't have all required config
@@ -134,7 +136,8 @@ async def publish_clip(
                                 "platform": request.platform,
                                 "reason": "incomplete_config",
                                 "publish_log_id": str(publish_log.id)
-                            }
+                            },
+                            durability="transactional"
                         )
                 except (AccountCredentialsError, UnsupportedPlatformError) as e:
                     # Failed to get provider client, fall back to simulator
@@ -147,7 +150,8 @@ async def publish_clip(
                             "platform": request.platform,
                             "reason": str(e),
                             "publish_log_id": str(publish_log.id)
-                        }
+                        },
+                        durability="transactional"
                     )
         except Exception as e:
             # Any error getting credentials, fall back to simulator
@@ -160,7 +164,8 @@ async def publish_clip(
                     "platform": request.platform,
                     "reason": f"credential_error: {str(e)}",
                     "publish_log_id": str(publish_log.id)
-                }
+                },
+                durability="transactional"
             )
     
     # 5. Execute publish using provider client or simulator
@@ -212,7 +217,8 @@ async def publish_clip(
                 "platform": request.platform,
                 "error": str(e),
                 "publish_log_id": str(publish_log.id)
-            }
+            },
+            durability="transactional"
         )
         
         return PublishResult(
@@ -245,7 +251,8 @@ async def publish_clip(
                 "external_post_id": publish_result.external_post_id,
                 "external_url": publish_result.external_url,
                 "publish_log_id": str(publish_log.id)
-            }
+            },
+            durability="transactional"
         )
     else:
         publish_log.status = "failed"
@@ -263,7 +270,8 @@ async def publish_clip(
                 "platform": request.platform,
                 "error": publish_result.error_message,
                 "publish_log_id": str(publish_log.id)
-            }
+            },
+            durability="transactional"
         )
     
     return publish_result
@@ -413,7 +413,8 @@ async def auto_schedule_clip(
             "scheduled_for": scheduled_for.isoformat(),
             "priority": priority_calc.priority,
             "conflict_detected": conflict_info.detected
-        }
+        },
+        durability="transactional"
     )
     
     reason = None
@@ -490,7 +491,8 @@ async def _resolve_conflicts(
                     "original_slot": original_time.isoformat(),
                     "new_slot": new_slot.isoformat(),
                     "reason": "Lower priority, shifted by higher priority request"
-                }
+                },
+                durability="transactional"
             )
             
             await log_event(
@@ -502,7 +504,8 @@ async def _resolve_conflicts(
                     "shifted_to": new_slot.isoformat(),
                     "conflict_priority": conflict_priority,
                     "winner_priority": proposed_priority
-                }
+                },
+                durability="transactional"
             )
             
             return ConflictInfo(
@@ -528,7 +531,8 @@ async def _resolve_conflicts(
                 "proposed_slot": proposed_time.isoformat(),
                 "shifted_to": new_slot.isoformat(),
                 "reason": "Lower priority, shifted to next available slot"
-            }
+            },
+            durability="transactional"
         )
         
         return ConflictInfo(
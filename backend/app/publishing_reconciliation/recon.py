@@ -112,7 +112,8 @@ async def reconcile_publications(
                     "action": "marked_success",
                     "reason": "webhook_confirmed",
                     "external_post_id": log.external_post_id
-                }
+                },
+                durability="transactional"
             )
             
             stats["marked_success"] += 1
@@ -146,7 +147,8 @@ async def reconcile_publications(
                     "action": "marked_failed",
                     "reason": "webhook_timeout",
                     "timeout_minutes": since_minutes
-                }
+                },
+                durability="transactional"
             )
             
             stats["marked_failed"] += 1
@@ -6,6 +6,7 @@ from sqlalchemy import select, and_
 
 from app.models.database import Clip, SocialAccountModel, PublishLogModel
 from app.core.config import Settings
+from app.core.clip_dedup import find_recent_duplicates
 from app.ledger import log_event
 from .models import ScheduleRequest, ScheduleResponse, PublishLogScheduledInfo
 
@@ -184,6 +185,21 @@ async def schedule_publication(
     # Validate and adjust schedule
     adjusted_for, adjusted_window, reason = await validate_and_adjust_schedule(db, request)
     
+    # Check for near-duplicates already scheduled/published on this platform
+    duplicates = await find_recent_duplicates(db, [clip], request.platform, around=adjusted_for)
+    near_duplicates = duplicates.get(str(clip_uuid), [])
+    
+    if near_duplicates and settings.CLIP_DEDUP_ACTION == "skip":
+        closest = near_duplicates[0]
+        return ScheduleResponse(
+            publish_log_id="",
+            status="rejected",
+            reason=(
+                f"Near-duplicate of clip {closest['clip_id']} (similarity {closest['similarity']:.2f}) "
+                f"on {request.platform} within {settings.CLIP_DEDUP_WINDOW_DAYS} days"
+            )
+        )
+    
     # Create scheduled publish log
     log = PublishLogModel(
         clip_id=clip_uuid,
@@ -197,7 +213,8 @@ async def schedule_publication(
         extra_metadata={
             "original_scheduled_for": request.scheduled_for.isoformat(),
             "original_window_end": request.scheduled_window_end.isoformat() if request.scheduled_window_end else None,
-            "adjustment_reason": reason
+            "adjustment_reason": reason,
+            "near_duplicates": near_duplicates or None
         }
     )
     
@@ -219,7 +236,8 @@ async def schedule_publication(
             "scheduled_window_end": adjusted_window.isoformat() if adjusted_window else None,
             "scheduled_by": request.scheduled_by,
             "status": "scheduled"
-        }
+        },
+        durability="transactional"
     )
     
     if reason:
@@ -234,7 +252,22 @@ async def schedule_publication(
                 "original_time": request.scheduled_for.isoformat(),
                 "adjusted_time": adjusted_for.isoformat(),
                 "reason": reason
-            }
+            },
+            durability="transactional"
+        )
+    
+    if near_duplicates:
+        await log_event(
+            db=db,
+            event_type="publish_near_duplicate_flagged",
+            entity_type="publish_log",
+            entity_id=str(log.id),
+            metadata={
+                "clip_id": request.clip_id,
+                "platform": request.platform,
+                "near_duplicates": near_duplicates
+            },
+            durability="transactional"
         )
     
     return ScheduleResponse(
@@ -335,7 +368,8 @@ async def scheduler_tick(
                     "social_account_id": str(log.social_account_id),
                     "scheduled_for": log.scheduled_for.isoformat(),
                     "enqueued_at": now.isoformat()
-                }
+                },
+                durability="transactional"
             )
         
         moved_ids.append(str(log.id))
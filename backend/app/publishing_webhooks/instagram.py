@@ -93,7 +93,8 @@ async def handle_instagram_webhook(db: AsyncSession, payload: Dict[str, Any]) ->
             "platform": "instagram",
             "external_post_id": external_post_id,
             "webhook_status": payload.get("status", "published")
-        }
+        },
+        durability="transactional"
     )
     
     logger.info(f"Instagram webhook processed for log {log.id}")
@@ -96,7 +96,8 @@ async def handle_tiktok_webhook(db: AsyncSession, payload: Dict[str, Any]) -> Di
             "external_post_id": external_post_id,
             "task_id": payload.get("task_id"),
             "complete": payload.get("complete", False)
-        }
+        },
+        durability="transactional"
     )
     
     logger.info(f"TikTok webhook processed for log {log.id}")
@@ -96,7 +96,8 @@ async def handle_youtube_webhook(db: AsyncSession, payload: Dict[str, Any]) -> D
             "external_post_id": external_post_id,
             "videoId": payload.get("videoId"),
             "webhook_status": payload.get("status", "published")
-        }
+        },
+        durability="transactional"
     )
     
     logger.info(f"YouTube webhook processed for log {log.id}")
@@ -234,7 +234,8 @@ async def _process_one_log(db: AsyncSession, worker_id: str) -> Dict[str, Any]:
             "worker_id": worker_id,
             "platform": log.platform,
             "clip_id": str(log.clip_id)
-        }
+        },
+        durability="transactional"
     )
     
     logger.info(f"Worker {worker_id}: Processing log {log.id} (platform={log.platform})")
@@ -277,7 +278,8 @@ async def _process_one_log(db: AsyncSession, worker_id: str) -> Dict[str, Any]:
                 "platform": log.platform,
                 "external_post_id": result.external_post_id,
                 "external_url": result.external_url
-            }
+            },
+            durability="transactional"
         )
         
         logger.info(
@@ -336,7 +338,8 @@ async def _process_one_log(db: AsyncSession, worker_id: str) -> Dict[str, Any]:
                 "error_message": error_message,
                 "retry_count": log.retry_count,
                 "max_retries": log.max_retries
-            }
+            },
+            durability="transactional"
         )
         
         logger_msg = (
@@ -1,13 +1,15 @@
 """
 Main Rule Engine interface.
 """
+from typing import List, Sequence
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.database import Clip
 from app.rules_engine.models import AdaptiveRuleSet
-from app.rules_engine.loader import load_rules
+from app.rules_engine.loader import load_rules, load_rules_cached
 from app.rules_engine.heuristics import apply_platform_heuristics
-from app.rules_engine.evaluator import evaluate_clip_by_id
+from app.rules_engine.evaluator import evaluate_clip_by_id, evaluate_clips
 from app.rules_engine.trainer import train_rules
 
 
@@ -17,14 +19,15 @@ class RuleEngine:
     
     Provides high-level methods for:
     - Getting rules for a platform
-    - Evaluating clips
+    - Evaluating clips (one at a time or in batches)
     - Training adaptive weights
     """
     
     async def get_rules(
         self,
         db: AsyncSession,
-        platform: str
+        platform: str,
+        use_cache: bool = False
     ) -> AdaptiveRuleSet:
         """
         Get rule set for a platform.
@@ -34,12 +37,16 @@ class RuleEngine:
         Args:
             db: Database session
             platform: Target platform (tiktok|instagram|youtube)
-            
+            use_cache: Serve base rules from the in-process rule cache
+        
         Returns:
             AdaptiveRuleSet with weights
         """
         # Load base rules from database
-        rules = await load_rules(db, platform)
+        if use_cache:
+            rules = await load_rules_cached(db, platform)
+        else:
+            rules = await load_rules(db, platform)
         
         # Apply platform heuristics
         rules = apply_platform_heuristics(rules, platform)
@@ -59,7 +66,7 @@ class RuleEngine:
             db: Database session
             clip_id: ID of clip to evaluate
             platform: Target platform
-            
+        
         Returns:
             Score between 0.0 and 1.0
         """
@@ -71,6 +78,29 @@ class RuleEngine:
         
         return score
     
+    async def evaluate_clips_batch(
+        self,
+        db: AsyncSession,
+        clips: Sequence[Clip],
+        platform: str
+    ) -> List[float]:
+        """
+        Evaluate many clips for a specific platform.
+        
+        Rules are loaded once (from the rule cache) and all clips are
+        scored in one vectorized pass, logging a single ledger event.
+        
+        Args:
+            db: Database session
+            clips: Clips to evaluate
+            platform: Target platform
+        
+        Returns:
+            Scores between 0.0 and 1.0, in input order
+        """
+        rules = await self.get_rules(db, platform, use_cache=True)
+        return await evaluate_clips(db, clips, rules, platform)
+    
     async def train(
         self,
         db: AsyncSession,
@@ -82,7 +112,7 @@ class RuleEngine:
         Args:
             db: Database session
             platform: Platform to train for
-            
+        
         Returns:
             Updated AdaptiveRuleSet
         """
@@ -1,8 +1,9 @@
 """
 Clip evaluator - normalizes features and computes weighted scores.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence
 from uuid import UUID
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -11,6 +12,10 @@ from app.rules_engine.models import AdaptiveRuleSet
 from app.ledger import log_event
 
 
+# Columns of the feature matrix built by _feature_matrix()
+FEATURE_NAMES = ("visual_score", "duration_ms", "cut_position", "motion_intensity")
+
+
 async def evaluate_clip(
     db: AsyncSession,
     clip: Clip,
@@ -25,7 +30,7 @@ async def evaluate_clip(
         clip: Clip to evaluate
         rules: Rule set with weights
         platform: Target platform
-        
+    
     Returns:
         Score between 0.0 and 1.0
     """
@@ -64,7 +69,7 @@ def _normalize_features(clip: Clip) -> Dict[str, float]:
     
     Args:
         clip: Clip to extract features from
-        
+    
     Returns:
         Dictionary of normalized features
     """
@@ -84,13 +89,89 @@ def _normalize_features(clip: Clip) -> Dict[str, float]:
     # For now, use a default of 0.5 (middle of video)
     features["cut_position"] = 0.5
     
-    # motion_intensity - simulated for now (would come from video analysis)
-    # Use a default value
-    features["motion_intensity"] = 0.5
+    # motion_intensity - measured by cut analysis (clip params), default 0.5
+    motion_intensity = (clip.params or {}).get("motion_intensity")
+    if motion_intensity is not None:
+        features["motion_intensity"] = min(1.0, max(0.0, float(motion_intensity)))
+    else:
+        features["motion_intensity"] = 0.5
     
     return features
 
 
+async def evaluate_clips(
+    db: AsyncSession,
+    clips: Sequence[Clip],
+    rules: AdaptiveRuleSet,
+    platform: str
+) -> List[float]:
+    """
+    Evaluate many clips at once and return their scores in input order.
+    
+    Scores match evaluate_clip(); the features of all clips are normalized
+    into one matrix and weighted with a single matrix product. Logs one
+    clips_evaluated ledger event for the whole batch instead of one
+    clip_evaluated event per clip.
+    
+    Args:
+        db: Database session
+        clips: Clips to evaluate
+        rules: Rule set with weights
+        platform: Target platform
+    
+    Returns:
+        Scores between 0.0 and 1.0
+    """
+    if not clips:
+        return []
+    
+    X = _feature_matrix(clips)
+    weights = np.array([rules.weights.get(name, 0.0) for name in FEATURE_NAMES])
+    scores = np.clip(X @ weights, 0.0, 1.0)
+    
+    # One summary event, with per-clip columns for the trainer
+    await log_event(
+        db=db,
+        event_type="clips_evaluated",
+        entity_type="rules_engine",
+        entity_id=platform,
+        metadata={
+            "platform": platform,
+            "num_clips": len(clips),
+            "score_mean": float(scores.mean()),
+            "score_max": float(scores.max()),
+            "weights": rules.weights,
+            "clip_ids": [str(clip.id) for clip in clips],
+            "scores": scores.tolist(),
+            "features": {name: X[:, i].tolist() for i, name in enumerate(FEATURE_NAMES)}
+        }
+    )
+    
+    return scores.tolist()
+
+
+def _feature_matrix(clips: Sequence[Clip]) -> np.ndarray:
+    """
+    Normalized features of many clips, as _normalize_features() computes them.
+    
+    Returns:
+        (len(clips), len(FEATURE_NAMES)) matrix
+    """
+    visual = np.array([clip.visual_score or 0.5 for clip in clips], dtype=np.float64)
+    duration = np.array([clip.duration_ms or 0 for clip in clips], dtype=np.float64)
+    motion = np.array(
+        [(clip.params or {}).get("motion_intensity") for clip in clips],
+        dtype=np.float64
+    )  # None -> nan
+    
+    X = np.empty((len(clips), len(FEATURE_NAMES)))
+    X[:, 0] = np.clip(visual, 0.0, 1.0)
+    X[:, 1] = np.where(duration != 0, np.minimum(1.0, duration / 60000.0), 0.5)
+    X[:, 2] = 0.5  # cut_position, see _normalize_features()
+    X[:, 3] = np.where(np.isnan(motion), 0.5, np.clip(motion, 0.0, 1.0))
+    return X
+
+
 async def evaluate_clip_by_id(
     db: AsyncSession,
     clip_id: UUID,
@@ -105,10 +186,10 @@ async def evaluate_clip_by_id(
         clip_id: ID of clip to evaluate
         rules: Rule set with weights
         platform: Target platform
-        
+    
     Returns:
         Score between 0.0 and 1.0
-        
+    
     Raises:
         ValueError: If clip not found
     """
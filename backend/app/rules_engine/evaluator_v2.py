@@ -2,7 +2,8 @@
 Rules Evaluator v2 - Evaluate rules against state snapshot
 
 Takes RuleSet + StateSnapshot and returns:
-- Triggered rules
+- Triggered rules (including the base_rules.json if/then rules, compiled
+  once by rule_compiler)
 - Priority level
 - Recommended action
 - Reasoning
@@ -18,6 +19,7 @@ import time
 
 from .loader_v2 import DecisionRule, MergedRuleSet, RulePriority, RuleType
 from .rule_context import StateSnapshot, ChannelType, Platform
+from .rule_compiler import CompiledRule, CompiledRuleSet, compile_rules
 
 
 class ActionType(str, Enum):
@@ -61,6 +63,7 @@ class DecisionResult(BaseModel):
     
     # Triggered rules
     triggered_rules: List[str]  # rule_ids
+    fired_rules: List[Dict[str, Any]] = []  # if/then rules: rule_id, priority, then
     
     # Decision
     recommended_action: ActionType
@@ -88,6 +91,7 @@ class RulesEvaluatorV2:
     Decision flow:
     1. Check CRITICAL rules (safety, cost guards) - REJECT if violated
     2. Check HIGH rules (brand compliance, quality) - EVALUATE for official
+       (if/then rules whose action is reject_content fail these checks)
     3. Check MEDIUM rules (trends, platform) - RECOMMEND actions
     4. Check LOW rules (ML predictions) - OPTIMIZE actions
     """
@@ -101,6 +105,10 @@ class RulesEvaluatorV2:
         """
         self.ruleset = ruleset
         self.rules_by_priority = self._organize_rules_by_priority()
+        self.compiled_rules: CompiledRuleSet = compile_rules({
+            "rules": ruleset.dsl_rules,
+            "evaluation_order": ruleset.evaluation_order
+        })
     
     def _organize_rules_by_priority(self) -> Dict[RulePriority, List[DecisionRule]]:
         """Organize rules by priority for fast lookup."""
@@ -123,7 +131,7 @@ class RulesEvaluatorV2:
         
         Args:
             snapshot: Current system state
-            
+        
         Returns:
             DecisionResult with recommended action
         """
@@ -152,11 +160,23 @@ class RulesEvaluatorV2:
                 requires_human_approval=False
             )
         
+        # if/then rules from base_rules.json
+        fired = self.compiled_rules.evaluate(snapshot)
+        fired_rules = [
+            {"rule_id": rule.rule_id, "priority": rule.priority.value, "then": rule.then}
+            for rule in fired
+        ]
+        for rule in fired:
+            triggered_rules.append(rule.rule_id)
+            reasoning.append(rule.then.get("reason", f"Rule {rule.rule_id} matched"))
+        
         # Step 2: Check HIGH rules (brand compliance, quality)
         high_result = await self._evaluate_high(snapshot)
         triggered_rules.extend(high_result["triggered"])
         reasoning.extend(high_result["reasoning"])
         warnings.extend(high_result.get("warnings", []))
+        rule_actions = self._apply_fired_rules(fired, high_result)
+        reasoning.extend(rule_actions["reasoning"])
         
         # Step 3: Check MEDIUM rules (trends, platform)
         medium_result = await self._evaluate_medium(snapshot)
@@ -172,6 +192,7 @@ class RulesEvaluatorV2:
         decision = await self._make_decision(
             snapshot, high_result, medium_result, low_result
         )
+        self._merge_rule_actions(decision, rule_actions)
         
         evaluation_time = (time.time() - start_time) * 1000
         
@@ -179,6 +200,7 @@ class RulesEvaluatorV2:
             timestamp=datetime.utcnow(),
             snapshot_id=snapshot.snapshot_id,
             triggered_rules=triggered_rules,
+            fired_rules=fired_rules,
             recommended_action=decision["action"],
             action_priority=decision["priority"],
             confidence=decision["confidence"],
@@ -189,6 +211,70 @@ class RulesEvaluatorV2:
             requires_human_approval=decision.get("requires_approval", False)
         )
     
+    def match_rules_batch(self, snapshots: List[StateSnapshot]) -> List[List[str]]:
+        """
+        IDs of the if/then rules that fire for each snapshot.
+        
+        Args:
+            snapshots: States to check
+        
+        Returns:
+            Fired rule IDs per snapshot (evaluation order), in input order
+        """
+        return [
+            [rule.rule_id for rule in fired]
+            for fired in self.compiled_rules.evaluate_many(snapshots)
+        ]
+    
+    def _apply_fired_rules(self, fired: List[CompiledRule], high_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fold the `then` of fired if/then rules into the evaluation.
+        
+        - action reject_content: fails the HIGH checks, so official content
+          goes through the HOLD/approval path and satellite content through
+          its quality rejection (ignored if a fired rule sets
+          skip_brand_validation)
+        - action flag_for_review: the decision requires human approval
+        - boost_score: summed over fired rules
+        
+        Returns:
+            Dict with actions (rule_id -> then), boost_score,
+            requires_approval and reasoning
+        """
+        result = {
+            "actions": {rule.rule_id: rule.then for rule in fired},
+            "boost_score": sum(rule.then.get("boost_score", 0.0) for rule in fired),
+            "requires_approval": False,
+            "reasoning": []
+        }
+        skip_brand_validation = any(rule.then.get("skip_brand_validation") for rule in fired)
+        
+        for rule in fired:
+            action = rule.then.get("action")
+            if action == ActionType.REJECT_CONTENT.value:
+                if skip_brand_validation:
+                    result["reasoning"].append(f"Rule {rule.rule_id} skipped (brand validation skipped)")
+                else:
+                    high_result["pass"] = False
+            elif action == "flag_for_review":
+                result["requires_approval"] = True
+        
+        return result
+    
+    def _merge_rule_actions(self, decision: Dict[str, Any], rule_actions: Dict[str, Any]) -> None:
+        """Add fired if/then rule actions to a decision's params."""
+        if not rule_actions["actions"]:
+            return
+        
+        params = decision.setdefault("params", {})
+        params["rule_actions"] = rule_actions["actions"]
+        if rule_actions["boost_score"]:
+            params["boost_score"] = rule_actions["boost_score"]
+        if rule_actions["requires_approval"] and decision["action"] in (
+            ActionType.POST_SHORT, ActionType.POST_TO_SATELLITE
+        ):
+            decision["requires_approval"] = True
+    
     async def _evaluate_critical(self, snapshot: StateSnapshot) -> Dict[str, Any]:
         """Evaluate CRITICAL rules (safety, cost guards)."""
         result = {
@@ -2,11 +2,22 @@
 Database loader for rule weights.
 """
 import json
+import time
 from datetime import datetime
+from typing import Dict, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.rules_engine.models import AdaptiveRuleSet, DEFAULT_WEIGHTS
+from app.rules_engine.models import AdaptiveRuleSet, TrainingCheckpoint, DEFAULT_WEIGHTS
+
+
+# In-process rule cache: platform -> (version, loaded_at, rules).
+# save_rules() bumps the version, so writes from this process are seen
+# immediately; the TTL bounds staleness for writes from other processes.
+RULES_CACHE_TTL_SECONDS = 60.0
+
+_rules_version = 0
+_rules_cache: Dict[str, Tuple[int, float, AdaptiveRuleSet]] = {}
 
 
 async def load_rules(
@@ -22,7 +33,7 @@ async def load_rules(
     Args:
         db: Database session
         platform: Platform to load rules for
-        
+    
     Returns:
         AdaptiveRuleSet for the platform
     """
@@ -67,3 +78,82 @@ async def load_rules(
         pass
     
     return rules
+
+
+def invalidate_rules_cache() -> None:
+    """Drop every cached rule set (called by save_rules)."""
+    global _rules_version
+    _rules_version += 1
+    _rules_cache.clear()
+
+
+async def load_rules_cached(
+    db: AsyncSession,
+    platform: str
+) -> AdaptiveRuleSet:
+    """
+    Load rule weights, served from the in-process cache when current.
+    
+    Args:
+        db: Database session
+        platform: Platform to load rules for
+    
+    Returns:
+        AdaptiveRuleSet for the platform
+    """
+    cached = _rules_cache.get(platform)
+    if (
+        cached
+        and cached[0] == _rules_version
+        and time.monotonic() - cached[1] < RULES_CACHE_TTL_SECONDS
+    ):
+        return cached[2]
+    
+    version = _rules_version
+    rules = await load_rules(db, platform)
+    
+    # A save during the load (e.g. of the defaults) makes this entry stale
+    _rules_cache[platform] = (version, time.monotonic(), rules)
+    
+    return rules
+
+
+async def load_training_checkpoint(
+    db: AsyncSession,
+    platform: str
+) -> TrainingCheckpoint:
+    """
+    Load the trainer checkpoint for a platform.
+    
+    Args:
+        db: Database session
+        platform: Platform to load the checkpoint for
+    
+    Returns:
+        TrainingCheckpoint (empty, i.e. start of the ledger, if none saved)
+    """
+    query = text("""
+        SELECT platform, last_event_timestamp, last_event_id, weights,
+               examples_seen, updated_at
+        FROM rules_engine_training_checkpoints
+        WHERE platform = :platform
+    """)
+    
+    result = await db.execute(query, {"platform": platform})
+    row = result.fetchone()
+    
+    if not row:
+        return TrainingCheckpoint(platform=platform)
+    
+    weights = row.weights
+    if isinstance(weights, str):
+        weights = json.loads(weights)
+    
+    return TrainingCheckpoint(
+        platform=platform,
+        last_event_timestamp=row.last_event_timestamp,
+        last_event_id=row.last_event_id,
+        weights=weights,
+        examples_seen=row.examples_seen,
+        updated_at=row.updated_at
+    )
@@ -51,6 +51,10 @@ class MergedRuleSet(BaseModel):
     brand_config: Dict[str, Any] = Field(default_factory=dict)
     satellite_config: Dict[str, Any] = Field(default_factory=dict)
     strategy_config: Dict[str, Any] = Field(default_factory=dict)
+    
+    # if/then DSL rules from base_rules.json (compiled by the evaluator)
+    dsl_rules: List[Dict[str, Any]] = Field(default_factory=list)
+    evaluation_order: List[str] = Field(default_factory=list)
 
 
 class RulesLoaderV2:
@@ -61,18 +65,24 @@ class RulesLoaderV2:
         self.rules_dir = self.base_dir / "rules_engine" / "rules"
         self.brand_dir = self.base_dir / "community_ai" / "brand"
     
-    def load_base_rules(self) -> List[DecisionRule]:
-        """Load base system rules."""
+    def _read_base_rules(self) -> Dict[str, Any]:
+        """Raw base_rules.json document ({} if missing)."""
         base_path = self.rules_dir / "base_rules.json"
         
         if not base_path.exists():
-            return []
+            return {}
         
         with open(base_path) as f:
-            data = json.load(f)
+            return json.load(f)
+    
+    def load_base_rules(self) -> List[DecisionRule]:
+        """Load base system rules (if/then DSL rules are left to load_dsl_rules)."""
+        data = self._read_base_rules()
         
         rules = []
         for rule_data in data.get("rules", []):
+            if "if" in rule_data:
+                continue
             rule = DecisionRule(
                 rule_id=rule_data["rule_id"],
                 rule_type=RuleType(rule_data["type"]),
@@ -86,6 +96,15 @@ class RulesLoaderV2:
         
         return rules
     
+    def load_dsl_rules(self) -> Dict[str, Any]:
+        """if/then DSL rules of base_rules.json and their evaluation order."""
+        data = self._read_base_rules()
+        
+        return {
+            "rules": [rule for rule in data.get("rules", []) if "if" in rule],
+            "evaluation_order": data.get("evaluation_order", [])
+        }
+    
     def load_brand_config(self) -> Dict[str, Any]:
         """Load brand static rules from onboarding."""
         brand_path = self.brand_dir / "brand_static_rules.json"
@@ -119,6 +138,7 @@ class RulesLoaderV2:
     def load_and_merge(self) -> MergedRuleSet:
         """Load all rules and configs, return merged ruleset."""
         rules = self.load_base_rules()
+        dsl = self.load_dsl_rules()
         brand_config = self.load_brand_config()
         satellite_config = self.load_satellite_config()
         strategy_config = self.load_strategy_config()
@@ -160,5 +180,7 @@ class RulesLoaderV2:
             rules=rules,
             brand_config=brand_config,
             satellite_config=satellite_config,
-            strategy_config=strategy_config
+            strategy_config=strategy_config,
+            dsl_rules=dsl["rules"],
+            evaluation_order=dsl["evaluation_order"]
         )
@@ -1,7 +1,7 @@
 """
 Data models for the Rule Engine.
 """
-from typing import Dict, Literal
+from typing import Dict, Literal, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,18 @@ class AdaptiveRuleSet(BaseModel):
         }
 
 
+class TrainingCheckpoint(BaseModel):
+    """Trainer position in the ledger and solver state for a platform."""
+    platform: str
+    # Keyset position: (timestamp, id) of the last ledger event read
+    last_event_timestamp: Optional[datetime] = None
+    last_event_id: Optional[str] = None
+    # Unnormalized SGD weights (the promoted weights are normalized)
+    weights: Dict[str, float] = Field(default_factory=dict)
+    examples_seen: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 # Default weights for each platform (before any training)
 DEFAULT_WEIGHTS: Dict[str, Dict[str, float]] = {
     "tiktok": {
@@ -6,7 +6,8 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.rules_engine.models import AdaptiveRuleSet
+from app.rules_engine.models import AdaptiveRuleSet, TrainingCheckpoint
+from app.rules_engine.loader import invalidate_rules_cache
 
 
 async def save_rules(
@@ -16,7 +17,8 @@ async def save_rules(
     """
     Save rule weights to database.
     
-    Uses UPSERT to insert or update existing rules.
+    Uses UPSERT to insert or update existing rules, then invalidates
+    the in-process rule cache.
     
     Args:
         db: Database session
@@ -45,3 +47,44 @@ async def save_rules(
     )
     
     await db.commit()
+    invalidate_rules_cache()
+
+
+async def save_training_checkpoint(
+    db: AsyncSession,
+    checkpoint: TrainingCheckpoint
+) -> None:
+    """
+    Save the trainer checkpoint for a platform (UPSERT).
+    
+    Args:
+        db: Database session
+        checkpoint: Ledger position and solver state to save
+    """
+    query = text("""
+        INSERT INTO rules_engine_training_checkpoints
+            (platform, last_event_timestamp, last_event_id, weights, examples_seen, updated_at)
+        VALUES
+            (:platform, :last_event_timestamp, :last_event_id, :weights, :examples_seen, :updated_at)
+        ON CONFLICT (platform)
+        DO UPDATE SET
+            last_event_timestamp = EXCLUDED.last_event_timestamp,
+            last_event_id = EXCLUDED.last_event_id,
+            weights = EXCLUDED.weights,
+            examples_seen = EXCLUDED.examples_seen,
+            updated_at = EXCLUDED.updated_at
+    """)
+    
+    await db.execute(
+        query,
+        {
+            "platform": checkpoint.platform,
+            "last_event_timestamp": checkpoint.last_event_timestamp,
+            "last_event_id": checkpoint.last_event_id,
+            "weights": json.dumps(checkpoint.weights),
+            "examples_seen": checkpoint.examples_seen,
+            "updated_at": checkpoint.updated_at
+        }
+    )
+    
+    await db.commit()
@@ -0,0 +1,302 @@
+"""
+Rule Compiler - Compile the base_rules.json if/then DSL
+
+Each rule's "if" block is parsed once into closures over StateSnapshot
+accessors, so evaluating a context is a handful of lookups and comparisons
+per condition (no JSON walking or operator dispatch at evaluation time).
+
+DSL:
+- "if": {field: condition, ...} - every condition must hold
+- condition: a literal (equality) or {operator: operand, ...} with
+  operators eq, ne, gt, gte, lt, lte, in, not_in, exists, outside_peak_hours
+- field: an alias from FIELD_ALIASES or a dotted path into StateSnapshot
+  ("vision_analysis.quality_score"); the whole path must be a key
+  RuleContextBuilder emits (SNAPSHOT_FIELDS), so a typo or a key no
+  engine provides fails at load time instead of never matching
+- "then": payload reported with the match
+
+A field missing from the context fails every condition on it, except
+{"exists": false}.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import operator
+
+from .loader_v2 import RulePriority
+from .rule_context import SNAPSHOT_FIELDS, StateSnapshot
+
+
+Context = Union[StateSnapshot, Dict[str, Any]]
+Predicate = Callable[[Context], bool]
+
+# StateSnapshot sections a field path may start with
+SNAPSHOT_SECTIONS = frozenset(StateSnapshot.model_fields)
+
+# DSL field names used by base_rules.json -> StateSnapshot paths
+# (quality_score and aesthetic_score are on a 0-10 scale, other scores 0-1)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "channel_type": ("content", "channel_type"),
+    "current_time": ("timestamp",),
+    "quality_score": ("vision_analysis", "quality_score"),
+    "brand_compliance_score": ("vision_analysis", "brand_compliance_score"),
+    "visual_rating": ("vision_analysis", "scene_coherence"),
+    "aesthetic_score": ("vision_analysis", "aesthetic_score"),
+    "color_palette_match": ("vision_analysis", "color_match_score"),
+    "virality_score": ("ml_predictions", "virality_score"),
+    "trend_match": ("trend_signals", "top_viral_score"),
+    "trend_alignment": ("trend_signals", "top_opportunity_confidence"),
+    "brand_fit": ("trend_signals", "top_brand_fit_score"),
+    "posts_today": ("cm_state", "daily_plan", "official_posts_scheduled"),
+    "recent_sentiment": ("cm_state", "sentiment_analysis", "sentiment_score"),
+}
+
+# Peak engagement hours (UTC), as used by the virality predictor
+PEAK_HOURS = frozenset([6, 7, 8, 9, 17, 18, 19, 20])
+
+_MISSING = object()
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+class RuleCompileError(ValueError):
+    """A rule does not parse or references an unknown field."""
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One rule, ready to evaluate."""
+    rule_id: str
+    priority: RulePriority
+    then: Dict[str, Any]
+    fields: Tuple[str, ...]
+    predicate: Predicate = field(repr=False, compare=False)
+    
+    def matches(self, context: Context) -> bool:
+        return self.predicate(context)
+
+
+@dataclass
+class CompiledRuleSet:
+    """Compiled rules in evaluation order."""
+    version: str = "1.0.0"
+    rules: List[CompiledRule] = field(default_factory=list)
+    
+    def evaluate(self, context: Context) -> List[CompiledRule]:
+        """Rules that fire for one context, in evaluation order."""
+        return [rule for rule in self.rules if rule.predicate(context)]
+    
+    def first_match(self, context: Context) -> Optional[CompiledRule]:
+        """First rule (in evaluation order) that fires, if any."""
+        for rule in self.rules:
+            if rule.predicate(context):
+                return rule
+        return None
+    
+    def evaluate_many(self, contexts: Iterable[Context]) -> List[List[CompiledRule]]:
+        """Fired rules for each context, in input order."""
+        rules = [(rule, rule.predicate) for rule in self.rules]
+        return [
+            [rule for rule, predicate in rules if predicate(context)]
+            for context in contexts
+        ]
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def resolve_field(name: str) -> Tuple[str, ...]:
+    """
+    StateSnapshot path of a DSL field.
+    
+    Raises:
+        RuleCompileError: If the field is neither an alias nor a path to a
+            key RuleContextBuilder emits
+    """
+    path = FIELD_ALIASES.get(name) or tuple(name.split("."))
+    section, key = path[0], ".".join(path[1:])
+    
+    if section not in SNAPSHOT_SECTIONS:
+        raise RuleCompileError(
+            f"Unknown field '{name}' (expected one of {sorted(FIELD_ALIASES)} "
+            f"or a path into {sorted(SNAPSHOT_SECTIONS)})"
+        )
+    if key and key not in SNAPSHOT_FIELDS.get(section, ()):
+        raise RuleCompileError(
+            f"Unknown field '{name}': RuleContextBuilder emits no '{key}' in '{section}'"
+        )
+    return path
+
+
+def _accessor(path: Tuple[str, ...]) -> Callable[[Context], Any]:
+    """Getter for a StateSnapshot path (snapshot or its dict form)."""
+    section, keys = path[0], path[1:]
+    
+    def get(context: Context) -> Any:
+        if isinstance(context, dict):
+            value = context.get(section, _MISSING)
+        else:
+            value = getattr(context, section, _MISSING)
+        for key in keys:
+            if not isinstance(value, dict):
+                return _MISSING
+            value = value.get(key, _MISSING)
+        return _MISSING if value is None else value
+    
+    return get
+
+
+def _outside_peak_hours(value: Any) -> bool:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.hour not in PEAK_HOURS
+
+
+def _operator_test(op: str, operand: Any, rule_id: str) -> Callable[[Any], bool]:
+    """Test of one value against one operator (value is never missing)."""
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        
+        def test(value: Any) -> bool:
+            try:
+                return compare(value, operand)
+            except TypeError:
+                return False
+        return test
+    
+    if op in ("in", "not_in"):
+        if not isinstance(operand, (list, tuple, set)):
+            raise RuleCompileError(f"Rule '{rule_id}': '{op}' needs a list, got {operand!r}")
+        members = frozenset(operand)
+        if op == "in":
+            return lambda value: value in members
+        return lambda value: value not in members
+    
+    if op == "outside_peak_hours":
+        if operand:
+            return _outside_peak_hours
+        return lambda value: not _outside_peak_hours(value)
+    
+    raise RuleCompileError(f"Rule '{rule_id}': unknown operator '{op}'")
+
+
+def _compile_condition(name: str, spec: Any, rule_id: str) -> Predicate:
+    """Predicate for one "field: condition" entry."""
+    try:
+        get = _accessor(resolve_field(name))
+    except RuleCompileError as e:
+        raise RuleCompileError(f"Rule '{rule_id}': {e}") from None
+    
+    if not isinstance(spec, dict):
+        # Literal: equality
+        return lambda context: get(context) == spec
+    
+    if not spec:
+        raise RuleCompileError(f"Rule '{rule_id}': empty condition for '{name}'")
+    
+    exists = spec.get("exists")
+    tests = [_operator_test(op, operand, rule_id) for op, operand in spec.items() if op != "exists"]
+    
+    if exists is False:
+        if tests:
+            raise RuleCompileError(f"Rule '{rule_id}': 'exists: false' cannot be combined with other operators")
+        return lambda context: get(context) is _MISSING
+    
+    if len(tests) == 1:
+        test = tests[0]
+        
+        def predicate(context: Context) -> bool:
+            value = get(context)
+            return value is not _MISSING and test(value)
+        return predicate
+    
+    def predicate(context: Context) -> bool:
+        value = get(context)
+        return value is not _MISSING and all(test(value) for test in tests)
+    return predicate
+
+
+def compile_rule(rule_data: Dict[str, Any]) -> CompiledRule:
+    """
+    Compile one {"id", "priority", "if", "then"} rule.
+    
+    Raises:
+        RuleCompileError: On a malformed rule or an unknown field/operator
+    """
+    rule_id = rule_data.get("id") or rule_data.get("rule_id")
+    if not rule_id:
+        raise RuleCompileError(f"Rule without id: {rule_data!r}")
+    
+    conditions = rule_data.get("if")
+    if not isinstance(conditions, dict) or not conditions:
+        raise RuleCompileError(f"Rule '{rule_id}': 'if' must be a non-empty object")
+    
+    try:
+        priority = RulePriority(str(rule_data.get("priority", "medium")).lower())
+    except ValueError:
+        raise RuleCompileError(f"Rule '{rule_id}': unknown priority {rule_data.get('priority')!r}") from None
+    
+    predicates = [_compile_condition(name, spec, rule_id) for name, spec in conditions.items()]
+    if len(predicates) == 1:
+        predicate = predicates[0]
+    elif len(predicates) == 2:
+        first, second = predicates
+        predicate = lambda context: first(context) and second(context)
+    else:
+        predicate = lambda context: all(p(context) for p in predicates)
+    
+    return CompiledRule(
+        rule_id=rule_id,
+        priority=priority,
+        then=dict(rule_data.get("then", {})),
+        fields=tuple(conditions),
+        predicate=predicate
+    )
+
+
+def compile_rules(data: Dict[str, Any]) -> CompiledRuleSet:
+    """
+    Compile a base_rules.json document.
+    
+    Rules run in "evaluation_order"; rules not listed there follow in file
+    order. Entries without an "if" block (legacy rule format) are skipped.
+    
+    Raises:
+        RuleCompileError: On a malformed rule, unknown field/operator or an
+            evaluation_order entry that names no rule
+    """
+    compiled = {}
+    for rule_data in data.get("rules", []):
+        if "if" not in rule_data:
+            continue
+        rule = compile_rule(rule_data)
+        if rule.rule_id in compiled:
+            raise RuleCompileError(f"Duplicate rule id '{rule.rule_id}'")
+        compiled[rule.rule_id] = rule
+    
+    order = list(data.get("evaluation_order", []))
+    unknown = [rule_id for rule_id in order if rule_id not in compiled]
+    if unknown:
+        raise RuleCompileError(f"evaluation_order names unknown rules: {unknown}")
+    order += [rule_id for rule_id in compiled if rule_id not in order]
+    
+    return CompiledRuleSet(
+        version=str(data.get("version", "1.0.0")),
+        rules=[compiled[rule_id] for rule_id in order]
+    )
+
+
+def load_compiled_rules(path: Union[str, Path]) -> CompiledRuleSet:
+    """Compile the rules in a base_rules.json file."""
+    with open(path) as f:
+        return compile_rules(json.load(f))
@@ -10,12 +10,17 @@ Combines data from all system engines:
 - Trend Signals: External patterns, viral opportunities
 - Meta Ads: Campaign performance, budget status
 - Orchestrator: System state, recent actions, queues
+
+Sections are fetched concurrently. Content-independent sections are
+memoized per section (SECTION_TTLS); content-dependent sections (vision,
+ML) are fetched for a whole batch of contents at once (build_many).
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 from enum import Enum
+import asyncio
 
 
 class ChannelType(str, Enum):
@@ -31,6 +36,80 @@ class Platform(str, Enum):
     YOUTUBE = "youtube_shorts"
 
 
+# Content-independent sections and how long a fetched value is reused.
+# Cost tracking and orchestrator state feed the budget/safety guards, so
+# they are only reused for a few seconds.
+SECTION_TTLS: Dict[str, timedelta] = {
+    "cm_state": timedelta(seconds=60),
+    "satellite_metrics": timedelta(seconds=60),
+    "brand_rules": timedelta(minutes=10),
+    "trend_signals": timedelta(minutes=5),
+    "meta_ads_state": timedelta(seconds=30),
+    "orchestrator_state": timedelta(seconds=10),
+    "cost_tracking": timedelta(seconds=5),
+}
+
+# Keys RuleContextBuilder emits per section, as dotted paths (nested dicts
+# are listed key by key; lists are not entered). Rule fields are validated
+# against this, so keep it in step with the _fetch_* methods.
+SNAPSHOT_FIELDS: Dict[str, FrozenSet[str]] = {
+    "vision_analysis": frozenset([
+        "scene_type", "detected_objects", "color_palette", "color_match_score",
+        "aesthetic_score", "brand_compliance_score", "quality_score",
+        "dominant_colors", "lighting_type", "scene_coherence"
+    ]),
+    "cm_state": frozenset([
+        "daily_plan", "daily_plan.official_posts_scheduled",
+        "daily_plan.satellite_posts_scheduled", "daily_plan.next_official_post_time",
+        "recommended_content_types", "sentiment_analysis",
+        "sentiment_analysis.recent_comments_sentiment", "sentiment_analysis.sentiment_score",
+        "trend_recommendations"
+    ]),
+    "satellite_metrics": frozenset([
+        "last_24h", "last_24h.posts_published", "last_24h.avg_retention",
+        "last_24h.avg_ctr", "last_24h.avg_engagement", "last_24h.total_views",
+        "top_performing", "failed_content"
+    ]),
+    "ml_predictions": frozenset([
+        "predicted_retention", "predicted_engagement", "virality_score",
+        "content_cluster", "similar_content_ids", "audience_match_score",
+        "recommendation"
+    ]),
+    "brand_rules": frozenset([
+        "official_quality_threshold", "satellite_quality_threshold",
+        "brand_compliance_threshold", "aesthetic_coherence_threshold",
+        "color_match_threshold", "signature_color",
+        "allowed_content_official", "forbidden_content_official"
+    ]),
+    "trend_signals": frozenset([
+        "tiktok_trending", "instagram_trending", "viral_opportunities",
+        "top_brand_fit_score", "top_viral_score", "top_opportunity_confidence"
+    ]),
+    "meta_ads_state": frozenset([
+        "active_campaigns", "daily_spend", "monthly_spend",
+        "budget_remaining_daily", "budget_remaining_monthly",
+        "best_performing_campaign", "best_performing_campaign.campaign_id",
+        "best_performing_campaign.cost_per_result", "best_performing_campaign.results"
+    ]),
+    "orchestrator_state": frozenset([
+        "pending_actions", "recent_decisions", "system_health", "queue_sizes",
+        "queue_sizes.render_queue", "queue_sizes.post_queue",
+        "queue_sizes.approval_queue", "error_count_24h"
+    ]),
+    "cost_tracking": frozenset([
+        "daily_spend", "daily_limit", "monthly_spend", "monthly_limit",
+        "per_action_costs", "per_action_costs.render_video",
+        "per_action_costs.post_short", "per_action_costs.meta_ads",
+        "budget_alerts"
+    ]),
+    # Supplied by the caller
+    "content": frozenset([
+        "content_id", "video_path", "duration", "channel_type", "platform",
+        "caption", "hashtags"
+    ]),
+}
+
+
 class StateSnapshot(BaseModel):
     """
     Complete system state snapshot for rule evaluation.
@@ -92,6 +171,30 @@ class StateSnapshot(BaseModel):
     # caption, hashtags
 
 
+def summarize_trend_signals(signals: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add scalar summaries of the trend lists, for rules to compare against.
+    
+    - top_brand_fit_score: best brand_fit_score of a trending sound/format
+    - top_viral_score: best viral_score of a trending sound/format
+    - top_opportunity_confidence: best confidence of a viral opportunity
+    
+    A summary is left out when no entry carries its score.
+    """
+    trending = signals.get("tiktok_trending", []) + signals.get("instagram_trending", [])
+    summaries = {
+        "top_brand_fit_score": [t["brand_fit_score"] for t in trending if "brand_fit_score" in t],
+        "top_viral_score": [t["viral_score"] for t in trending if "viral_score" in t],
+        "top_opportunity_confidence": [
+            o["confidence"] for o in signals.get("viral_opportunities", []) if "confidence" in o
+        ],
+    }
+    return {
+        **signals,
+        **{name: max(values) for name, values in summaries.items() if values}
+    }
+
+
 class RuleContextBuilder:
     """
     Builds StateSnapshot from all system components.
@@ -101,12 +204,28 @@ class RuleContextBuilder:
     2. Combine into unified StateSnapshot
     3. Validate completeness
     4. Handle missing data gracefully
+    
+    _fetch_* methods run concurrently, so a fetcher backed by the database
+    must open its own session (AsyncSessionLocal) rather than share one.
     """
     
     def __init__(self):
         """Initialize context builder."""
         self.last_snapshot: Optional[StateSnapshot] = None
-        self.snapshot_cache_ttl = timedelta(minutes=5)
+        self.section_ttls: Dict[str, timedelta] = dict(SECTION_TTLS)
+        
+        # section -> (fetched_at, fetch task); the task is shared by
+        # concurrent builds while the fetch is in flight
+        self._section_cache: Dict[str, Tuple[datetime, "asyncio.Future[Dict[str, Any]]"]] = {}
+        self._section_fetchers: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {
+            "cm_state": self._fetch_cm_data,
+            "satellite_metrics": self._fetch_satellite_metrics,
+            "brand_rules": self._fetch_brand_rules,
+            "trend_signals": self._fetch_trend_signals,
+            "meta_ads_state": self._fetch_meta_ads_state,
+            "orchestrator_state": self._fetch_orchestrator_state,
+            "cost_tracking": self._fetch_cost_tracking,
+        }
     
     async def build_snapshot(
         self,
@@ -116,39 +235,111 @@ class RuleContextBuilder:
         """
         Build complete state snapshot.
         
+        All sections are fetched concurrently; content-independent sections
+        come from the section cache while within their TTL.
+        
         Args:
             content: Content being evaluated (optional)
-            force_refresh: Force refresh even if cached
-            
+            force_refresh: Refetch every section, ignoring the section cache
+        
         Returns:
             StateSnapshot with all system data
         """
-        # Check cache
-        if not force_refresh and self.last_snapshot:
-            age = datetime.utcnow() - self.last_snapshot.timestamp
-            if age < self.snapshot_cache_ttl:
-                if content:
-                    self.last_snapshot.content = content
-                return self.last_snapshot
+        shared, vision_analysis, ml_predictions = await asyncio.gather(
+            self._fetch_shared_sections(force_refresh),
+            self._fetch_vision_data(content),
+            self._fetch_ml_predictions(content)
+        )
         
-        # Build new snapshot
         snapshot = StateSnapshot(
             snapshot_id=self._generate_snapshot_id(),
-            vision_analysis=await self._fetch_vision_data(content),
-            cm_state=await self._fetch_cm_data(),
-            satellite_metrics=await self._fetch_satellite_metrics(),
-            ml_predictions=await self._fetch_ml_predictions(content),
-            brand_rules=await self._fetch_brand_rules(),
-            trend_signals=await self._fetch_trend_signals(),
-            meta_ads_state=await self._fetch_meta_ads_state(),
-            orchestrator_state=await self._fetch_orchestrator_state(),
-            cost_tracking=await self._fetch_cost_tracking(),
-            content=content
+            vision_analysis=vision_analysis,
+            ml_predictions=ml_predictions,
+            content=content,
+            **shared
         )
         
         self.last_snapshot = snapshot
         return snapshot
     
+    async def build_many(
+        self,
+        contents: Sequence[Optional[Dict[str, Any]]],
+        force_refresh: bool = False
+    ) -> List[StateSnapshot]:
+        """
+        Build one snapshot per content.
+        
+        Content-independent sections are fetched once for the whole batch and
+        vision/ML data with one batch call each, instead of one round trip
+        per section per content.
+        
+        Args:
+            contents: Contents being evaluated
+            force_refresh: Refetch every section, ignoring the section cache
+        
+        Returns:
+            Snapshots in the order of contents
+        """
+        contents = list(contents)
+        if not contents:
+            return []
+        
+        shared, vision_batch, ml_batch = await asyncio.gather(
+            self._fetch_shared_sections(force_refresh),
+            self._fetch_vision_data_many(contents),
+            self._fetch_ml_predictions_many(contents)
+        )
+        
+        base_id = self._generate_snapshot_id()
+        timestamp = datetime.utcnow()
+        snapshots = [
+            StateSnapshot(
+                snapshot_id=f"{base_id}_{i}",
+                timestamp=timestamp,
+                vision_analysis=vision_analysis,
+                ml_predictions=ml_predictions,
+                content=content,
+                **shared
+            )
+            for i, (content, vision_analysis, ml_predictions)
+            in enumerate(zip(contents, vision_batch, ml_batch))
+        ]
+        
+        self.last_snapshot = snapshots[-1]
+        return snapshots
+    
+    def invalidate_cache(self, section: Optional[str] = None):
+        """Drop one cached section (or all of them)."""
+        if section is None:
+            self._section_cache.clear()
+        else:
+            self._section_cache.pop(section, None)
+    
+    async def _fetch_shared_sections(self, force_refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Content-independent sections, fetched concurrently."""
+        names = list(self._section_fetchers)
+        values = await asyncio.gather(*(self._get_section(name, force_refresh) for name in names))
+        return dict(zip(names, values))
+    
+    async def _get_section(self, name: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """One content-independent section, memoized for its TTL."""
+        cached = self._section_cache.get(name)
+        if cached and not force_refresh:
+            fetched_at, task = cached
+            if datetime.utcnow() - fetched_at < self.section_ttls[name]:
+                return await task
+        
+        task = asyncio.ensure_future(self._section_fetchers[name]())
+        self._section_cache[name] = (datetime.utcnow(), task)
+        try:
+            return await task
+        except Exception:
+            # Don't memoize failures
+            if self._section_cache.get(name, (None, None))[1] is task:
+                del self._section_cache[name]
+            raise
+    
     def _generate_snapshot_id(self) -> str:
         """Generate unique snapshot ID."""
         return f"snapshot_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}"
@@ -159,10 +350,18 @@ class RuleContextBuilder:
         
         If content provided, analyze it. Otherwise return latest analysis.
         """
-        if not content:
-            return {}
-        
-        # Mock implementation - replace with actual Vision Engine call
+        return (await self._fetch_vision_data_many([content]))[0]
+    
+    async def _fetch_vision_data_many(
+        self,
+        contents: Sequence[Optional[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch Vision Engine analysis for many contents in one call."""
+        # Mock implementation - replace with one Vision Engine batch call
+        # (a set-based query over all content ids)
+        return [self._mock_vision_analysis() if content else {} for content in contents]
+    
+    def _mock_vision_analysis(self) -> Dict[str, Any]:
         return {
             "scene_type": "urban_night",
             "detected_objects": ["car", "city", "neon_lights"],
@@ -232,10 +431,18 @@ class RuleContextBuilder:
     
     async def _fetch_ml_predictions(self, content: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Fetch ML Engine predictions."""
-        if not content:
-            return {}
-        
-        # Mock implementation - replace with actual ML Engine call
+        return (await self._fetch_ml_predictions_many([content]))[0]
+    
+    async def _fetch_ml_predictions_many(
+        self,
+        contents: Sequence[Optional[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch ML Engine predictions for many contents in one call."""
+        # Mock implementation - replace with one ML Engine batch call
+        # (e.g. ViralityPredictor.predict_virality_batch)
+        return [self._mock_ml_predictions() if content else {} for content in contents]
+    
+    def _mock_ml_predictions(self) -> Dict[str, Any]:
         return {
             "predicted_retention": 0.74,
             "predicted_engagement": 0.058,
@@ -268,7 +475,10 @@ class RuleContextBuilder:
         }
     
     async def _fetch_trend_signals(self) -> Dict[str, Any]:
-        """Fetch trending signals from platforms."""
+        """Fetch trending signals from platforms (with top_* summaries)."""
+        return summarize_trend_signals(self._mock_trend_signals())
+    
+    def _mock_trend_signals(self) -> Dict[str, Any]:
         # Mock implementation - replace with actual Trend Miner data
         return {
             "tiktok_trending": [
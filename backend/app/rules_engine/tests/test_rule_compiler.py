@@ -0,0 +1,285 @@
+"""
+Tests for rule_compiler.py - base_rules.json if/then DSL
+"""
+
+import json
+import time
+import pytest
+from datetime import datetime
+from pathlib import Path
+from backend.app.rules_engine.rule_compiler import (
+    RuleCompileError,
+    compile_rule,
+    compile_rules,
+    load_compiled_rules,
+    resolve_field,
+    FIELD_ALIASES
+)
+from backend.app.rules_engine.evaluator_v2 import RulesEvaluatorV2, ActionType
+from backend.app.rules_engine.loader_v2 import RulesLoaderV2, MergedRuleSet, RulePriority
+from backend.app.rules_engine.rule_context import RuleContextBuilder, SNAPSHOT_FIELDS, StateSnapshot
+
+
+BASE_RULES_PATH = Path(__file__).parent.parent / "rules" / "base_rules.json"
+
+
+def _snapshot(snapshot_id="test", channel="official", quality=9.0, posts=0, hour=19, **vision):
+    return StateSnapshot(
+        snapshot_id=snapshot_id,
+        timestamp=datetime(2025, 1, 6, hour),
+        vision_analysis={"quality_score": quality, "color_match_score": 0.8, "brand_compliance_score": 0.9, **vision},
+        cm_state={
+            "daily_plan": {"official_posts_scheduled": posts},
+            "sentiment_analysis": {"sentiment_score": 0.5}
+        },
+        ml_predictions={"virality_score": 0.5},
+        trend_signals={},
+        cost_tracking={"daily_spend": 1.0, "daily_limit": 10.0},
+        content={"channel_type": channel}
+    )
+
+
+class TestRuleCompiler:
+    """Test cases for the rule compiler."""
+    
+    def test_base_rules_compile_in_evaluation_order(self):
+        """Test the shipped base_rules.json compiles in its evaluation order."""
+        data = json.loads(BASE_RULES_PATH.read_text())
+        compiled = load_compiled_rules(BASE_RULES_PATH)
+        
+        assert [rule.rule_id for rule in compiled.rules] == data["evaluation_order"]
+        assert compiled.rules[0].priority == RulePriority.CRITICAL
+    
+    def test_rules_fire_on_matching_context(self):
+        """Test which rules fire for official/satellite contexts."""
+        compiled = load_compiled_rules(BASE_RULES_PATH)
+        
+        fired = [rule.rule_id for rule in compiled.evaluate(_snapshot(posts=3, color_match_score=0.4))]
+        assert fired == ["prevent_oversaturation", "enforce_color_palette_compliance"]
+        
+        official = _snapshot(quality=7.5, brand_compliance_score=0.3)
+        fired = [rule.rule_id for rule in compiled.evaluate(official)]
+        assert fired == ["check_brand_compliance", "enforce_official_quality_gate"]
+        assert compiled.first_match(official).then["action"] == "reject_content"
+        
+        # Brand and quality gates are for the official channel only
+        satellite = _snapshot(channel="satellite", quality=6.0, hour=3, brand_compliance_score=0.3)
+        fired = [rule.rule_id for rule in compiled.evaluate(satellite)]
+        assert fired == ["satellite_experimentation_allowed", "optimize_posting_time"]
+        assert compiled.first_match(_snapshot()) is None
+    
+    def test_evaluate_many_reports_rule_per_context(self):
+        """Test batch evaluation keeps input order and accepts dict contexts."""
+        compiled = load_compiled_rules(BASE_RULES_PATH)
+        contexts = [
+            _snapshot(posts=3),
+            _snapshot(),
+            _snapshot(channel="satellite").model_dump()
+        ]
+        
+        results = compiled.evaluate_many(contexts)
+        
+        assert [[rule.rule_id for rule in fired] for fired in results] == [
+            ["prevent_oversaturation"],
+            [],
+            ["satellite_experimentation_allowed"]
+        ]
+    
+    def test_operators(self):
+        """Test comparison, membership and existence operators."""
+        rule = compile_rule({
+            "id": "ops",
+            "priority": "low",
+            "if": {
+                "vision_analysis.scene_type": {"in": ["urban_night", "studio"]},
+                "vision_analysis.quality_score": {"gte": 5.0, "lt": 9.0},
+                "ml_predictions.recommendation": {"exists": False}
+            },
+            "then": {}
+        })
+        
+        assert rule.matches(_snapshot(quality=5.0, scene_type="studio"))
+        assert not rule.matches(_snapshot(quality=9.0, scene_type="studio"))
+        assert not rule.matches(_snapshot(quality=5.0, scene_type="beach"))
+        assert not rule.matches(_snapshot(quality=5.0))  # scene_type missing
+    
+    def test_unknown_field_rejected(self):
+        """Test field references are validated against the snapshot schema."""
+        with pytest.raises(RuleCompileError, match="not_a_field"):
+            compile_rule({"id": "bad", "if": {"not_a_field": {"gt": 1}}, "then": {}})
+        
+        # The section exists, the key is not one RuleContextBuilder emits
+        with pytest.raises(RuleCompileError, match="trend_match"):
+            compile_rule({"id": "bad", "if": {"trend_signals.trend_match": {"gt": 0.5}}, "then": {}})
+        
+        with pytest.raises(RuleCompileError, match="unknown operator"):
+            compile_rule({"id": "bad", "if": {"quality_score": {"about": 1}}, "then": {}})
+        
+        with pytest.raises(RuleCompileError, match="unknown rules"):
+            compile_rules({
+                "rules": [{"id": "a", "if": {"quality_score": {"gt": 1}}, "then": {}}],
+                "evaluation_order": ["a", "b"]
+            })
+    
+    def test_aliases_resolve_to_builder_fields(self):
+        """Test every alias names a key RuleContextBuilder emits."""
+        for name, path in FIELD_ALIASES.items():
+            assert resolve_field(name) == path
+    
+    @pytest.mark.asyncio
+    async def test_schema_matches_builder_output(self):
+        """Test SNAPSHOT_FIELDS lists exactly the keys the builder fills."""
+        def paths(data, prefix=""):
+            for key, value in data.items():
+                yield prefix + key
+                if isinstance(value, dict):
+                    yield from paths(value, prefix + key + ".")
+        
+        snapshot = await RuleContextBuilder().build_snapshot(content={"channel_type": "official"})
+        
+        for section, fields in SNAPSHOT_FIELDS.items():
+            if section != "content":
+                assert set(paths(getattr(snapshot, section))) == fields, section
+    
+    @pytest.mark.asyncio
+    async def test_rules_fire_on_builder_snapshot(self):
+        """Test the visual, trend and virality rules can fire on built contexts."""
+        compiled = load_compiled_rules(BASE_RULES_PATH)
+        snapshot = await RuleContextBuilder().build_snapshot(content={"channel_type": "official"})
+        snapshot.ml_predictions["virality_score"] = 0.9
+        
+        fired = {rule.rule_id for rule in compiled.evaluate(snapshot)}
+        
+        assert {
+            "prioritize_visual_coherence",
+            "boost_trending_patterns",
+            "detect_high_virality_potential"
+        } <= fired
+        assert "check_brand_compliance" not in fired
+    
+    def test_evaluates_thousands_of_contexts_per_second(self):
+        """Test batch evaluation throughput."""
+        compiled = load_compiled_rules(BASE_RULES_PATH)
+        contexts = [_snapshot(quality=i % 10, posts=i % 5, hour=i % 24) for i in range(5000)]
+        
+        start = time.perf_counter()
+        results = compiled.evaluate_many(contexts)
+        elapsed = time.perf_counter() - start
+        
+        assert len(results) == 5000
+        assert elapsed < 1.0, f"5000 contexts took {elapsed:.2f}s"
+
+
+class TestEvaluatorUsesCompiledRules:
+    """RulesEvaluatorV2 with if/then rules from base_rules.json."""
+    
+    @pytest.fixture
+    def ruleset(self):
+        data = json.loads(BASE_RULES_PATH.read_text())
+        return MergedRuleSet(
+            rules=[],
+            dsl_rules=data["rules"],
+            evaluation_order=data["evaluation_order"]
+        )
+    
+    @pytest.mark.asyncio
+    async def test_low_brand_compliance_keeps_baseline_decisions(self, ruleset):
+        """Test a fired brand rule goes through the HOLD/approval path, not an outright reject."""
+        evaluator = RulesEvaluatorV2(ruleset)
+        
+        official = await evaluator.evaluate(_snapshot(brand_compliance_score=0.3))
+        assert official.recommended_action == ActionType.HOLD_CONTENT
+        assert official.action_priority == RulePriority.HIGH
+        assert "check_brand_compliance" in official.triggered_rules
+        assert "brand_compliance_check" in official.triggered_rules
+        assert official.fired_rules[0]["rule_id"] == "check_brand_compliance"
+        assert "Brand violation detected" in official.reasoning
+        
+        # High ML prediction: human review, as without the if/then rules
+        snapshot = _snapshot(brand_compliance_score=0.3)
+        snapshot.ml_predictions["predicted_retention"] = 0.8
+        review = await evaluator.evaluate(snapshot)
+        assert review.recommended_action == ActionType.REQUEST_REVIEW
+        assert review.requires_human_approval is True
+        
+        satellite = await evaluator.evaluate(_snapshot(channel="satellite", quality=6.0, brand_compliance_score=0.3))
+        assert satellite.recommended_action == ActionType.POST_TO_SATELLITE
+        assert satellite.action_priority == RulePriority.MEDIUM
+        assert "check_brand_compliance" not in satellite.triggered_rules
+        assert satellite.action_params["rule_actions"]["satellite_experimentation_allowed"]["skip_brand_validation"] is True
+    
+    @pytest.mark.asyncio
+    async def test_skip_brand_validation_ignores_reject_rules(self, ruleset):
+        """Test a reject_content rule is ignored when a fired rule skips brand validation."""
+        for rule in ruleset.dsl_rules:
+            if rule["id"] == "check_brand_compliance":
+                del rule["if"]["channel_type"]
+        
+        decision = await RulesEvaluatorV2(ruleset).evaluate(
+            _snapshot(channel="satellite", quality=6.0, brand_compliance_score=0.3)
+        )
+        
+        assert "check_brand_compliance" in decision.triggered_rules
+        assert decision.recommended_action == ActionType.POST_TO_SATELLITE
+    
+    @pytest.mark.asyncio
+    async def test_official_quality_gate_on_ten_point_scale(self, ruleset):
+        """Test the official quality gate compares quality_score on its 0-10 scale."""
+        evaluator = RulesEvaluatorV2(ruleset)
+        
+        passed = await evaluator.evaluate(_snapshot(quality=8.5))
+        assert passed.recommended_action == ActionType.POST_SHORT
+        assert "enforce_official_quality_gate" not in passed.triggered_rules
+        
+        held = await evaluator.evaluate(_snapshot(quality=7.5))
+        assert held.recommended_action == ActionType.HOLD_CONTENT
+        assert "enforce_official_quality_gate" in held.triggered_rules
+    
+    @pytest.mark.asyncio
+    async def test_editing_rules_changes_decisions(self, ruleset):
+        """Test the JSON rules, not hardcoded branches, drive the decision."""
+        # No brand_config: the hardcoded brand threshold alone would hold this
+        for rule in ruleset.dsl_rules:
+            if rule["id"] == "enforce_official_quality_gate":
+                rule["if"]["quality_score"] = {"lt": 9.5}
+        
+        decision = await RulesEvaluatorV2(ruleset).evaluate(_snapshot(quality=9.0))
+        
+        assert "enforce_official_quality_gate" in decision.triggered_rules
+        assert decision.recommended_action == ActionType.HOLD_CONTENT
+    
+    @pytest.mark.asyncio
+    async def test_fired_rule_actions_reach_the_decision(self, ruleset):
+        """Test then actions of non-critical rules are applied to the decision params."""
+        snapshot = _snapshot(posts=3, color_match_score=0.4)
+        
+        decision = await RulesEvaluatorV2(ruleset).evaluate(snapshot)
+        
+        assert decision.recommended_action == ActionType.POST_SHORT
+        assert decision.requires_human_approval is True  # flag_for_review
+        assert set(decision.action_params["rule_actions"]) == {
+            "prevent_oversaturation",
+            "enforce_color_palette_compliance"
+        }
+        assert decision.action_params["rule_actions"]["prevent_oversaturation"]["action"] == "defer_content"
+    
+    def test_match_rules_batch(self, ruleset):
+        """Test fired rule IDs are reported per snapshot."""
+        evaluator = RulesEvaluatorV2(ruleset)
+        
+        assert evaluator.match_rules_batch([_snapshot(posts=3), _snapshot()]) == [
+            ["prevent_oversaturation"],
+            []
+        ]
+    
+    def test_loader_separates_dsl_rules(self):
+        """Test the shipped base_rules.json loads through RulesLoaderV2."""
+        base_dir = Path(__file__).parent.parent.parent
+        ruleset = RulesLoaderV2(base_dir=base_dir).load_and_merge()
+        
+        assert len(ruleset.dsl_rules) == len(ruleset.evaluation_order) == 10
+        assert len(RulesEvaluatorV2(ruleset).compiled_rules) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
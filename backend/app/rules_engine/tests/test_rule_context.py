@@ -0,0 +1,123 @@
+"""
+Tests for rule_context.py - Concurrent, cached snapshot assembly
+"""
+
+import asyncio
+import time
+import pytest
+from datetime import timedelta
+from backend.app.rules_engine.rule_context import RuleContextBuilder, SECTION_TTLS
+
+
+FETCH_DELAY = 0.05
+
+
+class CountingContextBuilder(RuleContextBuilder):
+    """Builder whose fetchers are slow and count their calls."""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+        for name, fetch in list(self._section_fetchers.items()):
+            self._section_fetchers[name] = self._counted(name, fetch)
+    
+    def _counted(self, name, fetch):
+        async def counted():
+            self.calls[name] = self.calls.get(name, 0) + 1
+            await asyncio.sleep(FETCH_DELAY)
+            return await fetch()
+        return counted
+    
+    async def _fetch_vision_data_many(self, contents):
+        self.calls["vision_batch"] = self.calls.get("vision_batch", 0) + 1
+        await asyncio.sleep(FETCH_DELAY)
+        return await super()._fetch_vision_data_many(contents)
+
+
+@pytest.fixture
+def builder():
+    return CountingContextBuilder()
+
+
+class TestRuleContextBuilder:
+    """Test cases for RuleContextBuilder."""
+    
+    @pytest.mark.asyncio
+    async def test_sections_fetched_concurrently(self, builder):
+        """Test a snapshot costs about one fetch, not one per section."""
+        start = time.perf_counter()
+        snapshot = await builder.build_snapshot(content={"channel_type": "official"})
+        elapsed = time.perf_counter() - start
+        
+        assert len(SECTION_TTLS) * FETCH_DELAY > 3 * elapsed
+        assert snapshot.brand_rules
+        assert snapshot.vision_analysis["quality_score"] == 9.1
+        assert builder.validate_snapshot(snapshot)["valid"]
+    
+    @pytest.mark.asyncio
+    async def test_shared_sections_memoized(self, builder):
+        """Test shared sections are reused within their TTL."""
+        first = await builder.build_snapshot(content={"channel_type": "official"})
+        second = await builder.build_snapshot()
+        
+        assert all(builder.calls[name] == 1 for name in SECTION_TTLS)
+        assert second.cost_tracking == first.cost_tracking
+        assert second.content is None
+        assert second.vision_analysis == {}
+        
+        await builder.build_snapshot(force_refresh=True)
+        assert all(builder.calls[name] == 2 for name in SECTION_TTLS)
+    
+    @pytest.mark.asyncio
+    async def test_expired_section_refetched(self, builder):
+        """Test only sections past their TTL are refetched."""
+        builder.section_ttls["cost_tracking"] = timedelta(0)
+        
+        await builder.build_snapshot()
+        await builder.build_snapshot()
+        
+        assert builder.calls["cost_tracking"] == 2
+        assert builder.calls["brand_rules"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_builds_share_in_flight_fetch(self, builder):
+        """Test concurrent builds wait on one fetch per section."""
+        await asyncio.gather(*(builder.build_snapshot() for _ in range(10)))
+        
+        assert all(builder.calls[name] == 1 for name in SECTION_TTLS)
+    
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_memoized(self, builder):
+        """Test a failing fetch is retried on the next build."""
+        async def failing():
+            raise ConnectionError("brand service down")
+        
+        fetch = builder._section_fetchers["brand_rules"]
+        builder._section_fetchers["brand_rules"] = failing
+        with pytest.raises(ConnectionError):
+            await builder.build_snapshot()
+        
+        builder._section_fetchers["brand_rules"] = fetch
+        snapshot = await builder.build_snapshot()
+        assert snapshot.brand_rules
+    
+    @pytest.mark.asyncio
+    async def test_build_many(self, builder):
+        """Test N contents cost one fetch per section."""
+        contents = [{"content_id": f"clip_{i}", "channel_type": "satellite"} for i in range(50)]
+        contents.append(None)
+        
+        snapshots = await builder.build_many(contents)
+        
+        assert [s.content for s in snapshots] == contents
+        assert len({s.snapshot_id for s in snapshots}) == len(contents)
+        assert snapshots[0].ml_predictions["virality_score"] == 0.62
+        assert snapshots[-1].vision_analysis == {}
+        assert builder.calls["vision_batch"] == 1
+        assert all(builder.calls[name] == 1 for name in SECTION_TTLS)
+        assert builder.last_snapshot is snapshots[-1]
+        assert await builder.build_many([]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
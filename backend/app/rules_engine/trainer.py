@@ -1,19 +1,51 @@
 """
 Adaptive trainer - learns weights from ledger events.
+
+Evaluation events are streamed from the whole ledger in keyset-paginated
+chunks (ordered by timestamp, id) and turned into feature/target matrices.
+Weights are fitted by mini-batch SGD with an L2 penalty toward the promoted
+weights. The ledger position and the solver weights are checkpointed per
+platform, so a rerun only reads events logged since the previous run.
+
+A share of the examples is held out. New weights are promoted only if their
+held-out error is no worse than that of the current weights; rejected
+weights are dropped from the checkpoint, so the next run starts over from
+the promoted ones.
 """
-from typing import Dict, List, Tuple
-from datetime import datetime, timedelta
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 
 from app.ledger.models import LedgerEvent
-from app.rules_engine.models import AdaptiveRuleSet, DEFAULT_WEIGHTS
-from app.rules_engine.persistence import save_rules
+from app.rules_engine.models import AdaptiveRuleSet, TrainingCheckpoint, DEFAULT_WEIGHTS
+from app.rules_engine.persistence import save_rules, save_training_checkpoint
 from app.ledger import log_event
 
 
-# Learning rate for weight updates
-LEARNING_RATE = 0.05
+# Learning rate of one SGD step (mean gradient over a mini-batch)
+LEARNING_RATE = 0.2
+
+# L2 penalty pulling the solver weights toward the promoted weights
+L2_PENALTY = 0.01
+
+# Rows per SGD step
+SGD_BATCH_SIZE = 32
+
+# Ledger events read per query
+TRAIN_CHUNK_EVENTS = 500
+
+# Share of examples held out (stable per event/row) to validate new weights
+HOLDOUT_FRACTION = 0.2
+
+# Most recent held-out examples kept in memory for validation
+HOLDOUT_MAX_EXAMPLES = 10000
+
+# With fewer held-out examples, promotion is not gated on the holdout
+MIN_HOLDOUT_EXAMPLES = 20
 
 
 async def train_rules(
@@ -23,47 +55,90 @@ async def train_rules(
     """
     Train rule weights based on performance data from the ledger.
     
-    Analyzes ledger events to identify successful clips and updates
-    weights using gradient-like optimization.
+    Reads the evaluation events logged since the platform's checkpoint,
+    continues the SGD fit on them and promotes the resulting weights if
+    they do at least as well as the current ones on held-out examples.
     
     Args:
         db: Database session
         platform: Platform to train rules for
-        
+    
     Returns:
-        Updated AdaptiveRuleSet
+        Updated AdaptiveRuleSet (the current one if nothing was promoted)
     """
     # Load current weights (from persistence or defaults)
-    from app.rules_engine.loader import load_rules
+    from app.rules_engine.loader import load_rules, load_training_checkpoint
     current_rules = await load_rules(db, platform)
+    checkpoint = await load_training_checkpoint(db, platform)
     
-    # Collect training examples from ledger
-    training_examples = await _collect_training_examples(db, platform)
+    feature_names = list(current_rules.weights)
+    prior = np.array([current_rules.weights[name] for name in feature_names])
+    solver_weights = np.array([
+        checkpoint.weights.get(name, current_rules.weights[name])
+        for name in feature_names
+    ])
     
-    if not training_examples:
-        # No training data available, return current rules
-        return current_rules
+    holdout_X: List[np.ndarray] = []
+    holdout_y: List[np.ndarray] = []
+    examples_count = 0
     
-    # Update weights based on training examples
-    new_weights = current_rules.weights.copy()
-    
-    for features, target_score in training_examples:
-        # Compute current prediction
-        predicted_score = sum(
-            features.get(name, 0.0) * weight
-            for name, weight in new_weights.items()
-        )
-        
-        # Compute error
-        error = target_score - predicted_score
+    async for X, y, holdout, position in _stream_training_chunks(db, platform, feature_names, checkpoint):
+        train = ~holdout
+        solver_weights = _sgd_fit(solver_weights, X[train], y[train], prior)
+        holdout_X.append(X[holdout])
+        holdout_y.append(y[holdout])
+        _trim_holdout(holdout_X, holdout_y)
+        examples_count += len(y)
         
-        # Update weights (gradient descent-like)
-        for feature_name in new_weights.keys():
-            feature_value = features.get(feature_name, 0.0)
-            new_weights[feature_name] += LEARNING_RATE * error * feature_value
+        checkpoint = TrainingCheckpoint(
+            platform=platform,
+            last_event_timestamp=position[0],
+            last_event_id=position[1],
+            weights=dict(zip(feature_names, solver_weights.tolist())),
+            examples_seen=checkpoint.examples_seen + len(y),
+            updated_at=datetime.utcnow()
+        )
+        await save_training_checkpoint(db, checkpoint)
+    
+    if not examples_count:
+        # No new training data, return current rules
+        return current_rules
     
     # Normalize weights to sum to ~1.0
-    new_weights = _normalize_weights(new_weights)
+    new_weights = _normalize_weights(dict(zip(feature_names, solver_weights.tolist())))
+    
+    metrics = _holdout_metrics(
+        np.concatenate(holdout_X),
+        np.concatenate(holdout_y),
+        candidate=np.array([new_weights[name] for name in feature_names]),
+        current=prior
+    )
+    promoted = (
+        metrics["holdout_examples"] < MIN_HOLDOUT_EXAMPLES
+        or metrics["candidate_mse"] <= metrics["current_mse"]
+    )
+    
+    if not promoted:
+        # Continue the next run from the promoted weights, not the rejected
+        # ones (a small rerun would otherwise promote them ungated)
+        await save_training_checkpoint(db, checkpoint.model_copy(update={
+            "weights": dict(current_rules.weights),
+            "updated_at": datetime.utcnow()
+        }))
+        await log_event(
+            db=db,
+            event_type="rule_weight_update_rejected",
+            entity_type="rules_engine",
+            entity_id=platform,
+            metadata={
+                "platform": platform,
+                "candidate_weights": new_weights,
+                "training_examples_count": examples_count,
+                "holdout": metrics
+            },
+            durability="transactional"
+        )
+        return current_rules
     
     # Create updated rule set
     updated_rules = AdaptiveRuleSet(
@@ -84,71 +159,189 @@ async def train_rules(
         metadata={
             "platform": platform,
             "new_weights": new_weights,
-            "training_examples_count": len(training_examples)
-        }
+            "training_examples_count": examples_count,
+            "holdout": metrics
+        },
+        durability="transactional"
     )
     
     return updated_rules
 
 
-async def _collect_training_examples(
+async def _stream_training_chunks(
     db: AsyncSession,
     platform: str,
-    lookback_days: int = 7
-) -> List[Tuple[Dict[str, float], float]]:
+    feature_names: List[str],
+    checkpoint: TrainingCheckpoint
+) -> AsyncIterator[Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[datetime, str]]]:
     """
-    Collect training examples from ledger events.
+    Stream training examples logged after the checkpoint position.
     
-    Returns list of (features, target_score) tuples.
+    Reads TRAIN_CHUNK_EVENTS ledger events per query, keyset-paginated on
+    (timestamp, id). Events logged later with an older timestamp than the
+    checkpoint are not picked up.
+    
+    Yields:
+        (features, targets, holdout mask, position) per chunk with examples
+        for the platform; position is (timestamp, id) of the chunk's last
+        event
     """
-    training_examples = []
-    
-    # Look back N days for performance data
-    cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
-    
-    # Find clip_evaluated events for this platform
-    result = await db.execute(
-        select(LedgerEvent)
-        .where(
-            and_(
-                LedgerEvent.event_type == "clip_evaluated",
-                LedgerEvent.entity_type == "clip",
-                LedgerEvent.timestamp >= cutoff_date
-            )
-        )
-        .order_by(LedgerEvent.timestamp.desc())
-        .limit(100)
-    )
+    position: Optional[Tuple[datetime, UUID]] = None
+    if checkpoint.last_event_timestamp is not None:
+        position = (checkpoint.last_event_timestamp, UUID(checkpoint.last_event_id))
     
-    events = result.scalars().all()
+    is_evaluation = or_(
+        and_(
+            LedgerEvent.event_type == "clip_evaluated",
+            LedgerEvent.entity_type == "clip"
+        ),
+        LedgerEvent.event_type == "clips_evaluated"
+    )
     
-    for event in events:
-        metadata = event.event_data or {}
+    while True:
+        query = select(
+            LedgerEvent.id,
+            LedgerEvent.timestamp,
+            LedgerEvent.event_type,
+            LedgerEvent.event_data
+        ).where(is_evaluation)
         
-        # Check if this event is for the target platform
-        if metadata.get("platform") != platform:
-            continue
+        if position is not None:
+            last_timestamp, last_id = position
+            query = query.where(
+                or_(
+                    LedgerEvent.timestamp > last_timestamp,
+                    and_(LedgerEvent.timestamp == last_timestamp, LedgerEvent.id > last_id)
+                )
+            )
         
-        features = metadata.get("features", {})
-        score = metadata.get("score", 0.5)
+        result = await db.execute(
+            query
+            .order_by(LedgerEvent.timestamp, LedgerEvent.id)
+            .limit(TRAIN_CHUNK_EVENTS)
+        )
+        rows = result.all()
+        if not rows:
+            return
         
-        # Determine target based on engagement signals
-        # For now, use a simple heuristic:
-        # - If clip was published and got engagement, target = 1.0
-        # - If clip was evaluated but never published, target = 0.5
-        # - If clip had low score, target = 0.0
+        position = (rows[-1].timestamp, rows[-1].id)
         
-        target = _compute_target_score(score, metadata)
+        blocks = [
+            block for block in (_event_examples(row, platform, feature_names) for row in rows)
+            if block is not None
+        ]
+        if blocks:
+            X = np.concatenate([block[0] for block in blocks])
+            y = np.concatenate([block[1] for block in blocks])
+            holdout = np.concatenate([block[2] for block in blocks])
+        else:
+            # Nothing for this platform; still advance the checkpoint
+            X = np.empty((0, len(feature_names)))
+            y = np.empty(0)
+            holdout = np.zeros(0, dtype=bool)
         
-        if features:
-            training_examples.append((features, target))
+        yield X, y, holdout, (position[0], str(position[1]))
+        
+        if len(rows) < TRAIN_CHUNK_EVENTS:
+            return
+
+
+def _event_examples(
+    row,
+    platform: str,
+    feature_names: List[str]
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    (features, targets, holdout mask) of one ledger event, or None.
+    
+    clip_evaluated events hold one example; clips_evaluated (batch) events
+    hold one feature column per feature and one score per clip.
+    """
+    metadata = row.event_data or {}
+    
+    # Check if this event is for the target platform
+    if metadata.get("platform") != platform:
+        return None
+    
+    if row.event_type == "clips_evaluated":
+        scores = np.asarray(metadata.get("scores", []), dtype=float)
+        columns = metadata.get("features", {})
+    else:
+        features = metadata.get("features", {})
+        if not features:
+            return None
+        scores = np.array([metadata.get("score", 0.5)], dtype=float)
+        columns = {name: [value] for name, value in features.items()}
+    
+    if not len(scores):
+        return None
+    
+    zeros = np.zeros(len(scores))
+    X = np.column_stack([
+        np.asarray(columns[name], dtype=float) if name in columns else zeros
+        for name in feature_names
+    ])
+    y = _compute_target_scores(scores, metadata)
+    
+    return X, y, _holdout_mask(str(row.id), len(scores))
+
+
+def _holdout_mask(event_id: str, n: int) -> np.ndarray:
+    """Stable holdout assignment of an event's rows (same on every rerun)."""
+    seed = zlib.crc32(event_id.encode())
+    rows = np.arange(n, dtype=np.uint64)
+    hashed = (np.uint64(seed) + rows * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return (hashed % np.uint64(1000)) < int(HOLDOUT_FRACTION * 1000)
+
+
+def _trim_holdout(holdout_X: List[np.ndarray], holdout_y: List[np.ndarray]) -> None:
+    """Keep only the most recent HOLDOUT_MAX_EXAMPLES held-out examples."""
+    total = sum(len(y) for y in holdout_y)
+    while holdout_y and total - len(holdout_y[0]) >= HOLDOUT_MAX_EXAMPLES:
+        total -= len(holdout_y[0])
+        del holdout_X[0], holdout_y[0]
+
+
+def _sgd_fit(
+    weights: np.ndarray,
+    X: np.ndarray,
+    y: np.ndarray,
+    prior: np.ndarray
+) -> np.ndarray:
+    """One pass of mini-batch SGD on squared error + L2 toward prior."""
+    for start in range(0, len(y), SGD_BATCH_SIZE):
+        X_batch = X[start:start + SGD_BATCH_SIZE]
+        error = y[start:start + SGD_BATCH_SIZE] - X_batch @ weights
+        gradient = -(X_batch.T @ error) / len(error) + L2_PENALTY * (weights - prior)
+        weights = weights - LEARNING_RATE * gradient
+    return weights
+
+
+def _holdout_metrics(
+    X: np.ndarray,
+    y: np.ndarray,
+    candidate: np.ndarray,
+    current: np.ndarray
+) -> Dict[str, Any]:
+    """Held-out error of the candidate and current weights (scores clamped as in the evaluator)."""
+    if not len(y):
+        return {"holdout_examples": 0, "candidate_mse": None, "current_mse": None}
+    
+    candidate_error = np.clip(X @ candidate, 0.0, 1.0) - y
+    current_error = np.clip(X @ current, 0.0, 1.0) - y
     
-    return training_examples
+    return {
+        "holdout_examples": int(len(y)),
+        "candidate_mse": float(np.mean(candidate_error ** 2)),
+        "current_mse": float(np.mean(current_error ** 2)),
+        "candidate_mae": float(np.mean(np.abs(candidate_error))),
+        "current_mae": float(np.mean(np.abs(current_error)))
+    }
 
 
-def _compute_target_score(current_score: float, metadata: Dict) -> float:
+def _compute_target_scores(scores: np.ndarray, metadata: Dict) -> np.ndarray:
     """
-    Compute target score based on engagement signals.
+    Compute target scores based on engagement signals.
     
     This is a simplified heuristic. In production, you'd analyze:
     - Views, likes, shares from social platforms
@@ -164,20 +357,16 @@ def _compute_target_score(current_score: float, metadata: Dict) -> float:
         likes = engagement.get("likes", 0)
         
         if views > 1000 and likes > 50:
-            return 1.0
+            target = 1.0
         elif views > 100:
-            return 0.7
+            target = 0.7
         else:
-            return 0.3
+            target = 0.3
+        return np.full(len(scores), target)
     
     # No engagement data - use current score as baseline
     # with slight regression toward mean
-    if current_score > 0.7:
-        return 0.8
-    elif current_score < 0.3:
-        return 0.2
-    else:
-        return 0.5
+    return np.select([scores > 0.7, scores < 0.3], [0.8, 0.2], default=0.5)
 
 
 def _normalize_weights(weights: Dict[str, float]) -> Dict[str, float]:
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.models.database import Job, JobStatus, Clip, ClipStatus, VideoAsset
+from app.worker.handlers.generate_variants import run_generate_variants
 
 
 async def run_job(job_id: str, db: AsyncSession) -> Dict[str, Any]:
@@ -19,7 +20,7 @@ async def run_job(job_id: str, db: AsyncSession) -> Dict[str, Any]:
     Args:
         job_id: UUID of the job to process (as string)
         db: Async database session
-        
+    
     Returns:
         Dictionary with processing summary:
         {
@@ -62,10 +63,11 @@ async def run_job(job_id: str, db: AsyncSession) -> Dict[str, Any]:
                 "processing_time_ms": 0
             }
         
-        # 3. Change status to PROCESSING
+        # 3. Change status to PROCESSING (committed: handlers such as the
+        # variant renderer update the Job row from their own sessions)
         job.status = JobStatus.PROCESSING
         job.updated_at = datetime.utcnow()
-        await db.flush()
+        await db.commit()
         
         # 4. Process based on job_type
         if job.job_type == "cut_analysis":
@@ -106,7 +108,7 @@ async def run_job(job_id: str, db: AsyncSession) -> Dict[str, Any]:
             "processing_time_ms": processing_time_ms,
             "error": None
         }
-        
+    
     except Exception as e:
         # Rollback on error
         await db.rollback()
@@ -145,7 +147,7 @@ async def _process_cut_analysis(job: Job, db: AsyncSession) -> int:
     Args:
         job: Job object
         db: Database session
-        
+    
     Returns:
         Number of clips generated
     """
@@ -207,22 +209,14 @@ async def _process_cut_analysis(job: Job, db: AsyncSession) -> int:
 
 async def _process_generate_variants(job: Job, db: AsyncSession) -> int:
     """
-    Process generate_variants job: generate platform-specific variants
+    Process generate_variants job: render platform-specific variants with FFmpeg
     
     Args:
         job: Job object
         db: Database session
-        
+    
     Returns:
-        Number of variants generated (simulated)
+        Number of variants generated (simulated when ffmpeg is not installed)
     """
-    # Simulate variant generation
-    await asyncio.sleep(0.3)
-    
-    if not job.clip_id:
-        raise ValueError("Job has no associated clip_id")
-    
-    # Simulate generating variants
-    # In real implementation, this would call FFmpeg to create platform-specific videos
-    
-    return 3  # Fake: generated 3 variants (e.g., Instagram, TikTok, YouTube)
+    result = await run_generate_variants(job, db)
+    return result["variants_created"]
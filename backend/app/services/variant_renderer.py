@@ -0,0 +1,539 @@
+"""
+Variant Renderer - Platform variants of a clip with FFmpeg
+
+Renders the Instagram, TikTok and YouTube versions of a clip:
+- One ffmpeg process per clip: the source is decoded once and a split
+  filter graph feeds one scaler/encoder per platform output
+- Bounded pool of ffmpeg subprocesses sized to the host's cores
+- Progress (-progress pipe:1) streamed into the Job row, in its own session
+- Cancellable (per render ID, by cancelling the awaiting task, or from any
+  process through the job's persisted cancel flag)
+"""
+import asyncio
+import logging
+import os
+import shutil
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.database import Clip, ClipVariant, Job, VideoAsset
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Output format of one platform variant."""
+    platform: str
+    width: int
+    height: int
+    video_bitrate: str
+    max_duration_ms: Optional[int] = None
+    fps: int = 30
+    audio_bitrate: str = "128k"
+
+
+PLATFORM_PROFILES: Dict[str, RenderProfile] = {
+    "instagram": RenderProfile("instagram", 1080, 1350, "5M", max_duration_ms=90_000),
+    "tiktok": RenderProfile("tiktok", 1080, 1920, "6M", max_duration_ms=180_000),
+    "youtube": RenderProfile("youtube", 1920, 1080, "8M"),
+}
+
+
+# Min seconds between progress commits to the Job row
+PROGRESS_INTERVAL_S = 1.0
+
+# job.result key set by request_render_cancel()
+CANCEL_REQUESTED = "cancel_requested"
+
+
+class RenderError(RuntimeError):
+    """ffmpeg failed or is not available."""
+
+
+class RenderCancelled(Exception):
+    """Rendering was cancelled before it finished."""
+
+
+ProgressCallback = Callable[[float], Awaitable[None]]
+
+
+def build_ffmpeg_command(
+    input_path: str,
+    start_ms: int,
+    end_ms: int,
+    outputs: List[Tuple[RenderProfile, str]],
+    threads: int = 2,
+    ffmpeg_binary: str = "ffmpeg"
+) -> List[str]:
+    """
+    Build a single ffmpeg invocation rendering every output from one decode.
+    
+    The clip range is decoded once (input seek), split in the filter graph
+    and each branch is scaled/cropped to its platform's frame; audio is
+    decoded once as well and mapped to every output.
+    
+    Args:
+        input_path: Source video
+        start_ms: Clip start within the source
+        end_ms: Clip end within the source
+        outputs: (profile, output path) per variant
+        threads: Thread budget for the whole process
+        ffmpeg_binary: ffmpeg executable
+    
+    Returns:
+        argv list for asyncio.create_subprocess_exec
+    """
+    n = len(outputs)
+    duration_s = max(0, end_ms - start_ms) / 1000
+    
+    split = f"[0:v]split={n}" + "".join(f"[v{i}]" for i in range(n))
+    branches = [
+        f"[v{i}]scale={p.width}:{p.height}:force_original_aspect_ratio=increase,"
+        f"crop={p.width}:{p.height},fps={p.fps},setsar=1[out{i}]"
+        for i, (p, _) in enumerate(outputs)
+    ]
+    
+    command = [
+        ffmpeg_binary, "-hide_banner", "-nostdin", "-y",
+        "-threads", str(threads),
+        "-ss", f"{start_ms / 1000:.3f}", "-t", f"{duration_s:.3f}",
+        "-i", input_path,
+        "-filter_complex", ";".join([split] + branches),
+    ]
+    
+    encoder_threads = max(1, threads // n)
+    for i, (profile, output_path) in enumerate(outputs):
+        command += [
+            "-map", f"[out{i}]", "-map", "0:a?",
+            "-c:v", "libx264", "-preset", "veryfast", "-b:v", profile.video_bitrate,
+            "-pix_fmt", "yuv420p", "-threads", str(encoder_threads),
+            "-c:a", "aac", "-b:a", profile.audio_bitrate,
+            "-movflags", "+faststart",
+        ]
+        if profile.max_duration_ms and profile.max_duration_ms < duration_s * 1000:
+            command += ["-t", f"{profile.max_duration_ms / 1000:.3f}"]
+        command.append(output_path)
+    
+    command += ["-progress", "pipe:1", "-nostats"]
+    return command
+
+
+class RenderPool:
+    """
+    Bounded pool of ffmpeg subprocesses.
+    
+    At most `max_concurrent` ffmpeg processes run at once (each one gets
+    `threads_per_job` threads), so a burst of variant jobs queues instead of
+    oversubscribing the host. Renders are identified by a render ID (the Job
+    ID for variant jobs) so they can be cancelled from elsewhere.
+    """
+    
+    # Grace period between SIGTERM and SIGKILL on cancellation
+    TERMINATE_TIMEOUT_S = 5.0
+    STDERR_TAIL_LINES = 20
+    
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        threads_per_job: int = 2,
+        ffmpeg_binary: str = "ffmpeg"
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            max_concurrent: Max ffmpeg processes at once. If None or 0, uses
+                CPU count // threads_per_job.
+            threads_per_job: Threads given to each ffmpeg process
+            ffmpeg_binary: ffmpeg executable
+        """
+        self.threads_per_job = max(1, threads_per_job)
+        self.max_concurrent = max_concurrent or max(1, (os.cpu_count() or 1) // self.threads_per_job)
+        self.ffmpeg_binary = ffmpeg_binary
+        
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._pending: Set[str] = set()
+        self._cancelled: Set[str] = set()
+        
+        # Telemetry
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+    
+    @property
+    def available(self) -> bool:
+        """Whether the ffmpeg executable can be found."""
+        return shutil.which(self.ffmpeg_binary) is not None
+    
+    async def render(
+        self,
+        render_id: str,
+        input_path: str,
+        start_ms: int,
+        end_ms: int,
+        outputs: List[Tuple[RenderProfile, str]],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        Render every output of a clip in one ffmpeg process.
+        
+        Waits for a free slot first. Partial outputs are removed if the
+        render fails or is cancelled.
+        
+        Args:
+            render_id: ID used by cancel()
+            input_path: Source video
+            start_ms: Clip start within the source
+            end_ms: Clip end within the source
+            outputs: (profile, output path) per variant
+            on_progress: Awaited with the completed fraction (0-1)
+        
+        Returns:
+            Output paths
+        
+        Raises:
+            RenderCancelled: If cancel(render_id) was called
+            RenderError: If ffmpeg is missing or exits with an error
+        """
+        for _, output_path in outputs:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        command = build_ffmpeg_command(
+            input_path, start_ms, end_ms, outputs,
+            threads=self.threads_per_job, ffmpeg_binary=self.ffmpeg_binary
+        )
+        output_paths = [path for _, path in outputs]
+        
+        self._pending.add(render_id)
+        self.queued += 1
+        started = False
+        try:
+            async with self._semaphore:
+                started = True
+                self.queued -= 1
+                self.running += 1
+                try:
+                    await self._run(render_id, command, max(1, end_ms - start_ms), on_progress)
+                finally:
+                    self.running -= 1
+        
+        except (RenderCancelled, asyncio.CancelledError):
+            self.cancelled += 1
+            self._remove_outputs(output_paths)
+            raise
+        except Exception:
+            self.failed += 1
+            self._remove_outputs(output_paths)
+            raise
+        finally:
+            if not started:
+                self.queued -= 1
+            self._pending.discard(render_id)
+            self._cancelled.discard(render_id)
+        
+        self.completed += 1
+        return output_paths
+    
+    async def _run(
+        self,
+        render_id: str,
+        command: List[str],
+        duration_ms: int,
+        on_progress: Optional[ProgressCallback]
+    ) -> None:
+        if render_id in self._cancelled:
+            raise RenderCancelled(f"Render {render_id} cancelled")
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError as e:
+            raise RenderError(f"ffmpeg not found: {self.ffmpeg_binary}") from e
+        
+        self._processes[render_id] = process
+        stderr_tail: deque = deque(maxlen=self.STDERR_TAIL_LINES)
+        stderr_task = asyncio.create_task(self._drain(process.stderr, stderr_tail))
+        
+        try:
+            # -progress emits key=value blocks; out_time_us is the encoded position
+            async for raw_line in process.stdout:
+                key, _, value = raw_line.decode(errors="replace").strip().partition("=")
+                if key == "out_time_us" and on_progress is not None and value.isdigit():
+                    await on_progress(min(1.0, int(value) / 1000 / duration_ms))
+            
+            return_code = await process.wait()
+            await stderr_task
+        
+        except asyncio.CancelledError:
+            await self._terminate(process)
+            stderr_task.cancel()
+            raise
+        finally:
+            self._processes.pop(render_id, None)
+        
+        if render_id in self._cancelled:
+            raise RenderCancelled(f"Render {render_id} cancelled")
+        
+        if return_code != 0:
+            raise RenderError(f"ffmpeg exited with code {return_code}: {' | '.join(stderr_tail)}")
+        
+        if on_progress is not None:
+            await on_progress(1.0)
+    
+    @staticmethod
+    async def _drain(stream: asyncio.StreamReader, tail: deque) -> None:
+        """Read stderr continuously (a full pipe would block ffmpeg), keep the last lines."""
+        async for raw_line in stream:
+            line = raw_line.decode(errors="replace").strip()
+            if line:
+                tail.append(line)
+    
+    async def _terminate(self, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.TERMINATE_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+    
+    def cancel(self, render_id: str) -> bool:
+        """
+        Cancel a queued or running render.
+        
+        The awaiting render() call raises RenderCancelled once ffmpeg exits.
+        
+        Returns:
+            True if the render was running (its process was signalled)
+        """
+        if render_id not in self._pending:
+            return False
+        
+        self._cancelled.add(render_id)
+        process = self._processes.get(render_id)
+        if process is None or process.returncode is not None:
+            return False
+        process.terminate()
+        return True
+    
+    @staticmethod
+    def _remove_outputs(paths: List[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove partial render {path}: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "threads_per_job": self.threads_per_job,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+
+_render_pool: Optional[RenderPool] = None
+
+
+def get_render_pool() -> RenderPool:
+    """Process-wide render pool, configured from settings."""
+    global _render_pool
+    
+    if _render_pool is None:
+        _render_pool = RenderPool(
+            max_concurrent=settings.RENDER_MAX_CONCURRENT,
+            threads_per_job=settings.RENDER_THREADS_PER_JOB,
+            ffmpeg_binary=settings.FFMPEG_BINARY
+        )
+    return _render_pool
+
+
+def cancel_render(job_id: str) -> bool:
+    """
+    Cancel the variant rendering of a job in this process.
+    
+    The pool's cancel flags are process-local: a render running in another
+    worker process is not affected (see request_render_cancel).
+    
+    Returns:
+        True if a running ffmpeg process was signalled
+    """
+    return get_render_pool().cancel(str(job_id))
+
+
+def request_render_cancel(job: Job) -> bool:
+    """
+    Cancel the variant rendering of a job in whichever process runs it.
+    
+    Signals ffmpeg if it runs in this process and sets the job's persisted
+    cancel flag (job.result[CANCEL_REQUESTED]; the caller commits). A render
+    in another process stops at its next progress update.
+    
+    Returns:
+        True if a running ffmpeg process in this process was signalled
+    """
+    job.result = {**(job.result or {}), CANCEL_REQUESTED: True}
+    return cancel_render(str(job.id))
+
+
+async def _write_progress(
+    session_factory: Callable[[], AsyncSession],
+    job_id: Any,
+    progress: float
+) -> bool:
+    """
+    Write render progress to job.result in a short-lived session.
+    
+    Returns:
+        True if the job's cancel flag is set (progress is not written)
+    """
+    try:
+        async with session_factory() as session:
+            result = (await session.execute(
+                select(Job.result).where(Job.id == job_id).with_for_update()
+            )).scalar_one_or_none() or {}
+            if result.get(CANCEL_REQUESTED):
+                return True
+            
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    result={**result, "stage": "rendering", "progress": progress},
+                    updated_at=datetime.utcnow()
+                )
+            )
+            await session.commit()
+    except Exception as e:
+        # Progress is informational - never fail the render over it
+        logger.warning(f"Could not write render progress of job {job_id}: {e}")
+    return False
+
+
+async def render_clip_variants(
+    job: Job,
+    db: AsyncSession,
+    platforms: Optional[List[str]] = None,
+    pool: Optional[RenderPool] = None,
+    session_factory: Optional[Callable[[], AsyncSession]] = None
+) -> List[ClipVariant]:
+    """
+    Render the platform variants of a job's clip and record them.
+    
+    Progress is written to the Job row while ffmpeg runs (at most every
+    PROGRESS_INTERVAL_S) in its own short-lived session, so db's transaction
+    is left to the caller. Each update also checks the job's persisted cancel
+    flag (request_render_cancel) and stops the render if it is set.
+    
+    The caller must commit its writes to the Job row (e.g. the PROCESSING
+    status) before calling: the progress session waits for that row's lock.
+    
+    Args:
+        job: generate_variants job (clip_id set)
+        db: Database session
+        platforms: Platforms to render. Defaults to job.params["platforms"]
+            or every platform in PLATFORM_PROFILES.
+        pool: Render pool. Defaults to get_render_pool().
+        session_factory: Sessions for progress updates. Defaults to
+            AsyncSessionLocal.
+    
+    Returns:
+        Created ClipVariant rows (flushed, not committed)
+    
+    Raises:
+        ValueError: If the clip, its video or a platform is unknown
+        RenderCancelled: If the job was cancelled
+        RenderError: If ffmpeg is missing or fails
+    """
+    pool = pool or get_render_pool()
+    session_factory = session_factory or AsyncSessionLocal
+    platforms = platforms or (job.params or {}).get("platforms") or list(PLATFORM_PROFILES)
+    
+    unknown = [p for p in platforms if p not in PLATFORM_PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown platforms: {unknown}. Available: {list(PLATFORM_PROFILES)}")
+    
+    result = await db.execute(
+        select(Clip, VideoAsset.file_path)
+        .join(VideoAsset, VideoAsset.id == Clip.video_asset_id)
+        .where(Clip.id == job.clip_id)
+    )
+    row = result.first()
+    if row is None:
+        raise ValueError(f"Clip {job.clip_id} not found")
+    clip, video_path = row
+    
+    if not video_path or not os.path.exists(video_path):
+        raise ValueError(f"Source video of clip {clip.id} is not available: {video_path}")
+    
+    output_dir = Path(settings.VARIANT_STORAGE_DIR) / str(clip.id)
+    outputs = [
+        (PLATFORM_PROFILES[platform], str(output_dir / f"{platform}_{job.id}.mp4"))
+        for platform in platforms
+    ]
+    
+    last_update = 0.0
+    
+    async def on_progress(fraction: float) -> None:
+        nonlocal last_update
+        now = time.monotonic()
+        if fraction < 1.0 and now - last_update < PROGRESS_INTERVAL_S:
+            return
+        last_update = now
+        if await _write_progress(session_factory, job.id, round(fraction, 3)):
+            pool.cancel(str(job.id))
+    
+    render_start = time.perf_counter()
+    await pool.render(str(job.id), video_path, clip.start_ms, clip.end_ms, outputs, on_progress)
+    render_ms = int((time.perf_counter() - render_start) * 1000)
+    
+    variants = []
+    for number, (profile, output_path) in enumerate(outputs, start=1):
+        variant = ClipVariant(
+            id=uuid4(),
+            clip_id=clip.id,
+            variant_number=number,
+            platform=profile.platform,
+            file_path=output_path,
+            status="ready",
+            params={
+                "generated_by_job": str(job.id),
+                "width": profile.width,
+                "height": profile.height,
+                "video_bitrate": profile.video_bitrate,
+                "render_ms": render_ms
+            },
+            created_at=datetime.utcnow()
+        )
+        db.add(variant)
+        variants.append(variant)
+    
+    await db.flush()
+    logger.info(f"✅ Rendered {len(variants)} variants of clip {clip.id} in {render_ms}ms")
+    return variants
@@ -6,7 +6,7 @@ from typing import Dict, Callable, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.database import Job
-from app.worker.handlers import run_cut_analysis
+from app.worker.handlers import run_cut_analysis, run_generate_variants
 from app.e2b.dispatcher import dispatch_e2b_job, should_use_e2b_dispatcher
 
 
@@ -14,8 +14,8 @@ from app.e2b.dispatcher import dispatch_e2b_job, should_use_e2b_dispatcher
 DISPATCH_TABLE: Dict[str, Callable] = {
     "cut_analysis": run_cut_analysis,
     "cut_analysis_e2b": dispatch_e2b_job,  # E2B simulation
+    "generate_variants": run_generate_variants,
     # Add more handlers here as they're implemented:
-    # "generate_variants": run_generate_variants,
     # "publish_to_platform": run_publish_to_platform,
 }
 
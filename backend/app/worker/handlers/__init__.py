@@ -2,5 +2,6 @@
 Job Handlers Module
 """
 from app.worker.handlers.cut_analysis import run_cut_analysis
+from app.worker.handlers.generate_variants import run_generate_variants
 
-__all__ = ["run_cut_analysis"]
+__all__ = ["run_cut_analysis", "run_generate_variants"]
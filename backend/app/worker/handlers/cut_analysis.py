@@ -3,7 +3,7 @@ Cut Analysis Handler
 Processes video assets to generate clips based on visual analysis
 """
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +11,29 @@ from sqlalchemy import select
 
 from app.models.database import Job, VideoAsset, Clip, ClipStatus
 from app.ledger import log_clip_event
+from app.core.vision import analyze_clips, detect_cuts
+from app.core.clip_dedup import encode_embedding
+
+
+async def _analyze_segments(
+    video_asset: VideoAsset,
+    segments: List[Dict[str, int]]
+) -> Optional[List[Any]]:
+    """
+    Vision analysis of every segment (stored results first, then the vision pool).
+    
+    Returns:
+        ClipMetadata per segment, or None if the source file is not available
+        locally or vision analysis is not possible here
+    """
+    return await analyze_clips(
+        video_asset.file_path,
+        [
+            {"clip_id": f"{video_asset.id}_{i}", **segment}
+            for i, segment in enumerate(segments)
+        ],
+        video_id=str(video_asset.id)
+    )
 
 
 async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
@@ -18,14 +41,15 @@ async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
     Execute cut analysis on a video asset.
     
     Analyzes video content and generates multiple clips based on:
-    - Scene detection (simulated)
-    - Visual quality scoring (simulated)
-    - Duration-based segmentation
+    - Shot-boundary detection (clips aligned to cuts, scored by motion)
+    - Scene detection (Vision Engine, simulated when unavailable)
+    - Visual quality scoring (cuts + Vision Engine, simulated when unavailable)
+    - Duration-based segmentation (when the source file is not available)
     
     Args:
         job: Job object with video_asset_id
         db: Database session
-        
+    
     Returns:
         Dictionary with processing results:
         {
@@ -33,7 +57,7 @@ async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
             "duration": int (ms),
             "variants": list
         }
-        
+    
     Raises:
         ValueError: If video_asset_id is missing or video not found
     """
@@ -50,29 +74,69 @@ async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
     if not video_asset:
         raise ValueError(f"VideoAsset {job.video_asset_id} not found")
     
-    # Simulate video analysis processing
-    await asyncio.sleep(0.5)
-    
-    # Determine video duration (default 60s if not set)
-    video_duration_ms = video_asset.duration_ms or 60000
+    # Shot-boundary analysis of the source file: clips start/end on real cuts
+    cuts = await detect_cuts(video_asset.file_path)
+    if cuts is not None and cuts.candidates:
+        video_duration_ms = cuts.duration_ms
+        segments = [
+            {"start_ms": candidate.start_ms, "end_ms": candidate.end_ms}
+            for candidate in cuts.candidates
+        ]
+    else:
+        cuts = None
+        
+        # Determine video duration (default 60s if not set)
+        video_duration_ms = video_asset.duration_ms or 60000
+        
+        # Generate clips based on video length
+        # Strategy: 1 clip per 20 seconds of video, minimum 3, maximum 5
+        num_clips = min(5, max(3, video_duration_ms // 20000))
+        segment_duration = video_duration_ms // num_clips
+        segments = [
+            {"start_ms": i * segment_duration, "end_ms": (i + 1) * segment_duration}
+            for i in range(num_clips)
+        ]
+    num_clips = len(segments)
     
-    # Generate clips based on video length
-    # Strategy: 1 clip per 20 seconds of video, minimum 3, maximum 5
-    num_clips = min(5, max(3, video_duration_ms // 20000))
-    segment_duration = video_duration_ms // num_clips
+    # Analyze all segments (stored results, else in parallel across the vision pool)
+    vision_results = await _analyze_segments(video_asset, segments)
+    if vision_results is None and cuts is None:
+        # Simulate video analysis processing
+        await asyncio.sleep(0.5)
     
     clips_created = []
     
-    for i in range(num_clips):
+    for i, segment in enumerate(segments):
         # Calculate clip timestamps
-        start_ms = i * segment_duration
-        end_ms = start_ms + segment_duration
+        start_ms = segment["start_ms"]
+        end_ms = segment["end_ms"]
+        duration_ms = end_ms - start_ms
+        
+        cut = cuts.candidates[i] if cuts else None
+        vision = vision_results[i] if vision_results else None
+        
+        scores = []
+        if cut is not None:
+            scores.append(cut.visual_score)
+        if vision is not None:
+            scores.append((vision.virality_score_visual + vision.aesthetic_score) / 2)
+        
+        if scores:
+            visual_score = round(sum(scores) / len(scores), 2)
+        else:
+            # Generate visual score (simulated)
+            # Higher scores for middle clips (assumption: best content in middle)
+            distance_from_middle = abs(i - num_clips / 2)
+            base_score = 0.85 - (distance_from_middle * 0.05)
+            visual_score = round(base_score, 2)
         
-        # Generate visual score (simulated)
-        # Higher scores for middle clips (assumption: best content in middle)
-        distance_from_middle = abs(i - num_clips / 2)
-        base_score = 0.85 - (distance_from_middle * 0.05)
-        visual_score = round(base_score, 2)
+        analysis_method = "cut_analysis_v2" if cut else "cut_analysis_v1"
+        avg_embedding = None
+        if vision:
+            analysis_method += "_vision"
+            if vision.avg_embedding is not None and len(vision.avg_embedding):
+                # Kept for near-duplicate checks before publishing (app.core.clip_dedup)
+                avg_embedding = encode_embedding(vision.avg_embedding)
         
         # Create clip record
         clip = Clip(
@@ -80,15 +144,20 @@ async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
             video_asset_id=video_asset.id,
             start_ms=start_ms,
             end_ms=end_ms,
-            duration_ms=segment_duration,
+            duration_ms=duration_ms,
             visual_score=visual_score,
             status=ClipStatus.READY,
             params={
                 "generated_by_job": str(job.id),
-                "analysis_method": "cut_analysis_v1",
+                "analysis_method": analysis_method,
                 "clip_index": i,
                 "total_clips": num_clips,
-                "scene_type": "auto_detected"
+                "scene_type": (vision.dominant_scene if vision else None) or "auto_detected",
+                "objects_detected": vision.objects_detected if vision else [],
+                "motion_intensity": cut.motion_intensity if cut else None,
+                "shot_count": cut.shot_count if cut else None,
+                "cut_confidence": cut.confidence if cut else None,
+                "avg_embedding": avg_embedding
             },
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
@@ -105,12 +174,13 @@ async def run_cut_analysis(job: Job, db: AsyncSession) -> Dict[str, Any]:
                 "video_asset_id": str(video_asset.id),
                 "start_ms": start_ms,
                 "end_ms": end_ms,
-                "duration_ms": segment_duration,
+                "duration_ms": duration_ms,
                 "visual_score": visual_score,
                 "clip_index": i,
                 "total_clips": num_clips
             },
-            job_id=job.id
+            job_id=job.id,
+            durability="transactional"
         )
         
         # Evaluate clip with Rule Engine (default to Instagram)
@@ -0,0 +1,65 @@
+"""
+Generate Variants Handler
+Renders the platform variants (Instagram, TikTok, YouTube) of a clip with FFmpeg
+"""
+import asyncio
+import logging
+from typing import Dict, Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.database import Job
+from app.services.variant_renderer import PLATFORM_PROFILES, get_render_pool, render_clip_variants
+
+logger = logging.getLogger(__name__)
+
+
+async def run_generate_variants(job: Job, db: AsyncSession) -> Dict[str, Any]:
+    """
+    Execute variant generation for a clip.
+    
+    All variants come out of one ffmpeg process (single decode) running in
+    the shared render pool; progress is written to job.result while it runs.
+    Without ffmpeg on the host, generation is simulated.
+    
+    Args:
+        job: Job object with clip_id (optional params["platforms"])
+        db: Database session
+    
+    Returns:
+        Dictionary with processing results:
+        {
+            "variants_created": int,
+            "variants": list
+        }
+    
+    Raises:
+        ValueError: If clip_id is missing or the clip / its video is not found
+        RenderCancelled: If the job was cancelled while rendering
+        RenderError: If ffmpeg fails
+    """
+    if not job.clip_id:
+        raise ValueError("Job has no associated clip_id")
+    
+    if not get_render_pool().available:
+        logger.warning(f"ffmpeg not available, simulating variants for job {job.id}")
+        await asyncio.sleep(0.3)
+        platforms = (job.params or {}).get("platforms") or list(PLATFORM_PROFILES)
+        return {
+            "variants_created": len(platforms),
+            "variants": [{"platform": platform, "simulated": True} for platform in platforms]
+        }
+    
+    variants = await render_clip_variants(job, db)
+    
+    return {
+        "variants_created": len(variants),
+        "variants": [
+            {
+                "variant_id": str(variant.id),
+                "platform": variant.platform,
+                "file_path": variant.file_path
+            }
+            for variant in variants
+        ]
+    }
@@ -61,8 +61,12 @@ async def process_single_job(db: AsyncSession) -> Optional[Dict[str, Any]]:
         db=db,
         job_id=job.id,
         event_type="job_processing_started",
-        metadata={"job_type": job_type}
+        metadata={"job_type": job_type},
+        durability="transactional"
     )
+    # Commit before the handler runs: handlers such as the variant renderer
+    # write to the Job row from their own sessions
+    await db.commit()
     
     try:
         # Check if handler exists
@@ -86,7 +90,8 @@ async def process_single_job(db: AsyncSession) -> Optional[Dict[str, Any]]:
             metadata={
                 "job_type": job_type,
                 "clips_created": result.get("clips_created", 0) if isinstance(result, dict) else None
-            }
+            },
+            durability="transactional"
         )
         
         await db.commit()
@@ -134,7 +139,8 @@ async def process_single_job(db: AsyncSession) -> Optional[Dict[str, Any]]:
                 "error": str(e),
                 "error_type": "unknown_job_type"
             },
-            severity="ERROR"
+            severity="ERROR",
+            durability="transactional"
         )
         
         await db.commit()
@@ -29,6 +29,7 @@ from app.models.database import (
     Campaign,
     PlatformRule,
     RuleEngineWeights,
+    RuleEngineTrainingCheckpoint,
     BestClipDecisionModel,
     # Social/Publishing models
     SocialAccountModel,
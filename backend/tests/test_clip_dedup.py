@@ -0,0 +1,254 @@
+"""
+Tests for near-duplicate clip detection (app.core.clip_dedup).
+
+- ClipDedupIndex: exact and LSH-pruned queries
+- schedule_publication flags / rejects near-duplicates on the same platform
+"""
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import select
+
+from app.models.database import PublishLogModel, Clip, VideoAsset, ClipStatus, SocialAccountModel
+from app.core import clip_dedup
+from app.core.clip_dedup import ClipDedupIndex, encode_embedding, decode_embedding
+from app.publishing_scheduler import scheduler as scheduler_module
+from app.publishing_scheduler.models import ScheduleRequest
+from app.publishing_scheduler.scheduler import schedule_publication
+from test_db import init_test_db, drop_test_db, get_test_session
+
+DIM = 512
+
+
+def _unit(rng, n=1):
+    vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _near(rng, vector, noise=0.1):
+    """A vector with cosine ~0.99 to `vector`."""
+    return vector + noise * _unit(rng)[0]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━
+# INDEX
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_embedding_roundtrip():
+    rng = np.random.default_rng(0)
+    vector = _unit(rng)[0]
+    decoded = decode_embedding(encode_embedding(vector))
+    assert decoded.shape == (DIM,)
+    assert float(decoded @ vector) > 0.999
+
+
+def test_index_finds_near_duplicates_only():
+    rng = np.random.default_rng(1)
+    index = ClipDedupIndex()
+    base = _unit(rng, 50)
+    for i, vector in enumerate(base):
+        index.add(f"clip-{i}", vector)
+    
+    matches = index.query(_near(rng, base[7]), min_similarity=0.95)
+    assert [clip_id for clip_id, _ in matches] == ["clip-7"]
+    assert matches[0][1] >= 0.95
+    
+    # Restricted to candidates / excluding the clip itself
+    assert index.query(base[7], 0.95, candidates=["clip-1", "clip-2"]) == []
+    assert index.query(base[7], 0.95, exclude=["clip-7"]) == []
+
+
+def test_index_lsh_matches_exact_search():
+    rng = np.random.default_rng(2)
+    exact = ClipDedupIndex(brute_force_max=10 ** 9)
+    pruned = ClipDedupIndex(brute_force_max=0)
+    base = _unit(rng, 2000)
+    for i, vector in enumerate(base):
+        exact.add(str(i), vector)
+        pruned.add(str(i), vector)
+    
+    hits = 0
+    for i in range(0, 2000, 20):
+        query = _near(rng, base[i])
+        expected = exact.query(query, 0.95)
+        assert expected and expected[0][0] == str(i)
+        hits += pruned.query(query, 0.95) == expected
+    assert hits >= 95
+
+
+def test_index_replaces_embedding():
+    rng = np.random.default_rng(3)
+    index = ClipDedupIndex(brute_force_max=0)
+    first, second = _unit(rng, 2)
+    index.add("clip", first)
+    index.add("clip", second)
+    
+    assert len(index) == 1
+    assert index.query(first, 0.95) == []
+    assert index.query(second, 0.95)[0][0] == "clip"
+
+
+def test_index_discard_keeps_other_clips_queryable():
+    rng = np.random.default_rng(5)
+    index = ClipDedupIndex(brute_force_max=0)
+    base = _unit(rng, 3)
+    for i, vector in enumerate(base):
+        index.add(f"clip-{i}", vector)
+    
+    index.discard("clip-0")
+    index.discard("missing")
+    
+    assert len(index) == 2 and "clip-0" not in index
+    assert index.query(base[0], 0.95) == []
+    assert index.query(base[2], 0.95)[0][0] == "clip-2"
+    assert index.query(base[1], 0.95)[0][0] == "clip-1"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SCHEDULER
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest_asyncio.fixture(scope="function")
+async def db():
+    await init_test_db()
+    async for session in get_test_session():
+        yield session
+    await drop_test_db()
+
+
+@pytest_asyncio.fixture
+async def clips_and_account(db):
+    """Two visually identical clips, one different clip and an Instagram account."""
+    rng = np.random.default_rng(4)
+    base, other = _unit(rng, 2)
+    
+    video_asset = VideoAsset(
+        id=uuid4(),
+        title="Test Video for Dedup",
+        file_path="/storage/test_dedup.mp4",
+        file_size=1000000,
+        duration_ms=30000,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    db.add(video_asset)
+    await db.flush()
+    
+    clips = []
+    for i, embedding in enumerate([base, _near(rng, base), other]):
+        clip = Clip(
+            id=uuid4(),
+            video_asset_id=video_asset.id,
+            start_ms=i * 10000,
+            end_ms=(i + 1) * 10000,
+            duration_ms=10000,
+            visual_score=0.8,
+            status=ClipStatus.READY,
+            params={"avg_embedding": encode_embedding(embedding)},
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.add(clip)
+        clips.append(clip)
+    
+    account = SocialAccountModel(
+        id=uuid4(),
+        platform="instagram",
+        handle="@dedup",
+        external_id="dedup_123",
+        is_active=1,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    db.add(account)
+    await db.commit()
+    return clips, account
+
+
+def _request(clip, account, days=1):
+    return ScheduleRequest(
+        clip_id=str(clip.id),
+        platform="instagram",
+        social_account_id=str(account.id),
+        scheduled_for=(datetime.utcnow() + timedelta(days=days)).replace(hour=20, minute=0, second=0, microsecond=0),
+        scheduled_by="manual"
+    )
+
+
+@pytest.mark.asyncio
+async def test_schedule_flags_near_duplicate(db, clips_and_account, monkeypatch):
+    monkeypatch.setattr(scheduler_module.settings, "CLIP_DEDUP_ACTION", "flag")
+    (original, duplicate, other), account = clips_and_account
+    
+    first = await schedule_publication(db, _request(original, account))
+    second = await schedule_publication(db, _request(duplicate, account, days=2))
+    third = await schedule_publication(db, _request(other, account, days=3))
+    assert first.status == second.status == third.status == "scheduled"
+    
+    result = await db.execute(select(PublishLogModel))
+    logs = {str(log.clip_id): log for log in result.scalars().all()}
+    near = logs[str(duplicate.id)].extra_metadata["near_duplicates"]
+    assert [d["clip_id"] for d in near] == [str(original.id)]
+    assert near[0]["similarity"] >= 0.95
+    assert logs[str(original.id)].extra_metadata["near_duplicates"] is None
+    assert logs[str(other.id)].extra_metadata["near_duplicates"] is None
+
+
+@pytest.mark.asyncio
+async def test_schedule_skips_near_duplicate(db, clips_and_account, monkeypatch):
+    monkeypatch.setattr(scheduler_module.settings, "CLIP_DEDUP_ACTION", "skip")
+    (original, duplicate, other), account = clips_and_account
+    
+    assert (await schedule_publication(db, _request(original, account))).status == "scheduled"
+    
+    rejected = await schedule_publication(db, _request(duplicate, account, days=2))
+    assert rejected.status == "rejected"
+    assert "Near-duplicate" in rejected.reason
+    assert str(original.id) in rejected.reason
+    
+    # Outside the window the same clip is fine again
+    later = await schedule_publication(
+        db, _request(duplicate, account, days=2 + 2 * scheduler_module.settings.CLIP_DEDUP_WINDOW_DAYS)
+    )
+    assert later.status == "scheduled"
+    
+    assert (await schedule_publication(db, _request(other, account, days=3))).status == "scheduled"
+
+
+@pytest.mark.asyncio
+async def test_index_follows_rewritten_embeddings(db, clips_and_account, monkeypatch):
+    monkeypatch.setattr(clip_dedup, "_index", None)
+    (original, duplicate, other), _ = clips_and_account
+    clip_ids = [original.id, duplicate.id, other.id]
+    
+    await clip_dedup._load_embeddings(db, clip_ids)
+    index = clip_dedup.get_clip_dedup_index()
+    assert index.query(index.get(str(original.id)), 0.95, exclude=[str(original.id)])[0][0] == str(duplicate.id)
+    
+    # Re-analysis rewrites the embedding of one clip and drops another's
+    embedding = decode_embedding(original.params["avg_embedding"])
+    other.params = {"avg_embedding": encode_embedding(embedding)}
+    duplicate.params = {"analysis_method": "cut_analysis_v2"}
+    await db.commit()
+    
+    await clip_dedup._load_embeddings(db, clip_ids)
+    assert str(duplicate.id) not in index
+    assert [match for match, _ in index.query(embedding, 0.95, exclude=[str(original.id)])] == [str(other.id)]
+    
+    # Unchanged clips (with or without an embedding) only cost the updated_at query
+    statements = []
+    execute = db.execute
+    
+    async def counting_execute(statement, *args, **kwargs):
+        statements.append(statement)
+        return await execute(statement, *args, **kwargs)
+    
+    monkeypatch.setattr(db, "execute", counting_execute)
+    await clip_dedup._load_embeddings(db, clip_ids)
+    assert len(statements) == 1
@@ -0,0 +1,228 @@
+"""
+Tests for the buffered ledger writer.
+
+Tests cover:
+- Buffered events written in batches in the writer's own session
+- Size- and time-triggered flushes
+- Bounded buffer (dropped events are counted)
+- "flush" and "transactional" durability
+- Flush on stop, one retry per failed batch and fail-safe batch errors
+"""
+import asyncio
+from uuid import uuid4
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, func
+
+from app.ledger import log_event, log_clip_event
+from app.ledger.models import LedgerEvent
+from app.ledger.writer import LedgerWriter, start_ledger_writer, stop_ledger_writer, get_ledger_writer
+from tests.test_db import init_test_db, drop_test_db, get_test_session, TestSessionLocal
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def setup_test_db():
+    """Initialize test database before each test."""
+    await init_test_db()
+    yield
+    await stop_ledger_writer()
+    await drop_test_db()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Provide a database session for tests"""
+    async for session in get_test_session():
+        yield session
+
+
+async def _count_events(event_type=None) -> int:
+    async with TestSessionLocal() as session:
+        query = select(func.count(LedgerEvent.id))
+        if event_type:
+            query = query.where(LedgerEvent.event_type == event_type)
+        return (await session.execute(query)).scalar()
+
+
+async def _log(db, i, **kwargs):
+    return await log_event(
+        db=db,
+        event_type="clip_evaluated",
+        entity_type="clip",
+        entity_id=f"clip_{i}",
+        metadata={"i": i},
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_buffered_events_written_in_batches(db_session):
+    """Test buffered events skip the caller's session and are written per batch."""
+    writer = LedgerWriter(TestSessionLocal, batch_size=50, flush_interval_ms=60000)
+    
+    events = []
+    for i in range(120):
+        event = LedgerEvent(
+            event_type="clip_evaluated",
+            entity_type="clip",
+            entity_id=f"clip_{i}",
+            event_data={"i": i}
+        )
+        assert writer.enqueue(event)
+        events.append(event)
+    
+    assert all(event.id is not None for event in events)
+    assert writer.queue_depth == 120
+    assert await _count_events() == 0
+    
+    assert await writer.flush() == 120
+    assert await _count_events() == 120
+    assert writer.stats()["written"] == 120
+    assert writer.stats()["queue_depth"] == 0
+    assert writer.flushes == 3  # 50 + 50 + 20 rows
+    
+    # Log order is kept (timestamps set when logged, not when written)
+    async with TestSessionLocal() as session:
+        rows = (await session.execute(
+            select(LedgerEvent.event_data).order_by(LedgerEvent.timestamp, LedgerEvent.id)
+        )).scalars().all()
+    assert [row["i"] for row in rows] == list(range(120))
+
+
+@pytest.mark.asyncio
+async def test_log_event_buffers_when_writer_running(db_session):
+    """Test log_event() hands events to the running writer instead of the session."""
+    writer = await start_ledger_writer(TestSessionLocal, batch_size=100, flush_interval_ms=60000)
+    
+    event = await _log(db_session, 0)
+    
+    assert event is not None
+    assert not db_session.new
+    assert writer.queue_depth == 1
+    assert writer.stats()["enqueued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_flush_on_size_and_interval(db_session):
+    """Test the flush loop writes full batches at once and partial ones on the timer."""
+    writer = await start_ledger_writer(TestSessionLocal, batch_size=10, flush_interval_ms=50)
+    
+    for i in range(10):
+        await _log(db_session, i)
+    await asyncio.sleep(0.02)
+    assert await _count_events() == 10
+    
+    await _log(db_session, 10)
+    assert writer.queue_depth == 1
+    await asyncio.sleep(0.15)
+    assert await _count_events() == 11
+    assert writer.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_and_counts(db_session):
+    """Test buffered events beyond max_buffer are dropped, not blocking the caller."""
+    writer = await start_ledger_writer(TestSessionLocal, batch_size=100, flush_interval_ms=60000, max_buffer=5)
+    
+    results = [await _log(db_session, i) for i in range(8)]
+    
+    assert sum(result is None for result in results) == 3
+    assert writer.stats()["dropped"] == 3
+    assert writer.stats()["max_queue_depth"] == 5
+    
+    await stop_ledger_writer()
+    assert await _count_events() == 5
+
+
+@pytest.mark.asyncio
+async def test_flush_durability_waits_for_commit(db_session):
+    """Test a "flush" event is committed when log_event returns."""
+    await start_ledger_writer(TestSessionLocal, batch_size=100, flush_interval_ms=20)
+    
+    event = await log_clip_event(
+        db=db_session,
+        clip_id=uuid4(),
+        event_type="clip_published",
+        durability="flush"
+    )
+    
+    assert event is not None
+    assert await _count_events("clip_published") == 1
+
+
+@pytest.mark.asyncio
+async def test_transactional_durability_uses_caller_session(db_session):
+    """Test "transactional" events stay in the caller's transaction."""
+    writer = await start_ledger_writer(TestSessionLocal, batch_size=100, flush_interval_ms=60000)
+    
+    event = await _log(db_session, 0, durability="transactional")
+    
+    assert event in db_session.new
+    assert writer.queue_depth == 0
+    
+    await db_session.rollback()
+    assert await _count_events() == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_buffer(db_session):
+    """Test stop_ledger_writer() writes what is still buffered (shutdown)."""
+    await start_ledger_writer(TestSessionLocal, batch_size=100, flush_interval_ms=60000)
+    for i in range(7):
+        await _log(db_session, i)
+    
+    await stop_ledger_writer()
+    
+    assert get_ledger_writer() is None
+    assert await _count_events() == 7
+    
+    # Without a writer, events go to the caller's session again
+    event = await _log(db_session, 7)
+    assert event in db_session.new
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_counted_not_raised(db_session):
+    """Test a failing batch never breaks the caller."""
+    class BrokenSession:
+        async def __aenter__(self):
+            raise ConnectionError("database unavailable")
+        
+        async def __aexit__(self, *exc):
+            return False
+    
+    writer = await start_ledger_writer(BrokenSession, batch_size=100, flush_interval_ms=60000)
+    
+    assert await _log(db_session, 0) is not None
+    assert await _log(db_session, 1, durability="flush") is None
+    
+    assert writer.stats()["retried"] == 2
+    assert writer.stats()["failed"] == 2
+    assert writer.stats()["written"] == 0
+    assert writer.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_once(db_session):
+    """Test a batch that fails once (e.g. dropped connection) is written on retry."""
+    attempts = []
+    
+    def flaky_session():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("connection reset")
+        return TestSessionLocal()
+    
+    writer = LedgerWriter(flaky_session, batch_size=100, flush_interval_ms=60000)
+    for i in range(3):
+        writer.enqueue(LedgerEvent(event_type="clip_evaluated", entity_type="clip", entity_id=f"clip_{i}"))
+    
+    assert await writer.flush() == 3
+    assert len(attempts) == 2
+    assert writer.stats()["retried"] == 3
+    assert writer.stats()["failed"] == 0
+    assert await _count_events() == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
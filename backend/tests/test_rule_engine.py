@@ -1,6 +1,7 @@
 """
 Tests for Rule Engine 2.0
 """
+import numpy as np
 import pytest
 import pytest_asyncio
 from datetime import datetime
@@ -14,7 +15,7 @@ from app.models.database import Clip, VideoAsset, ClipStatus
 from app.rules_engine import RuleEngine
 from app.rules_engine.models import AdaptiveRuleSet, DEFAULT_WEIGHTS
 from app.rules_engine.heuristics import apply_platform_heuristics
-from app.rules_engine.loader import load_rules
+from app.rules_engine.loader import load_rules, invalidate_rules_cache
 from app.rules_engine.persistence import save_rules
 from app.ledger import log_event
 from tests.test_db import init_test_db, drop_test_db, get_test_session
@@ -104,6 +105,19 @@ async def test_evaluate_clip_returns_score_between_0_and_1(db_session):
     assert isinstance(score, float)
 
 
+@pytest.mark.asyncio
+async def test_normalize_features_uses_measured_motion_intensity():
+    """Test motion_intensity comes from cut analysis params when present."""
+    from app.rules_engine.evaluator import _normalize_features
+    
+    measured = Clip(visual_score=0.8, duration_ms=15000, params={"motion_intensity": 0.83})
+    unmeasured = Clip(visual_score=0.8, duration_ms=15000, params={"motion_intensity": None})
+    
+    assert _normalize_features(measured)["motion_intensity"] == pytest.approx(0.83)
+    assert _normalize_features(unmeasured)["motion_intensity"] == 0.5
+    assert _normalize_features(Clip(visual_score=0.8))["motion_intensity"] == 0.5
+
+
 @pytest.mark.asyncio
 async def test_tiktok_heuristics_increase_motion_intensity_weight(db_session):
     """Test that TikTok heuristics prioritize motion intensity."""
@@ -201,6 +215,95 @@ async def test_youtube_prefers_longer_duration(db_session):
     assert long_score >= short_score * 0.95  # Allow for small variance
 
 
+@pytest.mark.asyncio
+async def test_evaluate_clips_batch_matches_single_evaluation(db_session):
+    """Test batch scores equal per-clip scores and are logged as one event."""
+    from app.rules_engine.loader import invalidate_rules_cache
+    from app.ledger.models import LedgerEvent
+    
+    video_asset = VideoAsset(
+        id=uuid4(),
+        title="Test Batch Video",
+        file_path="/storage/test_batch.mp4",
+        file_size=1000000,
+        duration_ms=120000,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    db_session.add(video_asset)
+    await db_session.flush()
+    
+    clips = []
+    for i, (visual_score, duration_ms, params) in enumerate([
+        (0.9, 12000, {"motion_intensity": 0.8}),
+        (0.4, 75000, {}),
+        (None, 0, None),
+        (0.0, 30000, {"motion_intensity": 1.7}),
+    ]):
+        clip = Clip(
+            id=uuid4(),
+            video_asset_id=video_asset.id,
+            start_ms=i * 1000,
+            end_ms=i * 1000 + duration_ms,
+            duration_ms=duration_ms,
+            visual_score=visual_score,
+            status=ClipStatus.READY,
+            params=params,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db_session.add(clip)
+        clips.append(clip)
+    await db_session.flush()
+    
+    engine = RuleEngine()
+    single = [await engine.evaluate_clip(db_session, clip.id, "tiktok") for clip in clips]
+    batch = await engine.evaluate_clips_batch(db_session, clips, "tiktok")
+    
+    assert batch == pytest.approx(single)
+    assert await engine.evaluate_clips_batch(db_session, [], "tiktok") == []
+    await db_session.flush()
+    
+    result = await db_session.execute(
+        select(LedgerEvent).where(LedgerEvent.event_type == "clips_evaluated")
+    )
+    events = result.scalars().all()
+    assert len(events) == 1
+    assert events[0].event_data["clip_ids"] == [str(clip.id) for clip in clips]
+    assert events[0].event_data["features"]["motion_intensity"] == pytest.approx([0.8, 0.5, 0.5, 1.0])
+    
+    invalidate_rules_cache()
+
+
+@pytest.mark.asyncio
+async def test_cached_rules_invalidated_on_save(db_session):
+    """Test the rule cache serves loaded rules until rules are saved."""
+    from app.rules_engine.loader import load_rules_cached, invalidate_rules_cache
+    
+    await load_rules(db_session, "youtube")  # Saves the defaults
+    first = await load_rules_cached(db_session, "youtube")
+    assert await load_rules_cached(db_session, "youtube") is first
+    
+    custom_weights = {
+        "visual_score": 0.7,
+        "duration_ms": 0.1,
+        "cut_position": 0.1,
+        "motion_intensity": 0.1
+    }
+    await save_rules(db_session, AdaptiveRuleSet(
+        platform="youtube",
+        weights=custom_weights,
+        updated_at=datetime.utcnow()
+    ))
+    
+    reloaded = await load_rules_cached(db_session, "youtube")
+    assert reloaded is not first
+    assert reloaded.weights == pytest.approx(custom_weights)
+    
+    # Don't leak this database's rules into other tests
+    invalidate_rules_cache()
+
+
 @pytest.mark.asyncio
 async def test_training_updates_weights(db_session):
     """Test that training modifies weights based on performance data."""
@@ -248,6 +351,165 @@ async def test_training_updates_weights(db_session):
     assert weights_changed, "Training should modify at least one weight"
 
 
+def _training_features(i):
+    return {
+        "visual_score": (i % 10) / 10,
+        "duration_ms": 0.3,
+        "cut_position": 0.5,
+        "motion_intensity": (i % 7) / 7
+    }
+
+
+@pytest.mark.asyncio
+async def test_training_streams_whole_ledger_incrementally(db_session, monkeypatch):
+    """Test training reads past 100 events in chunks and resumes from its checkpoint."""
+    from app.rules_engine import trainer
+    from app.rules_engine.loader import load_training_checkpoint
+    
+    monkeypatch.setattr(trainer, "TRAIN_CHUNK_EVENTS", 40)
+    platform = "tiktok"
+    
+    for i in range(150):
+        await log_event(
+            db=db_session,
+            event_type="clip_evaluated",
+            entity_type="clip",
+            entity_id=str(uuid4()),
+            metadata={
+                "platform": platform if i % 3 else "youtube",
+                "score": (i % 10) / 10,
+                "features": _training_features(i)
+            }
+        )
+    await log_event(
+        db=db_session,
+        event_type="clips_evaluated",
+        entity_type="rules_engine",
+        entity_id=platform,
+        metadata={
+            "platform": platform,
+            "scores": [0.9, 0.1],
+            "features": {
+                "visual_score": [0.9, 0.1],
+                "duration_ms": [0.3, 0.3],
+                "cut_position": [0.5, 0.5],
+                "motion_intensity": [0.8, 0.2]
+            }
+        }
+    )
+    await db_session.commit()
+    
+    engine = RuleEngine()
+    trained = await engine.train(db_session, platform)
+    checkpoint = await load_training_checkpoint(db_session, platform)
+    
+    assert checkpoint.examples_seen == 100 + 2
+    assert sum(trained.weights.values()) == pytest.approx(1.0)
+    
+    # Nothing new: the rerun reads no events and keeps the weights
+    rerun = await engine.train(db_session, platform)
+    assert rerun.weights == pytest.approx(trained.weights)
+    assert (await load_training_checkpoint(db_session, platform)).examples_seen == 102
+    
+    for i in range(5):
+        await log_event(
+            db=db_session,
+            event_type="clip_evaluated",
+            entity_type="clip",
+            entity_id=str(uuid4()),
+            metadata={"platform": platform, "score": 0.9, "features": _training_features(i)}
+        )
+    await db_session.commit()
+    
+    await engine.train(db_session, platform)
+    assert (await load_training_checkpoint(db_session, platform)).examples_seen == 107
+
+
+async def _log_engagement_events(db_session, platform, count):
+    """Evaluation events whose engagement follows visual_score."""
+    for i in range(count):
+        visual = (i % 10) / 10
+        await log_event(
+            db=db_session,
+            event_type="clip_evaluated",
+            entity_type="clip",
+            entity_id=str(uuid4()),
+            metadata={
+                "platform": platform,
+                "score": 0.5,
+                "features": {**_training_features(i), "visual_score": visual},
+                "engagement": {"views": 5000 if visual > 0.5 else 10, "likes": 500 if visual > 0.5 else 0}
+            }
+        )
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_training_keeps_weights_worse_on_holdout(db_session, monkeypatch):
+    """Test new weights are not promoted when they do worse on held-out examples."""
+    from app.rules_engine import trainer
+    from app.ledger.models import LedgerEvent
+    
+    platform = "instagram"
+    initial = await load_rules(db_session, platform)
+    
+    # Targets from engagement say visual_score is what matters ...
+    await _log_engagement_events(db_session, platform, 200)
+    
+    # ... but a solver that ignores the data proposes worse weights
+    monkeypatch.setattr(
+        trainer, "_sgd_fit",
+        lambda weights, X, y, prior: np.array([0.0, 1.0, 0.0, 0.0])
+    )
+    rules = await RuleEngine().train(db_session, platform)
+    await db_session.flush()
+    
+    assert rules.weights == pytest.approx(initial.weights)
+    assert (await load_rules(db_session, platform)).weights == pytest.approx(initial.weights)
+    
+    result = await db_session.execute(
+        select(LedgerEvent).where(LedgerEvent.event_type == "rule_weight_update_rejected")
+    )
+    event = result.scalars().one()
+    holdout = event.event_data["holdout"]
+    assert holdout["holdout_examples"] >= trainer.MIN_HOLDOUT_EXAMPLES
+    assert holdout["candidate_mse"] > holdout["current_mse"]
+    
+    invalidate_rules_cache()
+
+
+@pytest.mark.asyncio
+async def test_rejected_weights_not_resumed_by_small_rerun(db_session, monkeypatch):
+    """Test a small rerun after a rejection starts from the promoted weights."""
+    from app.rules_engine import trainer
+    from app.rules_engine.loader import load_training_checkpoint
+    
+    platform = "youtube"
+    initial = await load_rules(db_session, platform)
+    await _log_engagement_events(db_session, platform, 200)
+    
+    sgd_fit = trainer._sgd_fit
+    monkeypatch.setattr(
+        trainer, "_sgd_fit",
+        lambda weights, X, y, prior: np.array([0.0, 1.0, 0.0, 0.0])
+    )
+    await RuleEngine().train(db_session, platform)
+    
+    checkpoint = await load_training_checkpoint(db_session, platform)
+    assert checkpoint.weights == pytest.approx(initial.weights)
+    assert checkpoint.examples_seen == 200
+    
+    # Too few new events for the holdout gate: promoted without it, so it
+    # must not build on the rejected weights
+    monkeypatch.setattr(trainer, "_sgd_fit", sgd_fit)
+    await _log_engagement_events(db_session, platform, 3)
+    rules = await RuleEngine().train(db_session, platform)
+    
+    assert rules.weights["duration_ms"] == pytest.approx(initial.weights["duration_ms"], abs=0.1)
+    
+    invalidate_rules_cache()
+
+
 @pytest.mark.asyncio
 async def test_persistence_roundtrip(db_session):
     """Test that saving and loading rules works correctly."""
@@ -0,0 +1,365 @@
+"""
+Tests for the FFmpeg variant renderer (app/services/variant_renderer.py)
+
+ffmpeg is replaced by a small script that speaks the same -progress protocol.
+"""
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.ledger.models import LedgerEvent  # noqa: F401 - registers the ledger table
+from app.models.database import Clip, Job, JobStatus, VideoAsset
+from app.services.job_worker import run_job
+from app.worker.worker import process_single_job
+from app.services import variant_renderer
+from app.services.variant_renderer import (
+    CANCEL_REQUESTED,
+    PLATFORM_PROFILES,
+    RenderCancelled,
+    RenderError,
+    RenderPool,
+    build_ffmpeg_command,
+    render_clip_variants,
+    request_render_cancel,
+)
+from tests.test_db import init_test_db, drop_test_db, TestSessionLocal
+
+
+FAKE_FFMPEG = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+outputs = [a for i, a in enumerate(args) if a.endswith(".mp4") and args[i - 1] != "-i"]
+if os.environ.get("FAKE_FFMPEG_FAIL"):
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+for path in outputs:
+    open(path, "wb").write(b"partial")
+step_s = float(os.environ.get("FAKE_FFMPEG_STEP_S", "0.01"))
+for out_time_us in (500000, 1000000, 1500000, 2000000):
+    print("frame=1", flush=True)
+    print(f"out_time_us={{out_time_us}}", flush=True)
+    print("progress=continue", flush=True)
+    time.sleep(step_s)
+print("progress=end", flush=True)
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    """Executable standing in for ffmpeg (2s of output in 4 progress steps)."""
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def _outputs(tmp_path, name="clip"):
+    return [
+        (PLATFORM_PROFILES[platform], str(tmp_path / "out" / f"{name}_{platform}.mp4"))
+        for platform in ("instagram", "tiktok", "youtube")
+    ]
+
+
+def test_build_ffmpeg_command_single_decode_multiple_outputs(tmp_path):
+    """Test one input and one split filter graph feed all three outputs."""
+    outputs = _outputs(tmp_path)
+    command = build_ffmpeg_command("source.mp4", 10_000, 110_000, outputs, threads=4)
+    
+    assert command.count("-i") == 1
+    graph = command[command.index("-filter_complex") + 1]
+    assert graph.startswith("[0:v]split=3[v0][v1][v2];")
+    assert "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920" in graph
+    for i, (_, path) in enumerate(outputs):
+        assert command[command.index(path) - 1] != "-i"
+        assert f"[out{i}]" in command
+    
+    # 100s clip: only Instagram (90s) is trimmed
+    assert command[command.index(outputs[0][1]) - 2:command.index(outputs[0][1])] == ["-t", "90.000"]
+    assert command[command.index(outputs[1][1]) - 2] != "-t"
+    assert command[-3:] == ["-progress", "pipe:1", "-nostats"]
+
+
+@pytest.mark.asyncio
+async def test_render_pool_renders_and_reports_progress(tmp_path, fake_ffmpeg):
+    """Test outputs are produced and progress goes from 0 to 1."""
+    pool = RenderPool(max_concurrent=2, ffmpeg_binary=fake_ffmpeg)
+    progress = []
+    
+    async def on_progress(fraction):
+        progress.append(fraction)
+    
+    paths = await pool.render("job-1", "source.mp4", 0, 2000, _outputs(tmp_path), on_progress)
+    
+    assert all(os.path.exists(path) for path in paths)
+    assert progress == [0.25, 0.5, 0.75, 1.0, 1.0]
+    assert pool.get_stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_render_pool_bounds_concurrent_processes(tmp_path, fake_ffmpeg, monkeypatch):
+    """Test no more than max_concurrent ffmpeg processes run at once."""
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "0.05")
+    pool = RenderPool(max_concurrent=2, ffmpeg_binary=fake_ffmpeg)
+    peak = 0
+    
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, pool.running)
+            await asyncio.sleep(0.005)
+    
+    watcher = asyncio.create_task(watch())
+    await asyncio.gather(*(
+        pool.render(f"job-{i}", "source.mp4", 0, 2000, _outputs(tmp_path, f"clip{i}"))
+        for i in range(5)
+    ))
+    watcher.cancel()
+    
+    assert peak == 2
+    assert pool.get_stats()["completed"] == 5
+    assert pool.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_render_pool_cancel_terminates_ffmpeg(tmp_path, fake_ffmpeg, monkeypatch):
+    """Test cancel() stops a running render and removes partial outputs."""
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "5")
+    pool = RenderPool(max_concurrent=1, ffmpeg_binary=fake_ffmpeg)
+    started = asyncio.Event()
+    
+    async def on_progress(fraction):
+        started.set()
+    
+    outputs = _outputs(tmp_path)
+    task = asyncio.create_task(pool.render("job-1", "source.mp4", 0, 2000, outputs, on_progress))
+    await asyncio.wait_for(started.wait(), 5)
+    
+    begin = time.monotonic()
+    assert pool.cancel("job-1") is True
+    with pytest.raises(RenderCancelled):
+        await task
+    
+    assert time.monotonic() - begin < 2
+    assert not any(os.path.exists(path) for _, path in outputs)
+    assert pool.get_stats()["cancelled"] == 1
+    assert pool.cancel("job-1") is False
+
+
+@pytest.mark.asyncio
+async def test_render_pool_cancel_queued_render(tmp_path, fake_ffmpeg, monkeypatch):
+    """Test a render cancelled while waiting for a slot never starts ffmpeg."""
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "0.05")
+    pool = RenderPool(max_concurrent=1, ffmpeg_binary=fake_ffmpeg)
+    
+    first = asyncio.create_task(pool.render("job-1", "source.mp4", 0, 2000, _outputs(tmp_path, "a")))
+    second = asyncio.create_task(pool.render("job-2", "source.mp4", 0, 2000, _outputs(tmp_path, "b")))
+    await asyncio.sleep(0.05)
+    
+    assert pool.cancel("job-2") is False  # queued, nothing to signal yet
+    await first
+    with pytest.raises(RenderCancelled):
+        await second
+    assert not os.path.exists(str(tmp_path / "out" / "b_youtube.mp4"))
+
+
+@pytest.mark.asyncio
+async def test_render_pool_reports_ffmpeg_errors(tmp_path, fake_ffmpeg, monkeypatch):
+    """Test a failing ffmpeg raises RenderError with its stderr."""
+    monkeypatch.setenv("FAKE_FFMPEG_FAIL", "1")
+    pool = RenderPool(ffmpeg_binary=fake_ffmpeg)
+    
+    with pytest.raises(RenderError, match="Invalid data found"):
+        await pool.render("job-1", "source.mp4", 0, 2000, _outputs(tmp_path))
+    
+    assert pool.get_stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_render_pool_missing_ffmpeg(tmp_path):
+    """Test a missing ffmpeg binary is reported as RenderError."""
+    pool = RenderPool(ffmpeg_binary=str(tmp_path / "no-ffmpeg"))
+    
+    assert pool.available is False
+    with pytest.raises(RenderError):
+        await pool.render("job-1", "source.mp4", 0, 2000, _outputs(tmp_path))
+
+
+# ================== render_clip_variants (Job row) ==================
+
+@pytest_asyncio.fixture
+async def variant_job(tmp_path, monkeypatch):
+    """Committed generate_variants job for a 2s clip, with its own session."""
+    await init_test_db()
+    monkeypatch.setattr(variant_renderer.settings, "VARIANT_STORAGE_DIR", str(tmp_path / "variants"))
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b"video")
+    
+    async with TestSessionLocal() as session:
+        video = VideoAsset(title="Source", file_path=str(source))
+        session.add(video)
+        await session.flush()
+        clip = Clip(video_asset_id=video.id, start_ms=0, end_ms=2000, duration_ms=2000)
+        session.add(clip)
+        await session.flush()
+        job = Job(job_type="generate_variants", status=JobStatus.PROCESSING, clip_id=clip.id)
+        session.add(job)
+        await session.commit()
+        yield job, session
+    
+    await drop_test_db()
+
+
+async def _job_result(job_id):
+    async with TestSessionLocal() as session:
+        return (await session.execute(select(Job.result).where(Job.id == job_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_render_clip_variants_writes_progress_in_own_session(variant_job, fake_ffmpeg, monkeypatch):
+    """Test progress reaches the Job row without committing the caller's session."""
+    job, db = variant_job
+    
+    async def no_commit():
+        raise AssertionError("render_clip_variants must not commit the caller's session")
+    
+    monkeypatch.setattr(db, "commit", no_commit)
+    pool = RenderPool(ffmpeg_binary=fake_ffmpeg)
+    
+    variants = await render_clip_variants(job, db, pool=pool, session_factory=TestSessionLocal)
+    
+    assert [variant.platform for variant in variants] == list(PLATFORM_PROFILES)
+    assert await _job_result(job.id) == {"stage": "rendering", "progress": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_persisted_cancel_flag_stops_render(variant_job, fake_ffmpeg, monkeypatch):
+    """Test a cancel requested from another process stops the render at its next progress update."""
+    job, db = variant_job
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "5")
+    pool = RenderPool(ffmpeg_binary=fake_ffmpeg)
+    
+    # The API process: this pool is not its render pool
+    async with TestSessionLocal() as api_session:
+        api_job = (await api_session.execute(select(Job).where(Job.id == job.id))).scalar_one()
+        assert request_render_cancel(api_job) is False
+        await api_session.commit()
+    
+    begin = time.monotonic()
+    with pytest.raises(RenderCancelled):
+        await render_clip_variants(job, db, pool=pool, session_factory=TestSessionLocal)
+    
+    assert time.monotonic() - begin < 2
+    assert (await _job_result(job.id))[CANCEL_REQUESTED] is True
+    assert pool.get_stats()["cancelled"] == 1
+
+
+# ================== Job runners (file-backed database) ==================
+
+@pytest_asyncio.fixture
+async def file_db(tmp_path, monkeypatch):
+    """
+    File-backed SQLite database with a PENDING generate_variants job.
+    
+    Unlike the shared in-memory test database, sessions get their own
+    connections, so uncommitted writes of one session lock out the others
+    (the short timeout makes a lock fail fast instead of waiting 5s).
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"timeout": 0.5}
+    )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    monkeypatch.setattr(variant_renderer.settings, "VARIANT_STORAGE_DIR", str(tmp_path / "variants"))
+    source = tmp_path / "source.mp4"
+    source.write_bytes(b"video")
+    async with session_factory() as session:
+        video = VideoAsset(title="Source", file_path=str(source))
+        session.add(video)
+        await session.flush()
+        clip = Clip(video_asset_id=video.id, start_ms=0, end_ms=2000, duration_ms=2000)
+        session.add(clip)
+        await session.flush()
+        job = Job(job_type="generate_variants", status=JobStatus.PENDING, clip_id=clip.id)
+        session.add(job)
+        await session.commit()
+    
+    yield session_factory, job.id
+    await engine.dispose()
+
+
+@pytest.fixture
+def render_in_file_db(file_db, fake_ffmpeg, monkeypatch):
+    """Route the renderer's pool and progress sessions to file_db; record persisted progress."""
+    session_factory, job_id = file_db
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "0.1")
+    monkeypatch.setattr(variant_renderer, "PROGRESS_INTERVAL_S", 0.0)
+    monkeypatch.setattr(variant_renderer, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(variant_renderer, "_render_pool", RenderPool(ffmpeg_binary=fake_ffmpeg))
+    
+    persisted = []
+    write_progress = variant_renderer._write_progress
+    
+    async def recording_write_progress(factory, job_id, progress):
+        cancel = await write_progress(factory, job_id, progress)
+        async with factory() as session:
+            result = (await session.execute(select(Job.result).where(Job.id == job_id))).scalar_one()
+        persisted.append((result or {}).get("progress"))
+        return cancel
+    
+    monkeypatch.setattr(variant_renderer, "_write_progress", recording_write_progress)
+    return session_factory, job_id, persisted
+
+
+async def _run_with(runner, session):
+    if runner == "run_job":
+        return (await run_job(str(session.info["job_id"]), session))["status"]
+    return (await process_single_job(session))["status"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("runner", ["run_job", "worker"])
+async def test_job_runners_persist_progress_while_rendering(render_in_file_db, runner, caplog):
+    """Test progress is saved mid-job: the runner's session holds no lock on the Job row."""
+    session_factory, job_id, persisted = render_in_file_db
+    
+    async with session_factory() as session:
+        session.info["job_id"] = job_id
+        begin = time.monotonic()
+        assert await _run_with(runner, session) == "completed"
+    
+    assert time.monotonic() - begin < 3
+    assert persisted == [0.25, 0.5, 0.75, 1.0, 1.0]
+    assert "Could not write render progress" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cancel_flag_reaches_render_started_by_job_runner(render_in_file_db, monkeypatch):
+    """Test a cancel persisted by another session stops a render run by run_job."""
+    session_factory, job_id, persisted = render_in_file_db
+    monkeypatch.setenv("FAKE_FFMPEG_STEP_S", "0.3")
+    
+    async with session_factory() as session:
+        session.info["job_id"] = job_id
+        task = asyncio.create_task(_run_with("run_job", session))
+        while not persisted:
+            await asyncio.sleep(0.01)
+        
+        async with session_factory() as api_session:
+            api_job = (await api_session.execute(select(Job).where(Job.id == job_id))).scalar_one()
+            request_render_cancel(api_job)
+            await api_session.commit()
+        
+        assert await asyncio.wait_for(task, 5) == "failed"
+    
+    assert variant_renderer._render_pool.get_stats()["cancelled"] == 1